@@ -4,5 +4,11 @@
 # 'daemon off;' is nginx configuration directive
 nginx -g 'daemon off;' &
 
+# Empty the directory of the Prometheus metrics of the uwsgi workers (see uwsgi.ini),
+# so that counters restart with the workers, and the directory of the slow query tables
+# of the workers (SLOW_QUERY_DIR in app.cfg)
+rm -rf /tmp/hs-ontology-api-metrics /tmp/hs-ontology-api-slow-queries
+mkdir -p /tmp/hs-ontology-api-metrics
+
 # Start uwsgi and keep it running in foreground
 /usr/local/python3.13/bin/uwsgi --ini /usr/src/app/src/uwsgi.ini
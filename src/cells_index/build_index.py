@@ -1,96 +1,578 @@
-"""
 # coding: utf-8
 
-# Prototype utility that builds a CSV file of information extracted from the Cells API.
+# Utility that builds TSV and Parquet files of the cell types associated with genes, extracted from the Cells API.
+# The files are read by OntologyCellsClient.celltypes_for_gene_csv (utils/cellsclient.py).
 # This script is not part of the Flask Blueprint architecture, but shares the app.cfg file.
 
-import logging
+# A gene is present in a cell if its expression value in one of the modalities (by default, RNA and ATAC) is
+# greater than a threshold (by default, 1). For every gene, the file has a row for each distinct cell type of
+# the cells in datasets in which the gene is present.
+
+# The script has two modes:
+# 1. gene (default): for every gene, the script asks the Cells API for the cells in which the gene is present.
+#    This requires two requests (one per modality) per gene.
+# 2. dataset (--mode dataset): for every dataset, the script obtains the expression values of the cells of the
+#    dataset, in chunks of genes, and computes the presence of every gene by organ and cell type locally, with
+#    NumPy and pandas. The number of requests depends on the number of datasets, not on the number of genes.
+# The requests for a gene (or dataset) are independent of the requests for others, so a pool of threads
+# processes genes (or datasets) concurrently. Results are written by the main thread only.
+
+# Rows are appended to a working file (the TSV file with the suffix .genes or .datasets). A checkpoint file lists
+# the genes (or datasets) for which the rows have been written. A run with --resume skips these, so that a run
+# that stopped--e.g., because of a network error--does not have to start over.
+
+# At the end of a build, the TSV file is written from the working file, and the rows are also written to a
+# Parquet file for the API (see CellsParquetIndex in utils/cellsclient.py): sorted by gene symbol, with
+# dictionary-encoded columns and statistics for each row group, so that a lookup by gene symbol reads only the
+# row groups that can contain the gene. Both files are written to temporary files that replace the files
+# atomically, so that the API never reads a partial file.
+
+# In dataset mode, a manifest file records the datasets and the parameters of the last completed build.
+# A run with --incremental processes only the datasets added since that build, removes the rows of the
+# datasets that were removed, and merges the result into the files.
+
+# The client is created by a factory function, one per thread, so that the pipeline (build_index) can be run
+# with a local stand-in for the Cells API client that implements select_datasets, select_cells and
+# select_genes.
+
+# Usage (from the src/cells_index directory):
+#   python build_index.py [--mode gene|dataset] [--workers 8] [--resume | --incremental] [--genes MMRN1 ...]
+#       [--modalities rna atac] [--threshold 1] [--gene-chunk-size 1000] [--no-parquet]
+
+import argparse
+import concurrent.futures
 import csv
+import hashlib
+import json
+import logging
 import os
-
-# Cells API client
-from hubmap_api_py_client import Client
-from hubmap_api_py_client.errors import ClientError
+import shutil
+import threading
+import time
+from typing import Callable, Iterable, Optional
 
 from flask import Flask
 
-# Instantiate hubmap-api-py-client. Obtain URL from the Flask app's config file.
+logging.basicConfig(format='[%(asctime)s] %(levelname)s in %(module)s:%(lineno)d: %(message)s',
+                    datefmt='%Y-%m-%d %H:%M:%S',
+                    level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+INDEX_DIR = os.path.dirname(os.path.abspath(__file__))
+# Default output files
+TSV_PATH = os.path.join(INDEX_DIR, 'cells.tsv')
+CHECKPOINT_PATH = os.path.join(INDEX_DIR, 'cells.checkpoint')
+MANIFEST_PATH = os.path.join(INDEX_DIR, 'cells.manifest.json')
+PARQUET_PATH = os.path.join(INDEX_DIR, 'cells.parquet')
+
+# Rows per row group of the Parquet file. Smaller row groups let a lookup skip more rows, at the cost of
+# more statistics in the file footer.
+PARQUET_ROW_GROUP_SIZE = 64 * 1024
+
+HEADER = ['gene_symbol', 'dataset_uuid', 'organ', 'cell_type']
+
+# Defaults for the presence of a gene in a cell
+MODALITIES = ['rna', 'atac']
+THRESHOLD = 1.0
+# Number of genes for which the dataset mode requests expression values at a time
+GENE_CHUNK_SIZE = 1000
+
+
 def make_flask_config():
+    # Obtains the configuration of the API, including the URL of the Cells API (CELLSURL).
     temp_flask_app = Flask(__name__,
-                      instance_path=os.path.join(os.path.dirname(os.getcwd()), 'hs_ontology_api/instance'),
-                      instance_relative_config=True)
+                           instance_path=os.path.join(INDEX_DIR, '..', 'hs_ontology_api', 'instance'),
+                           instance_relative_config=True)
     temp_flask_app.config.from_pyfile('app.cfg')
     return temp_flask_app.config
 
-# ---
 
-logging.basicConfig(format='[%(asctime)s] %(levelname)s in %(module)s:%(lineno)d: %(message)s',
-                            datefmt='%Y-%m-%d %H:%M:%S',
-                            level=logging.INFO)
-logger = logging.getLogger(__name__)
-client_url = make_flask_config()['CELLSURL']
-client = Client(client_url)
-
-# Open CSV and write header.
-fpath = os.path.dirname(os.getcwd())
-fpath = os.path.join(fpath, 'cells_index/cells.tsv')
-csvfile = open(fpath, 'w', newline='')
-cellwriter = csv.writer(csvfile, delimiter='\t',quotechar='|', quoting=csv.QUOTE_MINIMAL)
-cellwriter.writerow(['gene_symbol', 'dataset_uuid', 'organ', 'cell_type'])
-
-# Load dataset and cell information using Cells API.
-
-# 1. All datasets
-datasets = client.select_datasets()
-logging.info(f'{len(datasets)} datasets')
-
-# 2. All cells in datasets.
-dataset_uuids = []
-datasets = datasets.get_list()
-for d in datasets:
-    dataset_uuids.append(d['uuid'])
-
-cells_in_datasets = client.select_cells(where='dataset', has=dataset_uuids)
-logging.info(f'{len(cells_in_datasets)} cells in datasets')
-
-# 3. All genes
-genes = client.select_genes().get_list()
-logging.info(f'{len(genes)} genes')
-
-# DEBUG - use set of test genes for prototype.
-genes = [{'gene_symbol':'MMRN1'}]
-# Check every gene for presence in cells in datasets.
-gene_symbols = []
-
-for gene in genes:
-    gene_symbol = gene['gene_symbol']
-    try:
-        # Find cells with the gene, and intersect with cells from datasets to find
-        # cells with the gene in datasets.
-        logging.info(f'Looking for cells with gene {gene_symbol}, rna')
-        cells_with_gene_rna = client.select_cells(where='gene', has=[f'{gene_symbol} > 1'], genomic_modality='rna')
-        logging.info(f'Looking for cells with gene {gene_symbol}, atac')
-        cells_with_gene_atac = client.select_cells(where='gene', has=[f'{gene_symbol} > 1'], genomic_modality='atac')
+def tsv_writer(tsvfile):
+    # The dialect must match the reader in utils/cellsclient.py.
+    return csv.writer(tsvfile, delimiter='\t', quotechar='|', quoting=csv.QUOTE_MINIMAL)
+
+
+def read_checkpoint(checkpoint_path: str) -> set:
+    """
+    Returns the set of genes listed in a checkpoint file.
+    :param checkpoint_path: path to the checkpoint file
+    """
+    if not os.path.exists(checkpoint_path):
+        return set()
+    with open(checkpoint_path) as checkpointfile:
+        return {line.rstrip('\n') for line in checkpointfile if line.strip() != ''}
+
+
+def write_checkpoint(checkpoint_path: str, keys: Iterable[str]):
+    """
+    Writes a checkpoint file.
+    :param checkpoint_path: path to the checkpoint file
+    :param keys: genes (or datasets)
+    """
+    with open(checkpoint_path, 'w') as checkpointfile:
+        checkpointfile.writelines(f'{key}\n' for key in keys)
+
+
+def replace_file(path: str, write: Callable[[str], None]):
+    """
+    Writes a file to a temporary file that then replaces the file atomically, so that readers of the file
+    see either the previous file or the new file.
+    :param path: path to the file
+    :param write: function that writes the file, with the path of the temporary file as its argument
+    """
+    tmp_path = f'{path}.tmp'
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def read_manifest(manifest_path: str) -> Optional[dict]:
+    """
+    Returns the manifest of the last completed build in dataset mode, or None if there is no manifest.
+    :param manifest_path: path to the manifest file
+    """
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path) as manifestfile:
+        return json.load(manifestfile)
+
+
+def write_manifest(manifest_path: str, datasets: Iterable[str], parameters: dict):
+    """
+    Writes the manifest of a completed build in dataset mode.
+    :param manifest_path: path to the manifest file
+    :param datasets: UUIDs of the datasets in the index
+    :param parameters: parameters of the build, from build_parameters
+    """
+    def write(tmp_path: str):
+        with open(tmp_path, 'w') as manifestfile:
+            json.dump(dict(parameters, datasets=sorted(datasets)), manifestfile, indent=2)
+    replace_file(manifest_path, write)
+
+
+def build_parameters(genes: list[str], modalities: list[str], threshold: float) -> dict:
+    """
+    Returns the parameters that determine the rows for a dataset. An incremental build is possible only
+    with the parameters of the last build.
+    :param genes: gene symbols
+    :param modalities: genomic modalities
+    :param threshold: minimum expression value (exclusive) for the presence of a gene in a cell
+    """
+    return {'genes_sha256': hashlib.sha256('\n'.join(sorted(genes)).encode()).hexdigest(),
+            'modalities': sorted(modalities),
+            'threshold': threshold}
+
+
+def truncate_to_checkpoint(tsv_path: str, done: set, key_column: int = 0):
+    """
+    Removes the rows of the genes (or datasets) that are not in the checkpoint from the TSV file--e.g., rows
+    written by a run that stopped before it recorded the gene in the checkpoint.
+
+    :param tsv_path: path to the TSV file
+    :param done: set of genes (or datasets) in the checkpoint
+    :param key_column: index of the column with the keys of the checkpoint
+    """
+    def write(tmp_path: str):
+        with open(tsv_path, newline='') as tsvfile, open(tmp_path, 'w', newline='') as tmpfile:
+            reader = csv.reader(tsvfile, delimiter='\t', quotechar='|')
+            writer = tsv_writer(tmpfile)
+            next(reader, None)
+            writer.writerow(HEADER)
+            for row in reader:
+                if len(row) > key_column and row[key_column] in done:
+                    writer.writerow(row)
+    replace_file(tsv_path, write)
+
+
+def write_parquet(tsv_path: str, parquet_path: str, row_group_size: int = PARQUET_ROW_GROUP_SIZE) -> int:
+    """
+    Writes the rows of the TSV file to a Parquet file, sorted by gene symbol and cell type.
+
+    :param tsv_path: path to the TSV file
+    :param parquet_path: path to the Parquet file. The file is replaced atomically, so that the API never
+                         reads a partial file.
+    :param row_group_size: number of rows per row group
+    :return: number of rows
+    """
+    # pyarrow is required only to write the Parquet file.
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    with open(tsv_path, newline='') as tsvfile:
+        reader = csv.reader(tsvfile, delimiter='\t', quotechar='|')
+        next(reader, None)
+        rows = sorted((row for row in reader if len(row) == len(HEADER)), key=lambda row: (row[0], row[3]))
+
+    columns = {name: pa.array([row[i] for row in rows], type=pa.string()) for i, name in enumerate(HEADER)}
+    # Gene symbol, organ and cell type repeat across rows, so they are dictionary-encoded.
+    for name in ('gene_symbol', 'organ', 'cell_type'):
+        columns[name] = columns[name].dictionary_encode()
+    table = pa.table(columns)
+
+    replace_file(parquet_path, lambda tmp_path: pq.write_table(table, tmp_path, row_group_size=row_group_size,
+                                                               use_dictionary=True, write_statistics=True,
+                                                               compression='zstd'))
+    return len(rows)
+
+
+def gene_cell_types(client, gene_symbol: str, cells_in_datasets, client_error: type,
+                    modalities: list[str] = MODALITIES, threshold: float = THRESHOLD) -> list[list[str]]:
+    """
+    Returns the rows for a gene: one row for each distinct cell type of the cells in datasets that have
+    the gene, with the dataset and organ of the first of these cells.
 
+    :param client: Cells API client
+    :param gene_symbol: gene symbol
+    :param cells_in_datasets: cells in all datasets, from client.select_cells
+    :param client_error: type of the errors raised by the client for genes that are not in the client's
+                         list of genes
+    :param modalities: genomic modalities in which to look for the gene
+    :param threshold: minimum expression value (exclusive) for the presence of the gene in a cell
+    """
+    try:
         # Cells from all modalities
-        cells_with_gene = cells_with_gene_rna | cells_with_gene_atac
-
-        # Cells with gene in datasets
-        cells_with_gene_in_datasets = cells_with_gene & cells_in_datasets
-        cells_list = cells_with_gene_in_datasets.get_list()
-
-        # Find distinct combinations of cell type, dataset, gene.
-        cell_types = []
-        for c in cells_list:
-            cell_type = c['cell_type']
-            if not cell_type in cell_types:
-                cell_types.append(cell_type)
-                dataset_uuid = c['dataset']
-                organ = c['organ']
-                cellwriter.writerow([gene_symbol, dataset_uuid, organ, cell_type])
-
-    except ClientError:
+        cells_with_gene = None
+        for modality in modalities:
+            cells = client.select_cells(where='gene', has=[f'{gene_symbol} > {threshold:g}'],
+                                        genomic_modality=modality)
+            cells_with_gene = cells if cells_with_gene is None else cells_with_gene | cells
+    except client_error:
         # The genes list contains elements that are not actually genes, and that
         # result in errors from the client that are meaningless in this context.
-        pass
-"""
\ No newline at end of file
+        return []
+    if cells_with_gene is None:
+        return []
+
+    # Cells with gene in datasets
+    cells_with_gene_in_datasets = cells_with_gene & cells_in_datasets
+
+    # Find distinct combinations of cell type, dataset, gene.
+    cell_types = {}
+    for c in cells_with_gene_in_datasets.get_list():
+        if c['cell_type'] not in cell_types:
+            cell_types[c['cell_type']] = [gene_symbol, c['dataset'], c['organ'], c['cell_type']]
+    return list(cell_types.values())
+
+
+def presence(cells: list[dict], genes: list[str], threshold: float):
+    """
+    Returns the distinct combinations of gene, organ and cell type for which the gene is present in a cell.
+
+    :param cells: cells with organ, cell_type and values, a dict of expression values keyed by gene symbol
+    :param genes: gene symbols for which the cells have values
+    :param threshold: minimum expression value (exclusive) for the presence of a gene in a cell
+    :return: pandas DataFrame with columns gene_symbol, organ, cell_type
+    """
+    import numpy as np
+    import pandas as pd
+
+    # Matrix of cells x genes, True where the gene is present in the cell
+    values = pd.DataFrame.from_records([c.get('values') or {} for c in cells], columns=genes)
+    present = pd.DataFrame(values.fillna(0).to_numpy(dtype=float) > threshold, columns=genes)
+
+    # Matrix of (organ, cell type) x genes, True where the gene is present in a cell of the group
+    grouped = present.groupby([np.array([c['organ'] for c in cells], dtype=object),
+                               np.array([c['cell_type'] for c in cells], dtype=object)]).any()
+    group_rows, gene_columns = np.nonzero(grouped.to_numpy())
+    return pd.DataFrame({'gene_symbol': np.array(genes, dtype=object)[gene_columns],
+                         'organ': grouped.index.get_level_values(0).to_numpy()[group_rows],
+                         'cell_type': grouped.index.get_level_values(1).to_numpy()[group_rows]})
+
+
+def dataset_cell_types(client, dataset_uuid: str, genes: list[str], client_error: type,
+                       modalities: list[str] = MODALITIES, threshold: float = THRESHOLD,
+                       gene_chunk_size: int = GENE_CHUNK_SIZE) -> list[list[str]]:
+    """
+    Returns the rows for a dataset: one row for each distinct combination of gene, organ and cell type for
+    which the gene is present in a cell of the dataset.
+
+    :param client: Cells API client
+    :param dataset_uuid: dataset UUID
+    :param genes: gene symbols
+    :param client_error: type of the errors raised by the client--e.g., for a modality without cells in the
+                         dataset
+    :param modalities: genomic modalities in which to look for genes
+    :param threshold: minimum expression value (exclusive) for the presence of a gene in a cell
+    :param gene_chunk_size: number of genes for which to request expression values at a time
+    """
+    import pandas as pd
+
+    frames = []
+    for modality in modalities:
+        try:
+            cells = client.select_cells(where='dataset', has=[dataset_uuid], genomic_modality=modality)
+        except client_error:
+            continue
+        for start in range(0, len(genes), gene_chunk_size):
+            chunk = genes[start:start + gene_chunk_size]
+            cells_with_values = cells.get_list(values_included=chunk)
+            if len(cells_with_values) == 0:
+                break
+            frames.append(presence(cells_with_values, chunk, threshold))
+
+    if len(frames) == 0:
+        return []
+    rows = pd.concat(frames, ignore_index=True).drop_duplicates()
+    rows.insert(1, 'dataset_uuid', dataset_uuid)
+    return rows[HEADER].values.tolist()
+
+
+def merge_dataset_rows(work_path: str, tsv_path: str) -> int:
+    """
+    Writes the TSV file from the working file of the dataset mode, with one row for each distinct combination
+    of gene and cell type, with the first dataset (by UUID) and organ in which the gene is present.
+
+    :param work_path: path to the working file
+    :param tsv_path: path to the TSV file
+    :return: number of rows
+    """
+    import pandas as pd
+
+    rows = pd.read_csv(work_path, sep='\t', quotechar='|', dtype=str, keep_default_na=False)
+    rows = rows.sort_values(['gene_symbol', 'cell_type', 'dataset_uuid', 'organ'], kind='stable')
+    rows = rows.drop_duplicates(['gene_symbol', 'cell_type'])
+    def write(tmp_path: str):
+        with open(tmp_path, 'w', newline='') as tsvfile:
+            writer = tsv_writer(tsvfile)
+            writer.writerow(HEADER)
+            writer.writerows(rows[HEADER].values.tolist())
+    replace_file(tsv_path, write)
+    return len(rows)
+
+
+class Progress:
+
+    def __init__(self, total: int, interval: float = 30.0, unit: str = 'genes'):
+        """
+        Logs the progress and throughput of a build.
+        :param total: number of genes (or datasets) to process
+        :param interval: minimum number of seconds between reports
+        :param unit: name of the items to process, for the reports
+        """
+        self.total = total
+        self.unit = unit
+        self.interval = interval
+        self.done = 0
+        self.rows = 0
+        self.failed = 0
+        self.start = time.perf_counter()
+        self._last_report = self.start
+
+    def update(self, rows: int = 0, failed: bool = False):
+        if failed:
+            self.failed += 1
+        else:
+            self.done += 1
+            self.rows += rows
+        if time.perf_counter() - self._last_report >= self.interval:
+            self.report()
+
+    def report(self):
+        self._last_report = time.perf_counter()
+        elapsed = self._last_report - self.start
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        remaining = self.total - self.done - self.failed
+        eta = f'{remaining / rate / 60:.1f} min' if rate > 0 else 'unknown'
+        logger.info(f'{self.done}/{self.total} {self.unit} ({self.failed} failed); {self.rows} rows; '
+                    f'{rate:.2f} {self.unit}/s; ETA {eta}')
+
+
+def process(keys: list[str], func: Callable[[object, str], list], client_factory: Callable[[], object],
+            tsv_path: str, checkpoint_path: str, resume: bool, workers: int, report_interval: float,
+            unit: str, key_column: int) -> Progress:
+    """
+    Appends the rows for a list of genes (or datasets) to a TSV file, calling a function for each in a pool
+    of threads, and records the genes (or datasets) in a checkpoint file.
+
+    :param keys: genes (or datasets)
+    :param func: function that returns the rows for a gene (or dataset), with a client and a key as arguments
+    :param client_factory: function that returns a Cells API client. Each thread calls the function once.
+    :param tsv_path: path to the TSV file
+    :param checkpoint_path: path to the checkpoint file
+    :param resume: if True, skip the keys in the checkpoint file and append to the TSV file; otherwise,
+                   start a new TSV file and checkpoint file
+    :param workers: number of threads
+    :param report_interval: minimum number of seconds between progress reports
+    :param unit: name of the keys, for the progress reports
+    :param key_column: index of the column of the TSV file with the key
+    :return: final progress
+    """
+    local = threading.local()
+
+    def thread_client():
+        if not hasattr(local, 'client'):
+            local.client = client_factory()
+        return local.client
+
+    done = set()
+    if resume and os.path.exists(tsv_path):
+        done = read_checkpoint(checkpoint_path)
+        truncate_to_checkpoint(tsv_path, done, key_column=key_column)
+        logger.info(f'Resuming: {len(done)} {unit} in checkpoint {checkpoint_path}')
+    else:
+        with open(tsv_path, 'w', newline='') as tsvfile:
+            tsv_writer(tsvfile).writerow(HEADER)
+        open(checkpoint_path, 'w').close()
+
+    todo = [key for key in keys if key not in done]
+    progress = Progress(total=len(todo), interval=report_interval, unit=unit)
+
+    with open(tsv_path, 'a', newline='') as tsvfile, open(checkpoint_path, 'a') as checkpointfile, \
+            concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        writer = tsv_writer(tsvfile)
+        futures = {executor.submit(lambda k: func(thread_client(), k), key): key for key in todo}
+        for future in concurrent.futures.as_completed(futures):
+            key = futures[future]
+            try:
+                rows = future.result()
+            except Exception as e:
+                # The key is not recorded in the checkpoint, so a resumed run retries it.
+                logger.warning(f'{key}: {e}')
+                progress.update(failed=True)
+                continue
+            # Rows are written before the key is recorded in the checkpoint.
+            writer.writerows(rows)
+            tsvfile.flush()
+            checkpointfile.write(f'{key}\n')
+            checkpointfile.flush()
+            progress.update(rows=len(rows))
+
+    progress.report()
+    return progress
+
+
+def build_index(client_factory: Callable[[], object], genes: Optional[Iterable[str]] = None,
+                tsv_path: str = TSV_PATH, checkpoint_path: str = CHECKPOINT_PATH, resume: bool = False,
+                workers: int = 8, client_error: type = Exception, report_interval: float = 30.0,
+                parquet_path: Optional[str] = PARQUET_PATH, mode: str = 'gene',
+                modalities: list[str] = MODALITIES, threshold: float = THRESHOLD,
+                gene_chunk_size: int = GENE_CHUNK_SIZE, incremental: bool = False,
+                manifest_path: str = MANIFEST_PATH) -> Progress:
+    """
+    Builds the TSV file of cell types for genes.
+
+    :param client_factory: function that returns a Cells API client (or a stand-in). Each thread calls
+                           the function once.
+    :param genes: gene symbols; if None, all genes from the Cells API
+    :param tsv_path: path to the TSV file
+    :param checkpoint_path: path to the checkpoint file
+    :param resume: if True, skip the genes (or datasets) in the checkpoint file; otherwise, start a new
+                   build
+    :param workers: number of threads that call the Cells API
+    :param client_error: type of the errors raised by the client for genes that are not in the client's
+                         list of genes
+    :param report_interval: minimum number of seconds between progress reports
+    :param parquet_path: path to the Parquet file written at the end of the build; if None, only the TSV
+                         file is written
+    :param mode: gene, for requests by gene; or dataset, for requests by dataset
+    :param modalities: genomic modalities in which to look for genes
+    :param threshold: minimum expression value (exclusive) for the presence of a gene in a cell
+    :param gene_chunk_size: in dataset mode, number of genes for which to request expression values at a time
+    :param incremental: in dataset mode, process only the datasets that are not in the manifest of the last
+                        build, and remove the rows of the datasets that are no longer in the Cells API. If
+                        there is no manifest, or the genes, modalities or threshold changed, the build is
+                        a full build.
+    :param manifest_path: path to the manifest file
+    :return: final progress, with the counts of genes (or datasets), rows and failures
+    """
+    client = client_factory()
+
+    # Load dataset and cell information using Cells API.
+    # 1. All datasets
+    datasets = client.select_datasets()
+    logger.info(f'{len(datasets)} datasets')
+    dataset_uuids = [d['uuid'] for d in datasets.get_list()]
+
+    # 2. All genes
+    if genes is None:
+        genes = [gene['gene_symbol'] for gene in client.select_genes().get_list()]
+    genes = list(dict.fromkeys(genes))
+    logger.info(f'{len(genes)} genes')
+
+    if mode == 'dataset':
+        work_path = f'{tsv_path}.datasets'
+        parameters = build_parameters(genes, modalities, threshold)
+        if incremental:
+            manifest = read_manifest(manifest_path)
+            if manifest is None or not os.path.exists(work_path):
+                logger.info('No manifest or working file from a previous build: full build')
+            elif any(manifest.get(key) != value for key, value in parameters.items()):
+                logger.info('The genes, modalities or threshold changed since the previous build: full build')
+            else:
+                # Keep the rows of the datasets of the last build that are still in the Cells API, and
+                # process only the datasets that were added.
+                kept = set(manifest['datasets']) & set(dataset_uuids)
+                logger.info(f'Incremental build: {len(dataset_uuids) - len(kept)} added datasets; '
+                            f'{len(manifest["datasets"]) - len(kept)} removed datasets')
+                write_checkpoint(checkpoint_path, sorted(kept))
+                resume = True
+        progress = process(dataset_uuids,
+                           lambda c, uuid: dataset_cell_types(c, uuid, genes, client_error, modalities=modalities,
+                                                              threshold=threshold, gene_chunk_size=gene_chunk_size),
+                           client_factory=client_factory, tsv_path=work_path, checkpoint_path=checkpoint_path,
+                           resume=resume, workers=workers, report_interval=report_interval,
+                           unit='datasets', key_column=1)
+        rows = merge_dataset_rows(work_path, tsv_path)
+        logger.info(f'Wrote {rows} rows to {tsv_path}')
+        write_manifest(manifest_path, read_checkpoint(checkpoint_path), parameters)
+    else:
+        work_path = f'{tsv_path}.genes'
+        # 3. All cells in datasets.
+        cells_in_datasets = client.select_cells(where='dataset', has=dataset_uuids)
+        logger.info(f'{len(cells_in_datasets)} cells in datasets')
+        progress = process(genes,
+                           lambda c, gene_symbol: gene_cell_types(c, gene_symbol, cells_in_datasets, client_error,
+                                                                  modalities=modalities, threshold=threshold),
+                           client_factory=client_factory, tsv_path=work_path, checkpoint_path=checkpoint_path,
+                           resume=resume, workers=workers, report_interval=report_interval,
+                           unit='genes', key_column=0)
+        replace_file(tsv_path, lambda tmp_path: shutil.copyfile(work_path, tmp_path))
+
+    if parquet_path is not None:
+        rows = write_parquet(tsv_path, parquet_path)
+        logger.info(f'Wrote {rows} rows to {parquet_path}')
+    return progress
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the TSV file of cell types for genes from the Cells API')
+    parser.add_argument('--mode', choices=['gene', 'dataset'], default='gene',
+                        help='request cells by gene, or expression values by dataset')
+    parser.add_argument('--workers', type=int, default=8, help='number of concurrent Cells API requests')
+    parser.add_argument('--resume', action='store_true', help='skip the genes (or datasets) in the checkpoint file')
+    parser.add_argument('--incremental', action='store_true',
+                        help='in dataset mode, process only the datasets added or removed since the last build')
+    parser.add_argument('--genes', nargs='+', help='gene symbols to process; default: all genes')
+    parser.add_argument('--modalities', nargs='+', default=MODALITIES, help='genomic modalities')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help='minimum expression value (exclusive) for the presence of a gene in a cell')
+    parser.add_argument('--gene-chunk-size', type=int, default=GENE_CHUNK_SIZE,
+                        help='in dataset mode, number of genes per request for expression values')
+    parser.add_argument('--output', default=TSV_PATH, help='path to the TSV file')
+    parser.add_argument('--checkpoint', default=CHECKPOINT_PATH, help='path to the checkpoint file')
+    parser.add_argument('--parquet', default=PARQUET_PATH, help='path to the Parquet file')
+    parser.add_argument('--no-parquet', action='store_true', help='write only the TSV file')
+    parser.add_argument('--manifest', default=MANIFEST_PATH, help='path to the manifest file of dataset mode')
+    args = parser.parse_args()
+    if args.incremental and args.mode != 'dataset':
+        parser.error('--incremental requires --mode dataset')
+
+    # Cells API client
+    from hubmap_api_py_client import Client
+    from hubmap_api_py_client.errors import ClientError
+
+    # Instantiate hubmap-api-py-client. Obtain URL from the Flask app's config file.
+    client_url = make_flask_config()['CELLSURL']
+
+    progress = build_index(client_factory=lambda: Client(client_url), genes=args.genes, tsv_path=args.output,
+                           checkpoint_path=args.checkpoint, resume=args.resume, workers=args.workers,
+                           client_error=ClientError, parquet_path=None if args.no_parquet else args.parquet,
+                           mode=args.mode, modalities=args.modalities, threshold=args.threshold,
+                           gene_chunk_size=args.gene_chunk_size, incremental=args.incremental,
+                           manifest_path=args.manifest)
+    if progress.failed > 0:
+        logger.warning(f'{progress.failed} {progress.unit} failed; run again with --resume to retry them.')
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,7 @@
 // October 2025
 // Returns information on cell type annotations.
 
-// The calling function in neo4j_logic.py will replace variables preceded with $.
+// The calling function in neo4j_logic.py will pass the variables preceded with $ as parameters.
 
 // Filter on SAB
 WITH toUpper($sab) as sab
@@ -10,7 +10,7 @@ WITH sab,
 // Optional filter on list of annotation codes or simple names
 //['0000001','Arterial Endothelial'] AS ids
 
-[$ids] AS ids
+$ids AS ids
 
 // Find all annotations that have the annotation parent and match the search terms.
 MATCH (tAnn:Term)<-[rAnn:PT]-(cAnn:Code{SAB:sab})<-[:CODE]-(pAnn:Concept)-[:isa]->(pAnnParent:Concept)-[:CODE]->(cAnnParent:Code{CODE:'2000000'}),
@@ -3,7 +3,7 @@
 
 // Used by the annotations/organs endpoints.
 
-// The calling function in neo4j_logic.py will replace variables preceded with $.
+// The calling function in neo4j_logic.py will pass the variables preceded with $ as parameters.
 
 // Optional filter on SAB
 WITH toUpper($sab) as sab
@@ -12,7 +12,7 @@ WITH sab,
 
 // Optional filter on list of organ UBERON identifiers or search terms
 //['intestine','0000160'] AS ids
-[$ids] AS ids
+$ids AS ids
 
 // Find all organ level codes (children of ID 1000000) that match the search terms.
 // Find corresponding UBERON organ codes.
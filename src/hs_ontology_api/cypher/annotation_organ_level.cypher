@@ -3,7 +3,7 @@
 
 // Used by the annotations/organ-levels endpoints.
 
-// The calling function in neo4j_logic.py will replace variables preceded with $.
+// The calling function in neo4j_logic.py will pass the variables preceded with $ as parameters.
 
 // Optional filter on SAB
 WITH toUpper($sab) as sab
@@ -13,7 +13,7 @@ WITH sab,
 // Optional filter on list of organ-level identifiers or search terms
 //[''] AS ids
 //['heart','100001'] AS ids
-[$ids] AS ids
+$ids AS ids
 
 // Find all organ level codes (children of ID 1000000) that match the search terms.
 // Find corresponding UBERON organ codes.
@@ -3,20 +3,22 @@
 // Return information on rule-based datasets--i.e., the datasets specified in the Rule Engine's testing rule chain.
 
 // Obtain identifiers for rule-based datasets (assay classes) for the application context.
-// The assayclass_filter allows filtering by either the UBKG code or term (rule_description)
+// The assayclass parameter allows filtering by either the UBKG code or term (rule_description)
 // for the assay class.
 // OCT 2024 - filter response content based on
 // 1. whether to provide dataset type hierarchical information
 // 2. whether to provide measurement assay codes
 
-WITH '$context' AS context, '$provide_hierarchy_info' AS provide_hierarchy_info
+// The calling function in neo4j_logic.py will pass the variables preceded with $ as parameters.
+// A null value for an optional filter parameter means no filtering.
+WITH $context AS context, $provide_hierarchy_info AS provide_hierarchy_info
 CALL
 {
         WITH context
         MATCH (p:Concept)<-[:isa]-(pRBD:Concept)-[:CODE]->(cRBD:Code)-[r:PT]->(tRBD:Term)
         WHERE p.CUI = context+':C000004 CUI'
         AND r.CUI=pRBD.CUI
-        $assayclass_filter
+        AND ($assayclass IS NULL OR cRBD.CodeID = context+':'+$assayclass OR tRBD.name = $assayclass)
         RETURN pRBD.CUI AS CUIRBD,cRBD.CODE AS CodeRBD,tRBD.name AS NameRBD
         ORDER BY pRBD.CUI
 }
@@ -26,7 +28,7 @@ CALL
         WITH CUIRBD, context
         MATCH (pRBD:Concept)-[:has_assaytype]->(passaytype:Concept)-[:CODE]->(cassaytype:Code)-[r:PT]->(tassaytype:Term)
         WHERE pRBD.CUI=CUIRBD
-        $assaytype_filter
+        AND ($assaytype IS NULL OR REPLACE(tassaytype.name,'_assaytype','') = $assaytype)
         AND r.CUI=passaytype.CUI AND cassaytype.SAB=context
         RETURN DISTINCT REPLACE(tassaytype.name,'_assaytype','') AS assaytype
 }
@@ -55,7 +57,7 @@ CALL
         WHERE pRBD.CUI=CUIRBD AND r.CUI=pvitessce_hint.CUI AND cvitessce_hint.SAB=context
         RETURN COLLECT(DISTINCT REPLACE(tvitessce_hint.name,'_vitessce_hint','')) AS vitessce_hints
 }
-// process state. The process_state_filter allows for filtering to just primary or derived assay classes.
+// process state. The process_state parameter allows for filtering to just primary or derived assay classes.
 CALL
 {
         WITH CUIRBD,context
@@ -65,7 +67,7 @@ CALL
         AND pProcessParent.CUI = context+':C004002 CUI'
         AND r.CUI=pdsProcess.CUI
         AND cdsProcess.SAB=context
-        $process_state_filter
+        AND ($process_state IS NULL OR tdsProcess.name = $process_state)
         RETURN tdsProcess.name AS process_state
 }
 // dataset_type
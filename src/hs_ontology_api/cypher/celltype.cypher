@@ -13,8 +13,8 @@ CALL
   //WITH ['0002138','0000236'] AS ids
 
 
-  // The calling function in neo4j_logic.py will replace $ids.
-  WITH [$ids] AS ids
+  // The calling function in neo4j_logic.py will pass $ids as a list parameter.
+  WITH $ids AS ids
 
   // 1. Because PATO and UBERON are ingested prior to CL, some CL codes may associate with multiple concepts.
   //    Use the concept that is associated with the code during the CL ingestion, which can be identified by the use of a
@@ -1,49 +1,29 @@
-// Returns high-level information on cell types in the UBKG
+// Returns the keys of a page of cell types in the UBKG
 // Used by the celltypes-info endpoint
 
-CALL
-{
-        Optional MATCH (t:Term)<-[r]-(c:Code)<-[:CODE]-(p:Concept)
-        WHERE r.CUI=p.CUI
-        AND c.SAB='CL'
-        AND TYPE(r) IN ['PT','SY']
-        // Allow for typeahead searches, but only on the preferred term provided by CL.
-        // (Other ontologies can provide other preferred terms for a CL code; these have a PT_SAB relationship.)
-        // The neo4j_logic will replace  starts_with_clause with a parameterized STARTS WITH clause.
-        $starts_with_clause
-        RETURN c.CodeID as id,
-        p.CUI as CodeCUI
-}
-// Preferred terms
-CALL
-{
-        WITH id
-        OPTIONAL MATCH (c:Code)-[:PT]->(t:Term)
-        WHERE c.CodeID=id
-        RETURN DISTINCT t.name AS term
-}
-// Synoyms
-CALL
-{
-        WITH id
-        OPTIONAL MATCH (c:Code)-[:SY]->(t:Term)
-        WHERE c.CodeID=id
-        RETURN COLLECT(t.name) AS synonyms
-}
-// Definition
-CALL
-{
-        WITH id
-        OPTIONAL MATCH (t:Term)<-[r:PT]-(c:Code)<-[:CODE]-(p:Concept)-[:DEF]->(d:Definition)
-        WHERE c.CodeID=id
-        AND d.SAB = 'CL'
-        AND r.CUI = p.CUI
-        RETURN DISTINCT d.DEF AS definition
-}
-WITH id, term,synonyms,definition
-// Pagination parameters to be added by calling function.
+// The query selects and sorts only the keys (CL code IDs) for the requested page.
+// neo4j_logic obtains the terms, synonyms and definitions of the cell types on the page with
+// celltypeslist_rows.cypher.
+
+// The query supports two types of pagination:
+// 1. page-based: $skiprows is the number of rows before the page; $after_id is null.
+// 2. keyset (cursor): $after_id is the CL CodeID of the last row of the previous page, decoded from
+//    the cursor; $skiprows is 0.
+
+MATCH (t:Term)<-[r]-(c:Code)<-[:CODE]-(p:Concept)
+WHERE r.CUI=p.CUI
+AND c.SAB='CL'
+AND TYPE(r) IN ['PT','SY']
+// Allow for typeahead searches on the preferred term or synonyms provided by CL.
+// (Other ontologies can provide other preferred terms for a CL code; these have a PT_SAB relationship.)
+// neo4j_logic passes $starts_with in lower case; an empty string means no filtering.
+AND ($starts_with = '' OR toLower(t.name) STARTS WITH $starts_with)
+WITH DISTINCT c.CodeID AS id
+// Keyset pagination: rows after the last row of the previous page.
+WHERE $after_id IS NULL OR id > $after_id
+ORDER BY id
+// Pagination parameters passed by calling function.
 SKIP $skiprows
 LIMIT $limitrows
-RETURN DISTINCT id, term,synonyms,definition
-ORDER BY id
-
+RETURN id AS code_id
+ORDER BY code_id
@@ -1,6 +1,6 @@
 // Returns count of cell types from Cell Ontology in UBKG.
 MATCH (t:Term)<-[r]-(c:Code)<-[:CODE]-(p:Concept)
 WHERE r.CUI=p.CUI AND c.SAB='CL' AND TYPE(r) IN ['PT','SY']
-// Allow for typeahead searches. neo4j_logic will replace $starts_with_clause with a parameterized STARTS WITH clause.
-$starts_with_clause
+// Allow for typeahead searches. neo4j_logic passes $starts_with in lower case; an empty string means no filtering.
+AND ($starts_with = '' OR toLower(t.name) STARTS WITH $starts_with)
 RETURN COUNT(DISTINCT c.CodeID) as celltypelistcount
\ No newline at end of file
@@ -0,0 +1,8 @@
+// Returns the keys of all CL cell types: the CodeID and the preferred terms and synonyms provided by CL.
+// Used to load the starts_with prefix index (utils/prefix_index.py) for the celltypes-info endpoint.
+MATCH (t:Term)<-[r]-(c:Code)<-[:CODE]-(p:Concept)
+WHERE r.CUI=p.CUI
+AND c.SAB='CL'
+AND TYPE(r) IN ['PT','SY']
+RETURN c.CodeID AS id,
+COLLECT(DISTINCT t.name) AS names
@@ -0,0 +1,11 @@
+// Returns counts of cell types from Cell Ontology in UBKG by the leading characters of their terms.
+// Used to warm the count cache (utils/count_cache.py) for the celltypes-info endpoint.
+// The rows are for the empty prefix (the total count) and for every prefix of 1 to $prefix_length characters.
+// A cell type is counted for a prefix if its preferred term or any synonym starts with the prefix,
+// as in celltypeslist_count.cypher.
+// neo4j_logic passes $prefix_length as a parameter.
+MATCH (t:Term)<-[r]-(c:Code)<-[:CODE]-(p:Concept)
+WHERE r.CUI=p.CUI AND c.SAB='CL' AND TYPE(r) IN ['PT','SY']
+WITH c.CodeID AS id, toLower(t.name) AS name
+UNWIND range(0, $prefix_length) AS n
+RETURN left(name, n) AS prefix, COUNT(DISTINCT id) AS count
@@ -0,0 +1,36 @@
+// Returns high-level information on a page of cell types.
+// Used by the celltypes-info endpoint for the cell types of a page selected by celltypeslist.cypher
+// or by the starts_with prefix index (utils/prefix_index.py).
+
+// The calling function in neo4j_logic.py passes $ids, the CL CodeIDs of the cell types on the page, in page order.
+UNWIND range(0, size($ids) - 1) AS i
+WITH i, $ids[i] AS id
+// Preferred term. The subqueries return exactly one row per id, so that a page has one row per cell type:
+// a code can have more than one preferred term or CL definition, of which the first in sort order is used.
+CALL
+{
+        WITH id
+        OPTIONAL MATCH (c:Code)-[:PT]->(t:Term)
+        WHERE c.CodeID=id
+        RETURN min(t.name) AS term
+}
+// Synoyms
+CALL
+{
+        WITH id
+        OPTIONAL MATCH (c:Code)-[:SY]->(t:Term)
+        WHERE c.CodeID=id
+        RETURN COLLECT(t.name) AS synonyms
+}
+// Definition
+CALL
+{
+        WITH id
+        OPTIONAL MATCH (t:Term)<-[r:PT]-(c:Code)<-[:CODE]-(p:Concept)-[:DEF]->(d:Definition)
+        WHERE c.CodeID=id
+        AND d.SAB = 'CL'
+        AND r.CUI = p.CUI
+        RETURN min(d.DEF) AS definition
+}
+RETURN id, term, synonyms, definition
+ORDER BY i
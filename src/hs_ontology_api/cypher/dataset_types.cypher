@@ -2,7 +2,7 @@
 
 // Filters:
 // Application context
-WITH '$context' AS context,
+WITH $context AS context,
 // Whether an EPIC (externally processed)
 false AS epictype_filter
 
@@ -3,14 +3,14 @@
 
 // Identify all metadata fields, from legacy sources (the field_*.yaml files in ingest-validation-tools, and modeled in HMFIELD), child codes of //HMFIELD:1000
 
-// The function that calls this query will replace the variable field_filter.
+// The function that calls this query will pass the parameter field_name. A null value means no filtering.
 
 CALL
 {
      MATCH (cFieldParent:Code)<-[:CODE]-(pFieldParent:Concept)-[:inverse_isa]->(pField:Concept)-[:CODE]->(cField:Code)-[rField:PT]->(tField:Term)
      WHERE rField.CUI=pField.CUI
      AND cFieldParent.CodeID IN ['HMFIELD:1000']
-     $field_filter
+     AND ($field_name IS NULL OR tField.name = $field_name)
      RETURN tField.name AS field_name, pField.CUI as CUIField, cField.CodeID as field_code_id
      ORDER BY tField.name
 }
@@ -22,7 +22,7 @@ CALL
 // - alt-name
 // However, only assaytype is relevant: alt-names were deprecated, and descriptions are no longer current.
 
-// The function that calls this query will replace the variable assay_type_filter.
+// The function that calls this query will pass the parameter assaytype. A null value means no filtering.
 // HMFIELD originally mapped fields to the "dataset type" in the older HuBMAP dataset hierarchy, but now maps directly to the HUBMAP
 // code for the assaytype.
 CALL
@@ -30,7 +30,7 @@ CALL
     WITH CUIField
     MATCH (pField:Concept)-[:used_in_dataset]->(pAssayType:Concept)-[:CODE]->(cAssayType:Code)-[r:PT]->(tAssayType:Term)
     WHERE pField.CUI=CUIField AND cAssayType.SAB='HUBMAP' AND r.CUI=pAssayType.CUI
-    $assay_type_filter
+    AND ($assaytype IS NULL OR tAssayType.name = $assaytype)
     RETURN COLLECT(DISTINCT tAssayType.name) AS assaytypes
 }
 WITH field_name, assaytypes
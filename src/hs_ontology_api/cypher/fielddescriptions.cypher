@@ -9,7 +9,7 @@
 // Collect the HMFIELD and CEDAR codes for each metadata field to flatten to level of field name.
 // Collect the HMFIELD and CEDAR definitions for each metadata field to flatten to level of field name.
 
-// The function that calls this query will replace the variables field_filter and source_filter
+// The function that calls this query will pass the parameters field_filter and source_filter.
 
 WITH $field_filter AS field_filter,
 $source_filter AS source_filter
@@ -8,14 +8,14 @@
 
 // Collect the HMFIELD and CEDAR codes for each metadata field to flatten to level of field name.
 
-// The field_schemas_get_logic in neo4j_logic will replace the field_filter variable.
+// The field_schemas_get_logic in neo4j_logic will pass the field_name parameter. A null value means no filtering.
 
 CALL
 {
      MATCH (cFieldParent:Code)<-[:CODE]-(pFieldParent:Concept)-[:inverse_isa]->(pField:Concept)-[:CODE]->(cField:Code)-[rField:PT]->(tField:Term)
      WHERE rField.CUI=pField.CUI
      AND cFieldParent.CodeID IN ['HMFIELD:1000','CEDAR:TemplateField']
-     $field_filter
+     AND ($field_name IS NULL OR tField.name = $field_name)
      RETURN tField.name AS field_name,
      apoc.text.join(COLLECT(DISTINCT cField.CodeID),'|') AS code_ids,
      pField.CUI AS CUIField
@@ -25,28 +25,28 @@ CALL
 // 1. Fields in HMFIELD have a _used_in_schema relationship with a node that corresponds to a HMFIELD schema;
 // 2. Fields in CEDAR have an inverse_has_field relationship with a node that corresponds to a CEDAR template.
 
-// The field_schemas_get_logic in neo4j_logic will replace the schema_filter variable.
+// The field_schemas_get_logic in neo4j_logic will pass the schema parameter. A null value means no filtering.
 CALL
 {
      WITH CUIField
      OPTIONAL MATCH (pField:Concept)-[:used_in_schema]->(pSchema:Concept)-[:CODE]->(cSchema:Code)-[r:PT]->(tSchema:Term)
      WHERE pField.CUI=CUIField and r.CUI=pSchema.CUI
      AND cSchema.SAB='HMFIELD'
-     $schema_filter
+     AND ($schema IS NULL OR tSchema.name = $schema)
      RETURN DISTINCT 'HMFIELD|' + tSchema.name as schema_name
 
      UNION
      WITH CUIField
      OPTIONAL MATCH (pField:Concept)<-[:has_field]-(pTemplate:Concept)-[:CODE]->(cTemplate:Code)-[r:PT]->(tSchema:Term)
      WHERE pField.CUI=CUIField and r.CUI=pTemplate.CUI
-     $schema_filter
+     AND ($schema IS NULL OR tSchema.name = $schema)
      AND cTemplate.SAB='CEDAR'
      RETURN DISTINCT 'CEDAR|' + tSchema.name as schema_name
 }
 
-// The field_schemas_get_logic in neo4j_logic will replace the mapping_source_filter variable.
+// The field_schemas_get_logic in neo4j_logic will pass the mapping_source parameter. A null value means no filtering.
 WITH field_name, code_ids, schema_name
 WHERE schema_name<>[]
-$mapping_source_filter
+AND ($mapping_source IS NULL OR SPLIT(schema_name,'|')[0] = $mapping_source)
 RETURN field_name, code_ids, COLLECT (DISTINCT schema_name) AS schemas
 ORDER BY field_name
\ No newline at end of file
@@ -0,0 +1,23 @@
+// Returns the identifiers of all HGNC genes: the CUI of the gene concept, the HGNC numeric ID, and the
+// symbol and name terms of the gene.
+// Called by the gene resolver (utils/gene_resolver.py), which maps identifiers to genes in memory for the
+// relationships/gene and genes endpoints.
+
+// The preferred CUI for each HGNC Code can be identified by the CUI property of any relationship between
+// the code and one of its terms--e.g., PT.
+// Term types:
+// PT: approved name
+// ACR: approved symbol
+// NS: previous symbol
+// NP: previous name
+// SYN: alias symbol
+// NA_UBKG: alias name
+MATCH (pGene:Concept)-[:CODE]->(cGene:Code)-[r]->(tGene:Term)
+WHERE cGene.SAB='HGNC'
+AND r.CUI=pGene.CUI
+AND type(r) IN ['PT','ACR','NS','NP','SYN','NA_UBKG']
+RETURN pGene.CUI AS cui,
+cGene.CODE AS code,
+type(r) AS type,
+tGene.name AS name
+ORDER BY code, type
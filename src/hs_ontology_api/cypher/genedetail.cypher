@@ -16,34 +16,19 @@ CALL
 
 {
 
-    // Criteria: list of HGNC identifiers.
+    // Criteria: list of CUIs of HGNC gene concepts.
 
-    // The following types of identifiers can be used in the list:
+    // The calling function in neo4j_logic.py resolves the list of HGNC identifiers in the request with the
+    // gene resolver (utils/gene_resolver.py), which maps the following types of identifiers to CUIs:
     // 1. HGNC numeric IDs (e.g., 7178)
     // 2. HGNC approved symbols (e.g., MMRN1)
     // 3. HGNC previous symbols (e.g., MMRN)
     // 4. HGNC aliases (e.g., ECM)
     // 5. names (approved name, previous name, alias name). Because exact matches would be required, it is unlikely that names would be useful criteria.
 
-    // If no criteria are specified, return information on all HGNC genes.
-
-    // Sample criteria
-    //WITH ['MMRN1'] AS ids
-
-    // The calling function will replace the variable preceded by $.
-    WITH [$ids] AS ids
-
-
-    // Find CUIs for genes that satisfy criteria for HGNC ID or term (symbol, name). The preferred CUI for each HGNC Code can be identified
-    // by the CUI property of any relationship between the code and one of its terms--e.g., PT.
-    OPTIONAL MATCH (pGene:Concept)-[:CODE]->(cGene:Code)-[r]->(tGene:Term)
-    WHERE r.CUI=pGene.CUI
-    AND type(r) IN ['PT','ACR','NS','NP','SYN','NA_UBKG']
-    AND cGene.SAB='HGNC'
-    AND CASE
-        WHEN ids[0]<>'' THEN (ANY(id IN ids WHERE cGene.CODE=id) or ANY(id in ids WHERE tGene.name=id))
-        ELSE 1=1
-        END
+    // The calling function will pass $cuis as a list parameter.
+    UNWIND $cuis AS cui
+    MATCH (pGene:Concept {CUI:cui})
     RETURN DISTINCT pGene.CUI AS GeneCUI
 
 }
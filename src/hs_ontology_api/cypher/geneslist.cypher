@@ -1,26 +1,37 @@
 // GENES LIST
-// Return high-level information on genes in the UBKG
+// Returns the keys of a page of HGNC genes in the UBKG.
 // Used by the genes-info endpoint.
 
-CALL
-{
-OPTIONAL MATCH (tGene:Term)<-[r]-(cGene:Code)<-[:CODE]-(pGene:Concept) WHERE r.CUI=pGene.CUI AND cGene.SAB='HGNC' AND type(r) IN ['PT','ACR'] RETURN toInteger(cGene.CODE) AS hgnc_id, CASE type(r) WHEN 'PT' THEN 'approved_name' WHEN 'ACR' THEN 'approved_symbol' ELSE type(r) END AS ret_key, tGene.name AS ret_value
-order by hgnc_id,ret_key
-UNION
-OPTIONAL MATCH (d:Definition)<-[:DEF]-(pGene:Concept)-[:CODE]-(cGene:Code)-[r]->(tGene:Term) where r.CUI=pGene.CUI AND cGene.SAB='HGNC' AND type(r) IN ['ACR'] RETURN toInteger(cGene.CODE) AS hgnc_id,'description' AS ret_key, d.DEF AS ret_value
-ORDER BY hgnc_id, ret_key
-}
-// Pivot values.
-WITH hgnc_id,ret_key, COLLECT(ret_value) AS values
-WITH hgnc_id,apoc.map.fromLists(COLLECT(ret_key),COLLECT(values)) AS map
-WHERE hgnc_id IS NOT NULL
-// Allow for typeahead searches. neo4j_logic will replace $starts_with_clause with a parameterized STARTS WITH clause.
-$starts_with_clause
-RETURN hgnc_id,
-map['approved_symbol'] AS approved_symbol,
-map['approved_name'] AS approved_name,
-map['description'] AS description
-ORDER BY approved_symbol
-// Pagination parameters to be added by calling function.
+// The query selects and sorts only the keys (approved symbol and HGNC ID) for the requested page.
+// neo4j_logic obtains the names and descriptions of the genes on the page with geneslist_rows.cypher.
+
+// The query supports two types of pagination:
+// 1. page-based: $skiprows is the number of rows before the page; $after_id is null.
+// 2. keyset (cursor): $after_symbol and $after_id are the sort key of the last row of the previous page,
+//    decoded from the cursor; $skiprows is 0.
+
+// Select the HGNC genes with all of their approved symbols.
+MATCH (pGene:Concept)-[:CODE]->(cGene:Code)-[r:ACR]->(tGene:Term)
+WHERE cGene.SAB='HGNC' AND r.CUI=pGene.CUI
+WITH cGene, tGene.name AS symbol
+ORDER BY symbol
+WITH cGene, COLLECT(symbol) AS approved_symbol
+// Allow for typeahead searches: genes with any approved symbol that starts with the prefix. The filter follows
+// the COLLECT, so that the response lists all of the symbols of a gene and sorts on its first symbol, as with
+// the prefix index (utils/prefix_index.py).
+// neo4j_logic passes $starts_with in upper case; an empty string means no filtering.
+WHERE $starts_with = '' OR ANY(s IN approved_symbol WHERE toUpper(s) STARTS WITH $starts_with)
+// Sort key
+WITH cGene, approved_symbol, approved_symbol[0] AS sort_symbol, toInteger(cGene.CODE) AS hgnc_id
+// Keyset pagination: rows after the last row of the previous page.
+WHERE $after_id IS NULL
+OR sort_symbol > $after_symbol
+OR (sort_symbol = $after_symbol AND hgnc_id > $after_id)
+ORDER BY sort_symbol, hgnc_id
+// Pagination parameters passed by calling function.
 SKIP $skiprows
-LIMIT $limitrows
\ No newline at end of file
+LIMIT $limitrows
+RETURN cGene.CodeID AS code_id,
+hgnc_id,
+sort_symbol
+ORDER BY sort_symbol, hgnc_id
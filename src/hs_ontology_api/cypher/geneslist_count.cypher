@@ -1,2 +1,3 @@
  // Returns count of HGNC genes in UBKG.
- MATCH (tGene:Term)<-[:ACR]-(cGene:Code)<-[:CODE]-(pGene:Concept) WHERE cGene.SAB='HGNC' $starts_with_clause RETURN COUNT(DISTINCT cGene) AS genelistcount
+ // neo4j_logic passes $starts_with in upper case; an empty string means no filtering.
+ MATCH (tGene:Term)<-[:ACR]-(cGene:Code)<-[:CODE]-(pGene:Concept) WHERE cGene.SAB='HGNC' AND ($starts_with = '' OR toUpper(tGene.name) STARTS WITH $starts_with) RETURN COUNT(DISTINCT cGene) AS genelistcount
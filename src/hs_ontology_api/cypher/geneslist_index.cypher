@@ -0,0 +1,7 @@
+// Returns the keys of all HGNC genes: the CodeID, the HGNC numeric ID and the approved symbols.
+// Used to load the starts_with prefix index (utils/prefix_index.py) for the genes-info endpoint.
+MATCH (pGene:Concept)-[:CODE]->(cGene:Code)-[r:ACR]->(tGene:Term)
+WHERE cGene.SAB='HGNC' AND r.CUI=pGene.CUI
+RETURN cGene.CodeID AS code_id,
+toInteger(cGene.CODE) AS id,
+COLLECT(tGene.name) AS symbols
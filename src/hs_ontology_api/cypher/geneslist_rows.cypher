@@ -0,0 +1,43 @@
+// GENES LIST ROWS
+// Returns high-level information on a page of HGNC genes.
+// Used by the genes-info endpoint for the genes of a page selected by geneslist.cypher
+// or by the starts_with prefix index (utils/prefix_index.py).
+
+// The calling function in neo4j_logic.py passes $ids, the CodeIDs of the genes on the page, in page order.
+UNWIND range(0, size($ids) - 1) AS i
+WITH i, $ids[i] AS code_id
+MATCH (cGene:Code {CodeID: code_id})
+// Approved symbols
+CALL
+{
+WITH cGene
+OPTIONAL MATCH (pGene:Concept)-[:CODE]->(cGene)-[r:ACR]->(tGene:Term)
+WHERE r.CUI=pGene.CUI
+WITH tGene.name AS symbol
+ORDER BY symbol
+RETURN COLLECT(symbol) AS approved_symbol
+}
+// Approved names
+CALL
+{
+WITH cGene
+OPTIONAL MATCH (pGene:Concept)-[:CODE]->(cGene)-[r:PT]->(tGene:Term)
+WHERE r.CUI=pGene.CUI
+WITH COLLECT(tGene.name) AS names
+RETURN CASE WHEN size(names) > 0 THEN names END AS approved_name
+}
+// Descriptions
+CALL
+{
+WITH cGene
+OPTIONAL MATCH (d:Definition)<-[:DEF]-(pGene:Concept)-[:CODE]->(cGene)-[r:ACR]->(:Term)
+WHERE r.CUI=pGene.CUI
+WITH COLLECT(d.DEF) AS definitions
+RETURN CASE WHEN size(definitions) > 0 THEN definitions END AS description
+}
+RETURN toInteger(cGene.CODE) AS hgnc_id,
+approved_symbol,
+approved_name,
+description,
+approved_symbol[0] AS sort_symbol
+ORDER BY i
@@ -1,22 +1,39 @@
 // MOUSE GENES LIST
-// Return high-level information on genes in the UBKG
+// Returns the keys of a page of MGI genes in the UBKG.
 // Used by the genes-info endpoint for mouse genes.
 
-CALL
-{
-OPTIONAL MATCH (tGene:Term)<-[r]-(cGene:Code)<-[:CODE]-(pGene:Concept) WHERE r.CUI=pGene.CUI AND cGene.SAB='MGI' AND type(r) IN ['PT_HCOP','SY'] RETURN toInteger(cGene.CODE) AS mgi_id, CASE type(r) WHEN 'PT_HCOP' THEN 'approved_name' WHEN 'SY' THEN 'approved_symbol' ELSE type(r) END AS ret_key, tGene.name AS ret_value
-order by mgi_id,ret_key
-}
-// Pivot values.
-WITH mgi_id,ret_key, COLLECT(ret_value) AS values
-WITH mgi_id,apoc.map.fromLists(COLLECT(ret_key),COLLECT(values)) AS map
-WHERE mgi_id IS NOT NULL
-// Allow for typeahead searches. neo4j_logic will replace $starts_with_clause with a parameterized STARTS WITH clause.
-$starts_with_clause
-RETURN mgi_id,
-map["approved_symbol"] AS approved_symbol,
-map['approved_name'] AS approved_name
-ORDER BY approved_symbol
-// Pagination parameters to be added by calling function.
+// The query selects and sorts only the keys (symbol and MGI ID) for the requested page.
+// neo4j_logic obtains the symbols and names of the genes on the page with mouse_geneslist_rows.cypher.
+
+// The query supports two types of pagination:
+// 1. page-based: $skiprows is the number of rows before the page; $after_id is null.
+// 2. keyset (cursor): $after_symbol and $after_id are the sort key of the last row of the previous page,
+//    decoded from the cursor; $skiprows is 0.
+// Genes without symbols sort after genes with symbols.
+
+// Select the MGI genes with symbols (SY) or names (PT_HCOP).
+MATCH (pGene:Concept)-[:CODE]->(cGene:Code)-[r]->(tGene:Term)
+WHERE cGene.SAB='MGI' AND r.CUI=pGene.CUI AND type(r) IN ['PT_HCOP','SY']
+WITH cGene, r, tGene
+ORDER BY tGene.name
+WITH cGene, COLLECT(CASE type(r) WHEN 'SY' THEN tGene.name END) AS symbols
+WITH cGene, CASE WHEN size(symbols) > 0 THEN symbols END AS approved_symbol
+// Sort key
+WITH cGene, approved_symbol, approved_symbol[0] AS sort_symbol, toInteger(cGene.CODE) AS mgi_id
+// Allow for typeahead searches. neo4j_logic passes $starts_with in upper case; an empty string means no filtering.
+// Symbols for mouse genes are currently stored in format ['0610010K14Rik'].
+WHERE ($starts_with = '' OR toUpper(replace(replace(replace(toString(sort_symbol), '[', ''), ']', ''), "'", '')) STARTS WITH $starts_with)
+// Keyset pagination: rows after the last row of the previous page.
+AND ($after_id IS NULL
+     OR ($after_symbol IS NULL AND sort_symbol IS NULL AND mgi_id > $after_id)
+     OR ($after_symbol IS NOT NULL AND (sort_symbol IS NULL
+                                        OR sort_symbol > $after_symbol
+                                        OR (sort_symbol = $after_symbol AND mgi_id > $after_id))))
+ORDER BY sort_symbol, mgi_id
+// Pagination parameters passed by calling function.
 SKIP $skiprows
-LIMIT $limitrows
\ No newline at end of file
+LIMIT $limitrows
+RETURN cGene.CodeID AS code_id,
+mgi_id,
+sort_symbol
+ORDER BY sort_symbol, mgi_id
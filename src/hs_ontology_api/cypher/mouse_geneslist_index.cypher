@@ -0,0 +1,8 @@
+// Returns the keys of all MGI genes with symbols (SY) or names (PT_HCOP): the CodeID, the MGI numeric ID
+// and the symbols.
+// Used to load the starts_with prefix index (utils/prefix_index.py) for the genes-info endpoint for mouse genes.
+MATCH (pGene:Concept)-[:CODE]->(cGene:Code)-[r]->(tGene:Term)
+WHERE cGene.SAB='MGI' AND r.CUI=pGene.CUI AND type(r) IN ['PT_HCOP','SY']
+RETURN cGene.CodeID AS code_id,
+toInteger(cGene.CODE) AS id,
+COLLECT(CASE type(r) WHEN 'SY' THEN tGene.name END) AS symbols
@@ -0,0 +1,9 @@
+// Returns counts of MGI genes in UBKG by the leading characters of their symbols.
+// Used to warm the count cache (utils/count_cache.py) for the genes-info endpoint.
+// The rows are for the empty prefix (the total count) and for every prefix of 1 to $prefix_length characters.
+// A gene is counted for a prefix if any of its symbols starts with the prefix, as in mouse_geneslist_count.cypher.
+// neo4j_logic passes $prefix_length as a parameter.
+MATCH (tGene:Term)<-[:PT_HCOP]-(cGene:Code)<-[:CODE]-(pGene:Concept) WHERE cGene.SAB='MGI'
+WITH cGene, toUpper(tGene.name) AS symbol
+UNWIND range(0, $prefix_length) AS n
+RETURN left(symbol, n) AS prefix, COUNT(DISTINCT cGene) AS count
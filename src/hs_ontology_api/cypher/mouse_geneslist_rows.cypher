@@ -0,0 +1,34 @@
+// MOUSE GENES LIST ROWS
+// Returns high-level information on a page of MGI genes.
+// Used by the genes-info endpoint for the mouse genes of a page selected by mouse_geneslist.cypher
+// or by the starts_with prefix index (utils/prefix_index.py).
+
+// The calling function in neo4j_logic.py passes $ids, the CodeIDs of the genes on the page, in page order.
+UNWIND range(0, size($ids) - 1) AS i
+WITH i, $ids[i] AS code_id
+MATCH (cGene:Code {CodeID: code_id})
+// Symbols
+CALL
+{
+WITH cGene
+OPTIONAL MATCH (pGene:Concept)-[:CODE]->(cGene)-[r:SY]->(tGene:Term)
+WHERE r.CUI=pGene.CUI
+WITH tGene.name AS symbol
+ORDER BY symbol
+WITH COLLECT(symbol) AS symbols
+RETURN CASE WHEN size(symbols) > 0 THEN symbols END AS approved_symbol
+}
+// Names
+CALL
+{
+WITH cGene
+OPTIONAL MATCH (pGene:Concept)-[:CODE]->(cGene)-[r:PT_HCOP]->(tGene:Term)
+WHERE r.CUI=pGene.CUI
+WITH COLLECT(tGene.name) AS names
+RETURN CASE WHEN size(names) > 0 THEN names END AS approved_name
+}
+RETURN toInteger(cGene.CODE) AS mgi_id,
+approved_symbol,
+approved_name,
+approved_symbol[0] AS sort_symbol
+ORDER BY i
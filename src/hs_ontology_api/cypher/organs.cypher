@@ -2,7 +2,7 @@
 
 //  Replaces and extends a read of the organ_types.yaml in the search-api. Used by endpoints in the organs route.
 
-// The calling function in neo4j_logic.py will replace $sab.
+// The calling function in neo4j_logic.py will pass $sab as a parameter.
 
 // First, obtain CUIs for concepts associated with organs.
 // These concepts are children of the concept for the C000008 code in the application ontology.
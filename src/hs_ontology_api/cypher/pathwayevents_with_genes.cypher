@@ -1,5 +1,7 @@
 // PATHWAY EVENTS WITH GENES
 // Returns information on the Reactome pathway events that have specified genes as participants.
+// The query returns one record per event. neo4j_logic streams the records for NDJSON responses, and
+// builds the count and list of events for JSON responses.
 
 // Optional input filters:
 // 1. HGNC identifiers:
@@ -28,9 +30,9 @@
 /////////////////////////////////////////
 
 // Input filters
-// The calling function will populate the input filters.
+// The calling function will pass the input filters as parameters.
 // Gene identifiers
-WITH [$geneids] AS geneids,
+WITH $geneids AS geneids,
 //WITH [''] AS geneids,
 //WITH ['EGFR'] AS geneids,
 
@@ -44,7 +46,7 @@ $pathwayname AS pathwayname,
 //'A' AS pathwayname
 
 // Reactome event type
-[$eventtypes] AS eventtypes
+$eventtypes AS eventtypes
 //'' AS eventtypes,
 //[''] AS eventtypes
 
@@ -139,11 +141,8 @@ CALL
 	RETURN cEvent.CODE AS EventCode, tEvent.name AS EventName, tEventType.name AS EventType
 }
 
-// Collect for response.
-// Order events.
-WITH EventType,EventName,EventCode,{type:EventType, code:EventCode,description:EventName} AS event
+// Return one record per event.
+WITH DISTINCT EventType,EventName,EventCode
 ORDER BY EventType DESC, EventName
-// Collect events.
-WITH COLLECT(DISTINCT event) AS events,COUNT(DISTINCT event) AS EventCount
-RETURN {count:EventCount,events:events} AS response
+RETURN {type:EventType, code:EventCode,description:EventName} AS event
 
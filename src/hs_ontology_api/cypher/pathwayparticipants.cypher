@@ -1,5 +1,7 @@
 // PARTICIPANTS FOR PATHWAY
 // Returns the participants in a specified Reactome pathway, optionally filtered for SAB.
+// The query returns one record per event. neo4j_logic streams the records for NDJSON responses, and
+// builds the count and list of events for JSON responses.
 
 // Required input filters: an identifier for a Reactome pathway:
 // 1. Reactome Stable ID
@@ -21,7 +23,7 @@
 // Filters
 
 WITH ['HGNC'] AS defaultsabs,
-[$sabs] AS sabs,
+$sabs AS sabs,
 //['HGNC','UNIPROTKB'] as sabs,
 
 $pathwayid AS pathwayid,
@@ -31,7 +33,7 @@ $pathwayid AS pathwayid,
 
 // ENSEMBl feature types--e.g., transcripts or genes
 ['gene'] AS default_featuretypes,
-[$featuretypes] AS featuretypes
+$featuretypes AS featuretypes
 
 //Get CUI for the pathway(s).
 CALL
@@ -127,6 +129,5 @@ WITH ParticipantSAB, PathwayCUI, PathwayCode,PathwayName, PathwayType,COLLECT(DI
 
 WITH PathwayCode,PathwayName,PathwayType,COLLECT(DISTINCT {SAB:ParticipantSAB,count:participantcount,participants:participants}) AS pathwaysabs
 ORDER BY PathwayType DESC, PathwayName
-WITH COLLECT({code:PathwayCode,name:PathwayName,type:PathwayType,sabs:pathwaysabs}) AS pathways,
-COUNT(DISTINCT PathwayCode) as pathwaycount
-RETURN {count:pathwaycount,events:pathways} AS response
\ No newline at end of file
+// Return one record per event.
+RETURN {code:PathwayCode,name:PathwayName,type:PathwayType,sabs:pathwaysabs} AS event
\ No newline at end of file
@@ -10,8 +10,8 @@ CALL
 //
 // If no criteria are specified, return information on all UniProtKB proteins.
 //WITH ['P53539','MMRN1_HUMAN'] AS ids
-// The calling function in neo4j_logic.py will replace $ids.
-WITH [$ids] AS ids
+// The calling function in neo4j_logic.py will pass $ids as a list parameter.
+WITH $ids AS ids
 
 OPTIONAL MATCH (pProtein:Concept)-[:CODE]->(cProtein:Code)-[r]->(tProtein:Term)
 WHERE r.CUI=pProtein.CUI AND type(r) IN ['PT','SY']
@@ -1,38 +1,41 @@
-// Return high-level information on proteins in UNIPROTKB.
+// Returns the keys of a page of proteins in UNIPROTKB.
 // Used by the proteins-info endpoint.
 
-CALL
-{
-// Protein identifiers
-OPTIONAL MATCH (pProtein:Concept)-[:CODE]->(cProtein:Code)-[r]->(tProtein:Term)
-  WHERE r.CUI=pProtein.CUI
-  AND type(r) IN ['PT','SY']
-  AND cProtein.SAB='UNIPROTKB'
-RETURN cProtein.CODE as id,
-       CASE type(r)
-         WHEN 'PT' THEN 'recommended_name'
-         WHEN 'SY' THEN
-          CASE WHEN tProtein.name ENDS WITH '_HUMAN' OR tProtein.name ENDS WITH '_MOUSE'
-          THEN 'entry_name'
-            ELSE 'synonym'
-            END
-         ELSE 'synonym'
-         END AS ret_key,tProtein.name AS ret_value
-ORDER BY id, ret_key
-}
-//Pivot results
-WITH id, ret_key, COLLECT(ret_value) AS values
-WITH id,apoc.map.fromLists(COLLECT(ret_key),COLLECT(values)) AS map
-WHERE id IS NOT NULL
-$organism_filter
-// Allow for typeahead searches. neo4j_logic will replace $starts_with_clause with a parameterized STARTS WITH clause.
-$starts_with_clause
-RETURN id,
-map['recommended_name'] AS recommended_name,
-map['entry_name'] AS entry_name,
-map['synonym'] AS synonyms
+// The query selects and sorts only the keys (UniProtKB codes) for the requested page.
+// neo4j_logic obtains the names of the proteins on the page with proteinslist_rows.cypher.
+// The filters use EXISTS subqueries, which are evaluated only if the filter is specified.
 
+// The query supports two types of pagination:
+// 1. page-based: $skiprows is the number of rows before the page; $after_id is null.
+// 2. keyset (cursor): $after_id is the UniProtKB ID of the last row of the previous page, decoded from
+//    the cursor; $skiprows is 0.
+
+// Entry names are synonyms (SY) that end with the organism--e.g., MMRN1_HUMAN.
+MATCH (cProtein:Code)
+WHERE cProtein.SAB='UNIPROTKB'
+// Keyset pagination: rows after the last row of the previous page.
+AND ($after_id IS NULL OR cProtein.CODE > $after_id)
+// Filter on organism. neo4j_logic passes $organism in upper case (HUMAN or MOUSE); an empty string means all organisms.
+AND ($organism = ''
+     OR EXISTS {
+        MATCH (pProtein:Concept)-[:CODE]->(cProtein)-[r:SY]->(tProtein:Term)
+        WHERE r.CUI=pProtein.CUI AND tProtein.name ENDS WITH '_' + $organism
+     })
+// Allow for typeahead searches on UniProtKB ID, entry name or recommended name.
+// neo4j_logic passes $starts_with in lower case; an empty string means no filtering.
+AND ($starts_with = ''
+     OR toLower(cProtein.CODE) STARTS WITH $starts_with
+     OR EXISTS {
+        MATCH (pProtein:Concept)-[:CODE]->(cProtein)-[r]->(tProtein:Term)
+        WHERE r.CUI=pProtein.CUI
+        AND (type(r) = 'PT' OR (type(r) = 'SY' AND (tProtein.name ENDS WITH '_HUMAN' OR tProtein.name ENDS WITH '_MOUSE')))
+        AND toLower(tProtein.name) STARTS WITH $starts_with
+     })
+WITH DISTINCT cProtein.CodeID AS code_id, cProtein.CODE AS id
 ORDER BY id
-// Pagination parameters to be added by calling function.
+// Pagination parameters passed by calling function.
 SKIP $skiprows
 LIMIT $limitrows
+RETURN code_id,
+id
+ORDER BY id
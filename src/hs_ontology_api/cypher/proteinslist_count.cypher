@@ -1,15 +1,22 @@
- // Returns count of UNIPROTKB proteins in UBKG.
-CALL
-{
-// Protein identifiers
-OPTIONAL MATCH (pProtein:Concept)-[:CODE]->(cProtein:Code)-[r]->(tProtein:Term) WHERE r.CUI=pProtein.CUI AND type(r) IN ['PT','SY'] AND cProtein.SAB='UNIPROTKB' RETURN cProtein.CODE as id, CASE type(r) WHEN 'PT' THEN 'recommended_name' WHEN 'SY' THEN CASE WHEN tProtein.name ENDS WITH '_HUMAN' OR tProtein.name ENDS WITH '_MOUSE' THEN 'entry_name' ELSE 'synonym' END ELSE 'synonym' END AS ret_key,tProtein.name AS ret_value
-ORDER BY id, ret_key
-}
-//Pivot results
-WITH id, ret_key, COLLECT(ret_value) AS values
-WITH id,apoc.map.fromLists(COLLECT(ret_key),COLLECT(values)) AS map
-WHERE id IS NOT NULL
-// Allow for typeahead searches. neo4j_logic will replace $starts_with_clause with a parameterized STARTS WITH clause.
-$starts_with_clause
-$organism_filter
-RETURN COUNT(DISTINCT id) AS proteinlistcount
\ No newline at end of file
+// Returns count of UNIPROTKB proteins in UBKG.
+// The filters are the same as those in proteinslist.cypher.
+
+MATCH (cProtein:Code)
+WHERE cProtein.SAB='UNIPROTKB'
+// Filter on organism. neo4j_logic passes $organism in upper case (HUMAN or MOUSE); an empty string means all organisms.
+AND ($organism = ''
+     OR EXISTS {
+        MATCH (pProtein:Concept)-[:CODE]->(cProtein)-[r:SY]->(tProtein:Term)
+        WHERE r.CUI=pProtein.CUI AND tProtein.name ENDS WITH '_' + $organism
+     })
+// Allow for typeahead searches on UniProtKB ID, entry name or recommended name.
+// neo4j_logic passes $starts_with in lower case; an empty string means no filtering.
+AND ($starts_with = ''
+     OR toLower(cProtein.CODE) STARTS WITH $starts_with
+     OR EXISTS {
+        MATCH (pProtein:Concept)-[:CODE]->(cProtein)-[r]->(tProtein:Term)
+        WHERE r.CUI=pProtein.CUI
+        AND (type(r) = 'PT' OR (type(r) = 'SY' AND (tProtein.name ENDS WITH '_HUMAN' OR tProtein.name ENDS WITH '_MOUSE')))
+        AND toLower(tProtein.name) STARTS WITH $starts_with
+     })
+RETURN COUNT(DISTINCT cProtein.CODE) AS proteinlistcount
@@ -0,0 +1,17 @@
+// Returns the keys of all UNIPROTKB proteins: the CodeID, the UniProtKB ID, the recommended names (PT)
+// and the entry names (SY that end with the organism--e.g., MMRN1_HUMAN).
+// Used to load the starts_with prefix index (utils/prefix_index.py) for the proteins-info endpoint.
+MATCH (cProtein:Code)
+WHERE cProtein.SAB='UNIPROTKB'
+CALL
+{
+WITH cProtein
+OPTIONAL MATCH (pProtein:Concept)-[:CODE]->(cProtein)-[r]->(tProtein:Term)
+WHERE r.CUI=pProtein.CUI AND type(r) IN ['PT','SY']
+RETURN COLLECT(CASE WHEN type(r)='PT' THEN tProtein.name END) AS recommended_names,
+       COLLECT(CASE WHEN type(r)='SY' AND (tProtein.name ENDS WITH '_HUMAN' OR tProtein.name ENDS WITH '_MOUSE') THEN tProtein.name END) AS entry_names
+}
+RETURN cProtein.CodeID AS code_id,
+cProtein.CODE AS id,
+recommended_names,
+entry_names
@@ -0,0 +1,29 @@
+// Returns counts of UNIPROTKB proteins in UBKG by the leading characters of their identifiers.
+// Used to warm the count cache (utils/count_cache.py) for the proteins-info endpoint.
+// The rows are for the empty prefix (the total count) and for every prefix of 1 to $prefix_length characters.
+// A protein is counted for a prefix if its UniProtKB ID, an entry name or a recommended name starts with
+// the prefix, as in proteinslist_count.cypher.
+// neo4j_logic passes $prefix_length and $organism as parameters.
+
+MATCH (cProtein:Code)
+WHERE cProtein.SAB='UNIPROTKB'
+// Filter on organism. neo4j_logic passes $organism in upper case (HUMAN or MOUSE); an empty string means all organisms.
+AND ($organism = ''
+     OR EXISTS {
+        MATCH (pProtein:Concept)-[:CODE]->(cProtein)-[r:SY]->(tProtein:Term)
+        WHERE r.CUI=pProtein.CUI AND tProtein.name ENDS WITH '_' + $organism
+     })
+// Recommended names and entry names
+CALL
+{
+WITH cProtein
+OPTIONAL MATCH (pProtein:Concept)-[:CODE]->(cProtein)-[r]->(tProtein:Term)
+WHERE r.CUI=pProtein.CUI
+AND (type(r) = 'PT' OR (type(r) = 'SY' AND (tProtein.name ENDS WITH '_HUMAN' OR tProtein.name ENDS WITH '_MOUSE')))
+RETURN COLLECT(toLower(tProtein.name)) AS names
+}
+WITH DISTINCT cProtein.CODE AS id, [toLower(cProtein.CODE)] + names AS names
+UNWIND range(0, $prefix_length) AS n
+UNWIND names AS name
+WITH id, left(name, n) AS prefix
+RETURN prefix, COUNT(DISTINCT id) AS count
@@ -0,0 +1,23 @@
+// Returns high-level information on a page of UNIPROTKB proteins.
+// Used by the proteins-info endpoint for the proteins of a page selected by proteinslist.cypher
+// or by the starts_with prefix index (utils/prefix_index.py).
+
+// The calling function in neo4j_logic.py passes $ids, the CodeIDs of the proteins on the page, in page order.
+UNWIND range(0, size($ids) - 1) AS i
+WITH i, $ids[i] AS code_id
+MATCH (cProtein:Code {CodeID: code_id})
+// Names
+CALL
+{
+WITH cProtein
+OPTIONAL MATCH (pProtein:Concept)-[:CODE]->(cProtein)-[r]->(tProtein:Term)
+WHERE r.CUI=pProtein.CUI AND type(r) IN ['PT','SY']
+WITH COLLECT(CASE WHEN type(r)='PT' THEN tProtein.name END) AS recommended_names,
+     COLLECT(CASE WHEN type(r)='SY' AND (tProtein.name ENDS WITH '_HUMAN' OR tProtein.name ENDS WITH '_MOUSE') THEN tProtein.name END) AS entry_names
+RETURN CASE WHEN size(recommended_names) > 0 THEN recommended_names END AS recommended_name,
+       CASE WHEN size(entry_names) > 0 THEN entry_names END AS entry_name
+}
+RETURN cProtein.CODE AS id,
+recommended_name,
+entry_name
+ORDER BY i
@@ -0,0 +1,16 @@
+// Called by the response cache (utils/response_cache.py).
+
+// Returns a fingerprint of the UBKG release loaded in the neo4j instance: the counts of all nodes and
+// all relationships. A new release changes the counts.
+// Neo4j reads unfiltered counts from its count store, so the query does not scan the graph.
+CALL
+{
+	MATCH (n)
+	RETURN COUNT(n) AS nodes
+}
+CALL
+{
+	MATCH ()-[r]->()
+	RETURN COUNT(r) AS relationships
+}
+RETURN nodes, relationships
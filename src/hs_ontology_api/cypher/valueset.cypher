@@ -0,0 +1,46 @@
+// Returns a valueset of concepts that are children (have an isa relationship) of another concept.
+// Used by the valueset endpoint.
+
+// A valueset is defined as the set of terms associated with the concept's child concepts. The parent
+// concept acts as an aggregator of concepts from multiple SABs.
+
+// The calling function in neo4j_logic.py will pass the variables preceded with $ as parameters:
+// $parent_sab, $parent_code: SAB and code of the parent concept
+// $child_sabs: list of SABs from which to select child concepts, in order of preference
+
+// 1. Find the child concepts with an isa relationship with the parent concept (identified by code).
+// 2. Order the child concepts based on the positions of the SABs for their codes in the child_sabs list
+//    (as opposed to an alphabetic order).
+// 3. Identify the code from the SAB that is the earliest in the list.  For example,
+//    if codes from SNOMEDCT_US are preferred to those from NCI, the list would include
+//    [...,'SNOMEDCT_US','NCI',...].
+CALL
+{
+    MATCH (codeChild:Code)<-[:CODE]-(conceptChild:Concept)-[r:isa]->(conceptParent:Concept)-[:CODE]->(codeParent:Code)
+    WHERE codeParent.SAB = $parent_sab AND codeParent.CODE = $parent_code
+    AND codeChild.SAB IN $child_sabs
+    // Limit SABs for isa relationship to specified child values
+    AND r.SAB IN $child_sabs
+    RETURN conceptChild.CUI AS conceptChildCUI, min(apoc.coll.indexOf($child_sabs, codeChild.SAB)) AS minSAB
+    ORDER BY conceptChildCUI
+}
+
+// 4. Filter to the code for the child concepts with the "earliest" SAB. The "earliest" SAB will be different for
+//    each child concept.  Limit to 1 to account for multiple cross-references (e.g., UMLS C0026018, which maps
+//    to 2 NCI codes).
+CALL
+{
+    WITH conceptChildCUI, minSAB
+    MATCH (codeChild:Code)<-[:CODE]-(conceptChild:Concept)
+    WHERE conceptChild.CUI = conceptChildCUI
+    AND apoc.coll.indexOf($child_sabs, codeChild.SAB) = minSAB
+    RETURN codeChild
+    ORDER BY codeChild.CODE
+    LIMIT 1
+}
+
+// 5. Get the term associated with the child concept code with the earliest SAB.
+WITH codeChild, conceptChildCUI
+MATCH (termChild:Term)<-[r:PT]-(codeChild:Code)
+WHERE r.CUI = conceptChildCUI
+RETURN termChild.name AS term, codeChild.CODE AS code, codeChild.SAB AS sab
@@ -17,7 +17,8 @@ from ubkg_api.models import util
 from hs_ontology_api.models.pagination import Pagination
 
 class CelltypeList:
-    def __init__(self, page=None, total_pages=None, cell_types_per_page=None, cell_types=None, starts_with=None, cell_type_count=None):
+    def __init__(self, page=None, total_pages=None, cell_types_per_page=None, cell_types=None, starts_with=None, cell_type_count=None,
+                 cursor=None, next_cursor=None):
         """CelltypeList - a model defined in OpenAPI
 
                     :param page: Requested relative "page" (block of genes)
@@ -32,6 +33,10 @@ class CelltypeList:
                     :type starts_with: str
                     :cell_type_count: Calculated count of cell types that satisfied the search criteria
                     :type cell_type_count: str
+                    :param cursor: Cursor of the request, for keyset pagination
+                    :type cursor: str
+                    :param next_cursor: Cursor for the next "page", or None for the last "page"
+                    :type next_cursor: str
 
                 """
 
@@ -53,7 +58,8 @@ class CelltypeList:
         # Property assignments
         self._cell_types = cell_types
         self._pagination = Pagination(page=page, total_pages=total_pages, items_per_page=cell_types_per_page,
-                                      starts_with=starts_with, item_count=cell_type_count).serialize()
+                                      starts_with=starts_with, item_count=cell_type_count,
+                                      cursor=cursor, next_cursor=next_cursor).serialize()
 
     def serialize(self):
         # Key/value format of response.
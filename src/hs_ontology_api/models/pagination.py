@@ -11,14 +11,17 @@ from ubkg_api.models import util
 
 class Pagination():
 
-    def __init__(self, page=None, total_pages=None, items_per_page=None, starts_with=None, item_count=None):
+    def __init__(self, page=None, total_pages=None, items_per_page=None, starts_with=None, item_count=None,
+                 cursor=None, next_cursor=None):
         """Pagination - a model defined in OpenAPI
 
-        :param page: Relative "page" (block of items)
+        :param page: Relative "page" (block of items). None for a request with a cursor.
         :param total_pages: Total number of "pages" (blocks of items)
         :param items_per_page: Number of items in each "page" (block)
         :param starts_with: Optional search string for type ahead
         :param item_count: Count of items, optionally filtered by starts_with
+        :param cursor: Cursor of the request, for keyset pagination
+        :param next_cursor: Cursor for the next "page", or None if this is the last "page"
 
         """
 
@@ -28,7 +31,9 @@ class Pagination():
             'total_pages': int,
             'items_per_page': int,
             'starts_with': str,
-            'item_count': int
+            'item_count': int,
+            'cursor': str,
+            'next_cursor': str
         }
 
         # Attribute mappings used by the base Model class to assert key/value pairs.
@@ -37,24 +42,18 @@ class Pagination():
             'total_pages': 'total_pages',
             'items_per_page': 'items_per_page',
             'starts_with': 'starts_with',
-            'item_count': 'item_count'
+            'item_count': 'item_count',
+            'cursor': 'cursor',
+            'next_cursor': 'next_cursor'
         }
         # Property assignments
-        self._page = int(page)
+        self._page = None if page is None else int(page)
         self._total_pages = int(total_pages)
         self._items_per_page = int(items_per_page)
         self._starts_with = starts_with
         self._item_count = item_count
-
-    def serialize(self):
-        # Key/value format of response.
-        return {
-            "page": self._page,
-            "total_pages": self._total_pages,
-            "genes_per_page": self._items_per_page,
-            "starts_with": self._starts_with,
-            "item_count": self._item_count
-        }
+        self._cursor = cursor
+        self._next_cursor = next_cursor
 
     @classmethod
     def from_dict(cls, dikt) -> 'Pagination':
@@ -74,7 +73,9 @@ class Pagination():
             "total_pages": self._total_pages,
             "items_per_page": self._items_per_page,
             "starts_with": self._starts_with,
-            "item_count": self._item_count
+            "item_count": self._item_count,
+            "cursor": self._cursor,
+            "next_cursor": self._next_cursor
         }
 
     @property
@@ -132,7 +133,7 @@ class Pagination():
         return self._items_per_page
 
     @items_per_page.setter
-    def genes_per_page(self, items_per_page):
+    def items_per_page(self, items_per_page):
         """Sets the items_per_page of this Pagination.
 
         Number of items per "page" or block of returns
@@ -185,4 +186,48 @@ class Pagination():
         :type item_count: int
         """
 
-        self._item_count = item_count
\ No newline at end of file
+        self._item_count = item_count
+
+    @property
+    def cursor(self):
+        """Gets the cursor of this Pagination.
+
+        Cursor of the request, for keyset pagination
+        :return: The cursor of this Pagination.
+        :rtype: str
+        """
+        return self._cursor
+
+    @cursor.setter
+    def cursor(self, cursor):
+        """Sets the cursor of this Pagination.
+
+        Cursor of the request, for keyset pagination
+
+        :param cursor: The cursor of this Pagination
+        :type cursor: str
+        """
+
+        self._cursor = cursor
+
+    @property
+    def next_cursor(self):
+        """Gets the next_cursor of this Pagination.
+
+        Cursor for the next "page" (block) of items, or None for the last "page"
+        :return: The next_cursor of this Pagination.
+        :rtype: str
+        """
+        return self._next_cursor
+
+    @next_cursor.setter
+    def next_cursor(self, next_cursor):
+        """Sets the next_cursor of this Pagination.
+
+        Cursor for the next "page" (block) of items, or None for the last "page"
+
+        :param next_cursor: The next_cursor of this Pagination
+        :type next_cursor: str
+        """
+
+        self._next_cursor = next_cursor
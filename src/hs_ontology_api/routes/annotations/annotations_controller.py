@@ -4,15 +4,19 @@ from ubkg_api.utils.http_error_string import (get_404_error_string, validate_que
 from hs_ontology_api.utils.neo4j_logic import annotations_get_logic, annotation_organ_levels_get_logic, annotation_organs_get_logic
 
 # S3 redirect functions
-from ubkg_api.utils.s3_redirect import redirect_if_large
+from hs_ontology_api.utils.json_response import redirect_if_large
+# Cache for responses from read-only endpoints
+from hs_ontology_api.utils.response_cache import cached_response
 from ubkg_api.utils.http_error_string import get_404_error_string
 
 annotations_blueprint = Blueprint('annotations', __name__, url_prefix='/annotations')
 
 @annotations_blueprint.route('/<ids>', methods=['GET'])
+@cached_response('annotations')
 def get_annotations_id_route(ids):
     return get_annotations(ids=ids)
 @annotations_blueprint.route('', methods=['GET'])
+@cached_response('annotations')
 def get_annotations_route():
     return get_annotations()
 def get_annotations(ids=None):
@@ -60,9 +64,11 @@ def get_annotations(ids=None):
     return redirect_if_large(resp=result)
 
 @annotations_blueprint.route('/organ-levels', methods=['GET'])
+@cached_response('annotations')
 def get_annotation_organ_levels_route():
     return get_annotation_organ_levels()
 @annotations_blueprint.route('/<ids>/organ-levels', methods=['GET'])
+@cached_response('annotations')
 def get_annotation_organ_levels_id_route(ids):
     return get_annotation_organ_levels(ids)
 
@@ -112,9 +118,11 @@ def get_annotation_organ_levels(ids=None):
     return redirect_if_large(resp=result)
 
 @annotations_blueprint.route('/organs', methods=['GET'])
+@cached_response('annotations')
 def get_annotation_organs_route():
     return get_annotation_organs()
 @annotations_blueprint.route('/<ids>/organs', methods=['GET'])
+@cached_response('annotations')
 def get_annotation_organs_id_route(ids):
     return get_annotation_organs(ids)
 
@@ -6,7 +6,13 @@ from hs_ontology_api.utils.neo4j_logic import assayclasses_get_logic
 
 # March 2025
 # S3 redirect functions
-from ubkg_api.utils.s3_redirect import redirect_if_large
+from hs_ontology_api.utils.json_response import redirect_if_large
+# Streamed (NDJSON) responses
+from hs_ontology_api.utils.json_response import stream_requested, peek_stream, ndjson_response
+# Cache for responses from read-only endpoints
+from hs_ontology_api.utils.response_cache import cached_response
+# Ready-to-send responses for static endpoints
+from hs_ontology_api.utils.static_responses import static_response, APPLICATION_CONTEXT_VARIANTS
 
 assayclasses_blueprint = Blueprint('assayclasses_hs', __name__, url_prefix='/assayclasses')
 
@@ -41,9 +47,12 @@ def convert_param_to_boolean_string(param_name: str) -> str:
         return 'False'
 
 @assayclasses_blueprint.route('', methods=['GET'])
+@static_response('assayclasses', params=['application_context', 'provide-hierarchy-info'],
+                 variants=APPLICATION_CONTEXT_VARIANTS)
 def assayclasses_expand_get():
     return assayclasses_get()
 @assayclasses_blueprint.route('/<name>', methods=['GET'])
+@cached_response('assayclasses')
 def assayclasses_name_expand_get(name):
     return assayclasses_get(name=name)
 
@@ -62,7 +71,7 @@ def assayclasses_get(name=None):
 
     # Check for invalid parameter names.
     err = validate_query_parameter_names(parameter_name_list=['application_context', 'process_state', 'assaytype',
-                                                              'provide-hierarchy-info'])
+                                                              'provide-hierarchy-info', 'stream'])
     if err != 'ok':
         return make_response(err, 400)
 
@@ -106,9 +115,12 @@ def assayclasses_get(name=None):
 
 
     neo4j_instance = current_app.neo4jConnectionHelper.instance()
+    stream = stream_requested()
     result = assayclasses_get_logic(
         neo4j_instance, assayclass=name, process_state=process_state, assaytype=assaytype,
-        context=application_context, provide_hierarchy_info=provide_hierarchy_info)
+        context=application_context, provide_hierarchy_info=provide_hierarchy_info, stream=stream)
+    if stream:
+        result = peek_stream(result)
 
     if result is None or result == []:
         # Empty result
@@ -116,6 +128,10 @@ def assayclasses_get(name=None):
                                                  f"specified parameters")
         return make_response(err, 404)
 
+    # A streamed response has one assay class per line.
+    if stream:
+        return ndjson_response(result)
+
     # March 2025
     # The result is either a list with one element or a single item.
     # Redirect to S3 if payload is large.
@@ -4,7 +4,7 @@ from flask import Blueprint, jsonify, current_app, make_response
 from hs_ontology_api.utils.neo4j_logic import celltypedetail_get_logic, celltype_get_logic
 # March 2025
 # S3 redirect functions
-from ubkg_api.utils.s3_redirect import redirect_if_large
+from hs_ontology_api.utils.json_response import redirect_if_large
 from ubkg_api.utils.http_error_string import get_404_error_string
 
 celltypes_blueprint = Blueprint('celltypes', __name__, url_prefix='/celltypes')
@@ -6,11 +6,12 @@ import math
 
 from ubkg_api.utils.http_error_string import (get_404_error_string, validate_query_parameter_names,
                                               validate_parameter_value_in_enum, validate_required_parameters)
+from hs_ontology_api.utils.pagination_cursor import validate_cursor, ID_KEY_TYPES
 
 
 # March 2025
 # S3 redirect functions
-from ubkg_api.utils.s3_redirect import redirect_if_large
+from hs_ontology_api.utils.json_response import redirect_if_large
 celltypesinfo_blueprint = Blueprint('celltypes-info', __name__, url_prefix='/celltypes-info')
 
 @celltypesinfo_blueprint.route('', methods=['GET'])
@@ -24,7 +25,7 @@ def celltypeslist() -> list[str]:
 
     # JUNE 2025 - Validation
     # Check for invalid parameter names.
-    err = validate_query_parameter_names(parameter_name_list=['page','celltypes_per_page','starts_with'])
+    err = validate_query_parameter_names(parameter_name_list=['page','celltypes_per_page','starts_with','cursor'])
     if err != 'ok':
         return make_response(err, 400)
 
@@ -46,6 +47,12 @@ def celltypeslist() -> list[str]:
                               f'must be greater '
                               f'than zero.', 400))
 
+    # Keyset (cursor) pagination. A cursor is an alternative to page; an empty cursor requests the first page.
+    cursor = request.args.get('cursor')
+    err = validate_cursor(cursor, page, key_types=ID_KEY_TYPES)
+    if err is not None:
+        return err
+
     # Obtain the total count of genes, considering the filter starts_with.
     cell_type_count = celltypelist_count_get_logic(neo4j_instance, starts_with)
     if cell_type_count == 0:
@@ -54,6 +61,19 @@ def celltypeslist() -> list[str]:
         return make_response(f"There are no cell types with preferred terms or synonyms that start "
                              f"with '{starts_with}' (case-insensitive).", 404)
 
+    # Calculate the total number of (filtered) pages.
+    total_pages = str(math.ceil(int(cell_type_count) / int(cell_types_per_page)))
+
+    if cursor is not None:
+        result = celltypelist_get_logic(neo4j_instance,
+                                        page=None,
+                                        total_pages=total_pages,
+                                        cell_types_per_page=cell_types_per_page,
+                                        starts_with=starts_with,
+                                        cell_type_count=cell_type_count,
+                                        cursor=cursor)
+        return redirect_if_large(resp=result)
+
     # Default values for page.
     # Case: No parameter specified.
     if page is None:
@@ -63,9 +83,6 @@ def celltypeslist() -> list[str]:
     if page == '0':
         page = '1'
 
-    # Calculate the total number of (filtered) pages.
-    total_pages = str(math.ceil(int(cell_type_count) / int(cell_types_per_page)))
-
     # Translation for cases "last" or "first"
     print(f'total_pages={total_pages}')
     if page == 'last':
@@ -5,19 +5,27 @@ from ubkg_api.utils.http_error_string import (get_404_error_string, validate_que
 from hs_ontology_api.utils.neo4j_logic import dataset_types_get_logic, dataset_types_valueset_get_logic
 # March 2025
 # S3 redirect functions
-from ubkg_api.utils.s3_redirect import redirect_if_large
+from hs_ontology_api.utils.json_response import redirect_if_large
+# Cache for responses from read-only endpoints
+from hs_ontology_api.utils.response_cache import cached_response
+# Ready-to-send responses for static endpoints
+from hs_ontology_api.utils.static_responses import static_response, APPLICATION_CONTEXT_VARIANTS
 
 datasettypes_blueprint = Blueprint('datasettypes_hs', __name__, url_prefix='/dataset-types')
 
 @datasettypes_blueprint.route('', methods=['GET'])
+@static_response('dataset-types', params=['application_context', 'is_externally_processed'],
+                 variants=APPLICATION_CONTEXT_VARIANTS)
 def datasettypes_expand_get():
     return datasettypes_get(ishierarchy=False)
 
 @datasettypes_blueprint.route('/hierarchy', methods=['GET'])
+@static_response('dataset-types', params=['application_context', 'is_externally_processed'])
 def datasettypes_hierarchy_expand_get():
     return datasettypes_get()
 
 @datasettypes_blueprint.route('/hierarchy/<dataset_type_code>', methods=['GET'])
+@cached_response('dataset-types')
 def datasettypes_dataset_type_get(dataset_type_code):
     if dataset_type_code.lower()=='valueset':
         return datasetypes_valueset_get()
@@ -25,10 +33,12 @@ def datasettypes_dataset_type_get(dataset_type_code):
         return datasettypes_get(dataset_type_code=dataset_type_code)
 
 @datasettypes_blueprint.route('/hierarchy/<dataset_type_code>/<modality_code>', methods=['GET'])
+@cached_response('dataset-types')
 def datasettypes_dataset_type_modality_get(dataset_type_code, modality_code):
     return datasettypes_get(dataset_type_code=dataset_type_code, modality_code=modality_code)
 
 @datasettypes_blueprint.route('/hierarchy/<dataset_type_code>/<modality_code>/<analyte_code>', methods=['GET'])
+@cached_response('dataset-types')
 def datasettypes_dataset_type_modality_analyte_get(dataset_type_code, modality_code, analyte_code):
     return datasettypes_get(dataset_type_code=dataset_type_code, modality_code=modality_code, analyte_code=analyte_code)
 
@@ -5,7 +5,9 @@ from hs_ontology_api.utils.neo4j_logic import field_assays_get_logic
 from ubkg_api.utils.http_error_string import get_404_error_string, validate_query_parameter_names
 # March 2025
 # S3 redirect functions
-from ubkg_api.utils.s3_redirect import redirect_if_large
+from hs_ontology_api.utils.json_response import redirect_if_large
+# Cache for responses from read-only endpoints
+from hs_ontology_api.utils.response_cache import cached_response
 
 field_assays_blueprint = Blueprint('field-assays', __name__, url_prefix='/field-assays')
 
@@ -48,10 +50,12 @@ def field_assays_get(name=None):
 
 
 @field_assays_blueprint.route('', methods=['GET'])
+@cached_response('field-assays')
 def field_assays_expand_get():
     return field_assays_get()
 
 
 @field_assays_blueprint.route('/<name>', methods=['GET'])
+@cached_response('field-assays')
 def field_assays_name_expand_get(name):
     return field_assays_get(name=name)
@@ -6,7 +6,11 @@ from ubkg_api.utils.http_error_string import get_404_error_string, validate_quer
     validate_parameter_value_in_enum
 # March 2025
 # S3 redirect functions
-from ubkg_api.utils.s3_redirect import redirect_if_large
+from hs_ontology_api.utils.json_response import redirect_if_large
+# Streamed (NDJSON) responses
+from hs_ontology_api.utils.json_response import stream_requested, peek_stream, ndjson_response
+# Cache for responses from read-only endpoints
+from hs_ontology_api.utils.response_cache import cached_response
 
 field_descriptions_blueprint = Blueprint('field-descriptions', __name__, url_prefix='/field-descriptions')
 
@@ -17,7 +21,7 @@ def field_descriptions_get(name=None):
 
     """
     # Validate parameter names.
-    err = validate_query_parameter_names(['source'])
+    err = validate_query_parameter_names(['source', 'stream'])
     if err != 'ok':
         return make_response(err, 400)
 
@@ -31,20 +35,28 @@ def field_descriptions_get(name=None):
         return make_response(err, 400)
 
     neo4j_instance = current_app.neo4jConnectionHelper.instance()
-    result = field_descriptions_get_logic(neo4j_instance, field_name=name, definition_source=source)
+    stream = stream_requested()
+    result = field_descriptions_get_logic(neo4j_instance, field_name=name, definition_source=source, stream=stream)
+    if stream:
+        result = peek_stream(result)
     if result is None or result == []:
         # Empty result
         err = get_404_error_string(prompt_string='No field descriptions')
         return make_response(err, 404)
 
+    if stream:
+        return ndjson_response(result)
+
     # Redirect to S3 if payload is large.
     return redirect_if_large(resp=result)
 
 @field_descriptions_blueprint.route('', methods=['GET'])
+@cached_response('field-descriptions')
 def field_descriptions_expand_get():
     return field_descriptions_get()
 
 
 @field_descriptions_blueprint.route('/<name>', methods=['GET'])
+@cached_response('field-descriptions')
 def field_descriptions_name_expand_get(name):
     return field_descriptions_get(name=name)
@@ -6,7 +6,9 @@ from ubkg_api.utils.http_error_string import get_404_error_string, validate_quer
     validate_parameter_value_in_enum
 # March 2025
 # S3 redirect functions
-from ubkg_api.utils.s3_redirect import redirect_if_large
+from hs_ontology_api.utils.json_response import redirect_if_large
+# Cache for responses from read-only endpoints
+from hs_ontology_api.utils.response_cache import cached_response
 
 field_schemas_blueprint = Blueprint('field-schemas', __name__, url_prefix='/field-schemas')
 
@@ -46,10 +48,12 @@ def field_schemas_get(name=None):
 
 
 @field_schemas_blueprint.route('', methods=['GET'])
+@cached_response('field-schemas')
 def field_schemas_expand_get():
     return field_schemas_get()
 
 
 @field_schemas_blueprint.route('/<name>', methods=['GET'])
+@cached_response('field-schemas')
 def field_schemas_name_expand_get(name):
     return field_schemas_get(name=name)
@@ -6,7 +6,11 @@ from ubkg_api.utils.http_error_string import get_404_error_string, validate_quer
     validate_parameter_value_in_enum
 # March 2025
 # S3 redirect functions
-from ubkg_api.utils.s3_redirect import redirect_if_large
+from hs_ontology_api.utils.json_response import redirect_if_large
+# Streamed (NDJSON) responses
+from hs_ontology_api.utils.json_response import stream_requested, peek_stream, ndjson_response
+# Cache for responses from read-only endpoints
+from hs_ontology_api.utils.response_cache import cached_response
 
 field_types_blueprint = Blueprint('field-types', __name__, url_prefix='/field-types')
 
@@ -16,7 +20,7 @@ def field_types_get(name=None):
 
     """
     # Validate parameter names.
-    err = validate_query_parameter_names(['mapping_source', 'type_source', 'type'])
+    err = validate_query_parameter_names(['mapping_source', 'type_source', 'type', 'stream'])
     if err != 'ok':
         return make_response(err, 400)
 
@@ -43,8 +47,11 @@ def field_types_get(name=None):
     type = request.args.get('type')
 
     neo4j_instance = current_app.neo4jConnectionHelper.instance()
+    stream = stream_requested()
     result = field_types_get_logic(neo4j_instance, field_name=name, mapping_source=mapping_source,
-                                   type_source=type_source, type=type)
+                                   type_source=type_source, type=type, stream=stream)
+    if stream:
+        result = peek_stream(result)
     if result is None or result == []:
         # Empty result
         err = get_404_error_string(prompt_string='No field type associations')
@@ -53,15 +60,20 @@ def field_types_get(name=None):
                         'Refer to the SmartAPI documentation for this endpoint for more information.'
         return make_response(err, 404)
 
+    if stream:
+        return ndjson_response(result)
+
     # Redirect to S3 if payload is large.
     return redirect_if_large(resp=result)
 
 
 @field_types_blueprint.route('', methods=['GET'])
+@cached_response('field-types')
 def field_types_expand_get():
     return field_types_get()
 
 
 @field_types_blueprint.route('/<name>', methods=['GET'])
+@cached_response('field-types')
 def field_types_name_expand_get(name):
     return field_types_get(name=name)
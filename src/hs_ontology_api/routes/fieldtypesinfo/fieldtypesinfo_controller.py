@@ -6,7 +6,9 @@ from ubkg_api.utils.http_error_string import get_404_error_string, validate_quer
     validate_parameter_value_in_enum
 # March 2025
 # S3 redirect functions
-from ubkg_api.utils.s3_redirect import redirect_if_large
+from hs_ontology_api.utils.json_response import redirect_if_large
+# Cache for responses from read-only endpoints
+from hs_ontology_api.utils.response_cache import cached_response
 
 field_types_info_blueprint = Blueprint('field-types-info', __name__, url_prefix='/field-types-info')
 
@@ -41,5 +43,6 @@ def field_types_info_get():
     return redirect_if_large(resp=result)
 
 @field_types_info_blueprint.route('', methods=['GET'])
+@cached_response('field-types-info')
 def field_types_expand_get():
     return field_types_info_get()
@@ -3,7 +3,7 @@
 from flask import Blueprint, jsonify, current_app, make_response, request
 from hs_ontology_api.utils.neo4j_logic import genedetail_get_logic, gene_get_logic
 # S3 redirect functions
-from ubkg_api.utils.s3_redirect import redirect_if_large
+from hs_ontology_api.utils.json_response import redirect_if_large
 
 from ubkg_api.utils.http_error_string import (get_404_error_string, validate_query_parameter_names,
                                               validate_parameter_value_in_enum, validate_required_parameters)
@@ -6,11 +6,11 @@ from hs_ontology_api.utils.neo4j_logic import genelist_get_logic,genelist_count_
 import math
 # March 2025
 # S3 redirect functions
-from ubkg_api.utils.s3_redirect import redirect_if_large
+from hs_ontology_api.utils.json_response import redirect_if_large
 
 from ubkg_api.utils.http_error_string import (get_404_error_string, validate_query_parameter_names,
                                               validate_parameter_value_in_enum, validate_required_parameters)
-
+from hs_ontology_api.utils.pagination_cursor import validate_cursor, GENE_KEY_TYPES
 
 genesinfo_blueprint = Blueprint('genes-info', __name__, url_prefix='/genes-info')
 
@@ -24,7 +24,7 @@ def geneslist() -> list[str]:
     """
 
     # Check for invalid parameter names.
-    err = validate_query_parameter_names(parameter_name_list=['page','genes_per_page', 'starts_with','organism'])
+    err = validate_query_parameter_names(parameter_name_list=['page','genes_per_page', 'starts_with','organism','cursor'])
     if err != 'ok':
         return make_response(err, 400)
 
@@ -53,6 +53,12 @@ def geneslist() -> list[str]:
     if int(genes_per_page) <= 0:
         return (make_response(f'The value for parameter genes_per_page ({genes_per_page}) must be greater than zero.', 400))
 
+    # Keyset (cursor) pagination. A cursor is an alternative to page; an empty cursor requests the first page.
+    cursor = request.args.get('cursor')
+    err = validate_cursor(cursor, page, key_types=GENE_KEY_TYPES)
+    if err is not None:
+        return err
+
     # Escape apostrophes and double quotes.
     starts_with = starts_with.replace("'", "\'").replace('"', "\'")
 
@@ -68,6 +74,20 @@ def geneslist() -> list[str]:
         return make_response(f"There are no genes with {sab} symbols that start with '{escape(starts_with)}'.", 404)
 
 
+    # Calculate the total number of (filtered) pages.
+    total_pages = str(math.ceil(int(gene_count) / int(genes_per_page)))
+
+    if cursor is not None:
+        result = genelist_get_logic(neo4j_instance,
+                                    page=None,
+                                    total_pages=total_pages,
+                                    genes_per_page=genes_per_page,
+                                    starts_with=starts_with,
+                                    gene_count=gene_count,
+                                    organism=organism,
+                                    cursor=cursor)
+        return redirect_if_large(resp=result)
+
     # Default values for page.
     # Case: No parameter specified.
     if page is None:
@@ -77,9 +97,6 @@ def geneslist() -> list[str]:
     if page == '0':
         page = '1'
 
-    # Calculate the total number of (filtered) pages.
-    total_pages = str(math.ceil(int(gene_count) / int(genes_per_page)))
-
     # Translation for cases "last" or "first"
     if page == 'last':
         page = str(int(total_pages))
@@ -5,12 +5,15 @@ from ubkg_api.utils.http_error_string import (get_404_error_string, validate_que
                                               validate_parameter_value_in_enum, validate_required_parameters)
 # March 2025
 # S3 redirect functions
-from ubkg_api.utils.s3_redirect import redirect_if_large
+from hs_ontology_api.utils.json_response import redirect_if_large
+# Ready-to-send responses for static endpoints
+from hs_ontology_api.utils.static_responses import static_response, APPLICATION_CONTEXT_VARIANTS
 
 organs_blueprint = Blueprint('organs_hs', __name__, url_prefix='/organs')
 
 
 @organs_blueprint.route('', methods=['GET'])
+@static_response('organs', params=['application_context'], variants=APPLICATION_CONTEXT_VARIANTS)
 def get_organ_types():
 
     # Check for required parameters.
@@ -36,6 +39,7 @@ def get_organ_types():
 
 
 @organs_blueprint.route('by-code', methods=['GET'])
+@static_response('organs', params=['application_context'], variants=APPLICATION_CONTEXT_VARIANTS)
 def get_organ_by_code():
 
     # Check for required parameters.
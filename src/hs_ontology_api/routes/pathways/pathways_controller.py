@@ -9,7 +9,9 @@ from hs_ontology_api.utils.neo4j_logic import pathway_events_with_genes_get_logi
 
 # March 2025
 # S3 redirect functions
-from ubkg_api.utils.s3_redirect import redirect_if_large
+from hs_ontology_api.utils.json_response import redirect_if_large
+# Streamed (NDJSON) responses
+from hs_ontology_api.utils.json_response import stream_requested, peek_stream, ndjson_response
 
 pathways_blueprint = Blueprint('pathways_hs', __name__, url_prefix='/pathways')
 
@@ -30,7 +32,8 @@ def pathways_with_genes_function_get():
     err = validate_query_parameter_names(parameter_name_list=['geneids',
                                                               'pathwayid',
                                                               'pathwaynamestartswith',
-                                                              'eventtypes'])
+                                                              'eventtypes',
+                                                              'stream'])
     if err != 'ok':
         return make_response(err, 400)
 
@@ -61,14 +64,19 @@ def pathways_with_genes_function_get():
                 return make_response(err, 400)
 
     neo4j_instance = current_app.neo4jConnectionHelper.instance()
+    stream = stream_requested()
     result = pathway_events_with_genes_get_logic(neo4j_instance,
                                geneids=geneids,
                                pathwayid=pathwayid,
                                pathwaynamestartswith=pathwaynamestartswith,
-                               eventtypes=eventtypes)
+                               eventtypes=eventtypes,
+                               stream=stream)
+    if stream:
+        # A streamed response has one event per line, without the count.
+        result = peek_stream(result)
 
     iserr = result is None or result == []
-    if not iserr:
+    if not iserr and not stream:
         count = result.get('count')
         iserr = count == 0
 
@@ -78,6 +86,9 @@ def pathways_with_genes_function_get():
                                                  f"specified parameters")
         return make_response(err, 404)
 
+    if stream:
+        return ndjson_response(result)
+
     return redirect_if_large(resp=result)
 
 @pathways_blueprint.route('/<id>/participants', methods=['GET'])
@@ -108,7 +119,7 @@ def pathways_participants_function_get(id=None):
 
     # Validate parameters.
     # Check for invalid parameter names.
-    err = validate_query_parameter_names(parameter_name_list=['sabs','featuretypes'])
+    err = validate_query_parameter_names(parameter_name_list=['sabs','featuretypes','stream'])
     if err != 'ok':
         return make_response(err, 400)
 
@@ -138,13 +149,18 @@ def pathways_participants_function_get(id=None):
                 return make_response(err, 400)
 
     neo4j_instance = current_app.neo4jConnectionHelper.instance()
+    stream = stream_requested()
     result = pathway_participants_get_logic(neo4j_instance,
                                             pathwayid=id,
                                             sabs=sabs,
-                                            featuretypes=featuretypes)
+                                            featuretypes=featuretypes,
+                                            stream=stream)
+    if stream:
+        # A streamed response has one event per line, without the count.
+        result = peek_stream(result)
 
     iserr = result is None or result == []
-    if not iserr:
+    if not iserr and not stream:
         count = result.get('count')
         iserr = count == 0
 
@@ -154,4 +170,7 @@ def pathways_participants_function_get(id=None):
                                                  f"specified parameters")
         return make_response(err, 404)
 
+    if stream:
+        return ndjson_response(result)
+
     return redirect_if_large(resp=result)
\ No newline at end of file
@@ -5,11 +5,12 @@ from hs_ontology_api.utils.neo4j_logic import proteinlist_get_logic,proteinlist_
 import math
 from markupsafe import escape
 # S3 redirect functions
-from ubkg_api.utils.s3_redirect import redirect_if_large
+from hs_ontology_api.utils.json_response import redirect_if_large
 proteinsinfo_blueprint = Blueprint('proteins-info', __name__, url_prefix='/proteins-info')
 
 from ubkg_api.utils.http_error_string import (get_404_error_string, validate_query_parameter_names,
                                               validate_parameter_value_in_enum, validate_required_parameters)
+from hs_ontology_api.utils.pagination_cursor import validate_cursor, ID_KEY_TYPES
 
 @proteinsinfo_blueprint.route('', methods=['GET'])
 def proteinslist() -> list[str]:
@@ -19,7 +20,7 @@ def proteinslist() -> list[str]:
     # Obtain a list of proteins from the UBKG.
 
     # Check for invalid parameter names.
-    err = validate_query_parameter_names(parameter_name_list=['page','proteins_per_page', 'starts_with', 'organism'])
+    err = validate_query_parameter_names(parameter_name_list=['page','proteins_per_page', 'starts_with', 'organism', 'cursor'])
     if err != 'ok':
         return make_response(err, 400)
 
@@ -52,6 +53,12 @@ def proteinslist() -> list[str]:
         return (make_response(f'The value for parameter proteins_per_page ({proteins_per_page}) must be greater '
                               f'than zero.', 400))
 
+    # Keyset (cursor) pagination. A cursor is an alternative to page; an empty cursor requests the first page.
+    cursor = request.args.get('cursor')
+    err = validate_cursor(cursor, page, key_types=ID_KEY_TYPES)
+    if err is not None:
+        return err
+
     # Obtain the total count of genes, considering the filter starts_with.
     protein_count = proteinlist_count_get_logic(neo4j_instance, organism=organism, starts_with=starts_with)
     if protein_count == 0:
@@ -64,6 +71,20 @@ def proteinslist() -> list[str]:
         return make_response(f"There are no proteins with UniProtKB identifiers (entry names or recommended names) "
                              f"for {orgs} that start with '{escape(starts_with)}' (case-insensitive).", 404)
 
+    # Calculate the total number of (filtered) pages.
+    total_pages = str(math.ceil(int(protein_count) / int(proteins_per_page)))
+
+    if cursor is not None:
+        result = proteinlist_get_logic(neo4j_instance,
+                                       page=None,
+                                       total_pages=total_pages,
+                                       proteins_per_page=proteins_per_page,
+                                       starts_with=starts_with,
+                                       protein_count=protein_count,
+                                       organism=organism,
+                                       cursor=cursor)
+        return redirect_if_large(resp=result)
+
     # Default values for page.
     # Case: No parameter specified.
     if page is None:
@@ -73,9 +94,6 @@ def proteinslist() -> list[str]:
     if page == '0':
         page = '1'
 
-    # Calculate the total number of (filtered) pages.
-    total_pages = str(math.ceil(int(protein_count) / int(proteins_per_page)))
-
     # Translation for cases "last" or "first"
     if page == 'last':
         page = str(int(total_pages))
@@ -3,7 +3,7 @@ from flask import Blueprint, jsonify, current_app, make_response
 from hs_ontology_api.utils.neo4j_logic import relationships_for_gene_target_symbol_get_logic
 # March 2025
 # S3 redirect functions
-from ubkg_api.utils.s3_redirect import redirect_if_large
+from hs_ontology_api.utils.json_response import redirect_if_large
 
 relationships_blueprint = Blueprint('relationships', __name__, url_prefix='/relationships')
 
@@ -3,12 +3,15 @@ from flask import Blueprint, jsonify, current_app, request
 from hs_ontology_api.utils.neo4j_logic import valueset_get_logic
 # March 2025
 # S3 redirect functions
-from ubkg_api.utils.s3_redirect import redirect_if_large
+from hs_ontology_api.utils.json_response import redirect_if_large
+# Cache for responses from read-only endpoints
+from hs_ontology_api.utils.response_cache import cached_response
 
 valueset_blueprint = Blueprint('valueset_hs', __name__, url_prefix='/valueset')
 
 
 @valueset_blueprint.route('', methods=['GET'])
+@cached_response('valueset')
 def valueset_get():
     """Returns a valueset of concepts that are children (have as isa relationship) of another concept.
 
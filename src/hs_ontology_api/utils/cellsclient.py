@@ -2,24 +2,295 @@
 # JAS October 2023
 
 # Wrapper for the Cells client (hubmap-api-py-client).
+import bisect
+import concurrent.futures
+import csv
 import logging
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
 
-from hubmap_api_py_client import Client
-from hubmap_api_py_client.errors import ClientError
+from flask import Flask
 
 # Array of cell type objects
 from hs_ontology_api.models.genedetail_celltype import GeneDetailCellType
+from hs_ontology_api.utils.metrics import metrics
 
-import pandas as pd
-import os
+logger = logging.getLogger(__name__)
+
+# Files built by the build_index script in the cells_index directory. The Parquet file is used if it
+# exists and pyarrow is installed; otherwise, the TSV file.
+CELLS_INDEX_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'cells_index')
+CELLS_TSV_PATH = os.path.join(CELLS_INDEX_DIR, 'cells.tsv')
+CELLS_PARQUET_PATH = os.path.join(CELLS_INDEX_DIR, 'cells.parquet')
+
+CELLS_COLUMNS = ['gene_symbol', 'dataset_uuid', 'organ', 'cell_type']
+
+
+class CellsTsvIndex:
+
+    def __init__(self, path: str = CELLS_TSV_PATH):
+        """
+        In-memory index of the TSV file built by the build_index script, keyed by gene symbol.
+
+        The file is read once, and read again only when its modification time changes.
+
+        :param path: path to the TSV file
+        """
+        self.path = os.path.abspath(path)
+        self._mtime = None
+        # Tuples of (dataset_uuid, organ, cell_type), keyed by gene symbol
+        self._rows = {}
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict:
+        """
+        Reads the file into a dict of row tuples keyed by gene symbol.
+        """
+        rows = {}
+        with open(self.path, newline='') as tsvfile:
+            # Same dialect as the csv writer in build_index.py
+            reader = csv.reader(tsvfile, delimiter='\t', quotechar='|')
+            header = next(reader, None)
+            if header is None:
+                return rows
+            columns = {name: i for i, name in enumerate(header)}
+            igene = columns['gene_symbol']
+            idataset = columns['dataset_uuid']
+            iorgan = columns['organ']
+            icelltype = columns['cell_type']
+            for row in reader:
+                if len(row) < len(header):
+                    continue
+                # Organs and cell types repeat across genes, so their strings are shared.
+                rows.setdefault(row[igene], []).append((row[idataset],
+                                                        sys.intern(row[iorgan]),
+                                                        sys.intern(row[icelltype])))
+        return {gene_symbol: tuple(generows) for gene_symbol, generows in rows.items()}
+
+    def rows(self) -> dict:
+        """
+        Returns the index, reading the file again if it changed since it was read.
+        """
+        mtime = os.stat(self.path).st_mtime_ns
+        with self._lock:
+            if mtime != self._mtime:
+                self._rows = self._load()
+                self._mtime = mtime
+                logger.info(f'Loaded cell types for {len(self._rows)} genes from {self.path}.')
+            return self._rows
+
+    def get(self, gene_symbol: str) -> tuple:
+        """
+        Returns the (dataset_uuid, organ, cell_type) tuples for a gene.
+        :param gene_symbol: approved HGNC gene symbol
+        """
+        return self.rows().get(gene_symbol, ())
+
+    def get_many(self, gene_symbols: list[str]) -> dict:
+        """
+        Returns the (dataset_uuid, organ, cell_type) tuples for a list of genes, keyed by gene symbol.
+        :param gene_symbols: list of approved HGNC gene symbols
+        """
+        rows = self.rows()
+        return {gene_symbol: rows.get(gene_symbol, ()) for gene_symbol in gene_symbols}
+
+
+class CellsParquetIndex:
+
+    def __init__(self, path: str = CELLS_PARQUET_PATH):
+        """
+        Reader of the Parquet file built by the build_index script.
+
+        The file is sorted by gene symbol and has statistics for each row group, so a lookup reads only the
+        row groups with a range of gene symbols that can contain the requested genes. The file is memory-mapped,
+        so it is not loaded into memory at startup; it is opened again when its modification time changes.
+
+        :param path: path to the Parquet file
+        """
+        self.path = os.path.abspath(path)
+        self._mtime = None
+        self._file = None
+        # (min, max) gene symbol of each row group
+        self._ranges = []
+        self._lock = threading.Lock()
+
+    def available(self) -> bool:
+        """
+        Returns True if the file exists and pyarrow is installed.
+        """
+        if not os.path.exists(self.path):
+            return False
+        try:
+            import pyarrow.parquet
+        except ImportError:
+            return False
+        return True
+
+    def _open(self) -> tuple:
+        """
+        Returns the file and the ranges of gene symbols of its row groups, opening the file again if it
+        changed since it was opened.
+        """
+        import pyarrow.parquet as pq
+
+        mtime = os.stat(self.path).st_mtime_ns
+        with self._lock:
+            if mtime != self._mtime:
+                parquetfile = pq.ParquetFile(self.path, memory_map=True)
+                column = parquetfile.schema_arrow.get_field_index('gene_symbol')
+                ranges = []
+                for i in range(parquetfile.metadata.num_row_groups):
+                    statistics = parquetfile.metadata.row_group(i).column(column).statistics
+                    if statistics is None or not statistics.has_min_max:
+                        # Without statistics, the row group must be read.
+                        ranges.append((None, None))
+                    else:
+                        ranges.append((statistics.min, statistics.max))
+                self._file, self._ranges, self._mtime = parquetfile, ranges, mtime
+                logger.info(f'Opened {self.path}: {parquetfile.metadata.num_rows} rows in {len(ranges)} row groups.')
+            return self._file, self._ranges
+
+    def get(self, gene_symbol: str) -> tuple:
+        """
+        Returns the (dataset_uuid, organ, cell_type) tuples for a gene.
+        :param gene_symbol: approved HGNC gene symbol
+        """
+        return self.get_many([gene_symbol])[gene_symbol]
+
+    def get_many(self, gene_symbols: list[str]) -> dict:
+        """
+        Returns the (dataset_uuid, organ, cell_type) tuples for a list of genes, keyed by gene symbol.
+        :param gene_symbols: list of approved HGNC gene symbols
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        rows = {gene_symbol: [] for gene_symbol in gene_symbols}
+        if len(rows) == 0:
+            return {}
+        parquetfile, ranges = self._open()
+
+        # Push the filter on gene_symbol down to the row groups: read only the row groups with a range of
+        # gene symbols that contains a requested gene.
+        symbols = sorted(rows)
+        row_groups = []
+        for i, (low, high) in enumerate(ranges):
+            if low is None:
+                row_groups.append(i)
+                continue
+            first = bisect.bisect_left(symbols, low)
+            if first < len(symbols) and symbols[first] <= high:
+                row_groups.append(i)
+        if len(row_groups) == 0:
+            return {gene_symbol: () for gene_symbol in rows}
+
+        table = parquetfile.read_row_groups(row_groups, columns=CELLS_COLUMNS)
+        table = table.filter(pc.is_in(table['gene_symbol'], value_set=pa.array(symbols, type=pa.string())))
+        columns = table.to_pydict()
+        for gene_symbol, dataset_uuid, organ, cell_type in zip(*(columns[name] for name in CELLS_COLUMNS)):
+            rows[gene_symbol].append((dataset_uuid, organ, cell_type))
+        return {gene_symbol: tuple(generows) for gene_symbol, generows in rows.items()}
+
+
+class CellTypesCache:
+
+    def __init__(self, maxsize: int = 4096, ttl: int = 24*60*60, negative_ttl: int = 60*60):
+        """
+        Cache of the cell types for genes obtained from the Cells API, with a TTL and LRU eviction.
+
+        Genes for which the Cells API returns an error--e.g., symbols that are not in the client's list of
+        genes--are cached as negative results (no cell types), with a shorter TTL.
+
+        :param maxsize: maximum number of genes; the least recently used gene is evicted first
+        :param ttl: time-to-live of the cell types for a gene, in seconds
+        :param negative_ttl: time-to-live of a negative result, in seconds
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+
+        # Tuples of (cell types, expiry time) keyed by gene symbol
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, gene_symbol: str) -> Optional[tuple]:
+        """
+        Returns the cached cell types for a gene, or None if there is no current entry.
+        :param gene_symbol: gene symbol
+        """
+        with self._lock:
+            entry = self._entries.get(gene_symbol)
+            if entry is not None and entry[1] <= time.monotonic():
+                del self._entries[gene_symbol]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                metrics.count_cache('celltypes', 'miss')
+                return None
+            self._entries.move_to_end(gene_symbol)
+            self.hits += 1
+            metrics.count_cache('celltypes', 'hit')
+            return entry[0]
+
+    def set(self, gene_symbol: str, cell_types: tuple, negative: bool = False):
+        """
+        Caches the cell types for a gene, evicting the least recently used genes if the cache is full.
+        :param gene_symbol: gene symbol
+        :param cell_types: cell types
+        :param negative: whether the result is a negative result from a Cells API error
+        """
+        expires = time.monotonic() + (self.negative_ttl if negative else self.ttl)
+        with self._lock:
+            self._entries[gene_symbol] = (cell_types, expires)
+            self._entries.move_to_end(gene_symbol)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Removes all entries.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        Returns cache counters.
+        """
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+
+# Indexes shared by the clients in this worker process.
+cells_tsv_index = CellsTsvIndex()
+cells_parquet_index = CellsParquetIndex()
 
-from flask import Flask
 
 class OntologyCellsClient():
 
-    def __init__(self,client_url):
+    def __init__(self,client_url, cells_index=None, workers: int = 8, celltypes_cache: CellTypesCache = None,
+                 client=None, client_error: type = None):
         """
         :param client_url: URL to the Cells API, stored in the Flask app.cfg.
+        :param cells_index: CellsParquetIndex or CellsTsvIndex for the files built by the build_index script.
+                            By default, the Parquet file if it is available; otherwise, the TSV file.
+        :param workers: maximum number of concurrent Cells API calls for a list of genes
+        :param celltypes_cache: cache of the cell types for genes from the Cells API
+        :param client: client for the Cells API. By default, a hubmap-api-py-client Client for client_url.
+        :param client_error: exception class of the errors of client for genes that the Cells API does not
+                             have. By default, the ClientError of hubmap-api-py-client.
         """
 
         logging.basicConfig(format='[%(asctime)s] %(levelname)s in %(module)s:%(lineno)d: %(message)s',
@@ -29,9 +300,27 @@ class OntologyCellsClient():
 
         self.logger.info(f'Startup: setting up client for Cells API.')
 
-        # Instantiate hubmap-api-py-client.
+        # Instantiate hubmap-api-py-client. The client is imported here, as in build_index.py, so that the
+        # module can be imported without it--e.g., with another client.
         self.client_url = client_url
-        self.client = Client(self.client_url)
+        if client is None:
+            from hubmap_api_py_client import Client
+            client = Client(self.client_url)
+        if client_error is None:
+            from hubmap_api_py_client.errors import ClientError
+            client_error = ClientError
+        self.client = client
+        self.client_error = client_error
+
+        if cells_index is None:
+            cells_index = cells_parquet_index if cells_parquet_index.available() else cells_tsv_index
+        self.cells_index = cells_index
+
+        # Cells API calls for a list of genes are made concurrently. The threads of the pool start on
+        # first use.
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers,
+                                                               thread_name_prefix='cellsclient')
+        self.celltypes_cache = celltypes_cache if celltypes_cache is not None else CellTypesCache()
 
     def celltypes_for_gene(self, gene_symbol: str) -> list[str]:
 
@@ -40,43 +329,80 @@ class OntologyCellsClient():
         :param gene_symbol: approved HGNC gene symbol
         :return: List[str]
         """
+        return self.celltypes_for_genes([gene_symbol])[gene_symbol]
 
-        logging.info('celltypes_for_gene')
+    def celltypes_for_genes(self, gene_symbols: list[str]) -> dict:
+
+        """
+        Returns the lists of Cell Ontology identifiers for cell types of cells that associate with genes,
+        keyed by gene symbol. Genes that are not cached are obtained from the Cells API concurrently.
+        :param gene_symbols: list of approved HGNC gene symbols
+        :return: dict of List[str]
+        """
+        result = {}
+        misses = []
+        for gene_symbol in dict.fromkeys(gene_symbols):
+            cell_types = self.celltypes_cache.get(gene_symbol)
+            if cell_types is None:
+                misses.append(gene_symbol)
+            else:
+                result[gene_symbol] = list(cell_types)
+
+        if len(misses) == 1:
+            # A single call does not need the pool.
+            result[misses[0]] = list(self._fetch_celltypes(misses[0]))
+        elif len(misses) > 1:
+            for gene_symbol, cell_types in zip(misses, self._executor.map(self._fetch_celltypes, misses)):
+                result[gene_symbol] = list(cell_types)
+
+        return {gene_symbol: result[gene_symbol] for gene_symbol in dict.fromkeys(gene_symbols)}
+
+    def _fetch_celltypes(self, gene_symbol: str) -> tuple:
+
+        # Obtains the cell types for a gene from the Cells API, and caches them.
         try:
             cells_with_gene = self.client.select_cells(where='gene', has=[f'{gene_symbol} > 1'],
                                                        genomic_modality='rna').get_list()
-            cell_type_names = []
-            for c in cells_with_gene:
-                if not c['cell_type'] in cell_type_names:
-                    cell_type_names.append(c['cell_type'])
-            return cell_type_names
-        except ClientError:
+        except self.client_error:
             # The client returns an error if a "gene" is not in a list internal to the client.
             self.logger.info(f'{gene_symbol}: error')
-            return []
+            self.celltypes_cache.set(gene_symbol, (), negative=True)
+            return ()
+
+        # Distinct cell types, in the order of the cells
+        cell_type_names = []
+        seen = set()
+        for c in cells_with_gene:
+            if c['cell_type'] not in seen:
+                seen.add(c['cell_type'])
+                cell_type_names.append(c['cell_type'])
+        cell_types = tuple(cell_type_names)
+        self.celltypes_cache.set(gene_symbol, cell_types)
+        return cell_types
 
     def celltypes_for_gene_csv(self, gene_symbol:str) -> list[GeneDetailCellType]:
 
-        # Reads the CSV file built by the build_index script in the cells_index directory.
-        # Obtains the list of cell type information for a specific gene.
+        # Obtains the list of cell type information for a specific gene from the CSV file built by the
+        # build_index script in the cells_index directory.
+        return self._celltypes(self.cells_index.get(gene_symbol))
+
+    def celltypes_for_genes_csv(self, gene_symbols: list[str]) -> dict:
+
+        # Obtains the lists of cell type information for a list of genes, keyed by gene symbol.
+        return {gene_symbol: self._celltypes(rows)
+                for gene_symbol, rows in self.cells_index.get_many(gene_symbols).items()}
 
-        # Hard code file name for now.
-        # Read CSV and filter for gene symbol.
-        fpath = os.path.dirname(os.getcwd())
-        fpath = os.path.join(fpath, 'src/cells_index/cells.tsv')
-        dfcelltype = pd.read_csv(fpath,sep='\t')
-        dfcelltype = dfcelltype[dfcelltype['gene_symbol']==gene_symbol]
+    @staticmethod
+    def _celltypes(rows: tuple) -> list[dict]:
 
         # Map rows to cell_types structure used with neo4j query.
         listret = []
-        for index,row in dfcelltype.iterrows():
+        for dataset_uuid, organ, cell_type in rows:
 
-            if index == 0: # header
-                pass
-            cell_types_code = row['cell_type']
-            cell_types_code_name = row['cell_type']
+            cell_types_code = cell_type
+            cell_types_code_name = cell_type
             cell_types_definition = ''
-            cell_types_code_organ = ['Cells API:*'+ row['organ']]
+            cell_types_code_organ = ['Cells API:*'+ organ]
             cell_types_code_source = 'Cells API'
 
             # Instantiate a cell type object.
@@ -84,4 +410,4 @@ class OntologyCellsClient():
             # Use the to_dict method of the Model base class to obtain a dict for the list.
             dictcell = genedetailcelltype.to_dict()
             listret.append(dictcell)
-        return listret
\ No newline at end of file
+        return listret
@@ -0,0 +1,158 @@
+# coding: utf-8
+# Cache of the counts used for pagination by the genes-info, proteins-info and celltypes-info endpoints.
+
+# The controllers for these endpoints obtain the count of items (optionally filtered by the starts_with
+# parameter) before every page request. The count depends only on the entity, the organism and the
+# starts_with prefix, and changes only when the UBKG release changes (see ubkg_version.py).
+
+# Counts are keyed by (entity, organism, normalized prefix).
+
+# The first request for an (entity, organism) pair warms the cache with a single grouped query
+# that counts items for the empty prefix and every prefix of 1 to COUNT_CACHE_WARMUP_PREFIX_LENGTH
+# characters. After warm-up, a short prefix that is not in the results has a count of 0.
+# Counts for longer prefixes are obtained with the count query and kept in a size-bounded LRU.
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from hs_ontology_api.utils.ubkg_version import ubkg_version
+from hs_ontology_api.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class CountCache:
+
+    def __init__(self, enabled: bool = True, warmup_prefix_length: int = 2, maxsize: int = 4096):
+        """
+        :param enabled: whether the cache stores and serves counts
+        :param warmup_prefix_length: maximum length of the prefixes counted at warm-up; 0 disables warm-up
+        :param maxsize: maximum number of counts for prefixes that are longer than the warm-up prefixes
+        """
+        self.enabled = enabled
+        self.warmup_prefix_length = warmup_prefix_length
+        self.maxsize = maxsize
+
+        # Counts from warm-up queries, keyed by (entity, organism), then by prefix.
+        self._warm = {}
+        # Counts for other prefixes, keyed by (entity, organism, prefix).
+        self._counts = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def configure(self, cfg):
+        """
+        Applies settings from app.cfg. Missing settings keep their defaults.
+        :param cfg: Flask configuration
+        """
+        self.enabled = cfg.get('COUNT_CACHE_ENABLED', self.enabled)
+        self.warmup_prefix_length = cfg.get('COUNT_CACHE_WARMUP_PREFIX_LENGTH', self.warmup_prefix_length)
+        self.maxsize = cfg.get('COUNT_CACHE_MAXSIZE', self.maxsize)
+        self.clear()
+
+    def clear(self):
+        """
+        Removes all counts--e.g., after a change of UBKG release.
+        """
+        with self._lock:
+            self._warm = {}
+            self._counts.clear()
+
+    def _lookup(self, entity: str, organism: str, prefix: str, count_stats: bool = False) -> Optional[int]:
+        with self._lock:
+            warm = self._warm.get((entity, organism))
+            if warm is not None and len(prefix) <= self.warmup_prefix_length:
+                count = warm.get(prefix, 0)
+            else:
+                key = (entity, organism, prefix)
+                count = self._counts.get(key)
+                if count is not None:
+                    self._counts.move_to_end(key)
+            if count_stats:
+                if count is None:
+                    self.misses += 1
+                    metrics.count_cache('count', 'miss')
+                else:
+                    self.hits += 1
+                    metrics.count_cache('count', 'hit')
+            return count
+
+    def get(self, neo4j_instance, entity: str, organism: str, prefix: str,
+            count_func: Callable[[], int], warmup_func: Optional[Callable[[int], dict]] = None) -> int:
+        """
+        Returns a count from the cache, warming the cache or running the count query as necessary.
+
+        :param neo4j_instance: neo4j connection
+        :param entity: name of the entity--e.g., genes
+        :param organism: organism filter, or '' for entities without an organism
+        :param prefix: starts_with prefix, normalized to the case used by the query
+        :param count_func: function that runs the count query for the prefix
+        :param warmup_func: function that runs the grouped prefix count query for a maximum prefix length,
+                            and returns a dict of counts keyed by prefix
+        """
+        if not self.enabled:
+            return count_func()
+
+        ubkg_version.check(neo4j_instance)
+
+        count = self._lookup(entity, organism, prefix, count_stats=True)
+        if count is not None:
+            return count
+
+        if warmup_func is not None and 0 < self.warmup_prefix_length and len(prefix) <= self.warmup_prefix_length:
+            self.warm(entity, organism, warmup_func)
+            count = self._lookup(entity, organism, prefix)
+            if count is not None:
+                return count
+
+        count = count_func()
+        with self._lock:
+            self._counts[(entity, organism, prefix)] = count
+            while len(self._counts) > self.maxsize:
+                self._counts.popitem(last=False)
+        return count
+
+    def warm(self, entity: str, organism: str, warmup_func: Callable[[int], dict]):
+        """
+        Stores the counts for all prefixes up to the warm-up length for an (entity, organism) pair.
+        :param entity: name of the entity
+        :param organism: organism filter
+        :param warmup_func: function that runs the grouped prefix count query
+        """
+        prefix_length = self.warmup_prefix_length
+        counts = warmup_func(prefix_length)
+        logger.info(f'Warmed count cache for {entity} ({organism or "all"}) with {len(counts)} prefixes.')
+        with self._lock:
+            if prefix_length == self.warmup_prefix_length:
+                self._warm[(entity, organism)] = counts
+
+    def stats(self) -> dict:
+        """
+        Returns cache counters.
+        """
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "warm": sorted(f'{entity}:{organism}' for entity, organism in self._warm),
+                "size": len(self._counts) + sum(len(counts) for counts in self._warm.values()),
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+
+# Cache shared by the controllers in this worker process.
+count_cache = CountCache()
+ubkg_version.add_listener(count_cache.clear)
+
+
+def init_count_cache(cfg) -> CountCache:
+    """
+    Configures the shared cache from app.cfg. Called once at application startup.
+    :param cfg: Flask configuration
+    """
+    count_cache.configure(cfg)
+    return count_cache
@@ -0,0 +1,161 @@
+# coding: utf-8
+# Registry of the Cypher query templates in the cypher directory.
+
+# The functions in neo4j_logic.py originally opened and read a .cypher file on every request.
+# The registry loads and validates every template once at application startup and then serves the
+# query strings from memory. In development mode, the registry re-reads a template only when the
+# modification time of its file changes, so that edits to a query can be tested without restarting
+# the API.
+
+import logging
+import os
+import re
+import threading
+
+logger = logging.getLogger(__name__)
+
+# The cypher directory is resolved relative to this package instead of the working directory,
+# so that the registry does not depend on the directory from which the worker starts.
+CYPHER_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cypher')
+
+# Cypher parameters have the form $name.
+PLACEHOLDER_PATTERN = re.compile(r'\$([A-Za-z_][A-Za-z0-9_]*)')
+
+
+def _strip_comments(querytxt: str) -> str:
+    """
+    Removes Cypher line comments (//) that are not inside string literals.
+    Comments in templates often mention placeholders--e.g., "// The calling function will replace $ids."
+
+    :param querytxt: query string
+    """
+    lines = []
+    for line in querytxt.splitlines():
+        quote = None
+        cut = len(line)
+        for i, c in enumerate(line):
+            if quote is not None:
+                if c == quote:
+                    quote = None
+            elif c in ('"', "'"):
+                quote = c
+            elif line.startswith('//', i):
+                cut = i
+                break
+        lines.append(line[:cut])
+    return '\n'.join(lines)
+
+
+class CypherTemplate:
+
+    def __init__(self, name: str, path: str):
+        """
+        A Cypher query template loaded from a file in the cypher directory.
+
+        :param name: file name of the template, without path--e.g., genedetail.cypher
+        :param path: full path to the template file
+        """
+        self.name = name
+        self.path = path
+        self.text = ''
+        self.placeholders = frozenset()
+        self.mtime = None
+        self.load()
+
+    def load(self):
+        """
+        Reads and validates the template file.
+        """
+        mtime = os.stat(self.path).st_mtime_ns
+        with open(self.path, 'r', encoding='utf-8') as f:
+            text = f.read()
+
+        if text.strip() == '':
+            raise ValueError(f'Cypher template {self.name} is empty.')
+
+        self.text = text
+        self.placeholders = frozenset(PLACEHOLDER_PATTERN.findall(_strip_comments(text)))
+        self.mtime = mtime
+
+    def is_stale(self) -> bool:
+        """
+        Indicates whether the template file has been modified since it was loaded.
+        """
+        try:
+            return os.stat(self.path).st_mtime_ns != self.mtime
+        except FileNotFoundError:
+            return False
+
+
+class CypherTemplateRegistry:
+
+    def __init__(self, cypher_dir: str = CYPHER_DIR, reload: bool = False):
+        """
+        :param cypher_dir: directory that contains the .cypher files
+        :param reload: development mode--re-read a template when the mtime of its file changes
+        """
+        self.cypher_dir = cypher_dir
+        self.reload = reload
+        self._templates = {}
+        self._lock = threading.Lock()
+
+    def load_all(self) -> int:
+        """
+        Loads and validates every .cypher file in the cypher directory.
+        :return: number of templates loaded
+        """
+        templates = {}
+        for filename in sorted(os.listdir(self.cypher_dir)):
+            if filename.endswith('.cypher'):
+                templates[filename] = CypherTemplate(filename, os.path.join(self.cypher_dir, filename))
+
+        with self._lock:
+            self._templates = templates
+
+        logger.info(f'Loaded {len(templates)} Cypher templates from {self.cypher_dir}')
+        return len(templates)
+
+    def get(self, name: str) -> CypherTemplate:
+        """
+        Returns a template by file name.
+        :param name: file name of the template, without path
+        """
+        template = self._templates.get(name)
+        if template is None:
+            # A template added after startup, or a registry that was never loaded.
+            path = os.path.join(self.cypher_dir, name)
+            if not os.path.isfile(path):
+                raise FileNotFoundError(f'No Cypher template named {name} in {self.cypher_dir}')
+            with self._lock:
+                template = self._templates.get(name)
+                if template is None:
+                    template = CypherTemplate(name, path)
+                    self._templates[name] = template
+
+        elif self.reload and template.is_stale():
+            with self._lock:
+                if template.is_stale():
+                    logger.info(f'Reloading modified Cypher template {name}')
+                    template.load()
+
+        return template
+
+    def names(self) -> list[str]:
+        """
+        Returns the names of the loaded templates.
+        """
+        return sorted(self._templates)
+
+
+# Registry shared by the functions in neo4j_logic.py.
+registry = CypherTemplateRegistry()
+
+
+def load_cypher_templates(reload: bool = False) -> CypherTemplateRegistry:
+    """
+    Loads the shared registry. Called once at application startup.
+    :param reload: development mode--re-read templates when their files change
+    """
+    registry.reload = reload
+    registry.load_all()
+    return registry
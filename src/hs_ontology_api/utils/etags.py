@@ -0,0 +1,123 @@
+# coding: utf-8
+# ETags and Cache-Control headers for the responses of read-only endpoints.
+
+# The responses of the cached endpoints (response_cache.py and static_responses.py) depend only on the
+# request and on the UBKG release. Clients such as the portal, ingest pipelines and the rules engine
+# request the same responses repeatedly--e.g., assayclasses, field-schemas and dataset-types.
+
+# The ETag of a response is computed from the build of the API, the UBKG fingerprint (ubkg_version.py) and
+# the normalized request (the cache key), with a suffix for the content encoding of the body. Because the
+# ETag does not depend on the body, a request with an If-None-Match header that matches the ETag is
+# answered with a 304 before the view function runs--i.e., without a Cypher query. The ETag is the same in
+# every worker process, and changes when a new UBKG release is loaded or a new build of the API is deployed.
+
+# Responses also have a Cache-Control header with a max-age, in seconds, that can be set per endpoint in
+# app.cfg.
+
+import hashlib
+import os
+from typing import Optional
+
+from flask import current_app, request
+
+from hs_ontology_api.utils.ubkg_version import ubkg_version
+from hs_ontology_api.utils.response_compression import ENCODINGS, set_content_encoding
+
+# Default max-age of the Cache-Control header, in seconds. With max-age=0, clients revalidate every
+# request with the ETag.
+DEFAULT_MAX_AGE = 0
+
+
+def _read_build() -> str:
+    """
+    Returns the version and build of the API, from the VERSION and BUILD files at the root of the
+    repository; an empty string if the files are not available.
+    """
+    root = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..')
+    build = []
+    for filename in ('VERSION', 'BUILD'):
+        try:
+            with open(os.path.join(root, filename)) as f:
+                build.append(f.read().strip())
+        except OSError:
+            build.append('')
+    return ':'.join(build)
+
+
+# Version and build of the deployed API
+API_BUILD = _read_build()
+
+
+def request_etag(key: tuple) -> Optional[str]:
+    """
+    Returns the ETag for the uncompressed response to the current request, or None if the UBKG fingerprint
+    is not known.
+    :param key: normalized request--e.g., the key of the response cache
+    """
+    fingerprint = ubkg_version.fingerprint
+    if fingerprint is None:
+        return None
+    return hashlib.sha256(repr((API_BUILD, fingerprint, key)).encode('utf-8')).hexdigest()[:32]
+
+
+def encoded_etag(etag: str, encoding: Optional[str]) -> str:
+    """
+    Returns the ETag for a representation of a response. Each content encoding of a response has its
+    own strong ETag.
+    :param etag: ETag of the uncompressed response
+    :param encoding: zstd, gzip or None
+    """
+    return etag if encoding is None else f'{etag}-{encoding}'
+
+
+def matching_etag(etag: Optional[str]) -> Optional[str]:
+    """
+    Returns the ETag of the representation of a response that matches the If-None-Match header of the
+    current request, or None if no representation matches.
+    :param etag: ETag of the uncompressed response
+    """
+    if etag is None or not request.if_none_match:
+        return None
+    for encoding in (None,) + ENCODINGS:
+        candidate = encoded_etag(etag, encoding)
+        if request.if_none_match.contains_weak(candidate):
+            return candidate
+    return None
+
+
+def max_age_for(endpoint: str) -> int:
+    """
+    Returns the max-age of the Cache-Control header for an endpoint, from app.cfg.
+    :param endpoint: endpoint name--e.g., assayclasses
+    """
+    cfg = current_app.config
+    overrides = cfg.get('CACHE_CONTROL_MAX_AGE_OVERRIDES', {})
+    return overrides.get(endpoint, cfg.get('CACHE_CONTROL_MAX_AGE', DEFAULT_MAX_AGE))
+
+
+def set_validators(response, endpoint: str, etag: Optional[str]):
+    """
+    Sets the ETag and Cache-Control headers of a successful response.
+    :param response: Flask response
+    :param endpoint: endpoint name
+    :param etag: ETag of the uncompressed response, or None
+    """
+    if etag is None:
+        return
+    response.set_etag(encoded_etag(etag, response.content_encoding))
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age_for(endpoint)
+
+
+def not_modified_response(endpoint: str, etag: str):
+    """
+    Returns a 304 (Not Modified) response.
+    :param endpoint: endpoint name
+    :param etag: ETag of the representation that matched If-None-Match
+    """
+    response = current_app.response_class(status=304)
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age_for(endpoint)
+    set_content_encoding(response, None)
+    return response
@@ -0,0 +1,194 @@
+# coding: utf-8
+# In-memory resolver of HGNC gene identifiers.
+
+# The relationships/gene and genes endpoints accept HGNC gene identifiers of several types: numeric IDs,
+# approved symbols, previous symbols, alias symbols and names. The Cypher queries for these endpoints
+# matched the identifiers against the names of HGNC Term nodes--e.g., toUpper(tSearch.name) = $target_symbol--
+# which cannot use an index, so every request scanned the HGNC terms.
+
+# The resolver loads the identifiers of all HGNC genes with a single query, and maps:
+# 1. HGNC numeric IDs to genes
+# 2. case-folded symbols and names to genes
+# A gene is identified by the CUI of its concept and its HGNC code.
+
+# The relationships/gene endpoint is answered entirely from the resolver. The genes endpoint resolves
+# identifiers to CUIs, and queries neo4j only by CUI.
+
+# The resolver is loaded at application startup if GENE_RESOLVER_PRELOAD is True in app.cfg, or on first
+# use. It is reloaded after the UBKG release changes (see release_index.py).
+
+import logging
+from typing import Optional
+
+from hs_ontology_api.utils.query_executor import execute_read
+from hs_ontology_api.utils.release_index import ReleaseIndex, preload_in_worker
+
+logger = logging.getLogger(__name__)
+
+# Query that returns the identifiers of all HGNC genes.
+IDENTIFIERS_QUERY = 'gene_identifiers.cypher'
+
+# Keys of the response of the relationships/gene endpoint, by relationship type of the term.
+RELATIONSHIP_KEYS = {'ACR': 'symbol-approved',
+                     'NS': 'symbol-previous',
+                     'SYN': 'symbol-alias'}
+
+
+class GeneEntry:
+
+    __slots__ = ('cui', 'code', 'terms')
+
+    def __init__(self, cui: str, code: str):
+        """
+        Identifiers of a HGNC gene.
+        :param cui: CUI of the gene concept
+        :param code: HGNC numeric ID--e.g., 7178
+        """
+        self.cui = cui
+        self.code = code
+        # Term names, keyed by relationship type--e.g., {'ACR': ['MMRN1']}
+        self.terms = {}
+
+
+class GeneIndex:
+
+    def __init__(self):
+        """
+        Maps of HGNC gene identifiers for a UBKG release.
+        """
+        # Genes keyed by HGNC numeric ID
+        self.by_code = {}
+        # Lists of (term name, gene) keyed by case-folded term name
+        self.by_name = {}
+
+    def add(self, cui: str, code: str, term_type: str, name: str):
+        """
+        Adds a term of a gene.
+        :param cui: CUI of the gene concept
+        :param code: HGNC numeric ID
+        :param term_type: type of the relationship between the code and the term--e.g., ACR
+        :param name: term name
+        """
+        entry = self.by_code.get(code)
+        if entry is None:
+            entry = GeneEntry(cui=cui, code=code)
+            self.by_code[code] = entry
+        entry.terms.setdefault(term_type, []).append(name)
+        self.by_name.setdefault(name.casefold(), []).append((name, entry))
+
+    def match_name(self, name: str, case_sensitive: bool = False) -> list[GeneEntry]:
+        """
+        Returns the genes with a term that matches a name, in the order in which they were loaded.
+        :param name: symbol or name
+        :param case_sensitive: if True, match the name exactly; otherwise, match the case-folded name
+        """
+        genes = []
+        for term_name, entry in self.by_name.get(name.casefold(), []):
+            if case_sensitive and term_name != name:
+                continue
+            if entry not in genes:
+                genes.append(entry)
+        return genes
+
+
+class GeneResolver:
+
+    def __init__(self):
+        # The index is reloaded after the UBKG release changes.
+        self._index = ReleaseIndex(name='gene resolver', loader=self.load)
+
+    def clear(self):
+        """
+        Marks the index as stale. The next request reloads the index.
+        """
+        self._index.clear()
+
+    @staticmethod
+    def load(neo4j_instance) -> GeneIndex:
+        """
+        Loads the index from neo4j.
+        :param neo4j_instance: neo4j connection
+        """
+        def work(records) -> GeneIndex:
+            # The index is built in the transaction function, which the driver can retry.
+            index = GeneIndex()
+            for record in records:
+                index.add(cui=record.get('cui'), code=record.get('code'),
+                          term_type=record.get('type'), name=record.get('name'))
+            return index
+
+        index = execute_read(neo4j_instance, IDENTIFIERS_QUERY, None, work)
+        logger.info(f'Gene resolver: {len(index.by_code)} HGNC genes; {len(index.by_name)} symbols and names.')
+        return index
+
+    def index(self, neo4j_instance) -> GeneIndex:
+        """
+        Returns the current index, loading it if necessary.
+        :param neo4j_instance: neo4j connection
+        """
+        return self._index.get(neo4j_instance)
+
+    def resolve_cuis(self, neo4j_instance, ids: list[str]) -> list[str]:
+        """
+        Returns the CUIs of the genes that match a list of HGNC identifiers, in the order of the identifiers.
+
+        An identifier can be a HGNC numeric ID, or the exact name of a symbol or name term of the gene.
+        If the first identifier is an empty string, returns the CUIs of all HGNC genes.
+
+        :param neo4j_instance: neo4j connection
+        :param ids: list of identifiers
+        """
+        index = self.index(neo4j_instance)
+        if len(ids) == 0 or ids[0] == '':
+            return list(dict.fromkeys(entry.cui for entry in index.by_code.values()))
+
+        cuis = []
+        for geneid in ids:
+            entry = index.by_code.get(geneid)
+            if entry is not None:
+                cuis.append(entry.cui)
+            cuis.extend(entry.cui for entry in index.match_name(geneid, case_sensitive=True))
+        return list(dict.fromkeys(cuis))
+
+    def relationships(self, neo4j_instance, target_symbol: str) -> Optional[dict]:
+        """
+        Returns the approved, previous and alias symbols of the genes with a symbol or name that matches
+        a target symbol, ignoring case. Returns None if no gene matches.
+
+        :param neo4j_instance: neo4j connection
+        :param target_symbol: symbol or name
+        """
+        genes = self.index(neo4j_instance).match_name(target_symbol)
+        if len(genes) == 0:
+            return None
+
+        result = {key: [] for key in RELATIONSHIP_KEYS.values()}
+        for entry in genes:
+            for term_type, key in RELATIONSHIP_KEYS.items():
+                result[key].extend(entry.terms.get(term_type, []))
+        return result
+
+    def stats(self) -> dict:
+        """
+        Returns the size of the index.
+        """
+        stats = self._index.stats()
+        index = self._index.peek()
+        stats["genes"] = 0 if index is None else len(index.by_code)
+        stats["names"] = 0 if index is None else len(index.by_name)
+        return stats
+
+
+# Resolver shared by the controllers in this worker process.
+gene_resolver = GeneResolver()
+
+
+def init_gene_resolver(cfg, neo4j_instance) -> GeneResolver:
+    """
+    Loads the shared resolver at application startup if GENE_RESOLVER_PRELOAD is True in app.cfg.
+    :param cfg: Flask configuration
+    :param neo4j_instance: neo4j connection
+    """
+    if cfg.get('GENE_RESOLVER_PRELOAD', True) and neo4j_instance is not None:
+        preload_in_worker('gene resolver', lambda: gene_resolver.index(neo4j_instance))
+    return gene_resolver
@@ -0,0 +1,217 @@
+# coding: utf-8
+# JSON responses with payload size validation and optional S3 redirection.
+
+# The controllers return their results through redirect_if_large. The version of redirect_if_large in
+# ubkg-api (ubkg_api.utils.s3_redirect) measures the payload with str(resp), and then serializes the
+# response again with jsonify--and, for S3 redirection, a third time with json.dumps. For multi-megabyte
+# responses--e.g., genes/<ids>/detail and pathways/with-genes--serialization is a large share of the CPU
+# time of a request.
+
+# This version serializes the response once, with orjson if it is installed and with the Flask JSON
+# provider otherwise, and uses the same bytes to check the size against LARGE_RESPONSE_THRESHOLD, for the
+# response body and for the file stashed in S3. The payload size is the size of the encoded body, in bytes.
+
+# If the client accepts gzip or zstd, the body is compressed (response_compression.py), and the size of the
+# compressed body is checked against the threshold, because the payload limit of the AWS API gateway applies
+# to the bytes sent. Files stashed in S3 are not compressed.
+
+# Endpoints that return a list of independent items can also stream their response as newline-delimited
+# JSON (NDJSON), if the request has the stream=true parameter or an Accept header that prefers
+# application/x-ndjson. The controller returns a generator that pulls records from the neo4j Result
+# (query_executor.stream_records) and writes one JSON document per line with chunked transfer encoding,
+# so that the memory of the worker does not grow with the size of the response, and the client receives
+# the first item before the query finishes. Streamed responses are neither size-checked nor cached.
+
+import traceback
+from typing import Iterable, Iterator, Optional
+
+import flask
+from flask import current_app, make_response, request, stream_with_context
+
+from ubkg_api.utils.http_error_string import wrap_message
+from ubkg_api.utils.S3_worker import S3Worker
+
+from hs_ontology_api.utils.response_compression import encode_body, set_content_encoding
+from hs_ontology_api.utils.metrics import metrics
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Media type of streamed responses.
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+
+def dumps(resp) -> bytes:
+    """
+    Serializes a response body to JSON.
+
+    With orjson, keys are sorted if the Flask JSON provider sorts keys (the default), so that the output
+    has the same order of keys as jsonify. Types that orjson does not serialize are passed to the default
+    function of the Flask JSON provider; if orjson still fails, the Flask JSON provider serializes the
+    response.
+
+    :param resp: response body--e.g., a dict or list
+    :return: UTF-8 encoded JSON
+    """
+    provider = current_app.json
+    if orjson is not None:
+        # Dates are passed to the default function, which formats them as jsonify does.
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if getattr(provider, 'sort_keys', True):
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(resp, default=getattr(provider, 'default', None), option=option)
+        except TypeError:
+            pass
+    return provider.dumps(resp).encode('utf-8')
+
+
+def json_response(body: bytes, status: int = 200, encoding: Optional[str] = None) -> flask.Response:
+    """
+    Returns a response for a serialized JSON body.
+    :param body: UTF-8 encoded JSON, compressed if encoding is not None
+    :param status: HTTP status code
+    :param encoding: content encoding of the body--e.g., gzip--or None
+    """
+    response = current_app.response_class(body, status=status, mimetype='application/json')
+    set_content_encoding(response, encoding)
+    return response
+
+
+def large_response_threshold() -> int:
+    """
+    Returns the LARGE_RESPONSE_THRESHOLD from app.cfg, in bytes; 0 if there is no threshold.
+    """
+    threshold = current_app.config.get('LARGE_RESPONSE_THRESHOLD', 0)
+    if threshold == '':
+        threshold = 0
+    return threshold
+
+
+def stash_url_response(body: bytes, s3w: S3Worker) -> flask.Response:
+    """
+    Stashes a serialized response body in the S3 bucket configured in the S3Worker, and returns a response
+    with the URL of the stashed file.
+    :param body: UTF-8 encoded JSON
+    :param s3w: S3Worker object
+    """
+    try:
+        s3_url = s3w.stash_response_body_if_big(body)
+    except Exception:
+        traceback.print_exc()
+        metrics.observe_payload(len(body), None, 's3_error')
+        err = 'Unexpected error storing large results in S3.'
+        return make_response(err, 500)
+    if s3_url is None:
+        metrics.observe_payload(len(body), None, 'inline')
+        return json_response(body)
+    metrics.observe_payload(len(body), None, 's3')
+    msg = {"message": "The response has been written to a file available at the URL.",
+           "url": s3_url}
+    return make_response(msg, 303)
+
+
+def redirect_if_large(resp) -> flask.Response:
+    """
+    Serializes the response from an API endpoint and checks its size.
+
+    The response is compressed if the client accepts gzip or zstd; the size is the size of the
+    compressed response.
+
+    If the size does not exceed the LARGE_RESPONSE_THRESHOLD specified in configuration,
+    the function returns the serialized response as JSON.
+
+    If the size exceeds the threshold, the function returns one of the following:
+    1. If S3 redirection is specified in the app.cfg,
+       a. directs the S3Worker to stash the serialized response in a file in a specified S3 bucket
+       b. returns a URL that points to the stored file
+    2. If S3 redirection is not specified, returns a custom HTTP 403 response.
+
+    :param resp: the response from an API endpoint--e.g., a dict or list
+
+    """
+    body = dumps(resp)
+    payload, encoding = encode_body(body)
+
+    threshold = large_response_threshold()
+    if threshold > 0 and len(payload) > threshold:
+
+        if 'AWS_S3_BUCKET_NAME' in current_app.config:
+            s3w = S3Worker(ACCESS_KEY_ID=current_app.config['AWS_ACCESS_KEY_ID']
+                           , SECRET_ACCESS_KEY=current_app.config['AWS_SECRET_ACCESS_KEY']
+                           , S3_BUCKET_NAME=current_app.config['AWS_S3_BUCKET_NAME']
+                           , S3_OBJECT_URL_EXPIRATION_IN_SECS=current_app.config['AWS_OBJECT_URL_EXPIRATION_IN_SECS']
+                           , LARGE_RESPONSE_THRESHOLD=current_app.config['LARGE_RESPONSE_THRESHOLD']
+                           , SERVICE_S3_OBJ_PREFIX=current_app.config['AWS_S3_OBJECT_PREFIX'])
+            # The stashed file is not compressed.
+            response = stash_url_response(body=body, s3w=s3w)
+        else:
+            # S3 redirection has not been enabled.
+            # Return a 403 (not authorized) error, with the message of ubkg-api's check_payload_size.
+            metrics.observe_payload(len(payload), encoding, 'forbidden')
+            err = (f'The size of the response to the endpoint with the specified parameters ({len(payload)} bytes) '
+                   f'exceeds the payload limit of {threshold} bytes.')
+            response = make_response(wrap_message(key="message", msg=err), 403)
+
+        # Whether a response exceeds the threshold depends on the encodings that the client accepts.
+        set_content_encoding(response, None)
+        return response
+
+    # Otherwise, return the serialized response
+    metrics.observe_payload(len(payload), encoding, 'inline')
+    return json_response(payload, encoding=encoding)
+
+
+def stream_requested() -> bool:
+    """
+    Returns True if the request asks for a streamed NDJSON response, either with the stream=true
+    parameter or with an Accept header that prefers application/x-ndjson to application/json.
+    """
+    if request.args.get('stream', '').lower() == 'true':
+        return True
+    return request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+
+def peek_stream(items: Iterable) -> Optional[Iterator]:
+    """
+    Pulls the first item from a stream, so that the controller can return a 404 for an empty result--and
+    neo4j errors before the first record can still become HTTP errors--before the response starts.
+
+    :param items: response items--e.g., a generator over query_executor.stream_records
+    :return: an iterator over all of the items, or None if there are no items
+    """
+    items = iter(items)
+    empty = object()
+    first = next(items, empty)
+    if first is empty:
+        return None
+
+    def chain():
+        yield first
+        # Closing this generator also closes items.
+        yield from items
+
+    return chain()
+
+
+def ndjson_response(items: Iterable) -> flask.Response:
+    """
+    Returns a streamed response with one JSON document per item and line.
+
+    Errors after the response starts cannot change its status; the stream ends early instead. If the
+    client disconnects, the generator is closed, which closes the neo4j session.
+
+    :param items: iterable of response items
+    """
+    def generate():
+        try:
+            for item in items:
+                yield dumps(item) + b'\n'
+        finally:
+            close = getattr(items, 'close', None)
+            if close is not None:
+                close()
+
+    return current_app.response_class(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
@@ -0,0 +1,220 @@
+# coding: utf-8
+# Prometheus metrics for capacity planning and alerting.
+
+# The API records, with the prometheus_client package:
+# - the latency of each request, by blueprint, route (the URL rule--e.g., /genes/<ids>/detail), method and
+#   HTTP status. For a streamed response, the latency is the time until the response starts.
+# - the server time (result_available_after + result_consumed_after) and the number of records of each
+#   neo4j query, by Cypher template (from query_executor.py)
+# - failed queries and queries that exceeded the TIMEOUT (and became a HTTP 504), by Cypher template
+# - the size of the JSON payloads serialized by redirect_if_large, by route and content encoding, and the
+#   outcome of the payload size check: inline, forbidden (HTTP 403) or S3 redirection
+# - the lookups in the caches of responses and query results, by cache and result (hit, miss or
+#   not_modified). The hit ratio of a cache is rate(hits) / rate(hits + misses).
+
+# The metrics are exposed in the Prometheus text format on the /metrics route. The route is served by
+# nginx on an internal port only (see docker/ubkg-api/nginx/conf.d).
+
+# Each uWSGI worker process records its own metrics. If the PROMETHEUS_MULTIPROC_DIR environment variable
+# is set--as it is in uwsgi.ini--each worker writes its metrics to memory-mapped files in that directory,
+# and the worker that answers /metrics aggregates the files of all workers, so that a scrape returns the
+# metrics of the whole API instead of the metrics of one worker. The directory must be emptied when uWSGI
+# starts (see docker/ubkg-api/start.sh), and the variable must be set before prometheus_client is imported.
+
+# If prometheus_client is not installed, the API records no metrics and has no /metrics route.
+
+import logging
+import os
+import time
+from typing import Optional
+
+import flask
+import neo4j
+from flask import g, request
+
+try:
+    import prometheus_client
+    from prometheus_client import multiprocess
+except ImportError:
+    prometheus_client = None
+
+logger = logging.getLogger(__name__)
+
+# Prefix of the names of the metrics
+NAMESPACE = 'hs_ontology_api'
+# Histogram buckets: latencies and server times in seconds, up to the TIMEOUT of 28 s
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30)
+# Numbers of records
+RECORD_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000, 1000000)
+# Payload sizes in bytes, up to beyond the 10 MB payload limit of the AWS API gateway
+PAYLOAD_BUCKETS = (2**10, 10*2**10, 100*2**10, 2**20, 5*2**20, 10*2**20, 50*2**20, 100*2**20)
+
+# Outcomes of the payload size check of redirect_if_large
+LARGE_RESPONSE_OUTCOMES = ('inline', 'forbidden', 's3', 's3_error')
+
+
+class Metrics:
+
+    def __init__(self):
+        """
+        Metrics of this worker process.
+        """
+        self.enabled = prometheus_client is not None
+        if prometheus_client is None:
+            return
+
+        self.request_seconds = prometheus_client.Histogram(
+            'request_duration_seconds', 'Latency of HTTP requests',
+            ['blueprint', 'route', 'method', 'status'], namespace=NAMESPACE, buckets=LATENCY_BUCKETS)
+        self.query_seconds = prometheus_client.Histogram(
+            'query_server_seconds', 'Server time (result_available_after + result_consumed_after) of neo4j queries',
+            ['template'], namespace=NAMESPACE, buckets=LATENCY_BUCKETS)
+        self.query_records = prometheus_client.Histogram(
+            'query_records', 'Records returned by neo4j queries',
+            ['template'], namespace=NAMESPACE, buckets=RECORD_BUCKETS)
+        self.query_errors = prometheus_client.Counter(
+            'query_errors', 'Failed neo4j queries, other than timeouts',
+            ['template'], namespace=NAMESPACE)
+        self.query_timeouts = prometheus_client.Counter(
+            'query_timeouts', 'neo4j queries that exceeded the TIMEOUT, answered with a HTTP 504 (GatewayTimeout)',
+            ['template'], namespace=NAMESPACE)
+        self.payload_bytes = prometheus_client.Histogram(
+            'response_payload_bytes', 'Size of the JSON payloads serialized by redirect_if_large',
+            ['route', 'encoding'], namespace=NAMESPACE, buckets=PAYLOAD_BUCKETS)
+        self.large_responses = prometheus_client.Counter(
+            'large_response_checks', 'Outcomes of the payload size check of redirect_if_large',
+            ['outcome'], namespace=NAMESPACE)
+        self.cache_requests = prometheus_client.Counter(
+            'cache_requests', 'Lookups in the caches of responses and query results',
+            ['cache', 'result'], namespace=NAMESPACE)
+
+        for outcome in LARGE_RESPONSE_OUTCOMES:
+            self.large_responses.labels(outcome)
+
+    def configure(self, cfg):
+        """
+        Applies settings from app.cfg.
+        :param cfg: Flask configuration
+        """
+        enabled = cfg.get('METRICS_ENABLED', True)
+        if enabled and prometheus_client is None:
+            logger.warning('Metrics are enabled, but prometheus_client is not installed.')
+        self.enabled = enabled and prometheus_client is not None
+
+    def observe_request(self, response: flask.Response, seconds: float):
+        """
+        Records the latency of the current request.
+        :param response: response to the request
+        :param seconds: latency, in seconds
+        """
+        if not self.enabled:
+            return
+        self.request_seconds.labels(request.blueprint or '', route_label(), request.method,
+                                    str(response.status_code)).observe(seconds)
+
+    def observe_query(self, template: str, summary: neo4j.ResultSummary, records: int):
+        """
+        Records the server time and number of records of a completed query.
+        :param template: file name of the Cypher template
+        :param summary: ResultSummary of the query
+        :param records: number of records streamed
+        """
+        if not self.enabled:
+            return
+        server_ms = (summary.result_available_after or 0) + (summary.result_consumed_after or 0)
+        self.query_seconds.labels(template).observe(server_ms / 1000)
+        self.query_records.labels(template).observe(records)
+
+    def count_query_error(self, template: str, timeout: bool = False):
+        """
+        Counts a failed query.
+        :param template: file name of the Cypher template
+        :param timeout: whether the query failed because of a timeout
+        """
+        if not self.enabled:
+            return
+        if timeout:
+            self.query_timeouts.labels(template).inc()
+        else:
+            self.query_errors.labels(template).inc()
+
+    def observe_payload(self, size: int, encoding: Optional[str], outcome: str):
+        """
+        Records the size of a payload serialized for the current request, and the outcome of its size check.
+        :param size: size of the payload, in bytes
+        :param encoding: content encoding of the payload--e.g., gzip--or None
+        :param outcome: one of LARGE_RESPONSE_OUTCOMES
+        """
+        if not self.enabled:
+            return
+        self.payload_bytes.labels(route_label(), encoding or 'identity').observe(size)
+        self.large_responses.labels(outcome).inc()
+
+    def count_cache(self, cache: str, result: str):
+        """
+        Counts a cache lookup.
+        :param cache: name of the cache--e.g., response
+        :param result: hit, miss or not_modified
+        """
+        if not self.enabled:
+            return
+        self.cache_requests.labels(cache, result).inc()
+
+    def exposition(self) -> bytes:
+        """
+        Returns the metrics in the Prometheus text format--of all worker processes, in multiprocess mode.
+        """
+        if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+            registry = prometheus_client.CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        else:
+            registry = prometheus_client.REGISTRY
+        return prometheus_client.generate_latest(registry)
+
+
+def route_label() -> str:
+    """
+    Returns the URL rule of the current request--e.g., /genes/<ids>--so that the number of label values
+    does not grow with the number of distinct requests.
+    """
+    rule = request.url_rule
+    return rule.rule if rule is not None else 'unmatched'
+
+
+# Multiprocess mode requires the directory of the metric files before the first metric is created.
+if prometheus_client is not None and os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+    os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'], exist_ok=True)
+
+# Metrics shared by the modules in this worker process.
+metrics = Metrics()
+
+
+def _start_timer():
+    g.metrics_start = time.perf_counter()
+
+
+def _observe_request(response: flask.Response) -> flask.Response:
+    start = g.pop('metrics_start', None)
+    if start is not None and request.endpoint != 'metrics':
+        metrics.observe_request(response, time.perf_counter() - start)
+    return response
+
+
+def metrics_view() -> flask.Response:
+    return flask.current_app.response_class(metrics.exposition(),
+                                             content_type=prometheus_client.CONTENT_TYPE_LATEST)
+
+
+def init_metrics(cfg, app) -> Metrics:
+    """
+    Configures the shared metrics from app.cfg, and adds the request hooks and the /metrics route to the
+    application if METRICS_ENABLED is True.
+    :param cfg: Flask configuration
+    :param app: Flask application
+    """
+    metrics.configure(cfg)
+    if metrics.enabled:
+        app.before_request(_start_timer)
+        app.after_request(_observe_request)
+        app.add_url_rule('/metrics', 'metrics', metrics_view, methods=['GET'])
+    return metrics
@@ -2,12 +2,7 @@
 # Added check for timeout
 
 import logging
-import neo4j
-from typing import List
-import os
-
-# Mar 2025 for handling configurable timeouts
-from werkzeug.exceptions import GatewayTimeout
+from typing import Callable, Iterable, List
 
 # Classes for JSON objects in response body
 from hs_ontology_api.models.sab_code_term import SabCodeTerm
@@ -15,15 +10,23 @@ from hs_ontology_api.models.sab_code_term import SabCodeTerm
 from hs_ontology_api.models.genedetail import GeneDetail
 
 from hs_ontology_api.models.celltypelist import CelltypeList
+from hs_ontology_api.models.pagination import Pagination
 from hs_ontology_api.models.celltypelist_detail import CelltypesListDetail
 
 from hs_ontology_api.models.fieldassay import FieldAssay
 from hs_ontology_api.models.fieldschema import FieldSchema
 
-# Mar 2025
-# Until the ubkg-api is refactored so that format_list_for_query function is in
-# a utility module, import from the ubkg-api's common_neo4j_logic module.
-from ubkg_api.common_routes.common_neo4j_logic import format_list_for_query
+# Shared executor for the Cypher query templates in the cypher directory. The executor applies the
+# timeout from app.cfg and converts query timeouts to HTTP 504.
+from hs_ontology_api.utils.query_executor import query_records, query_value, stream_records
+# Cache of the counts used for pagination
+from hs_ontology_api.utils.count_cache import count_cache
+# Cursors for keyset pagination
+from hs_ontology_api.utils.pagination_cursor import encode_cursor, decode_cursor, GENE_KEY_TYPES, ID_KEY_TYPES
+# In-memory resolver of HGNC gene identifiers
+from hs_ontology_api.utils.gene_resolver import gene_resolver
+# In-memory starts_with prefix indexes for the *-info list endpoints
+from hs_ontology_api.utils.prefix_index import prefix_indexes
 
 logging.basicConfig(format='[%(asctime)s] %(levelname)s in %(module)s:%(lineno)d: %(message)s',
                     datefmt='%Y-%m-%d %H:%M:%S',
@@ -31,21 +34,6 @@ logging.basicConfig(format='[%(asctime)s] %(levelname)s in %(module)s:%(lineno)d
 logger = logging.getLogger(__name__)
 
 
-def loadquerystring(filename: str) -> str:
-
-    # Load a query string from a file.
-    # filename: filename, without path.
-
-    # Assumes that the file is in the cypher directory.
-
-    fpath = os.path.dirname(os.getcwd())
-    fpath = os.path.join(fpath, 'src/hs_ontology_api/cypher', filename)
-
-    f = open(fpath, "r")
-    query = f.read()
-    f.close()
-    return query
-
 def get_organ_types_logic(neo4j_instance, sab):
     """
     Objectives: Provide crosswalk information between organs and RUI.
@@ -59,31 +47,13 @@ def get_organ_types_logic(neo4j_instance, sab):
 
     JAS NOV 2023 - Moved query string to external file and implemented loadquery utility logic.
     """
-    result = []
 
     # Load annotated Cypher query from the cypher directory.
     # The query is parameterized with variable $sab.
     queryfile = 'organs.cypher'
-    querytxt = loadquerystring(queryfile)
-    querytxt = querytxt.replace('$sab', f'\'{sab}\'')
-
-    # March 2025
-    # Set timeout for query based on value in app.cfg.
-    query = neo4j.Query(text=querytxt, timeout=neo4j_instance.timeout)
+    params = {'sab': sab}
 
-    with neo4j_instance.driver.session() as session:
-        try:
-            recds: neo4j.Result = session.run(query)
-
-            for record in recds:
-                result.append(record.get('organ'))
-
-        except neo4j.exceptions.ClientError as e:
-            # If the error is from a timeout, raise a HTTP 408.
-            if e.code == 'Neo.ClientError.Transaction.TransactionTimedOutClientConfiguration':
-                raise GatewayTimeout
-
-        return result
+    return query_records(neo4j_instance, queryfile, params, transform=lambda record: record.get('organ'))
 
 def relationships_for_gene_target_symbol_get_logic(neo4j_instance, target_symbol: str) -> dict:
     """
@@ -98,61 +68,10 @@ def relationships_for_gene_target_symbol_get_logic(neo4j_instance, target_symbol
     but all types are returned as arrays just in case.
 
     Also, other relationships may exist but only those mentioned will be returned.
-    """
-    querytxt: str = "CALL {" \
-                 "MATCH (tSearch:Term)<-[rSearch]-(cSearch:Code)<-[:CODE]-(pSearch:Concept) " \
-                 f"WHERE toUpper(tSearch.name)='{target_symbol.upper()}' AND " \
-                 "cSearch.SAB='HGNC' AND " \
-                 "rSearch.CUI=pSearch.CUI " \
-                 "RETURN DISTINCT cSearch.CodeID AS HGNCCodeID" \
-                 "} " \
-                 "WITH HGNCCodeID " \
-                 "MATCH (pHGNC:Concept)-[:CODE]->(cHGNC:Code)-[r]-(tHGNC:Term) " \
-                 "WHERE cHGNC.CodeID=HGNCCodeID AND " \
-                 "r.CUI=pHGNC.CUI AND " \
-                 "type(r) IN ['ACR','NS','SYN','PT'] " \
-                 "RETURN cHGNC.CODE AS code, " \
-                 "CASE type(r) " \
-                 "WHEN 'ACR' THEN 'symbol-approved' " \
-                 "WHEN 'NS' THEN 'symbol-previous' " \
-                 "WHEN 'SYN' THEN 'symbol-alias' " \
-                 "WHEN 'PT' THEN 'name-approved' " \
-                 "ELSE type(r) " \
-                 "END AS type, " \
-                 "tHGNC.name AS value " \
-                 "order by type(r)"
-    result: dict = {
-        'symbol-approved': [],
-        'symbol-previous': [],
-        'symbol-alias': []
-    }
-
-    # March 2025
-    # Set timeout for query based on value in app.cfg.
-    query = neo4j.Query(text=querytxt, timeout=neo4j_instance.timeout)
-
-    with neo4j_instance.driver.session() as session:
-        try:
-            recs: neo4j.Result = session.run(query)
-            if recs.peek() is None:
-                return None
-            for rec in recs:
-                try:
-                    type_name: str = rec['type']
-                    value: str = rec['value']
-                    if type_name == 'symbol-approved' or \
-                            type_name == 'symbol-previous' or \
-                            type_name == 'symbol-alias':
-                        result[type_name].append(value)
-                except KeyError:
-                    pass
-        except neo4j.exceptions.ClientError as e:
-            # If the error is from a timeout, raise a HTTP 408.
-            if e.code == 'Neo.ClientError.Transaction.TransactionTimedOutClientConfiguration':
-                raise GatewayTimeout
-
-    return result
 
+    The relationships are obtained from the in-memory gene resolver, without a query.
+    """
+    return gene_resolver.relationships(neo4j_instance, target_symbol)
 
 def valueset_get_logic(neo4j_instance, parent_sab: str, parent_code: str, child_sabs: List[str]) -> List[SabCodeTerm]:
     # JAS 29 NOV 2022
@@ -168,87 +87,16 @@ def valueset_get_logic(neo4j_instance, parent_sab: str, parent_code: str, child_
     # is from the UMLS. The order of SABs in the list indicates the order in which child concepts should be
     # selected.
 
-    sabcodeterms: [SabCodeTerm] = []
-
-    # Build clauses of the query that depend on child_sabs, including:
-    # 1. an IN statement
-    # 2. The CASE statement that will be used twice in the correlated subquery.
-    #    The CASE statement orders the codes for child concepts by where the SABs for the child concepts
-    #    occur in the child_sabs list.
-
-    sab_case: str = 'CASE codeChild.SAB '
-    sab_in: str = '['
-    for index, item in enumerate(child_sabs):
-        sab_case = sab_case + ' WHEN \'' + item + '\' THEN ' + str(index + 1)
-        sab_in = sab_in + '\'' + item + '\''
-        if index < len(child_sabs) - 1:
-            sab_in = sab_in + ', '
-    sab_case = sab_case + ' END'
-    sab_in = sab_in + ']'
-
-    # Build correlated subquery.
-
-    # 1. Find the child concepts with an isa relationship with the parent HUBMAP concept (identified by code).
-    # 2. Order the child concepts based on the positions of the SABs for their codes in a list
-    #    (as opposed to an alphabetic order).
-    # 3. Identify the code from the SAB that is the earliest in the list.  For example,
-    #    if codes from SNOMEDCT_US are preferred to those from NCI, the list would include
-    #    [...,'SNOMEDCT_US','NCI',...].
-
-    querytxt: str = 'CALL'
-    querytxt = querytxt + '{'
-    # JAS Nov 2023 limit SABs for isa relationship to specified child values
-    querytxt = querytxt + 'MATCH (codeChild:Code)<-[:CODE]-(conceptChild:Concept)-[r:isa]->(conceptParent:Concept)-[' \
-                    ':CODE]->(codeParent:Code) '
-    querytxt = querytxt + ' WHERE codeParent.SAB=\'' + parent_sab + '\' AND codeParent.CODE=\'' + parent_code + '\''
-    querytxt = querytxt + ' AND codeChild.SAB IN ' + sab_in
-    # JAS Nov 2023 limit SABs for isa relationship to specified child values
-    querytxt = querytxt + ' AND r.SAB IN ' + sab_in
-    querytxt = querytxt + ' RETURN conceptChild.CUI AS conceptChildCUI, min(' + sab_case + ') AS minSAB'
-    querytxt = querytxt + ' ORDER BY conceptChildCUI'
-    querytxt = querytxt + '}'
-
-    # 4. Filter to the code for the child concepts with the "earliest" SAB. The "earliest" SAB will be different for
-    #    each child concept.  Limit to 1 to account for multiple cross-references (e.g., UMLS C0026018, which maps
-    #    to 2 NCI codes).
-    querytxt = querytxt + ' CALL'
-    querytxt = querytxt + '{'
-    querytxt = querytxt + 'WITH conceptChildCUI, minSAB '
-    querytxt = querytxt + 'MATCH (codeChild:Code)<-[:CODE]-(conceptChild:Concept) '
-    querytxt = querytxt + 'WHERE conceptChild.CUI = conceptChildCUI '
-    querytxt = querytxt + 'AND ' + sab_case + ' = minSAB '
-    querytxt = querytxt + 'RETURN codeChild '
-    querytxt = querytxt + 'ORDER BY codeChild.CODE '
-    querytxt = querytxt + 'LIMIT 1'
-    querytxt = querytxt + '} '
-
-    # 5. Get the term associated with the child concept code with the earliest SAB.
-    querytxt = querytxt + 'WITH codeChild,conceptChildCUI '
-    querytxt = querytxt + 'MATCH (termChild:Term)<-[r:PT]-(codeChild:Code) '
-    querytxt = querytxt + 'WHERE r.CUI = conceptChildCUI '
-    querytxt = querytxt + 'RETURN termChild.name AS term, codeChild.CODE as code,codeChild.SAB as sab'
-
-    # March 2025
-    # Set timeout for query based on value in app.cfg.
-    query = neo4j.Query(text=querytxt, timeout=neo4j_instance.timeout)
-
-    # Execute Cypher query and return result.
-    with neo4j_instance.driver.session() as session:
-        try:
-            recds: neo4j.Result = session.run(query)
-            for record in recds:
-                try:
-                    sabcodeterm: [SabCodeTerm] = SabCodeTerm(record.get('sab'), record.get('code'),
-                                                             record.get('term')).serialize()
-                    sabcodeterms.append(sabcodeterm)
-                except KeyError:
-                    pass
-        except neo4j.exceptions.ClientError as e:
-            # If the error is from a timeout, raise a HTTP 408.
-            if e.code == 'Neo.ClientError.Transaction.TransactionTimedOutClientConfiguration':
-                raise GatewayTimeout
-
-    return sabcodeterms
+    # Load annotated Cypher query from the cypher directory.
+    # The child_sabs list is passed as a parameter. The query orders the codes for child concepts by the
+    # positions of their SABs in the child_sabs list.
+    queryfile = 'valueset.cypher'
+    params = {'parent_sab': parent_sab, 'parent_code': parent_code, 'child_sabs': child_sabs}
+
+    def sabcodeterm(record) -> dict:
+        return SabCodeTerm(record.get('sab'), record.get('code'), record.get('term')).serialize()
+
+    return query_records(neo4j_instance, queryfile, params, transform=sabcodeterm)
 
 def __subquery_dataset_synonym_property(sab: str, cuialias: str, returnalias: str, collectvalues: bool) -> str:
     # OCTOBER 2025 TO BE DEPRECATED AND REMOVED
@@ -503,37 +351,24 @@ def gene_get_logic(neo4j_instance, geneids: str, organism: str='human') -> list:
     :param organism: from an enum [human, mouse]
     """
 
-    result = []
+
+    # Pass the list of ids, stripped of white space, as a parameter.
+    ids = [item.strip() for item in geneids]
 
     # Load annotated Cypher query from the cypher directory.
     if organism == 'mouse':
         queryfile = 'mouse_gene.cypher'
+        params = {'ids': ids}
     else:
+        # Resolve the HGNC identifiers to the CUIs of gene concepts in memory.
         queryfile = 'gene.cypher'
+        cuis = gene_resolver.resolve_cuis(neo4j_instance, ids)
+        if len(cuis) == 0:
+            return []
+        params = {'cuis': cuis}
 
-    querytxt = loadquerystring(queryfile)
-    # Format the list of ids for the Cypher query clause:
-    # 1. Strip white space
-    # 2. Restore single quotes
-    #ids = format_list_for_query(listquery=geneids)
-    ids = ",".join([f"'{item.strip()}'" for item in geneids])
-    querytxt = querytxt.replace('$ids', ids)
-
-    # Set timeout for query based on value in app.cfg.
-    query = neo4j.Query(text=querytxt, timeout=neo4j_instance.timeout)
-
-    with neo4j_instance.driver.session() as session:
-        try:
-            recds: neo4j.Result = session.run(query)
-            for recd in recds:
-                result.append(recd.get('genes'))
-
-        except neo4j.exceptions.ClientError as e:
-            # If the error is from a timeout, raise a HTTP 408.
-            if e.code == 'Neo.ClientError.Transaction.TransactionTimedOutClientConfiguration':
-                raise GatewayTimeout
-
-        return result[0]
+    # The query returns a single record with a JSON object.
+    return query_value(neo4j_instance, queryfile, 'genes', params)
 
 def genedetail_get_logic(neo4j_instance, geneids: str) -> list:
     """
@@ -543,34 +378,106 @@ def genedetail_get_logic(neo4j_instance, geneids: str) -> list:
     :param neo4j_instance: neo4j client
     :param geneids: comma-delimited set of gene identifiers
     """
-    result = []
     # Load annotated Cypher query from the cypher directory.
-    # The query is parameterized with variable $sab.
+    # The query is parameterized with variable $cuis.
     queryfile = 'genedetail.cypher'
-    querytxt = loadquerystring(queryfile)
-    #ids = format_list_for_query(listquery=geneids)
-    # Format the list of ids for the Cypher query clause:
-    # 1. Strip white space
-    # 2. Restore single quotes
-    ids = ",".join([f"'{item.strip()}'" for item in geneids])
-    querytxt = querytxt.replace('$ids', ids)
 
+    # Resolve the HGNC identifiers, stripped of white space, to the CUIs of gene concepts in memory.
+    cuis = gene_resolver.resolve_cuis(neo4j_instance, [item.strip() for item in geneids])
+    if len(cuis) == 0:
+        return []
+    params = {'cuis': cuis}
+
+    # The query returns a single record with a JSON object.
+    return query_value(neo4j_instance, queryfile, 'genes', params)
+
+def __prefix_counts(neo4j_instance, queryfile: str, **params) -> dict:
+    """
+    Runs a query that returns counts of items by the leading characters (prefix) of their identifiers.
+    Used to warm the count cache for the genes-info, proteins-info and celltypes-info endpoints.
 
-    # Set timeout for query based on value in app.cfg.
-    query = neo4j.Query(text=querytxt, timeout=neo4j_instance.timeout)
+    :param neo4j_instance: neo4j client
+    :param queryfile: name of a *_prefix_counts.cypher file
+    :param params: query parameters, including prefix_length
+    :return: dict of counts keyed by prefix
+    """
+    records = query_records(neo4j_instance, queryfile, params,
+                            transform=lambda record: (record.get('prefix'), record.get('count')))
+    return dict(records)
 
-    with neo4j_instance.driver.session() as session:
-        try:
-            recds: neo4j.Result = session.run(query)
-            for recd in recds:
-                result.append(recd.get('genes'))
+def __page_params(page: str, items_per_page: str, cursor: str, key_names: list[str], key_types: tuple) -> dict:
+    """
+    Returns the pagination parameters for the query of a *-info list endpoint.
 
-        except neo4j.exceptions.ClientError as e:
-            # If the error is from a timeout, raise a HTTP 408.
-            if e.code == 'Neo.ClientError.Transaction.TransactionTimedOutClientConfiguration':
-                raise GatewayTimeout
+    With page-based pagination, the query skips the rows of the previous pages. With a cursor (keyset
+    pagination), the query returns the rows after the sort key encoded in the cursor, without skipping.
 
-        return result[0]
+    The query obtains one more row than the page size, so that the calling function can determine whether
+    there is a next page.
+
+    :param page: 1-based page number; ignored if cursor is not None
+    :param items_per_page: number of rows in a page
+    :param cursor: cursor from a previous page; an empty string requests the first page
+    :param key_names: names of the query parameters for the values of the sort key--e.g., ['after_id']
+    :param key_types: types of the values of the sort key (pagination_cursor.py)
+    :return: dict of query parameters
+    """
+    if cursor is None:
+        # SKIP in the neo4j query is 0-based--i.e., SKIP 0 means the first page.
+        # UI-based pagination, however, is 1-based.
+        # The controller will pass a default value of 1 for cases of no value (default)
+        # or 0.
+        # Convert to 1-based.
+        skiprows = (int(page) - 1) * int(items_per_page)
+        after = None
+    else:
+        skiprows = 0
+        after = decode_cursor(cursor, key_types=key_types)
+
+    params = {'skiprows': skiprows,
+              'limitrows': int(items_per_page) + 1}
+    for i, name in enumerate(key_names):
+        params[name] = None if after is None else after[i]
+    return params
+
+def __query_page(neo4j_instance, queryfile: str, params: dict, items_per_page: str, key: Callable) -> tuple:
+    """
+    Selects the rows of a page of a *-info list endpoint with the query of its list, which returns only the
+    keys of the rows.
+
+    :param neo4j_instance: neo4j client
+    :param queryfile: list query--e.g., geneslist.cypher
+    :param params: query parameters, with pagination parameters from __page_params
+    :param items_per_page: number of rows in a page
+    :param key: function that returns the sort key and the CodeID of a record
+    :return: tuple of the list of CodeIDs of the rows of the page and the next cursor, which is None for
+             the last page
+    """
+    rows = query_records(neo4j_instance, queryfile, params, transform=key)
+    limit = int(items_per_page)
+    next_cursor = encode_cursor(rows[limit - 1][0]) if len(rows) > limit else None
+    return [code_id for sort_key, code_id in rows[:limit]], next_cursor
+
+def __index_page(index, prefix: str, page: str, items_per_page: str, cursor: str, key_types: tuple) -> tuple:
+    """
+    Selects the rows of a page of a *-info list endpoint from a starts_with prefix index.
+
+    :param index: PrefixIndex for the list
+    :param prefix: starts_with parameter, in the case of the keys of the index
+    :param page: 1-based page number; ignored if cursor is not None
+    :param items_per_page: number of rows in a page
+    :param cursor: cursor from a previous page; an empty string requests the first page
+    :param key_types: types of the values of the sort key of the cursor (pagination_cursor.py)
+    :return: tuple of the list of CodeIDs of the rows of the page and the next cursor, which is None for
+             the last page
+    """
+    limit = int(items_per_page)
+    if cursor is None:
+        code_ids, next_key = index.page(prefix, skip=(int(page) - 1) * limit, limit=limit)
+    else:
+        code_ids, next_key = index.page(prefix, skip=0, limit=limit,
+                                        after=decode_cursor(cursor, key_types=key_types))
+    return code_ids, None if next_key is None else encode_cursor(next_key)
 
 def genelist_count_get_logic(neo4j_instance, starts_with: str, organism: str='human') -> int:
     """
@@ -588,39 +495,28 @@ def genelist_count_get_logic(neo4j_instance, starts_with: str, organism: str='hu
     # Load annotated Cypher query from the cypher directory.
     if organism == 'mouse':
         queryfile = 'mouse_geneslist_count.cypher'
+        prefixfile = 'mouse_geneslist_prefix_counts.cypher'
     else:
+        organism = 'human'
         queryfile = 'geneslist_count.cypher'
+        prefixfile = 'geneslist_prefix_counts.cypher'
 
-    querytxt = loadquerystring(queryfile)
-    starts_with_clause = ''
-    if starts_with != '':
-        # Escape apostrophes and double quotes.
-        starts_with = starts_with.replace("'", "\'").replace('"', "\'")
-        starts_with_clause = f'AND toUpper(tGene.name) STARTS WITH "{starts_with.upper()}"'
-    querytxt = querytxt.replace('$starts_with_clause', starts_with_clause)
-
-    # Set timeout for query based on value in app.cfg.
-    query = neo4j.Query(text=querytxt, timeout=neo4j_instance.timeout)
-
-    with neo4j_instance.driver.session() as session:
-        # Execute Cypher query.
-        try:
-            recds: neo4j.Result = session.run(query)
-
-            for record in recds:
-                try:
-                    gene_count = record.get('genelistcount')
-                except KeyError:
-                    pass
-        except neo4j.exceptions.ClientError as e:
-            # If the error is from a timeout, raise a HTTP 408.
-            if e.code == 'Neo.ClientError.Transaction.TransactionTimedOutClientConfiguration':
-                raise GatewayTimeout
-
-    return gene_count
+    # The query filters on the parameter only if it is not empty.
+    params = {'starts_with': starts_with.upper()}
+
+    if prefix_indexes.enabled:
+        index = prefix_indexes.get(neo4j_instance, entity='mouse_genes' if organism == 'mouse' else 'genes',
+                                   organism=organism)
+        return index.count(params['starts_with'])
+
+    # The count depends only on the organism and starts_with, so it is cached.
+    return count_cache.get(neo4j_instance, entity='genes', organism=organism, prefix=params['starts_with'],
+                           count_func=lambda: query_value(neo4j_instance, queryfile, 'genelistcount', params),
+                           warmup_func=lambda prefix_length: __prefix_counts(neo4j_instance, prefixfile,
+                                                                            prefix_length=prefix_length))
 
 def genelist_get_logic(neo4j_instance, page: str, total_pages: str, genes_per_page: str, starts_with: str,
-                       gene_count: str, organism: str='human') -> dict:
+                       gene_count: str, organism: str='human', cursor: str=None) -> dict:
 
     """
     Returns information on HGNC genes.
@@ -634,115 +530,98 @@ def genelist_get_logic(neo4j_instance, page: str, total_pages: str, genes_per_pa
     :param starts_with: string for type-ahead (starts with) searches
     :param gene_count: Calculated total count of genes, optionally filtered with starts_with
     :param organism: from an enum [human, mouse]
+    :param cursor: cursor for keyset pagination. If not None, page is ignored.
     :return: dict
 
     """
 
-    # Load annotated Cypher query from the cypher directory.
+    # Load annotated Cypher queries from the cypher directory: the list query selects the genes of the page,
+    # and the rows query obtains their symbols, names and descriptions.
     if organism == 'mouse':
         queryfile = 'mouse_geneslist.cypher'
+        rowsfile = 'mouse_geneslist_rows.cypher'
     else:
         queryfile = 'geneslist.cypher'
-    querytxt = loadquerystring(queryfile)
+        rowsfile = 'geneslist_rows.cypher'
 
-    # The query is parameterized with variables $skiprows and $limitrows.
-    # Calculate variable values from parameters.
+    # The list query is parameterized with variables $skiprows and $limitrows, and with the sort key
+    # ($after_symbol, $after_id) from the cursor.
+    params = __page_params(page=page, items_per_page=genes_per_page, cursor=cursor,
+                           key_names=['after_symbol', 'after_id'], key_types=GENE_KEY_TYPES)
 
-    # SKIP in the neo4j query is 0-based--i.e., SKIP 0 means the first page.
-    # UI-based pagination, however, is 1-based.
-    # The controller will pass a default value of 1 for cases of no value (default)
-    # or 0.
-    # Convert to 1-based.
-    intpage = int(page)-1
+    # The query filters on starts_with only if it is not empty.
+    params['starts_with'] = starts_with.upper()
 
-    skiprows = intpage * int(genes_per_page)
+    def gene_key(record) -> tuple:
+        # Returns the sort key and the CodeID of a gene.
+        if organism == 'mouse':
+            key = [record.get('sort_symbol'), record.get('mgi_id')]
+        else:
+            key = [record.get('sort_symbol'), record.get('hgnc_id')]
+        return key, record.get('code_id')
+
+    def gene_item(record) -> dict:
+        if organism == 'mouse':
+            # symbol currently returned for mouse genes in format
+            # ["['0610010K14Rik']"]
+            symbol = record.get('approved_symbol')
+            if symbol is None:
+                symbol = ''
+            elif symbol == ["['-']"]:
+                symbol = ''
+            else:
+                symbol = symbol[0].replace("[", "").replace("]", "").replace("'","")
+            approved_name = record.get('approved_name')
+            if approved_name is None:
+                approved_name = ''
+            elif approved_name == ["-"]:
+                approved_name = ''
+            else:
+                approved_name = approved_name[0]
+            return {
+                "approved_name": approved_name,
+                "approved_symbol": symbol,
+                "mgi_id": record.get('mgi_id')
+            }
 
-    if starts_with != '':
-        escaped_starts_with = starts_with.replace("\\", "\\\\").replace("'", "\\'").upper()
+        description = record.get('description')
+        if description is None:
+            description = ''
+        else:
+            description = description[0]
+        return {
+            "approved_name": record.get('approved_name')[0],
+            "approved_symbol": record.get('approved_symbol')[0],
+            "summary": description,
+            "hgnc_id": record.get('hgnc_id')
+        }
+
+    if prefix_indexes.enabled:
+        # Select the genes of the page from the prefix index, and query neo4j only for the genes of the page.
+        index = prefix_indexes.get(neo4j_instance, entity='mouse_genes' if organism == 'mouse' else 'genes',
+                                   organism='mouse' if organism == 'mouse' else 'human')
+        code_ids, next_cursor = __index_page(index, params['starts_with'], page=page,
+                                             items_per_page=genes_per_page, cursor=cursor,
+                                             key_types=GENE_KEY_TYPES)
+    else:
+        code_ids, next_cursor = __query_page(neo4j_instance, queryfile, params, items_per_page=genes_per_page,
+                                             key=gene_key)
 
-        symbol_expr = (
-            'toUpper(replace(replace(replace(toString(map["approved_symbol"][0]), "[", ""), "]", ""), "\'", ""))'
-            if organism == 'mouse'
-            else "toUpper(map['approved_symbol'][0])"
-        )
+    # Build the list of gene details for this page.
+    genes = query_records(neo4j_instance, rowsfile, {'ids': code_ids}, transform=gene_item)
 
-        starts_with_clause = f"AND {symbol_expr} STARTS WITH '{escaped_starts_with}'"
-    else:
-        starts_with_clause = ''
-
-    querytxt = querytxt.replace('$starts_with_clause', starts_with_clause)
-    querytxt = querytxt.replace('$skiprows', str(skiprows))
-    querytxt = querytxt.replace('$limitrows', str(genes_per_page))
-
-    # Set timeout for query based on value in app.cfg.
-    query = neo4j.Query(text=querytxt, timeout=neo4j_instance.timeout)
-
-    genes = []
-    with neo4j_instance.driver.session() as session:
-        # Execute Cypher query.
-        try:
-            recds: neo4j.Result = session.run(query)
-
-            # Build the list of gene details for this page.
-            for record in recds:
-                try:
-                    if organism == 'mouse':
-                        # symbol currently returned for mouse genes in format
-                        # ["['0610010K14Rik']"]
-                        symbol = record.get('approved_symbol')
-                        if symbol is None:
-                            symbol = ''
-                        elif symbol == ["['-']"]:
-                            symbol = ''
-                        else:
-                            symbol = symbol[0].replace("[", "").replace("]", "").replace("'","")
-                        approved_name = record.get('approved_name')
-                        if approved_name is None:
-                            approved_name = ''
-                        elif approved_name == ["-"]:
-                            approved_name = ''
-                        else:
-                            approved_name = approved_name[0]
-                        gene = {
-                            "approved_name": approved_name,
-                            "approved_symbol": symbol,
-                            "mgi_id": record.get('mgi_id')
-                        }
-                    else:
-                        description = record.get('description')
-                        if description is None:
-                            description = ''
-                        else:
-                            description = description[0]
-                        gene = {
-                            "approved_name": record.get('approved_name')[0],
-                            "approved_symbol": record.get('approved_symbol')[0],
-                            "summary": description,
-                            "hgnc_id": record.get('hgnc_id')
-                        }
-
-                except KeyError:
-                    pass
-
-                genes.append(gene)
-
-            pagination = {
-                "page": page,
-                "total_pages": total_pages,
-                "items_per_page": genes_per_page,
-                "starts_with": starts_with,
-                "item_count": gene_count
-            }
+    pagination = Pagination(page=None if cursor is not None else page,
+                            total_pages=total_pages,
+                            items_per_page=genes_per_page,
+                            starts_with=starts_with,
+                            item_count=gene_count,
+                            cursor=cursor,
+                            next_cursor=next_cursor).serialize()
 
-        except neo4j.exceptions.ClientError as e:
-            # If the error is from a timeout, raise a HTTP 408.
-            if e.code == 'Neo.ClientError.Transaction.TransactionTimedOutClientConfiguration':
-                raise GatewayTimeout
     return {"pagination": pagination, "genes":genes}
 
-
 def proteinlist_get_logic(neo4j_instance, page: str, total_pages: str, proteins_per_page: str, starts_with: str,
-                          protein_count: str, organism: str) -> list:
+                          protein_count: str, organism: str, cursor: str=None) -> list:
 
     """
     Returns information on UNIPROTKB proteins.
@@ -756,89 +635,71 @@ def proteinlist_get_logic(neo4j_instance, page: str, total_pages: str, proteins_
     :param starts_with: string for type-ahead (starts with) searches
     :param protein_count: Calculated total count of genes, optionally filtered with starts_with
     :param organism: organism to filter: human or mouse
+    :param cursor: cursor for keyset pagination. If not None, page is ignored.
 
     """
 
-    # Load annotated Cypher query from the cypher directory.
+    # Load annotated Cypher queries from the cypher directory: the list query selects the proteins of the page,
+    # and the rows query obtains their names.
     queryfile = 'proteinslist.cypher'
-    querytxt = loadquerystring(queryfile)
-
-    # The query is parameterized with variables $skiprows and $limitrows.
-    # Calculate variable values from parameters.
+    rowsfile = 'proteinslist_rows.cypher'
 
-    # SKIP in the neo4j query is 0-based--i.e., SKIP 0 means the first page.
-    # UI-based pagination, however, is 1-based.
-    # The controller will pass a default value of 1 for cases of no value (default)
-    # or 0.
-    # Convert to 1-based.
-    intpage = int(page)-1
+    # The list query is parameterized with variables $skiprows and $limitrows, and with the sort key
+    # ($after_id) from the cursor.
+    params = __page_params(page=page, items_per_page=proteins_per_page, cursor=cursor, key_names=['after_id'],
+                           key_types=ID_KEY_TYPES)
 
-    skiprows = intpage * int(proteins_per_page)
-
-    starts_with_clause = ''
-    if starts_with != '':
-        # Symbols will not be available until the UNIPROTKB ETL bug with synonyms with parentheses is fixed.
-        # Escape apostrophes and double quotes.
-        starts_with = starts_with.replace("'", "\'").replace('"', "\'")
-        starts_with_clause = f' AND (toLower(id) STARTS WITH "{starts_with.lower()}" ' \
-                             f' OR toLower(map["entry_name"][0]) STARTS WITH "{starts_with.lower()}" ' \
-                             f' OR toLower(map["recommended_name"][0]) STARTS WITH "{starts_with.lower()}" )' \
-                             f'OR ANY (n in map[\'synonyms\'] WHERE n.name STARTS WITH \'{starts_with}\')'
-    querytxt = querytxt.replace('$starts_with_clause', starts_with_clause)
-    querytxt = querytxt.replace('$skiprows', str(skiprows))
-    querytxt = querytxt.replace('$limitrows', str(proteins_per_page))
+    # The query filters on starts_with only if it is not empty.
+    # Symbols will not be available until the UNIPROTKB ETL bug with synonyms with parentheses is fixed.
+    params['starts_with'] = starts_with.lower()
 
     # If the starts_with parameter is specified, indicate in the response that the search is case-insensitive.
     if starts_with != '':
         starts_with = f'{starts_with} (case-insensitive)'
 
-    # Filter on organism.
+    # Filter on organism. An empty string means all organisms.
     if organism == 'all':
-        organism_filter = ''
+        params['organism'] = ''
     else:
-        organism_filter = f' AND map["entry_name"][0] CONTAINS "_{organism.upper()}"'
-    querytxt = querytxt.replace('$organism_filter', organism_filter)
-
-    # Set timeout for query based on value in app.cfg.
-    query = neo4j.Query(text=querytxt, timeout=neo4j_instance.timeout)
-
-    with neo4j_instance.driver.session() as session:
-        # Execute Cypher query.
-        try:
-            recds: neo4j.Result = session.run(query)
-
-            proteins = []
-            # Build the list of gene details for this page.
-            for record in recds:
-                try:
-                    protein = {
-                        "uniprotkb_id": record.get('id'),
-                        "recommended_name": record.get('recommended_name'),
-                        "entry_name": record.get('entry_name')
-                    }
-                    proteins.append(protein)
-                except KeyError:
-                    pass
-
-            proteinlist = {
-                "pagination": {
-                    "page": page,
-                    "total_pages": total_pages,
-                    "items_per_page": proteins_per_page,
-                    "starts_with": starts_with,
-                    "item_count": protein_count
-                },
-                    "proteins": proteins
-            }
-
-        except neo4j.exceptions.ClientError as e:
-            # If the error is from a timeout, raise a HTTP 408.
-            if e.code == 'Neo.ClientError.Transaction.TransactionTimedOutClientConfiguration':
-                raise GatewayTimeout
+        params['organism'] = organism.upper()
+
+    def protein_key(record) -> tuple:
+        # Returns the sort key and the CodeID of a protein.
+        return [record.get('id')], record.get('code_id')
+
+    def protein(record) -> dict:
+        return {
+            "uniprotkb_id": record.get('id'),
+            "recommended_name": record.get('recommended_name'),
+            "entry_name": record.get('entry_name')
+        }
+
+    if prefix_indexes.enabled:
+        # Select the proteins of the page from the prefix index, and query neo4j only for the proteins of the page.
+        index = prefix_indexes.get(neo4j_instance, entity='proteins', organism=params['organism'])
+        code_ids, next_cursor = __index_page(index, params['starts_with'], page=page,
+                                             items_per_page=proteins_per_page, cursor=cursor,
+                                             key_types=ID_KEY_TYPES)
+    else:
+        code_ids, next_cursor = __query_page(neo4j_instance, queryfile, params, items_per_page=proteins_per_page,
+                                             key=protein_key)
+
+    # Build the list of protein details for this page.
+    proteins = query_records(neo4j_instance, rowsfile, {'ids': code_ids}, transform=protein)
+
+    proteinlist = {
+        "pagination": Pagination(page=None if cursor is not None else page,
+                                 total_pages=total_pages,
+                                 items_per_page=proteins_per_page,
+                                 starts_with=starts_with,
+                                 item_count=protein_count,
+                                 cursor=cursor,
+                                 next_cursor=next_cursor).serialize(),
+            "proteins": proteins
+    }
 
     return proteinlist
 
-
 def proteinlist_count_get_logic(neo4j_instance, starts_with: str, organism: str) -> int:
     """
         Returns the count of UniProtKB proteins in the UBKG.
@@ -853,47 +714,28 @@ def proteinlist_count_get_logic(neo4j_instance, starts_with: str, organism: str)
 
     # Load annotated Cypher query from the cypher directory.
     queryfile = 'proteinslist_count.cypher'
-    querytxt = loadquerystring(queryfile)
-    starts_with_clause = ''
-    if starts_with != '':
-        # Check for recommended_name, entry_name, or one of the list of symbols.
-        # (Symbols will not be available until the UNIPROTKB ETL bug with synonyms with parentheses is fixed.)
-        # Escape apostrophes and double quotes.
-        starts_with = starts_with.replace("'", "\'").replace('"', "\'")
-        starts_with_clause = f' AND (toLower(id) STARTS WITH "{starts_with.lower()}" ' \
-                             f' OR toLower(map["entry_name"][0]) STARTS WITH "{starts_with.lower()}" ' \
-                             f' OR toLower(map["recommended_name"][0]) STARTS WITH "{starts_with.lower()}") ' \
-                             f' OR ANY (n in map["synonyms"] WHERE n[0].name STARTS WITH "{starts_with.lower()}")'
-
-    querytxt = querytxt.replace('$starts_with_clause', starts_with_clause)
-
-    # Filter on organism.
+    # Check for ID, recommended_name, or entry_name. The query filters on starts_with only if it is not empty.
+    # (Symbols will not be available until the UNIPROTKB ETL bug with synonyms with parentheses is fixed.)
+    params = {'starts_with': starts_with.lower()}
+
+    # Filter on organism. An empty string means all organisms.
     if organism == 'all':
-        organism_filter = ''
+        params['organism'] = ''
     else:
-        organism_filter = f' AND map["entry_name"][0] CONTAINS "_{organism.upper()}"'
-    querytxt = querytxt.replace('$organism_filter', organism_filter)
-
-    # Set timeout for query based on value in app.cfg.
-    query = neo4j.Query(text=querytxt, timeout=neo4j_instance.timeout)
+        params['organism'] = organism.upper()
 
-    with neo4j_instance.driver.session() as session:
-        # Execute Cypher query.
-        try:
-            recds: neo4j.Result = session.run(query)
-
-            for record in recds:
-                try:
-                    protein_count = record.get('proteinlistcount')
-                except KeyError:
-                    pass
-        except neo4j.exceptions.ClientError as e:
-            # If the error is from a timeout, raise a HTTP 408.
-            if e.code == 'Neo.ClientError.Transaction.TransactionTimedOutClientConfiguration':
-                raise GatewayTimeout
-
-    return protein_count
+    if prefix_indexes.enabled:
+        index = prefix_indexes.get(neo4j_instance, entity='proteins', organism=params['organism'])
+        return index.count(params['starts_with'])
 
+    # The count depends only on the organism and starts_with, so it is cached.
+    return count_cache.get(neo4j_instance, entity='proteins', organism=params['organism'],
+                           prefix=params['starts_with'],
+                           count_func=lambda: query_value(neo4j_instance, queryfile, 'proteinlistcount', params),
+                           warmup_func=lambda prefix_length: __prefix_counts(neo4j_instance,
+                                                                            'proteinslist_prefix_counts.cypher',
+                                                                            prefix_length=prefix_length,
+                                                                            organism=params['organism']))
 
 def proteindetail_get_logic(neo4j_instance, protein_ids: str) -> list:
     """
@@ -902,37 +744,16 @@ def proteindetail_get_logic(neo4j_instance, protein_ids: str) -> list:
     :param protein_ids: list of UniProtKB identifiers for protein--either a UniProtKB ID or entry name
 
     """
-    result = []
 
     # Load annotated Cypher query from the cypher directory.
     # The query is parameterized with variable $ids.
     queryfile = 'proteindetail.cypher'
-    querytxt = loadquerystring(queryfile)
-
-    #ids = format_list_for_query(listquery=protein_ids)
-    # Format the list of ids for the Cypher query clause:
-    # 1. Strip white space
-    # 2. Restore single quotes
-    # ids = format_list_for_query(listquery=geneids)
-    ids = ",".join([f"'{item.strip()}'" for item in protein_ids])
-    querytxt = querytxt.replace('$ids', ids)
 
-    # Set timeout for query based on value in app.cfg.
-    query = neo4j.Query(text=querytxt, timeout=neo4j_instance.timeout)
+    # Pass the list of ids, stripped of white space, as a parameter.
+    params = {'ids': [item.strip() for item in protein_ids]}
 
-    with neo4j_instance.driver.session() as session:
-        # Execute Cypher query.
-        try:
-            recds: neo4j.Result = session.run(query)
-            for recd in recds:
-                result.append(recd.get('proteins'))
-
-        except neo4j.exceptions.ClientError as e:
-            # If the error is from a timeout, raise a HTTP 408.
-            if e.code == 'Neo.ClientError.Transaction.TransactionTimedOutClientConfiguration':
-                raise GatewayTimeout
-
-    return result[0]
+    # The query returns a single record with a JSON object.
+    return query_value(neo4j_instance, queryfile, 'proteins', params)
 
 def celltypelist_count_get_logic(neo4j_instance, starts_with: str) -> int:
     """
@@ -947,41 +768,21 @@ def celltypelist_count_get_logic(neo4j_instance, starts_with: str) -> int:
 
     # Load annotated Cypher query from the cypher directory.
     queryfile = 'celltypeslist_count.cypher'
-    querytxt = loadquerystring(queryfile)
-    starts_with_clause = ''
-    if starts_with != '':
-        # Check for preferred term or synonym.
-        # Escape apostrophes and double quotes.
-        starts_with = starts_with.replace("'", "\'").replace('"', "\'")
-        starts_with_clause = f' AND toLower(t.name) STARTS WITH "{starts_with.lower()}"' \
-
-    querytxt = querytxt.replace('$starts_with_clause', starts_with_clause)
-
-    # March 2025
-    # Set timeout for query based on value in app.cfg.
-    query = neo4j.Query(text=querytxt, timeout=neo4j_instance.timeout)
-
-    with neo4j_instance.driver.session() as session:
-        # Execute Cypher query.
-        try:
-            recds: neo4j.Result = session.run(query)
+    # Check for preferred term or synonym. The query filters on starts_with only if it is not empty.
+    params = {'starts_with': starts_with.lower()}
 
-            for record in recds:
-                try:
-                    celltype_count = record.get('celltypelistcount')
-                except KeyError:
-                    pass
-
-        except neo4j.exceptions.ClientError as e:
-            # If the error is from a timeout, raise a HTTP 408.
-            if e.code == 'Neo.ClientError.Transaction.TransactionTimedOutClientConfiguration':
-                raise GatewayTimeout
-
-    return celltype_count
+    if prefix_indexes.enabled:
+        return prefix_indexes.get(neo4j_instance, entity='celltypes').count(params['starts_with'])
 
+    # The count depends only on starts_with, so it is cached.
+    return count_cache.get(neo4j_instance, entity='celltypes', organism='', prefix=params['starts_with'],
+                           count_func=lambda: query_value(neo4j_instance, queryfile, 'celltypelistcount', params),
+                           warmup_func=lambda prefix_length: __prefix_counts(neo4j_instance,
+                                                                            'celltypeslist_prefix_counts.cypher',
+                                                                            prefix_length=prefix_length))
 
 def celltypelist_get_logic(neo4j_instance, page: str, total_pages: str, cell_types_per_page: str,
-                           starts_with: str, cell_type_count: str) -> List[CelltypeList]:
+                           starts_with: str, cell_type_count: str, cursor: str=None) -> List[CelltypeList]:
 
     """
     Returns information on Cell Ontology cell types.
@@ -994,69 +795,57 @@ def celltypelist_get_logic(neo4j_instance, page: str, total_pages: str, cell_typ
     :param cell_types_per_page: number of rows to limit in neo4j query
     :param starts_with: string for type-ahead (starts with) searches
     :param cell_type_count: Calculated total count of cell types, optionally filtered with starts_with
+    :param cursor: cursor for keyset pagination. If not None, page is ignored.
     :return: List[CelltypeList]
 
     """
 
-    # Load annotated Cypher query from the cypher directory.
+    # Load annotated Cypher queries from the cypher directory: the list query selects the cell types of the
+    # page, and the rows query obtains their terms, synonyms and definitions.
     queryfile = 'celltypeslist.cypher'
-    querytxt = loadquerystring(queryfile)
-
-    # The query is parameterized with variables $skiprows and $limitrows.
-    # Calculate variable values from parameters.
-
-    # SKIP in the neo4j query is 0-based--i.e., SKIP 0 means the first page.
-    # UI-based pagination, however, is 1-based.
-    # The controller will pass a default value of 1 for cases of no value (default)
-    # or 0.
-    # Convert to 1-based.
-    intpage = int(page)-1
-
-    skiprows = intpage * int(cell_types_per_page)
-
-    starts_with_clause = ''
-    if starts_with != '':
-        # Escape apostrophes and double quotes.
-        starts_with = starts_with.replace("'", "\'").replace('"', "\'")
-        starts_with_clause = f' AND toLower(t.name) STARTS WITH "{starts_with.lower()}"' \
-
-    querytxt = querytxt.replace('$starts_with_clause', starts_with_clause)
-    querytxt = querytxt.replace('$skiprows', str(skiprows))
-    querytxt = querytxt.replace('$limitrows', str(cell_types_per_page))
-
-    # March 2025
-    # Set timeout for query based on value in app.cfg.
-    query = neo4j.Query(text=querytxt, timeout=neo4j_instance.timeout)
-
-    with (neo4j_instance.driver.session() as session):
-        # Execute Cypher query.
-        try:
-            recds: neo4j.Result = session.run(query)
-
-            cell_types: [CelltypesListDetail] = []
-            # Build the list of gene details for this page.
-            for record in recds:
-                try:
-                    cell_type: CelltypesListDetail = CelltypesListDetail(id=record.get('id'),
-                                                                         term=record.get('term'),
-                                                                         synonyms=record.get('synonyms'),
-                                                                         definition=record.get('definition')).serialize()
-                    cell_types.append(cell_type)
-                except KeyError:
-                    pass
-
-        except neo4j.exceptions.ClientError as e:
-            # If the error is from a timeout, raise a HTTP 408.
-            if e.code == 'Neo.ClientError.Transaction.TransactionTimedOutClientConfiguration':
-                raise GatewayTimeout
-
-        # Use the list of gene details with the page to build a genelist object.
-        celltypelist: CelltypeList = CelltypeList(page=page,
-                                                  total_pages=total_pages,
-                                                  cell_types_per_page=cell_types_per_page,
-                                                  cell_types=cell_types,
-                                                  starts_with=starts_with,
-                                                  cell_type_count=cell_type_count).serialize()
+    rowsfile = 'celltypeslist_rows.cypher'
+
+    # The list query is parameterized with variables $skiprows and $limitrows, and with the sort key
+    # ($after_id) from the cursor.
+    params = __page_params(page=page, items_per_page=cell_types_per_page, cursor=cursor, key_names=['after_id'],
+                           key_types=ID_KEY_TYPES)
+
+    # The query filters on starts_with only if it is not empty.
+    params['starts_with'] = starts_with.lower()
+
+    def cell_type_key(record) -> tuple:
+        # Returns the sort key and the CodeID of a cell type, which is also its identifier.
+        return [record.get('code_id')], record.get('code_id')
+
+    def cell_type(record) -> dict:
+        return CelltypesListDetail(id=record.get('id'),
+                                   term=record.get('term'),
+                                   synonyms=record.get('synonyms'),
+                                   definition=record.get('definition')).serialize()
+
+    if prefix_indexes.enabled:
+        # Select the cell types of the page from the prefix index, and query neo4j only for the cell types
+        # of the page.
+        index = prefix_indexes.get(neo4j_instance, entity='celltypes')
+        code_ids, next_cursor = __index_page(index, params['starts_with'], page=page,
+                                             items_per_page=cell_types_per_page, cursor=cursor,
+                                             key_types=ID_KEY_TYPES)
+    else:
+        code_ids, next_cursor = __query_page(neo4j_instance, queryfile, params,
+                                             items_per_page=cell_types_per_page, key=cell_type_key)
+
+    # Build the list of cell type details for this page.
+    cell_types = query_records(neo4j_instance, rowsfile, {'ids': code_ids}, transform=cell_type)
+
+    # Use the list of cell type details with the page to build a celltypelist object.
+    celltypelist: CelltypeList = CelltypeList(page=None if cursor is not None else page,
+                                              total_pages=total_pages,
+                                              cell_types_per_page=cell_types_per_page,
+                                              cell_types=cell_types,
+                                              starts_with=starts_with,
+                                              cell_type_count=cell_type_count,
+                                              cursor=cursor,
+                                              next_cursor=next_cursor).serialize()
     return celltypelist
 
 def celltypedetail_get_logic(neo4j_instance, searchids:list[str]) -> dict:
@@ -1069,30 +858,16 @@ def celltypedetail_get_logic(neo4j_instance, searchids:list[str]) -> dict:
                       If an identifier is a string, assume that the query should return
                       cell types with terms that include the string.
     """
-    result =  []
 
     # Load annotated Cypher query from the cypher directory.
     # The query is parameterized with variable $sab.
     queryfile = 'celltypedetail.cypher'
-    querytxt = loadquerystring(queryfile)
-    ids = format_list_for_query(listquery=searchids)
-    querytxt = querytxt.replace('$ids', ids)
+    # Pass the list of ids as a parameter. The query treats [''] as no filter.
+    params = {'ids': searchids if len(searchids) > 0 else ['']}
 
-    # Set timeout for query based on value in app.cfg.
-    query = neo4j.Query(text=querytxt, timeout=neo4j_instance.timeout)
+    # The query returns a single record with a JSON object.
+    return query_value(neo4j_instance, queryfile, 'celltype', params)
 
-    with neo4j_instance.driver.session() as session:
-        try:
-            recds: neo4j.Result = session.run(query)
-            for recd in recds:
-                result.append(recd.get('celltype'))
-
-        except neo4j.exceptions.ClientError as e:
-            # If the error is from a timeout, raise a HTTP 408.
-            if e.code == 'Neo.ClientError.Transaction.TransactionTimedOutClientConfiguration':
-                raise GatewayTimeout
-
-        return result[0]
 def celltype_get_logic(neo4j_instance, searchids:list[str]) -> list:
     """
     OCTOBER 2025
@@ -1105,85 +880,44 @@ def celltype_get_logic(neo4j_instance, searchids:list[str]) -> list:
                       cell types with terms that include the string.
     """
 
-    result = []
     # Load annotated Cypher query from the cypher directory.
     # The query is parameterized with variable $sab.
     queryfile = 'celltype.cypher'
-    querytxt = loadquerystring(queryfile)
-    ids = format_list_for_query(listquery=searchids)
-    querytxt = querytxt.replace('$ids', ids)
-
-    # Set timeout for query based on value in app.cfg.
-    query = neo4j.Query(text=querytxt, timeout=neo4j_instance.timeout)
+    # Pass the list of ids as a parameter. The query treats [''] as no filter.
+    params = {'ids': searchids if len(searchids) > 0 else ['']}
 
-    with neo4j_instance.driver.session() as session:
-        try:
-            recds: neo4j.Result = session.run(query)
-            for recd in recds:
-                result.append(recd.get('celltype'))
+    # The query returns a single record with a JSON object.
+    return query_value(neo4j_instance, queryfile, 'celltype', params)
 
-        except neo4j.exceptions.ClientError as e:
-            # If the error is from a timeout, raise a HTTP 408.
-            if e.code == 'Neo.ClientError.Transaction.TransactionTimedOutClientConfiguration':
-                raise GatewayTimeout
-
-        return result[0]
-
-def field_descriptions_get_logic(neo4j_instance, field_name=None, definition_source=None) -> List[dict]:
+def field_descriptions_get_logic(neo4j_instance, field_name=None, definition_source=None,
+                                 stream=False) -> Iterable[dict]:
     """
     Returns detailed information on an ingest metadata field description.
     :param: neo4j_instance - neo4j connection
     :param: field_name - field name (for field-description/{name} route)
     :param: definition_source - source of field description-- HMFIELD or CEDAR
+    :param: stream - if True, returns a generator that yields the descriptions as they arrive from neo4j
     """
-    # response list
-    fielddescriptions = []
-
-    # Used in WHERE clauses when no filter is needed.
-    identity_filter = '1=1'
-
     # Load annotated Cypher query from the cypher directory.
 
     queryfile = 'fielddescriptions.cypher'
-    querytxt = loadquerystring(queryfile)
 
     # Allow for filtering on field name.
     if field_name is None:
         field_name = ''
-    querytxt = querytxt.replace('$field_filter', f'"{field_name}"')
 
     # Allow for filtering on description source.
     if definition_source is None:
         definition_source = ""
-    querytxt = querytxt.replace('$source_filter', f'"{definition_source}"')
-
-    # Set timeout for query based on value in app.cfg.
-    query = neo4j.Query(text=querytxt, timeout=neo4j_instance.timeout)
-
-    with neo4j_instance.driver.session() as session:
-        # Execute Cypher query.
-        try:
-            recds: neo4j.Result = session.run(query)
-
-            record_count = 0
-            # Build response object.
-            for record in recds:
-                try:
-                    fielddescription=record.get('code_ids')
-                    fielddescriptions.append(fielddescription)
-                    record_count = record_count + 1
-                except KeyError:
-                    pass
-
-        except neo4j.exceptions.ClientError as e:
-            # If the error is from a timeout, raise a HTTP 408.
-            if e.code == 'Neo.ClientError.Transaction.TransactionTimedOutClientConfiguration':
-                raise GatewayTimeout
-
-    return fielddescriptions
-
-def field_types_get_logic(neo4j_instance, field_name=None, mapping_source=None, type_source=None, type=None)\
-        -> List[dict]:
+
+    params = {'field_filter': field_name, 'source_filter': definition_source}
+
+    if stream:
+        return stream_records(neo4j_instance, queryfile, params, transform=lambda record: record.get('code_ids'))
+    return query_records(neo4j_instance, queryfile, params, transform=lambda record: record.get('code_ids'))
+
+def field_types_get_logic(neo4j_instance, field_name=None, mapping_source=None, type_source=None, type=None,
+                          stream=False) -> Iterable[dict]:
     """
     Returns detailed information on an ingest metadata field's associated data types.
     The types here are not to be confused
@@ -1194,69 +928,46 @@ def field_types_get_logic(neo4j_instance, field_name=None, mapping_source=None,
     :param mapping_source: name of the source of field-type mapping--i.e., HMFIELD or CEDAR
     :param type_source: name of the source of the field term--i.e., the type ontology. Choices are HMFIELD and XSD.
     :param type: term for the type--e.g., string
+    :param stream: if True, returns a generator that yields the field types as they arrive from neo4j
     """
-    # response list
-    fieldtypes = []
-
     # Load annotated Cypher query from the cypher directory.
     # The query is parameterized with variable $ids.
     queryfile = 'fieldtypes.cypher'
-    querytxt = loadquerystring(queryfile)
 
     # Allow for filtering on case-sensitive field name.
     if field_name is None:
         field_name = ''
-    querytxt = querytxt.replace('$field_filter', f'"{field_name}"')
 
     # Allow for filtering on case-insensitive mapping source.
     if mapping_source in ['HMFIELD', 'CEDAR']:
-        mapping_source_filter = f"['{mapping_source.upper()}']"
+        mapping_source_filter = [mapping_source.upper()]
     else:
-        mapping_source_filter = f"['HMFIELD', 'CEDAR']"
-    querytxt = querytxt.replace('$mapping_source_filter', mapping_source_filter)
+        mapping_source_filter = ['HMFIELD', 'CEDAR']
 
     # Allow for filtering on case-insensitive type source.
     if type_source in ['HMFIELD', 'XSD']:
-        type_source_filter = f"['{type_source.upper()}']"
+        type_source_filter = [type_source.upper()]
     else:
-        type_source_filter = f"['HMFIELD', 'XSD']"
-    querytxt = querytxt.replace('$type_source_filter', type_source_filter)
+        type_source_filter = ['HMFIELD', 'XSD']
 
     # Allow for filtering on case-sensitive type.
     # Remove sab as necessary.
     if type is None:
-        type_filter = f"''"
+        type_filter = ''
     else:
         if ':' in type:
-            type_filter = f"'{type.split(':')[1]}'"
+            type_filter = type.split(':')[1]
         else:
-            type_filter = f"'{type}'"
-    querytxt = querytxt.replace('$type_filter', type_filter)
-
-    # Set timeout for query based on value in app.cfg.
-    query = neo4j.Query(text=querytxt, timeout=neo4j_instance.timeout)
-
-    with neo4j_instance.driver.session() as session:
-        # Execute Cypher query.
-        try:
-            recds: neo4j.Result = session.run(query)
-
-            record_count = 0
-            # Build response object.
-            for record in recds:
-                try:
-                    fieldtype = record.get('field_types')
-                    fieldtypes.append(fieldtype)
-                    record_count = record_count + 1
-                except KeyError:
-                    pass
-
-        except neo4j.exceptions.ClientError as e:
-            # If the error is from a timeout, raise a HTTP 408.
-            if e.code == 'Neo.ClientError.Transaction.TransactionTimedOutClientConfiguration':
-                raise GatewayTimeout
-
-    return fieldtypes
+            type_filter = type
+
+    params = {'field_filter': field_name,
+              'mapping_source_filter': mapping_source_filter,
+              'type_source_filter': type_source_filter,
+              'type_filter': type_filter}
+
+    if stream:
+        return stream_records(neo4j_instance, queryfile, params, transform=lambda record: record.get('field_types'))
+    return query_records(neo4j_instance, queryfile, params, transform=lambda record: record.get('field_types'))
 
 def field_types_info_get_logic(neo4j_instance, type_source=None)->List[dict]:
     """
@@ -1266,45 +977,19 @@ def field_types_info_get_logic(neo4j_instance, type_source=None)->List[dict]:
     :param neo4j_instance: neo4j connection
     :param type_source:  name of the source of the field term--i.e., the type ontology. Choices are HMFIELD and XSD.
     """
-    # response list
-    fieldtypes = []
-
 
     # Load annotated Cypher query from the cypher directory.
     # The query is parameterized with variable $ids.
     queryfile = 'fieldtypelist.cypher'
-    querytxt = loadquerystring(queryfile)
 
     # Allow for filtering on case-insensitive type source.
     if type_source in ['HMFIELD', 'XSD']:
-        type_source_filter = f"['{type_source.upper()}']"
+        type_source_filter = [type_source.upper()]
     else:
-        type_source_filter = f"['HMFIELD', 'XSD']"
-    querytxt = querytxt.replace('$type_source_filter', type_source_filter)
-
-    # Set timeout for query based on value in app.cfg.
-    query = neo4j.Query(text=querytxt, timeout=neo4j_instance.timeout)
-
-    with neo4j_instance.driver.session() as session:
-        # Execute Cypher query.
-        try:
-            recds: neo4j.Result = session.run(query)
-
-            # Build response object.
-            for record in recds:
-                try:
-                    fieldtype = record.get('field_types')
-                    fieldtypes.append(fieldtype)
-                except KeyError:
-                    pass
-
-        except neo4j.exceptions.ClientError as e:
-            # If the error is from a timeout, raise a HTTP 408.
-            if e.code == 'Neo.ClientError.Transaction.TransactionTimedOutClientConfiguration':
-                raise GatewayTimeout
-
-    return fieldtypes
+        type_source_filter = ['HMFIELD', 'XSD']
+    params = {'type_source_filter': type_source_filter}
 
+    return query_records(neo4j_instance, queryfile, params, transform=lambda record: record.get('field_types'))
 
 def field_assays_get_logic(neo4j_instance, field_name=None, assaytype=None) -> dict:
     """
@@ -1316,55 +1001,14 @@ def field_assays_get_logic(neo4j_instance, field_name=None, assaytype=None) -> d
     :return:
     """
 
-    # response list
-    fieldassays: [dict] = []
-
-    # Used in WHERE clauses when no filter is needed.
-    identity_filter = '1=1'
-
     # Load annotated Cypher query from the cypher directory.
-    # The query is parameterized with variable $ids.
     queryfile = 'fieldassays.cypher'
-    querytxt = loadquerystring(queryfile)
-
-    # Allow for filtering on field name.
-    if field_name is None:
-        field_filter = f' AND {identity_filter}'
-    else:
-        field_filter = f" AND tField.name = '{field_name}'"
-    querytxt = querytxt.replace('$field_filter', field_filter)
-
-    # Allow for filtering on assaytype.
-    if assaytype is None:
-        assay_type_filter = f'AND {identity_filter}'
-    else:
-        assay_type_filter = f" AND tAssayType.name='{assaytype}'"
 
-    querytxt = querytxt.replace('$assay_type_filter', assay_type_filter)
+    # Allow for filtering on field name and assaytype. The query ignores null filters.
+    params = {'field_name': field_name, 'assaytype': assaytype}
 
-    # March 2025
-    # Set timeout for query based on value in app.cfg.
-    query = neo4j.Query(text=querytxt, timeout=neo4j_instance.timeout)
-
-    with neo4j_instance.driver.session() as session:
-        # Execute Cypher query.
-        try:
-            recds: neo4j.Result = session.run(query)
-
-            for field in recds:
-                resp = field.get('fieldassays')
-                try:
-                    fieldassays.append(resp)
-
-                except KeyError:
-                    pass
-
-        except neo4j.exceptions.ClientError as e:
-            # If the error is from a timeout, raise a HTTP 408.
-            if e.code == 'Neo.ClientError.Transaction.TransactionTimedOutClientConfiguration':
-                raise GatewayTimeout
-
-        return resp
+    # The query returns a single record with a JSON object.
+    return query_value(neo4j_instance, queryfile, 'fieldassays', params)
 
 def field_schemas_get_logic(neo4j_instance, field_name=None, mapping_source=None, schema=None) -> List[FieldSchema]:
     """
@@ -1376,68 +1020,18 @@ def field_schemas_get_logic(neo4j_instance, field_name=None, mapping_source=None
     :param schema: name of schema from querystring
 
     """
-    # response list
-    fieldschemas: [FieldSchema] = []
-
-    # Used in WHERE clauses when no filter is needed.
-    identity_filter = '1=1'
-
     # Load annotated Cypher query from the cypher directory.
-    # The query is parameterized with variable $ids.
     queryfile = 'fieldschemas.cypher'
-    querytxt = loadquerystring(queryfile)
-
-    # Allow for filtering on field name.
-    if field_name is None:
-        field_filter = f' AND {identity_filter}'
-    else:
-        field_filter = f" AND tField.name = '{field_name}'"
-    querytxt = querytxt.replace('$field_filter', field_filter)
 
-    # Allow for filtering on schema.
-    if schema is None:
-        schema_filter = " AND " + identity_filter
-    else:
-        schema_filter = f" AND tSchema.name = '{schema}'"
-    querytxt = querytxt.replace('$schema_filter', schema_filter)
-
-    # Allow for filtering on mapping source.
-    if mapping_source is None:
-        mapping_source_filter = " AND " + identity_filter
-    else:
-        mapping_source_filter = f" AND SPLIT(schema_name,'|')[0]='{mapping_source}'"
-    querytxt = querytxt.replace('$mapping_source_filter', mapping_source_filter)
-
-    # March 2025
-    # Set timeout for query based on value in app.cfg.
-    query = neo4j.Query(text=querytxt, timeout=neo4j_instance.timeout)
-    with neo4j_instance.driver.session() as session:
-        # Execute Cypher query.
-        try:
-            recds: neo4j.Result = session.run(query)
-
-            record_count = 0
-
-            # Build response object.
-            for record in recds:
-                try:
-                    fieldschema: FieldSchema = \
-                        FieldSchema(code_ids=record.get('code_ids'),
-                                    name=record.get('field_name'),
-                                    schemas=record.get('schemas')).serialize()
-
-                    fieldschemas.append(fieldschema)
-                    record_count = record_count + 1
-                except KeyError:
-                    pass
+    # Allow for filtering on field name, schema and mapping source. The query ignores null filters.
+    params = {'field_name': field_name, 'schema': schema, 'mapping_source': mapping_source}
 
-        except neo4j.exceptions.ClientError as e:
-            # If the error is from a timeout, raise a HTTP 408.
-            if e.code == 'Neo.ClientError.Transaction.TransactionTimedOutClientConfiguration':
-                raise GatewayTimeout
-
-        return fieldschemas
+    def fieldschema(record) -> dict:
+        return FieldSchema(code_ids=record.get('code_ids'),
+                           name=record.get('field_name'),
+                           schemas=record.get('schemas')).serialize()
 
+    return query_records(neo4j_instance, queryfile, params, transform=fieldschema)
 
 def field_entities_get_logic(neo4j_instance, field_name=None, source=None, entity=None, application=None) -> List[dict]:
     """
@@ -1451,68 +1045,36 @@ def field_entities_get_logic(neo4j_instance, field_name=None, source=None, entit
     :param entity: term for the entity--e.g., "umi_offset"
     :param application: application context--i.e., HUBMAP or SENNET
     """
-    # response list
-    field_entities=[]
-
     # Load annotated Cypher query from the cypher directory.
     # The query is parameterized with variable $ids.
     queryfile = 'fieldentities.cypher'
-    querytxt = loadquerystring(queryfile)
 
     # Allow for filtering on field name.
     if field_name is None:
         field_name =''
-    querytxt = querytxt.replace('$field_filter', f'"{field_name}"')
 
     # Allow for filtering on source.
-    if source is None:
-        source_filter = "''"
-    elif source in ['HMFIELD', 'CEDAR']:
-        source_filter = f"'{source}'"
+    if source in ['HMFIELD', 'CEDAR']:
+        source_filter = source
     else:
-        source_filter = "''"
-    querytxt = querytxt.replace('$source_filter', source_filter)
+        source_filter = ''
 
     if entity is None:
-        entity_filter = "''"
-    else:
-        entity_filter = f"'{entity}'"
-    querytxt = querytxt.replace('$entity_filter', entity_filter)
+        entity = ''
 
     # Allow for filtering on application context.
     if application is None:
-        application_filter = "''"
-    else:
-        application_filter = f"'{application}'"
-    querytxt = querytxt.replace('$application_filter', application_filter)
-
-    # Set timeout for query based on value in app.cfg.
-    query = neo4j.Query(text=querytxt, timeout=neo4j_instance.timeout)
-
-    with neo4j_instance.driver.session() as session:
-        # Execute Cypher query.
-        try:
-            recds: neo4j.Result = session.run(query)
-
-            record_count = 0
-            # Build response object.
-            for record in recds:
-                try:
-                    field_entity = record.get('field_entity')
-                    field_entities.append(field_entity)
-                    record_count = record_count + 1
-                except KeyError:
-                    pass
-
-        except neo4j.exceptions.ClientError as e:
-            # If the error is from a timeout, raise a HTTP 408.
-            if e.code == 'Neo.ClientError.Transaction.TransactionTimedOutClientConfiguration':
-                raise GatewayTimeout
-
-        return field_entities
+        application = ''
+
+    params = {'field_filter': field_name,
+              'source_filter': source_filter,
+              'entity_filter': entity,
+              'application_filter': application}
+
+    return query_records(neo4j_instance, queryfile, params, transform=lambda record: record.get('field_entity'))
 
 def assayclasses_get_logic(neo4j_instance,assayclass=None, assaytype=None, process_state=None,
-                           context=None, provide_hierarchy_info=None) -> dict:
+                           context=None, provide_hierarchy_info=None, stream=False) -> Iterable[dict]:
     """
     October 2024 - filter response for hierarchical information.
 
@@ -1529,64 +1091,35 @@ def assayclasses_get_logic(neo4j_instance,assayclass=None, assaytype=None, proce
         :param process_state: in the enum ['primary','derived','epic']
         :param provide_hierarchy_info: "string boolean" (i.e. the word "True" or "False") indicating
                                         whether to include dataset hierarchical information in response
+        :param stream: if True, returns a generator that yields the assay classes as they arrive from neo4j
 
         example: if a assay class's rule has rule_description="non-DCWG primary AF" and rule code "HUBMAP:C200001", either
         "non-DCWG primary AF" or "C200001" will result in selection of the assay class. The application context is used
         to identify the complete rule code.
 
         """
-    assayclasses: [dict] = []
-
-    # Load and parameterize query.
-    querytxt = loadquerystring('assayclass.cypher')
-
-    # Filter by application context.
-    querytxt = querytxt.replace('$context', context)
-
-    # Oct 2024 - Filter by dataset hierarchy.
-    querytxt = querytxt.replace('$provide_hierarchy_info', provide_hierarchy_info)
-
-    # Filter by assay class
-    if assayclass is not None:
-        querytxt = querytxt.replace('$assayclass_filter', f"AND (cRBD.CodeID = context+':{assayclass}' OR tRBD.name='{assayclass}')")
-    else:
-        querytxt = querytxt.replace('$assayclass_filter','')
-
-    # Filter by process_state
-    if process_state is None:
-        querytxt = querytxt.replace('$process_state_filter','')
-    else:
-        querytxt = querytxt.replace('$process_state_filter',f"AND tdsProcess.name='{process_state}'")
+    # Load query.
+    queryfile = 'assayclass.cypher'
 
     # Filter by assaytype, but only if this is the general endpoint.
     #(The endpoint that filters by assayclass assumes a single response; assaytype is not unique.)
-    if assaytype is None:
-        querytxt = querytxt.replace('$assaytype_filter','')
-    elif assayclass is None:
-        querytxt = querytxt.replace('$assaytype_filter', f"AND REPLACE(tassaytype.name,'_assaytype','') = '{assaytype}'")
-    else:
-
-        querytxt = querytxt.replace('$assaytype_filter','')
-
-    # Set timeout for query based on value in app.cfg.
-    query = neo4j.Query(text=querytxt, timeout=neo4j_instance.timeout)
-
-    with neo4j_instance.driver.session() as session:
-        try:
-            recds: neo4j.Result = session.run(query)
-            for record in recds:
-                assayclass = record.get('rule_based_datasets')
-                try:
-                    assayclasses.append(assayclass)
-
-                except KeyError:
-                    pass
-        except neo4j.exceptions.ClientError as e:
-            # If the error is from a timeout, raise a HTTP 408.
-            if e.code == 'Neo.ClientError.Transaction.TransactionTimedOutClientConfiguration':
-                raise GatewayTimeout
-
-    return assayclasses
+    if assayclass is not None:
+        assaytype = None
+
+    # Parameters:
+    # - application context
+    # - Oct 2024 - dataset hierarchy flag
+    # - optional filters for assay class, process_state and assaytype. The query ignores null filters.
+    params = {'context': context,
+              'provide_hierarchy_info': provide_hierarchy_info,
+              'assayclass': assayclass,
+              'process_state': process_state,
+              'assaytype': assaytype}
+
+    if stream:
+        return stream_records(neo4j_instance, queryfile, params,
+                              transform=lambda record: record.get('rule_based_datasets'))
+    return query_records(neo4j_instance, queryfile, params, transform=lambda record: record.get('rule_based_datasets'))
 
 def dataset_types_valueset_get_logic(neo4j_instance) -> list:
     """
@@ -1595,28 +1128,10 @@ def dataset_types_valueset_get_logic(neo4j_instance) -> list:
 
     """
 
-    dataset_types: [dict] = []
-    querytxt = loadquerystring('dataset_type_valueset.cypher')
-
-    # Set timeout for query based on value in app.cfg.
-    query = neo4j.Query(text=querytxt, timeout=neo4j_instance.timeout)
+    queryfile = 'dataset_type_valueset.cypher'
+    params = {}
 
-    with neo4j_instance.driver.session() as session:
-        try:
-            recds: neo4j.Result = session.run(query)
-
-            for record in recds:
-                dst = record.get('dataset_type')
-                try:
-                    dataset_types.append(dst)
-                except KeyError:
-                    pass
-        except neo4j.exceptions.ClientError as e:
-            # If the error is from a timeout, raise a HTTP 408.
-            if e.code == 'Neo.ClientError.Transaction.TransactionTimedOutClientConfiguration':
-                raise GatewayTimeout
-
-    return dataset_types
+    return query_records(neo4j_instance, queryfile, params, transform=lambda record: record.get('dataset_type'))
 
 def dataset_types_get_logic(neo4j_instance, ishierarchy:bool, application_context: str, dataset_type_code=None, modality_code=None, analyte_code=None, isepic=None) -> dict:
     """
@@ -1633,65 +1148,24 @@ def dataset_types_get_logic(neo4j_instance, ishierarchy:bool, application_contex
         :param isepic: optional filter to Epic (externally processed) dataset types
 
         """
-    dataset_types: [dict] = []
-
     # Load and parameterize query.
     if ishierarchy:
-        querytxt = loadquerystring('dataset_types_hierarchy.cypher')
+        queryfile = 'dataset_types_hierarchy.cypher'
     else:
-        querytxt = loadquerystring('dataset_types.cypher')
+        queryfile = 'dataset_types.cypher'
 
     # Filter by application context.
-    querytxt = querytxt.replace('$context', application_context)
-
-    # Filter by dataset type code.
-    if dataset_type_code is not None:
-        querytxt = querytxt.replace('$dataset_type_code', f"'{dataset_type_code}'")
-    else:
-        querytxt = querytxt.replace('$dataset_type_code',f"''")
+    # Filter by dataset type, modality and analyte codes. The query treats '' as no filter.
+    params = {'context': application_context,
+              'dataset_type_code': dataset_type_code if dataset_type_code is not None else '',
+              'modality_code': modality_code if modality_code is not None else '',
+              'analyte_code': analyte_code if analyte_code is not None else '',
+              'epictype_filter': isepic == 'true'}
 
-
-    # Filter by modality code.
-    if modality_code is not None:
-        querytxt = querytxt.replace('$modality_code', f"'{modality_code}'")
-    else:
-        querytxt = querytxt.replace('$modality_code', f"''")
-
-    # Filter by analyte code.
-    if analyte_code is not None:
-        querytxt = querytxt.replace('$analyte_code', f"'{analyte_code}'")
-    else:
-        querytxt = querytxt.replace('$analyte_code', f"''")
-
-    if isepic in ['true','false']:
-        if isepic == 'true':
-            isepicbool = True
-        else:
-            isepicbool = False
-        querytxt = querytxt.replace('$epictype_filter', f"{isepicbool}")
-
-    # Set timeout for query based on value in app.cfg.
-    query = neo4j.Query(text=querytxt, timeout=neo4j_instance.timeout)
-
-    with neo4j_instance.driver.session() as session:
-        try:
-            recds: neo4j.Result = session.run(query)
-
-            for record in recds:
-                dst = record.get('dataset_type')
-                try:
-                    dataset_types.append(dst)
-                except KeyError:
-                    pass
-        except neo4j.exceptions.ClientError as e:
-            # If the error is from a timeout, raise a HTTP 408.
-            if e.code == 'Neo.ClientError.Transaction.TransactionTimedOutClientConfiguration':
-                raise GatewayTimeout
-
-    return dataset_types
+    return query_records(neo4j_instance, queryfile, params, transform=lambda record: record.get('dataset_type'))
 
 def pathway_events_with_genes_get_logic(neo4j_instance, geneids=None, pathwayid=None,
-                      pathwaynamestartswith=None, eventtypes=None) -> List[dict]:
+                      pathwaynamestartswith=None, eventtypes=None, stream=False):
     """
     March 2025
     Returns detailed information on the set of Reactome pathway events that
@@ -1703,64 +1177,30 @@ def pathway_events_with_genes_get_logic(neo4j_instance, geneids=None, pathwayid=
     :param pathwaynamestartswith: optional filter: partial name for a Reactome event
                                    to be used in 'starts with' queries
     :param eventtypes: optional filter: list of Reactome event types
+    :param stream: if True, returns a generator that yields the events as they arrive from neo4j,
+                   instead of a response with the count and list of events
 
     """
 
-    events:[dict] = []
     # Load query.
-    querytxt = loadquerystring('pathwayevents_with_genes.cypher')
+    queryfile = 'pathwayevents_with_genes.cypher'
 
     # Pass parameters to query.
-    # geneids is, in general, a list.
+    # geneids and eventtypes are, in general, lists. The query treats [''] and '' as no filter.
+    params = {'geneids': geneids if geneids is not None else [''],
+              'pathwayid': pathwayid if pathwayid is not None else '',
+              'pathwayname': pathwaynamestartswith if pathwaynamestartswith is not None else '',
+              'eventtypes': eventtypes if eventtypes is not None else ['']}
 
-    if geneids is None:
-        geneidsjoin = f"['']"
-    else:
-        geneidsjoin = format_list_for_query(listquery=geneids, doublequote=False)
-    querytxt = querytxt.replace('$geneids', geneidsjoin)
+    # The query returns one record per event.
+    if stream:
+        return stream_records(neo4j_instance, queryfile, params, transform=lambda record: record.get('event'))
 
-    if pathwayid is None:
-        querytxt = querytxt.replace('$pathwayid',"''")
-    else:
-        querytxt = querytxt.replace('$pathwayid', f"'{pathwayid}'")
-
-    if pathwaynamestartswith is None:
-        querytxt = querytxt.replace('$pathwayname',"''")
-    else:
-        querytxt = querytxt.replace('$pathwayname', f"'{pathwaynamestartswith}'")
-
-    # eventtypes is, in general, a list.
-    if eventtypes is None:
-        eventtypesjoin = f"['']"
-    else:
-        eventtypesjoin = format_list_for_query(listquery=eventtypes, doublequote=False)
-
-    querytxt = querytxt.replace('$eventtypes', eventtypesjoin)
-
-    # Set timeout for query based on value in app.cfg.
-    query = neo4j.Query(text=querytxt, timeout=neo4j_instance.timeout)
-
-    with neo4j_instance.driver.session() as session:
-        try:
-            recds: neo4j.Result = session.run(query)
-
-            for record in recds:
-                resp = record.get('response')
-                try:
-                    events.append(resp)
-                except KeyError:
-                    pass
-        except neo4j.exceptions.ClientError as e:
-            # If the error is from a timeout, raise a HTTP 408.
-            if e.code == 'Neo.ClientError.Transaction.TransactionTimedOutClientConfiguration':
-                raise GatewayTimeout
-
-    # The return should be a list with only one element.
-    if len(events)>0:
-        return events[0]
+    events = query_records(neo4j_instance, queryfile, params, transform=lambda record: record.get('event'))
+    return {'count': len(events), 'events': events}
 
 def pathway_participants_get_logic(neo4j_instance, pathwayid=None, sabs=None,
-                                   featuretypes=None) -> List[dict]:
+                                   featuretypes=None, stream=False):
     """
     March 2025
     Returns detailed information on the set of Reactome pathway events that
@@ -1776,54 +1216,28 @@ def pathway_participants_get_logic(neo4j_instance, pathwayid=None, sabs=None,
                                             are:
                                             1. gene
                                             2. transcript
+    :param stream: if True, returns a generator that yields the events as they arrive from neo4j,
+                   instead of a response with the count and list of events
 
     """
 
-    participants:[dict] = []
-
     # Load query.
-    querytxt = loadquerystring('pathwayparticipants.cypher')
+    queryfile = 'pathwayparticipants.cypher'
 
     # Pass parameters to query.
+    # sabs and featuretypes are, in general, lists. The query treats [''] and '' as no filter.
+    params = {'pathwayid': pathwayid if pathwayid is not None else '',
+              'sabs': sabs if sabs is not None else [''],
+              'featuretypes': featuretypes if featuretypes is not None else ['']}
 
-    if pathwayid is None:
-        querytxt = querytxt.replace('$pathwayid',"''")
-    else:
-        querytxt = querytxt.replace('$pathwayid', f"'{pathwayid}'")
-
-    if sabs is None:
-        sabsjoin = f"['']"
-    else:
-        sabsjoin = format_list_for_query(listquery=sabs, doublequote=False)
+    # The query returns one record per event.
+    if stream:
+        return stream_records(neo4j_instance, queryfile, params, transform=lambda record: record.get('event'))
 
-    querytxt = querytxt.replace('$sabs', sabsjoin)
+    events = query_records(neo4j_instance, queryfile, params, transform=lambda record: record.get('event'))
+    # The count is the number of distinct events.
+    return {'count': len({event.get('code') for event in events}), 'events': events}
 
-    if featuretypes is None:
-        featuretypesjoin = f"['']"
-    else:
-        featuretypesjoin = format_list_for_query(listquery=featuretypes, doublequote=False)
-    querytxt = querytxt.replace('$featuretypes', featuretypesjoin)
-
-    # Set timeout for query based on value in app.cfg.
-    query = neo4j.Query(text=querytxt, timeout=neo4j_instance.timeout)
-
-    with neo4j_instance.driver.session() as session:
-        try:
-            recds: neo4j.Result = session.run(query)
-
-            for record in recds:
-                resp = record.get('response')
-                try:
-                    participants.append(resp)
-                except KeyError:
-                    pass
-        except neo4j.exceptions.ClientError as e:
-            # If the error is from a timeout, raise a HTTP 408.
-            if e.code == 'Neo.ClientError.Transaction.TransactionTimedOutClientConfiguration':
-                raise GatewayTimeout
-
-    if len(participants) > 0:
-        return participants[0]
 def annotations_get_logic(neo4j_instance, sab:str, ids:list[str]) -> list:
     """
     OCTOBER 2025
@@ -1833,35 +1247,16 @@ def annotations_get_logic(neo4j_instance, sab:str, ids:list[str]) -> list:
     :param ids: optional comma-delimited list of IDs, either numeric ids left-padded with zeroes or portions of preferred terms
     """
 
-    result = []
     # Load annotated Cypher query from the cypher directory.
 
     # The query is parameterized
     queryfile = 'annotation.cypher'
-    querytxt = loadquerystring(queryfile)
-
-    searchids = format_list_for_query(listquery=ids)
-    if searchids == '':
-        searchids = f"''"
-    querytxt = querytxt.replace('$ids', searchids)
-
-    querytxt = querytxt.replace('$sab', f"'{sab}'")
 
-    # Set timeout for query based on value in app.cfg.
-    query = neo4j.Query(text=querytxt, timeout=neo4j_instance.timeout)
+    # Pass the list of ids as a parameter. The query treats [''] as no filter.
+    params = {'ids': ids if len(ids) > 0 else [''], 'sab': sab}
 
-    with neo4j_instance.driver.session() as session:
-        try:
-            recds: neo4j.Result = session.run(query)
-            for recd in recds:
-                result.append(recd.get('annotations'))
-
-        except neo4j.exceptions.ClientError as e:
-            # If the error is from a timeout, raise a HTTP 408.
-            if e.code == 'Neo.ClientError.Transaction.TransactionTimedOutClientConfiguration':
-                raise GatewayTimeout
-
-    return result[0]
+    # The query returns a single record with a JSON object.
+    return query_value(neo4j_instance, queryfile, 'annotations', params)
 
 def annotation_organ_levels_get_logic(neo4j_instance, sab:str, ids:list[str]) -> list:
     """
@@ -1872,38 +1267,20 @@ def annotation_organ_levels_get_logic(neo4j_instance, sab:str, ids:list[str]) ->
     :param ids: optional comma-delimited list of IDs, either numeric ids left-padded with zeroes or portions of preferred terms
     """
 
-    result = []
     # Load annotated Cypher query from the cypher directory.
 
     # The query is parameterized
     queryfile = 'annotation_organ_level.cypher'
-    querytxt = loadquerystring(queryfile)
-
-    searchids = format_list_for_query(listquery=ids)
-
-    if searchids == '':
-        searchids = f"''"
-    querytxt = querytxt.replace('$ids', searchids)
 
     if sab is None:
         sab = ''
-    querytxt = querytxt.replace('$sab', f"'{sab}'")
-
-    # Set timeout for query based on value in app.cfg.
-    query = neo4j.Query(text=querytxt, timeout=neo4j_instance.timeout)
 
-    with neo4j_instance.driver.session() as session:
-        try:
-            recds: neo4j.Result = session.run(query)
-            for recd in recds:
-                result.append(recd.get('organ_levels'))
+    # Pass the list of ids as a parameter. The query treats [''] as no filter.
+    params = {'ids': ids if len(ids) > 0 else [''], 'sab': sab}
 
-        except neo4j.exceptions.ClientError as e:
-            # If the error is from a timeout, raise a HTTP 408.
-            if e.code == 'Neo.ClientError.Transaction.TransactionTimedOutClientConfiguration':
-                raise GatewayTimeout
+    # The query returns a single record with a JSON object.
+    return query_value(neo4j_instance, queryfile, 'organ_levels', params)
 
-    return result[0]
 def annotation_organs_get_logic(neo4j_instance, sab:str, ids:list[str]) -> list:
     """
     NOVEMBER 2025
@@ -1913,35 +1290,16 @@ def annotation_organs_get_logic(neo4j_instance, sab:str, ids:list[str]) -> list:
     :param ids: optional comma-delimited list of IDs, either numeric ids left-padded with zeroes or portions of preferred terms
     """
 
-    result = []
     # Load annotated Cypher query from the cypher directory.
 
     # The query is parameterized
     queryfile = 'annotation_organ.cypher'
-    querytxt = loadquerystring(queryfile)
-
-    searchids = format_list_for_query(listquery=ids)
-
-    if searchids == '':
-        searchids = f"''"
-    querytxt = querytxt.replace('$ids', searchids)
 
     if sab is None:
         sab = ''
-    querytxt = querytxt.replace('$sab', f"'{sab}'")
-
-    # Set timeout for query based on value in app.cfg.
-    query = neo4j.Query(text=querytxt, timeout=neo4j_instance.timeout)
-
-    with neo4j_instance.driver.session() as session:
-        try:
-            recds: neo4j.Result = session.run(query)
-            for recd in recds:
-                result.append(recd.get('organs'))
 
-        except neo4j.exceptions.ClientError as e:
-            # If the error is from a timeout, raise a HTTP 408.
-            if e.code == 'Neo.ClientError.Transaction.TransactionTimedOutClientConfiguration':
-                raise GatewayTimeout
+    # Pass the list of ids as a parameter. The query treats [''] as no filter.
+    params = {'ids': ids if len(ids) > 0 else [''], 'sab': sab}
 
-    return result[0]
\ No newline at end of file
+    # The query returns a single record with a JSON object.
+    return query_value(neo4j_instance, queryfile, 'organs', params)
@@ -0,0 +1,89 @@
+# coding: utf-8
+# Cursors for keyset pagination of the *-info list endpoints--e.g., genes-info.
+
+# With page-based pagination, the list queries skip (page - 1) * items_per_page rows; the cost of a page
+# grows with its depth. With keyset pagination, a query returns the rows that sort after the key of the
+# last row of the previous page.
+
+# A cursor is an opaque string that encodes the sort key of the last row of a page--e.g., the approved
+# symbol and HGNC ID of a gene--as URL-safe base64 of a JSON array.
+
+import base64
+import binascii
+import json
+from typing import Optional, Sequence
+
+import flask
+from flask import make_response
+
+# Types of the values of the sort key of each list, by position. A cursor with values of other types is
+# not valid, because its values are compared with the sort keys of the list.
+# Genes (human and mouse): symbol, which is null for mouse genes without symbols, and numeric ID
+GENE_KEY_TYPES = ((str, type(None)), (int,))
+# Proteins and cell types: UniProtKB ID or CL CodeID
+ID_KEY_TYPES = ((str,),)
+
+
+def encode_cursor(key: list) -> str:
+    """
+    Encodes the sort key of a row as a cursor.
+    :param key: list of sort key values--e.g., [approved_symbol, hgnc_id]
+    """
+    data = json.dumps(key, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(data).decode('ascii').rstrip('=')
+
+
+def valid_key(key, key_types: Sequence[tuple]) -> bool:
+    """
+    Returns True if a sort key has a value of the expected type at each position.
+    :param key: decoded sort key
+    :param key_types: tuple of the types of each value--e.g., GENE_KEY_TYPES
+    """
+    # type() instead of isinstance(), because bool is a subclass of int.
+    return isinstance(key, list) and len(key) == len(key_types) \
+        and all(type(value) in types for value, types in zip(key, key_types))
+
+
+def decode_cursor(cursor: str, key_types: Sequence[tuple]) -> Optional[list]:
+    """
+    Decodes a cursor into a sort key. Returns None for an empty cursor, which requests the first page.
+    Raises ValueError if the cursor is not valid. The message of the error does not include the cursor,
+    because controllers return it in the body of a HTTP 400.
+
+    :param cursor: cursor from the next_cursor of a response
+    :param key_types: tuple of the types of each value of the sort key of the list--e.g., GENE_KEY_TYPES.
+                      The last value is the identifier of the row, and cannot be null.
+    """
+    if cursor == '':
+        return None
+
+    try:
+        data = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        key = json.loads(data.decode('utf-8'))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError('The value for parameter cursor is not a valid cursor.')
+
+    if not valid_key(key, key_types) or key[-1] is None:
+        raise ValueError('The value for parameter cursor is not a valid cursor.')
+
+    return key
+
+
+def validate_cursor(cursor: Optional[str], page: Optional[str], key_types: Sequence[tuple]) -> Optional[flask.Response]:
+    """
+    Validates the cursor parameter of a request to a *-info list endpoint.
+    Returns a HTTP 400 response if the cursor is specified with page or is not valid; otherwise, None.
+
+    :param cursor: value of the cursor parameter, or None
+    :param page: value of the page parameter, or None
+    :param key_types: tuple of the types of each value of the sort key of the list--e.g., GENE_KEY_TYPES
+    """
+    if cursor is None:
+        return None
+    if page is not None:
+        return make_response('Specify either page or cursor, but not both.', 400)
+    try:
+        decode_cursor(cursor, key_types=key_types)
+    except ValueError as e:
+        return make_response(str(e), 400)
+    return None
@@ -0,0 +1,234 @@
+# coding: utf-8
+# In-memory starts_with prefix indexes for the genes-info, proteins-info and celltypes-info endpoints.
+
+# The portal's type-ahead search calls the list endpoints with a starts_with parameter on every keystroke.
+# In Cypher, the starts_with filter is a STARTS WITH on the names of Term nodes--e.g., toUpper(tGene.name)--
+# which cannot use an index, so both the count query and the page query scan all of the entities.
+
+# A prefix index holds the entities of a list in the sort order of the endpoint. Each entity has a rank,
+# its position in that order. The index stores the search keys of every entity (e.g., approved symbols)
+# in a sorted array, with the rank of the entity for each key. The keys that start with a prefix are a
+# contiguous range of the array, found with bisect; the ranks in that range are the entities that match
+# the prefix. The count and the page for any prefix come from the index; neo4j is queried only for the
+# information on the rows of the page (the *_rows.cypher queries).
+
+# The indexes are loaded on first use with the *_index.cypher queries, and reloaded after the UBKG release
+# changes (see release_index.py).
+
+import bisect
+import functools
+from typing import Callable, Optional, Sequence
+
+from hs_ontology_api.utils.query_executor import query_records
+from hs_ontology_api.utils.pagination_cursor import valid_key, GENE_KEY_TYPES, ID_KEY_TYPES
+from hs_ontology_api.utils.release_index import ReleaseIndex, preload_in_worker
+
+# Highest code point, used for the upper bound of the range of keys that start with a prefix.
+MAX_CHAR = chr(0x10FFFF)
+
+
+class PrefixIndex:
+
+    def __init__(self, items: list[tuple], cursor_sort_key: Callable[[list], tuple], cursor_types: Sequence[tuple],
+                 matches_maxsize: int = 256):
+        """
+        :param items: list of (sort key, CodeID, cursor key, search keys) tuples, one per entity. The search
+                      keys must be normalized to the case used for the starts_with parameter.
+        :param cursor_sort_key: function that converts a cursor key (pagination_cursor.py) into a sort key
+        :param cursor_types: types of the values of a cursor key--e.g., pagination_cursor.GENE_KEY_TYPES
+        :param matches_maxsize: number of prefixes for which to keep the matching ranks
+        """
+        items = sorted(items, key=lambda item: item[0])
+        self._sort_keys = [item[0] for item in items]
+        self._code_ids = [item[1] for item in items]
+        self._cursor_keys = [item[2] for item in items]
+        self._cursor_sort_key = cursor_sort_key
+        self._cursor_types = cursor_types
+
+        # Search keys in sorted order, with the rank of the entity for each key.
+        pairs = sorted((key, rank) for rank, item in enumerate(items) for key in set(item[3]) if key)
+        self._keys = [key for key, rank in pairs]
+        self._ranks = [rank for key, rank in pairs]
+
+        # The ranks for recent prefixes--e.g., the prefixes typed in the portal's search box.
+        self.matches = functools.lru_cache(maxsize=matches_maxsize)(self._matches)
+
+    def __len__(self) -> int:
+        return len(self._code_ids)
+
+    def _matches(self, prefix: str) -> Sequence[int]:
+        """
+        Returns the ranks of the entities with a key that starts with a prefix, in ascending order.
+        :param prefix: normalized prefix; an empty string matches all entities
+        """
+        if prefix == '':
+            return range(len(self._code_ids))
+        lo = bisect.bisect_left(self._keys, prefix)
+        hi = bisect.bisect_left(self._keys, prefix + MAX_CHAR, lo)
+        # An entity can have more than one key that starts with the prefix.
+        return tuple(sorted(set(self._ranks[lo:hi])))
+
+    def count(self, prefix: str) -> int:
+        """
+        Returns the number of entities with a key that starts with a prefix.
+        :param prefix: normalized prefix
+        """
+        return len(self.matches(prefix))
+
+    def page(self, prefix: str, skip: int, limit: int, after: Optional[list] = None) -> tuple:
+        """
+        Returns a page of the entities with a key that starts with a prefix.
+
+        :param prefix: normalized prefix
+        :param skip: number of matching entities before the page
+        :param limit: number of entities in the page
+        :param after: cursor key of the last entity of the previous page. If not None, the page starts
+                      with the first matching entity that sorts after it.
+        :return: tuple of the list of CodeIDs of the page, in sort order, and the cursor key of the
+                 last entity of the page, or None if the page is the last page.
+        Raises ValueError if the values of the cursor key are not of the types of the index, which cannot
+        be compared with the sort keys.
+        """
+        ranks = self.matches(prefix)
+        start = skip
+        if after is not None:
+            if not valid_key(after, self._cursor_types):
+                raise ValueError('The value for parameter cursor is not a valid cursor.')
+            after_rank = bisect.bisect_right(self._sort_keys, self._cursor_sort_key(after))
+            start = bisect.bisect_left(ranks, after_rank)
+        page_ranks = ranks[start:start + limit]
+        code_ids = [self._code_ids[rank] for rank in page_ranks]
+        next_key = self._cursor_keys[page_ranks[-1]] if start + limit < len(ranks) else None
+        return code_ids, next_key
+
+
+def _clean_mouse_symbol(symbol: str) -> str:
+    # Symbols for mouse genes are currently stored in format ['0610010K14Rik'].
+    return symbol.replace('[', '').replace(']', '').replace("'", '')
+
+
+def _gene_sort_key(key: list) -> tuple:
+    # Sort key of a gene from its cursor key (symbol, numeric ID): genes without a symbol sort last, as
+    # nulls do in the ORDER BY of the list queries.
+    symbol, gene_id = key
+    return symbol is None, symbol or '', gene_id
+
+
+def _load_genes(neo4j_instance) -> dict:
+    # Human genes sort by approved symbol and HGNC ID; keys are approved symbols, in upper case.
+    items = []
+    for record in query_records(neo4j_instance, 'geneslist_index.cypher'):
+        symbols = sorted(record.get('symbols'))
+        cursor_key = [symbols[0], record.get('id')]
+        items.append((_gene_sort_key(cursor_key), record.get('code_id'), cursor_key,
+                      [symbol.upper() for symbol in symbols]))
+    return {'human': PrefixIndex(items, cursor_sort_key=_gene_sort_key, cursor_types=GENE_KEY_TYPES)}
+
+
+def _load_mouse_genes(neo4j_instance) -> dict:
+    # Mouse genes sort by symbol and MGI ID, with genes without symbols last; the key is the first
+    # symbol, in upper case.
+    items = []
+    for record in query_records(neo4j_instance, 'mouse_geneslist_index.cypher'):
+        symbols = sorted(record.get('symbols'))
+        symbol = symbols[0] if len(symbols) > 0 else None
+        keys = [] if symbol is None else [_clean_mouse_symbol(symbol).upper()]
+        cursor_key = [symbol, record.get('id')]
+        items.append((_gene_sort_key(cursor_key), record.get('code_id'), cursor_key, keys))
+    return {'mouse': PrefixIndex(items, cursor_sort_key=_gene_sort_key, cursor_types=GENE_KEY_TYPES)}
+
+
+def _load_proteins(neo4j_instance) -> dict:
+    # Proteins sort by UniProtKB ID; keys are the ID, entry names and recommended names, in lower case.
+    # There is an index for all proteins, and an index for each organism in the entry names.
+    items = {'': [], 'HUMAN': [], 'MOUSE': []}
+    for record in query_records(neo4j_instance, 'proteinslist_index.cypher'):
+        protein_id = record.get('id')
+        entry_names = record.get('entry_names')
+        names = [protein_id] + record.get('recommended_names') + entry_names
+        item = ((protein_id,), record.get('code_id'), [protein_id], [name.lower() for name in names])
+        items[''].append(item)
+        for organism in ('HUMAN', 'MOUSE'):
+            if any(name.endswith(f'_{organism}') for name in entry_names):
+                items[organism].append(item)
+    return {organism: PrefixIndex(organism_items, cursor_sort_key=tuple, cursor_types=ID_KEY_TYPES)
+            for organism, organism_items in items.items()}
+
+
+def _load_celltypes(neo4j_instance) -> dict:
+    # Cell types sort by CL CodeID; keys are the preferred terms and synonyms, in lower case.
+    items = []
+    for record in query_records(neo4j_instance, 'celltypeslist_index.cypher'):
+        celltype_id = record.get('id')
+        items.append(((celltype_id,), celltype_id, [celltype_id], [name.lower() for name in record.get('names')]))
+    return {'': PrefixIndex(items, cursor_sort_key=tuple, cursor_types=ID_KEY_TYPES)}
+
+
+class PrefixIndexes:
+
+    def __init__(self, enabled: bool = True):
+        """
+        :param enabled: whether the list endpoints use the prefix indexes
+        """
+        self.enabled = enabled
+        # Indexes keyed by entity, then by organism. Each entity is loaded with a single query.
+        self._indexes = {
+            'genes': ReleaseIndex(name='prefix index (human genes)', loader=_load_genes),
+            'mouse_genes': ReleaseIndex(name='prefix index (mouse genes)', loader=_load_mouse_genes),
+            'proteins': ReleaseIndex(name='prefix index (proteins)', loader=_load_proteins),
+            'celltypes': ReleaseIndex(name='prefix index (cell types)', loader=_load_celltypes)
+        }
+
+    def configure(self, cfg):
+        """
+        Applies settings from app.cfg.
+        :param cfg: Flask configuration
+        """
+        self.enabled = cfg.get('PREFIX_INDEX_ENABLED', self.enabled)
+
+    def get(self, neo4j_instance, entity: str, organism: str = '') -> PrefixIndex:
+        """
+        Returns the index for an entity and organism, loading it if necessary.
+        :param neo4j_instance: neo4j connection
+        :param entity: genes, mouse_genes, proteins or celltypes
+        :param organism: human for genes; mouse for mouse_genes; '', HUMAN or MOUSE for proteins; '' for celltypes
+        """
+        return self._indexes[entity].get(neo4j_instance)[organism]
+
+    def preload(self, neo4j_instance):
+        """
+        Loads all of the indexes.
+        :param neo4j_instance: neo4j connection
+        """
+        for index in self._indexes.values():
+            index.get(neo4j_instance)
+
+    def stats(self) -> dict:
+        """
+        Returns the state and size of the indexes.
+        """
+        stats = {"enabled": self.enabled}
+        for entity, index in self._indexes.items():
+            stats[entity] = index.stats()
+            value = index.peek()
+            if value is not None:
+                stats[entity]["size"] = {organism or 'all': len(organism_index)
+                                         for organism, organism_index in value.items()}
+        return stats
+
+
+# Indexes shared by the controllers in this worker process.
+prefix_indexes = PrefixIndexes()
+
+
+def init_prefix_indexes(cfg, neo4j_instance) -> PrefixIndexes:
+    """
+    Configures the shared indexes from app.cfg, and loads them at application startup if
+    PREFIX_INDEX_PRELOAD is True.
+    :param cfg: Flask configuration
+    :param neo4j_instance: neo4j connection
+    """
+    prefix_indexes.configure(cfg)
+    if prefix_indexes.enabled and cfg.get('PREFIX_INDEX_PRELOAD', False) and neo4j_instance is not None:
+        preload_in_worker('prefix indexes', lambda: prefix_indexes.preload(neo4j_instance))
+    return prefix_indexes
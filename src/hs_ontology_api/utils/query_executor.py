@@ -0,0 +1,315 @@
+# coding: utf-8
+# Shared executor for the Cypher query templates.
+
+# Every function in neo4j_logic.py runs its query through this module, which:
+# 1. obtains the query string from the template registry (cypher_templates.py), and checks the Bolt
+#    parameters against the placeholders of the template;
+# 2. runs the query with Bolt parameters in a managed read transaction, with the timeout from app.cfg;
+# 3. streams records to a transform function as they arrive from neo4j, instead of building a list of
+#    raw records first;
+# 4. converts a query timeout into a HTTP 504 (GatewayTimeout), and logs and re-raises any other error
+#    instead of silently returning an empty or partial response;
+# 5. records per-template timings from the driver's ResultSummary, in query_stats and in the Prometheus
+#    metrics (metrics.py);
+# 6. logs queries above the slow query threshold, and queries that exceed the timeout, with their
+#    parameters (slow_query_log.py).
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+import neo4j
+from werkzeug.exceptions import GatewayTimeout
+
+from hs_ontology_api.utils import cypher_templates
+from hs_ontology_api.utils.metrics import metrics
+from hs_ontology_api.utils.slow_query_log import slow_query_log
+
+logger = logging.getLogger(__name__)
+
+# Codes that neo4j returns when a transaction exceeds its timeout.
+TIMEOUT_CODES = frozenset(['Neo.ClientError.Transaction.TransactionTimedOutClientConfiguration',
+                           'Neo.ClientError.Transaction.TransactionTimedOut'])
+
+
+class QueryStats:
+
+    def __init__(self, name: str):
+        """
+        Aggregate timings for a single Cypher template.
+
+        The timings come from the ResultSummary of each query:
+        - result_available_after: ms until the server could stream the first record
+        - result_consumed_after: ms until the server had streamed the last record
+
+        :param name: file name of the template
+        """
+        self.name = name
+        self.calls = 0
+        self.records = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.available_ms_total = 0
+        self.available_ms_max = 0
+        self.consumed_ms_total = 0
+        self.consumed_ms_max = 0
+
+    def serialize(self) -> dict:
+        calls = max(self.calls, 1)
+        return {
+            "template": self.name,
+            "calls": self.calls,
+            "records": self.records,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "result_available_after_ms": {
+                "total": self.available_ms_total,
+                "mean": round(self.available_ms_total / calls, 2),
+                "max": self.available_ms_max
+            },
+            "result_consumed_after_ms": {
+                "total": self.consumed_ms_total,
+                "mean": round(self.consumed_ms_total / calls, 2),
+                "max": self.consumed_ms_max
+            }
+        }
+
+
+class QueryStatsRegistry:
+
+    def __init__(self):
+        """
+        Per-template query statistics for this worker process.
+        """
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def _get(self, name: str) -> QueryStats:
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = QueryStats(name)
+            self._stats[name] = stats
+        return stats
+
+    def record(self, name: str, summary: neo4j.ResultSummary, records: int):
+        """
+        Adds the timings of a completed query.
+        :param name: file name of the template
+        :param summary: ResultSummary of the query
+        :param records: number of records streamed
+        """
+        available = summary.result_available_after or 0
+        consumed = summary.result_consumed_after or 0
+        with self._lock:
+            stats = self._get(name)
+            stats.calls += 1
+            stats.records += records
+            stats.available_ms_total += available
+            stats.available_ms_max = max(stats.available_ms_max, available)
+            stats.consumed_ms_total += consumed
+            stats.consumed_ms_max = max(stats.consumed_ms_max, consumed)
+
+    def record_error(self, name: str, timeout: bool = False):
+        """
+        Counts a failed query.
+        :param name: file name of the template
+        :param timeout: whether the query failed because of a timeout
+        """
+        with self._lock:
+            stats = self._get(name)
+            stats.errors += 1
+            if timeout:
+                stats.timeouts += 1
+
+    def snapshot(self) -> list[dict]:
+        """
+        Returns the statistics for all templates, ordered by template name.
+        """
+        with self._lock:
+            return [self._stats[name].serialize() for name in sorted(self._stats)]
+
+    def reset(self):
+        with self._lock:
+            self._stats = {}
+
+
+# Statistics shared by all queries in this worker process.
+query_stats = QueryStatsRegistry()
+
+
+def _check_params(template: cypher_templates.CypherTemplate, params: dict):
+    """
+    Checks the Bolt parameters of a query against the placeholders of its template.
+    A missing parameter is a programming error: it raises a ValueError that names the template, instead of
+    the ParameterMissing error that neo4j would return. An extra parameter is only logged, because some
+    functions pass one set of parameters to alternative templates--e.g., dataset_types_get_logic.
+    """
+    missing = template.placeholders.difference(params)
+    if missing:
+        raise ValueError(f'Query {template.name} is missing parameters: {", ".join(sorted(missing))}')
+    extra = set(params).difference(template.placeholders)
+    if extra:
+        logger.debug(f'Query {template.name} does not use parameters: {", ".join(sorted(extra))}')
+
+
+def _handle_client_error(queryfile: str, params: dict, start: float, e: neo4j.exceptions.ClientError):
+    """
+    Converts a timeout into a HTTP 504; logs and re-raises any other client error.
+    """
+    if e.code in TIMEOUT_CODES:
+        query_stats.record_error(queryfile, timeout=True)
+        metrics.count_query_error(queryfile, timeout=True)
+        slow_query_log.record_timeout(queryfile, params, time.perf_counter() - start)
+        logger.warning(f'Query {queryfile} exceeded the timeout.')
+        raise GatewayTimeout
+    query_stats.record_error(queryfile)
+    metrics.count_query_error(queryfile)
+    logger.error(f'Query {queryfile} failed: {e.code} {e.message}')
+    raise e
+
+
+def _log_summary(queryfile: str, params: dict, start: float, summary: neo4j.ResultSummary, records: int):
+    query_stats.record(queryfile, summary, records)
+    metrics.observe_query(queryfile, summary, records)
+    slow_query_log.record(queryfile, params, summary, records, time.perf_counter() - start)
+    logger.debug(f'Query {queryfile}: {records} records; available after {summary.result_available_after} ms; '
+                 f'consumed after {summary.result_consumed_after} ms')
+
+
+class _RecordCounter:
+
+    def __init__(self, result: neo4j.Result):
+        """
+        Iterates a neo4j.Result, counting the records streamed.
+        """
+        self._result = result
+        self.count = 0
+
+    def __iter__(self):
+        for record in self._result:
+            self.count += 1
+            yield record
+
+
+def execute_read(neo4j_instance, queryfile: str, params: Optional[dict], work: Callable[[Iterable[neo4j.Record]], Any]) -> Any:
+    """
+    Runs a Cypher template in a managed read transaction and returns the value of work.
+
+    The driver retries a managed transaction after a transient error, so work must not have side effects
+    outside its own return value.
+
+    :param neo4j_instance: neo4j connection
+    :param queryfile: file name of the template in the cypher directory
+    :param params: Bolt parameters for the query
+    :param work: function that consumes the records of the query
+    """
+    template = cypher_templates.registry.get(queryfile)
+    querytxt = template.text
+    if params is None:
+        params = {}
+    _check_params(template, params)
+
+    # Set timeout for query based on value in app.cfg.
+    @neo4j.unit_of_work(timeout=neo4j_instance.timeout)
+    def _work(tx: neo4j.ManagedTransaction):
+        result = tx.run(querytxt, params)
+        counter = _RecordCounter(result)
+        value = work(counter)
+        summary = result.consume()
+        return value, summary, counter.count
+
+    start = time.perf_counter()
+    try:
+        with neo4j_instance.driver.session(default_access_mode=neo4j.READ_ACCESS) as session:
+            value, summary, count = session.execute_read(_work)
+    except neo4j.exceptions.ClientError as e:
+        _handle_client_error(queryfile, params, start, e)
+
+    _log_summary(queryfile, params, start, summary, count)
+    return value
+
+
+def query_records(neo4j_instance, queryfile: str, params: Optional[dict] = None,
+                  transform: Optional[Callable[[neo4j.Record], Any]] = None) -> list:
+    """
+    Runs a Cypher template and returns a list with one element per record.
+
+    :param neo4j_instance: neo4j connection
+    :param queryfile: file name of the template in the cypher directory
+    :param params: Bolt parameters for the query
+    :param transform: function applied to each record as it is streamed. If None, returns the records.
+    """
+    def work(records) -> list:
+        if transform is None:
+            return list(records)
+        return [transform(record) for record in records]
+
+    return execute_read(neo4j_instance, queryfile, params, work)
+
+
+def query_single(neo4j_instance, queryfile: str, params: Optional[dict] = None) -> Optional[neo4j.Record]:
+    """
+    Runs a Cypher template and returns its first record, or None if there are no records.
+
+    :param neo4j_instance: neo4j connection
+    :param queryfile: file name of the template in the cypher directory
+    :param params: Bolt parameters for the query
+    """
+    def work(records) -> Optional[neo4j.Record]:
+        return next(iter(records), None)
+
+    return execute_read(neo4j_instance, queryfile, params, work)
+
+
+def query_value(neo4j_instance, queryfile: str, key: str, params: Optional[dict] = None, default=None) -> Any:
+    """
+    Runs a Cypher template and returns a single value from its first record.
+    Most of the templates return one record with a complete JSON object--e.g., COLLECT(...) AS genes.
+
+    :param neo4j_instance: neo4j connection
+    :param queryfile: file name of the template in the cypher directory
+    :param key: name of the value in the record
+    :param params: Bolt parameters for the query
+    :param default: return value if there are no records
+    """
+    record = query_single(neo4j_instance, queryfile, params)
+    if record is None:
+        return default
+    return record.get(key, default)
+
+
+def stream_records(neo4j_instance, queryfile: str, params: Optional[dict] = None,
+                   transform: Optional[Callable[[neo4j.Record], Any]] = None) -> Iterator:
+    """
+    Runs a Cypher template and yields its records as they arrive from neo4j.
+
+    Because the records are consumed outside the transaction function, this uses an explicit read
+    transaction, which the driver does not retry. The session stays open until the generator is exhausted
+    or closed.
+
+    :param neo4j_instance: neo4j connection
+    :param queryfile: file name of the template in the cypher directory
+    :param params: Bolt parameters for the query
+    :param transform: function applied to each record before it is yielded. If None, yields the records.
+    """
+    template = cypher_templates.registry.get(queryfile)
+    querytxt = template.text
+    if params is None:
+        params = {}
+    _check_params(template, params)
+
+    start = time.perf_counter()
+    try:
+        with neo4j_instance.driver.session(default_access_mode=neo4j.READ_ACCESS) as session:
+            with session.begin_transaction(timeout=neo4j_instance.timeout) as tx:
+                result = tx.run(querytxt, params)
+                count = 0
+                for record in result:
+                    count += 1
+                    yield record if transform is None else transform(record)
+                summary = result.consume()
+    except neo4j.exceptions.ClientError as e:
+        _handle_client_error(queryfile, params, start, e)
+
+    _log_summary(queryfile, params, start, summary, count)
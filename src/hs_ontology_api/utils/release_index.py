@@ -0,0 +1,114 @@
+# coding: utf-8
+# In-memory indexes that are loaded from neo4j once per UBKG release.
+
+# Some endpoints are answered from indexes that the API loads from the UBKG into memory--e.g., the gene
+# resolver (gene_resolver.py) and the starts_with prefix indexes (prefix_index.py). An index is loaded
+# on first use, and reloaded after the UBKG release changes (see ubkg_version.py). While one request
+# reloads an index, requests in other threads continue to use the index of the previous release.
+
+# Each uWSGI worker process has its own indexes.
+
+import logging
+import threading
+import time
+from typing import Any, Callable
+
+from hs_ontology_api.utils.ubkg_version import ubkg_version
+
+logger = logging.getLogger(__name__)
+
+
+class ReleaseIndex:
+
+    def __init__(self, name: str, loader: Callable[[Any], Any]):
+        """
+        :param name: name of the index, for logging
+        :param loader: function that loads the index, with the neo4j connection as its argument
+        """
+        self.name = name
+        self._loader = loader
+        self._value = None
+        self._stale = False
+        self._loading = False
+        self._lock = threading.Lock()
+        self._loaded = threading.Condition(self._lock)
+        ubkg_version.add_listener(self.clear)
+
+    def clear(self):
+        """
+        Marks the index as stale--e.g., after a change of UBKG release. The next request reloads the index.
+        """
+        with self._lock:
+            self._stale = True
+
+    def peek(self) -> Any:
+        """
+        Returns the current index without loading it, or None if the index has not been loaded.
+        """
+        with self._lock:
+            return self._value
+
+    def get(self, neo4j_instance) -> Any:
+        """
+        Returns the current index, loading it if necessary.
+        :param neo4j_instance: neo4j connection
+        """
+        ubkg_version.check(neo4j_instance)
+
+        with self._lock:
+            while True:
+                if self._value is not None and (not self._stale or self._loading):
+                    return self._value
+                if not self._loading:
+                    self._loading = True
+                    break
+                # Another thread is loading the first index.
+                self._loaded.wait()
+
+        try:
+            start = time.perf_counter()
+            value = self._loader(neo4j_instance)
+            logger.info(f'Loaded {self.name} in {time.perf_counter() - start:.1f} s.')
+            with self._lock:
+                self._value = value
+                self._stale = False
+            return value
+        finally:
+            with self._lock:
+                self._loading = False
+                self._loaded.notify_all()
+
+    def stats(self) -> dict:
+        """
+        Returns the state of the index.
+        """
+        with self._lock:
+            return {
+                "loaded": self._value is not None,
+                "stale": self._stale
+            }
+
+
+def preload_in_worker(name: str, func: Callable[[], Any]):
+    """
+    Loads an index at application startup.
+
+    The uWSGI master process imports the application before it forks the workers. The neo4j driver's
+    connections cannot be shared between processes, so under uWSGI each worker loads its index after the
+    fork. An error is logged; the index then loads on first use.
+
+    :param name: name of the index, for logging
+    :param func: function that loads the index
+    """
+    def preload():
+        try:
+            func()
+        except Exception as e:
+            logger.warning(f'Unable to preload {name}: {e}')
+
+    try:
+        from uwsgidecorators import postfork
+    except ImportError:
+        preload()
+    else:
+        postfork(preload)
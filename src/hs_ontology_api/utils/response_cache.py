@@ -0,0 +1,276 @@
+# coding: utf-8
+# Response cache for read-only ontology endpoints.
+
+# The UBKG changes only when a new release is loaded into the neo4j instance, but endpoints such as
+# organs, dataset-types, assayclasses, field-* and valueset run their full Cypher query on every request.
+# Most of the traffic for these endpoints is a small set of identical portal requests.
+
+# The cache stores successful (HTTP 200) JSON responses in memory, keyed by endpoint path and normalized
+# query arguments. Entries expire after a TTL, which can be overridden per endpoint in app.cfg, and the
+# cache is bounded in size with LRU eviction.
+
+# An entry keeps the uncompressed body of a response and, as clients request them, its gzip and zstd
+# compressed bodies (see response_compression.py), so that a hit is not compressed again.
+
+# Responses have an ETag and a Cache-Control header (see etags.py). A request with an If-None-Match header
+# that matches the ETag is answered with a 304, from the cache key alone.
+
+# The cache is cleared when the UBKG release changes (see ubkg_version.py).
+
+# Each uWSGI worker process has its own cache.
+
+import functools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from flask import current_app, make_response, request
+
+from hs_ontology_api.utils.ubkg_version import ubkg_version
+from hs_ontology_api.utils.json_response import stream_requested, large_response_threshold
+from hs_ontology_api.utils.response_compression import negotiate_encoding, compress, decompress, \
+    set_content_encoding
+from hs_ontology_api.utils.etags import request_etag, matching_etag, set_validators, not_modified_response
+from hs_ontology_api.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class CacheEntry:
+
+    def __init__(self, body: bytes, mimetype: str, expires: float):
+        """
+        A cached response.
+        :param body: uncompressed response body
+        :param mimetype: response mimetype
+        :param expires: time (time.monotonic) after which the entry is stale
+        """
+        self.body = body
+        self.mimetype = mimetype
+        self.expires = expires
+        # Compressed bodies, keyed by content encoding--e.g., {'gzip': b'...'}
+        self.encoded = {}
+
+    def encoded_body(self, encoding: Optional[str]) -> bytes:
+        """
+        Returns the body in a content encoding, compressing it on first use.
+        :param encoding: zstd, gzip or None (uncompressed)
+        """
+        if encoding is None:
+            return self.body
+        body = self.encoded.get(encoding)
+        if body is None:
+            # Concurrent requests can compress the same body; the last one is kept.
+            body = compress(self.body, encoding)
+            self.encoded[encoding] = body
+        return body
+
+
+class ResponseCache:
+
+    def __init__(self, enabled: bool = True, maxsize: int = 1024, ttl: int = 86400,
+                 ttl_overrides: Optional[dict] = None):
+        """
+        :param enabled: whether the cache stores and serves responses
+        :param maxsize: maximum number of entries; the least recently used entry is evicted first
+        :param ttl: default time-to-live of an entry, in seconds
+        :param ttl_overrides: dict of TTLs, in seconds, keyed by endpoint name--e.g., {'organs': 3600}
+        """
+        self.enabled = enabled
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.ttl_overrides = ttl_overrides or {}
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def configure(self, cfg):
+        """
+        Applies settings from app.cfg. Missing settings keep their defaults.
+        :param cfg: Flask configuration
+        """
+        self.enabled = cfg.get('RESPONSE_CACHE_ENABLED', self.enabled)
+        self.maxsize = cfg.get('RESPONSE_CACHE_MAXSIZE', self.maxsize)
+        self.ttl = cfg.get('RESPONSE_CACHE_TTL', self.ttl)
+        self.ttl_overrides = cfg.get('RESPONSE_CACHE_TTL_OVERRIDES', self.ttl_overrides)
+        self.clear()
+
+    def ttl_for(self, endpoint: str) -> int:
+        """
+        Returns the TTL for an endpoint.
+        :param endpoint: endpoint name
+        """
+        return self.ttl_overrides.get(endpoint, self.ttl)
+
+    def get(self, key: tuple) -> Optional[CacheEntry]:
+        """
+        Returns the entry for a key, or None if there is no current entry.
+        :param key: cache key
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires <= time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                metrics.count_cache('response', 'miss')
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            metrics.count_cache('response', 'hit')
+            return entry
+
+    def set(self, key: tuple, entry: CacheEntry):
+        """
+        Adds an entry, evicting the least recently used entries if the cache is full.
+        :param key: cache key
+        :param entry: entry to cache
+        """
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def count_not_modified(self):
+        """
+        Counts a request answered with a 304.
+        """
+        with self._lock:
+            self.not_modified += 1
+        metrics.count_cache('response', 'not_modified')
+
+    def clear(self):
+        """
+        Removes all entries.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def invalidate(self):
+        """
+        Clears the cache after a change of UBKG release.
+        """
+        with self._lock:
+            logger.info(f'Clearing {len(self._entries)} cached responses.')
+            self._entries.clear()
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        """
+        Returns cache counters.
+        """
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "not_modified": self.not_modified,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "fingerprint": ubkg_version.fingerprint
+            }
+
+
+# Cache shared by the controllers in this worker process.
+response_cache = ResponseCache()
+ubkg_version.add_listener(response_cache.invalidate)
+
+
+def init_response_cache(cfg) -> ResponseCache:
+    """
+    Configures the shared cache from app.cfg. Called once at application startup.
+    :param cfg: Flask configuration
+    """
+    response_cache.configure(cfg)
+    logger.info(f'Response cache enabled: {response_cache.enabled}; maxsize: {response_cache.maxsize}; '
+                f'default TTL: {response_cache.ttl} s')
+    return response_cache
+
+
+def cache_key(endpoint: str) -> tuple:
+    """
+    Builds the cache key for the current request from the endpoint name, the path (which includes any
+    path parameters) and the query arguments.
+
+    Arguments are sorted by name. The values of a repeated argument keep their order, because order can
+    be meaningful--e.g., child_sabs for the valueset endpoint.
+
+    :param endpoint: endpoint name
+    """
+    args = tuple((name, tuple(values)) for name, values in sorted(request.args.lists()))
+    return endpoint, request.path, args
+
+
+def cached_response(endpoint: str) -> Callable:
+    """
+    Decorator for the view function of a read-only endpoint. Serves the response from the cache when
+    possible; otherwise calls the view function and caches a successful JSON response.
+
+    Error responses (e.g., 400 or 404) and S3 redirects (303), whose URLs expire, are not cached.
+    Requests for streamed (NDJSON) responses bypass the cache.
+
+    Successful responses have an ETag; a request with a matching If-None-Match header receives a 304
+    without calling the view function.
+
+    :param endpoint: endpoint name, used for TTL and Cache-Control max-age overrides in app.cfg
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not response_cache.enabled or stream_requested():
+                return func(*args, **kwargs)
+
+            ubkg_version.check(current_app.neo4jConnectionHelper.instance())
+
+            key = cache_key(endpoint)
+            etag = request_etag(key)
+            matched = matching_etag(etag)
+            if matched is not None:
+                response_cache.count_not_modified()
+                return not_modified_response(endpoint, matched)
+
+            entry = response_cache.get(key)
+            if entry is not None:
+                encoding = negotiate_encoding(len(entry.body))
+                body = entry.encoded_body(encoding)
+                # A response cached for a client that accepts compression can exceed the payload limit
+                # for a client that does not; the view function then handles the large response.
+                threshold = large_response_threshold()
+                if threshold == 0 or len(body) <= threshold:
+                    resp = make_response(body)
+                    resp.mimetype = entry.mimetype
+                    set_content_encoding(resp, encoding)
+                    set_validators(resp, endpoint, etag)
+                    resp.headers['X-Cache'] = 'HIT'
+                    return resp
+
+            resp = make_response(func(*args, **kwargs))
+            if resp.status_code == 200 and resp.is_json:
+                body = resp.get_data()
+                encoding = resp.content_encoding
+                entry = CacheEntry(body=decompress(body, encoding),
+                                   mimetype=resp.mimetype,
+                                   expires=time.monotonic() + response_cache.ttl_for(endpoint))
+                if encoding is not None:
+                    entry.encoded[encoding] = body
+                response_cache.set(key, entry)
+                set_validators(resp, endpoint, etag)
+            resp.headers['X-Cache'] = 'MISS'
+            return resp
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,127 @@
+# coding: utf-8
+# Compression of JSON responses, negotiated with the Accept-Encoding header of the request.
+
+# The payload limit of the AWS API gateway applies to the bytes that the API sends, but the ubkg-api
+# checks LARGE_RESPONSE_THRESHOLD against the uncompressed response. Ontology JSON compresses by a factor
+# of 10-20, so many responses that were redirected to S3 fit under the limit once compressed.
+
+# redirect_if_large (json_response.py) compresses a response with zstd or gzip, if the client accepts
+# either encoding, and checks the size of the compressed response against the threshold. The response
+# cache (response_cache.py) keeps the compressed bodies with the uncompressed body of a cached response.
+
+# zstd requires the optional zstandard package; gzip is always available.
+
+import gzip
+from typing import Optional
+
+from flask import current_app, has_request_context, request
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Supported encodings, in order of preference for equal quality values in Accept-Encoding.
+ENCODINGS = ('zstd', 'gzip')
+
+# Defaults for settings in app.cfg.
+DEFAULT_MIN_SIZE = 1024
+DEFAULT_GZIP_LEVEL = 6
+DEFAULT_ZSTD_LEVEL = 3
+
+
+def available_encodings(size: int) -> list[str]:
+    """
+    Returns the encodings that the API can use for a response body, or an empty list if compression is
+    disabled in app.cfg or the body is smaller than RESPONSE_COMPRESSION_MIN_SIZE.
+    :param size: size of the uncompressed body, in bytes
+    """
+    cfg = current_app.config
+    if not cfg.get('RESPONSE_COMPRESSION_ENABLED', True):
+        return []
+    if size < cfg.get('RESPONSE_COMPRESSION_MIN_SIZE', DEFAULT_MIN_SIZE):
+        return []
+    return [encoding for encoding in ENCODINGS if encoding != 'zstd' or zstandard is not None]
+
+
+def negotiate_encoding(size: int) -> Optional[str]:
+    """
+    Returns the encoding for a response body, or None if the body should not be compressed: compression
+    is disabled in app.cfg, the body is smaller than RESPONSE_COMPRESSION_MIN_SIZE, the client accepts
+    none of the supported encodings, or there is no request.
+
+    :param size: size of the uncompressed body, in bytes
+    """
+    cfg = current_app.config
+    if not cfg.get('RESPONSE_COMPRESSION_ENABLED', True) or not has_request_context():
+        return None
+    if size < cfg.get('RESPONSE_COMPRESSION_MIN_SIZE', DEFAULT_MIN_SIZE):
+        return None
+
+    best = None
+    best_quality = 0
+    for encoding in ENCODINGS:
+        if encoding == 'zstd' and zstandard is None:
+            continue
+        # Quality of the encoding in Accept-Encoding, including a match to *; 0 if not accepted.
+        quality = request.accept_encodings[encoding]
+        if quality > best_quality:
+            best = encoding
+            best_quality = quality
+    return best
+
+
+def compress(body: bytes, encoding: Optional[str]) -> bytes:
+    """
+    Compresses a response body.
+    :param body: uncompressed body
+    :param encoding: zstd, gzip or None (no compression)
+    """
+    cfg = current_app.config
+    if encoding == 'zstd':
+        level = cfg.get('RESPONSE_COMPRESSION_ZSTD_LEVEL', DEFAULT_ZSTD_LEVEL)
+        return zstandard.ZstdCompressor(level=level).compress(body)
+    if encoding == 'gzip':
+        # A fixed mtime makes the compressed body depend only on the uncompressed body.
+        level = cfg.get('RESPONSE_COMPRESSION_GZIP_LEVEL', DEFAULT_GZIP_LEVEL)
+        return gzip.compress(body, compresslevel=level, mtime=0)
+    return body
+
+
+def decompress(body: bytes, encoding: Optional[str]) -> bytes:
+    """
+    Decompresses a response body.
+    :param body: compressed body
+    :param encoding: zstd, gzip or None (no compression)
+    """
+    if encoding == 'zstd':
+        return zstandard.ZstdDecompressor().decompress(body)
+    if encoding == 'gzip':
+        return gzip.decompress(body)
+    return body
+
+
+def encode_body(body: bytes) -> tuple[bytes, Optional[str]]:
+    """
+    Compresses a response body with the encoding negotiated for the current request.
+    :param body: uncompressed body
+    :return: tuple of the body to send and its encoding, or None if the body is not compressed
+    """
+    encoding = negotiate_encoding(len(body))
+    return compress(body, encoding), encoding
+
+
+def set_content_encoding(response, encoding: Optional[str]):
+    """
+    Sets the headers of a response for the encoding of its body.
+
+    If compression is enabled, the response varies with Accept-Encoding even if it is not compressed, so
+    that shared caches do not serve a compressed response to a client that does not accept it.
+
+    :param response: Flask response
+    :param encoding: zstd, gzip or None (no compression)
+    """
+    if encoding is not None:
+        response.content_encoding = encoding
+    if current_app.config.get('RESPONSE_COMPRESSION_ENABLED', True):
+        response.vary.add('Accept-Encoding')
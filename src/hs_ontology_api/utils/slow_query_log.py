@@ -0,0 +1,219 @@
+# coding: utf-8
+# Log of slow neo4j queries, with a table of the worst offenders.
+
+# A query whose server time (result_available_after + result_consumed_after, from the ResultSummary)
+# exceeds SLOW_QUERY_THRESHOLD_MS in app.cfg is logged as a structured (JSON) entry with the file name of
+# the Cypher template, a digest of the Bolt parameters, the parameters themselves (truncated), the path and
+# arguments of the request, the number of records streamed and the timings of the ResultSummary.
+# A query that exceeds the TIMEOUT has no ResultSummary; it is always logged, with the time elapsed until
+# the timeout in the client.
+
+# Entries are grouped by template and parameter digest, so that repeated requests with the same
+# pathological input--e.g., a long list of genes for pathways/with-genes--count as one offender. The
+# SLOW_QUERY_TOP_N offenders with the longest durations are kept in memory and returned by the
+# /admin/slow-queries route, which nginx serves on the internal port only.
+
+# Each uWSGI worker process keeps its own table. If SLOW_QUERY_DIR is set in app.cfg, each worker also
+# writes its table to a file in that directory whenever the table changes, and the route merges the tables
+# of all workers.
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Optional
+
+import flask
+import neo4j
+from flask import has_request_context, request
+
+logger = logging.getLogger(__name__)
+
+
+def param_digest(params: dict) -> str:
+    """
+    Returns a digest of Bolt parameters that does not depend on the order of the keys.
+    :param params: Bolt parameters
+    """
+    text = json.dumps(params, sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+
+
+class SlowQueryLog:
+
+    def __init__(self, threshold_ms: int = 5000, top_n: int = 25, params_max_length: int = 2000,
+                 directory: Optional[str] = None):
+        """
+        :param threshold_ms: server time, in ms, above which a query is logged; 0 disables the log
+        :param top_n: number of offenders kept in the table
+        :param params_max_length: maximum length of the parameters in an entry, in characters
+        :param directory: directory in which each worker process writes its table, or None
+        """
+        self.threshold_ms = threshold_ms
+        self.top_n = top_n
+        self.params_max_length = params_max_length
+        self.directory = directory
+
+        # Entries keyed by (template, parameter digest)
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def configure(self, cfg):
+        """
+        Applies settings from app.cfg.
+        :param cfg: Flask configuration
+        """
+        self.threshold_ms = cfg.get('SLOW_QUERY_THRESHOLD_MS', self.threshold_ms)
+        self.top_n = cfg.get('SLOW_QUERY_TOP_N', self.top_n)
+        self.params_max_length = cfg.get('SLOW_QUERY_PARAMS_MAX_LENGTH', self.params_max_length)
+        self.directory = cfg.get('SLOW_QUERY_DIR') or None
+        if self.directory is not None:
+            os.makedirs(self.directory, exist_ok=True)
+        self.clear()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.threshold_ms)
+
+    def record(self, template: str, params: dict, summary: neo4j.ResultSummary, records: int, elapsed: float):
+        """
+        Logs a completed query if its server time exceeds the threshold.
+        :param template: file name of the Cypher template
+        :param params: Bolt parameters of the query
+        :param summary: ResultSummary of the query
+        :param records: number of records streamed
+        :param elapsed: time elapsed in the client, in seconds
+        """
+        if not self.enabled:
+            return
+        available = summary.result_available_after or 0
+        consumed = summary.result_consumed_after or 0
+        if available + consumed < self.threshold_ms:
+            return
+        self._add(template, params, elapsed, records=records, available=available, consumed=consumed)
+
+    def record_timeout(self, template: str, params: dict, elapsed: float):
+        """
+        Logs a query that exceeded the TIMEOUT.
+        :param template: file name of the Cypher template
+        :param params: Bolt parameters of the query
+        :param elapsed: time elapsed in the client until the timeout, in seconds
+        """
+        if not self.enabled:
+            return
+        self._add(template, params, elapsed, timeout=True)
+
+    def _add(self, template: str, params: dict, elapsed: float, records: Optional[int] = None,
+             available: Optional[int] = None, consumed: Optional[int] = None, timeout: bool = False):
+        elapsed_ms = round(elapsed * 1000)
+        entry = {
+            "template": template,
+            "param_digest": param_digest(params),
+            "params": json.dumps(params, sort_keys=True, default=str)[:self.params_max_length],
+            "request": request.full_path.rstrip('?')[:self.params_max_length] if has_request_context() else None,
+            "records": records,
+            "result_available_after_ms": available,
+            "result_consumed_after_ms": consumed,
+            "elapsed_ms": elapsed_ms,
+            "timeout": timeout,
+            # Server time, or the time until the timeout in the client
+            "duration_ms": elapsed_ms if timeout else available + consumed
+        }
+        logger.warning(f'Slow query: {json.dumps(entry)}', extra={'slow_query': entry})
+
+        key = (template, entry["param_digest"])
+        entry["last_seen"] = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        with self._lock:
+            previous = self._entries.get(key)
+            entry["count"] = 1 if previous is None else previous["count"] + 1
+            if previous is not None and previous["duration_ms"] > entry["duration_ms"]:
+                # Keep the timings of the slowest occurrence.
+                entry = dict(previous, count=entry["count"], last_seen=entry["last_seen"])
+            self._entries[key] = entry
+            while len(self._entries) > self.top_n:
+                fastest = min(self._entries, key=lambda k: self._entries[k]["duration_ms"])
+                del self._entries[fastest]
+            table = list(self._entries.values())
+        self._write(table)
+
+    def _write(self, table: list):
+        # Writes the table of this worker process to the shared directory.
+        if self.directory is None:
+            return
+        path = os.path.join(self.directory, f'slow_queries_{os.getpid()}.json')
+        temp = f'{path}.{threading.get_ident()}.tmp'
+        try:
+            with open(temp, 'w') as f:
+                json.dump(table, f)
+            os.replace(temp, path)
+        except OSError as e:
+            logger.warning(f'Unable to write the slow query table to {path}: {e}')
+
+    def _read_all(self) -> list:
+        # Returns the entries of the tables of all worker processes.
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.startswith('slow_queries_') and name.endswith('.json'):
+                try:
+                    with open(os.path.join(self.directory, name)) as f:
+                        entries.extend(json.load(f))
+                except (OSError, ValueError) as e:
+                    logger.warning(f'Unable to read the slow query table {name}: {e}')
+        return entries
+
+    def top(self) -> list[dict]:
+        """
+        Returns the offenders with the longest durations, slowest first--of all worker processes, if
+        SLOW_QUERY_DIR is set.
+        """
+        if self.directory is not None:
+            merged = {}
+            for entry in self._read_all():
+                key = (entry["template"], entry["param_digest"])
+                previous = merged.get(key)
+                if previous is None:
+                    merged[key] = entry
+                    continue
+                count = previous["count"] + entry["count"]
+                last_seen = max(previous["last_seen"], entry["last_seen"])
+                slowest = entry if entry["duration_ms"] > previous["duration_ms"] else previous
+                merged[key] = dict(slowest, count=count, last_seen=last_seen)
+            entries = list(merged.values())
+        else:
+            with self._lock:
+                entries = list(self._entries.values())
+        entries.sort(key=lambda entry: entry["duration_ms"], reverse=True)
+        return entries[:self.top_n]
+
+    def clear(self):
+        """
+        Removes all entries of this worker process.
+        """
+        with self._lock:
+            self._entries = {}
+
+
+# Log shared by the queries in this worker process.
+slow_query_log = SlowQueryLog()
+
+
+def slow_queries_view() -> flask.Response:
+    return flask.jsonify({
+        "threshold_ms": slow_query_log.threshold_ms,
+        "top_n": slow_query_log.top_n,
+        "slow_queries": slow_query_log.top()
+    })
+
+
+def init_slow_query_log(cfg, app) -> SlowQueryLog:
+    """
+    Configures the shared log from app.cfg, and adds the /admin/slow-queries route to the application.
+    :param cfg: Flask configuration
+    :param app: Flask application
+    """
+    slow_query_log.configure(cfg)
+    logger.info(f'Slow query threshold: {slow_query_log.threshold_ms} ms; top {slow_query_log.top_n} kept')
+    app.add_url_rule('/admin/slow-queries', 'slow_queries', slow_queries_view, methods=['GET'])
+    return slow_query_log
@@ -0,0 +1,270 @@
+# coding: utf-8
+# Store of ready-to-send responses for static endpoints.
+
+# The organs, organs/by-code, dataset-types, dataset-types/hierarchy and assayclasses endpoints are called
+# on every page load of the portal with the same few arguments--usually only an application context--and
+# their responses change only when a new UBKG release is loaded.
+
+# For these endpoints, the store keeps the serialized body of each response, its compressed bodies for the
+# encodings that the API supports (response_compression.py). A request with only the arguments of a static
+# variant--e.g., application_context--is answered with a dictionary lookup; a request with an If-None-Match
+# header that matches the ETag (etags.py) is answered with a 304. Other requests--e.g., with filter
+# arguments--use the response cache (response_cache.py).
+
+# The store is warmed at startup, if STATIC_RESPONSE_PRELOAD is True in app.cfg, by requesting every
+# static variant of every endpoint--e.g., every valid application context. The store is cleared when the
+# UBKG release changes; each response is then rebuilt on its next request.
+
+# Each uWSGI worker process has its own store.
+
+import functools
+import logging
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+from flask import current_app, make_response, request, url_for
+
+from hs_ontology_api.utils.ubkg_version import ubkg_version
+from hs_ontology_api.utils.json_response import stream_requested, large_response_threshold
+from hs_ontology_api.utils.response_cache import cached_response
+from hs_ontology_api.utils.response_compression import available_encodings, negotiate_encoding, compress, \
+    decompress, set_content_encoding
+from hs_ontology_api.utils.release_index import preload_in_worker
+from hs_ontology_api.utils.etags import request_etag, matching_etag, set_validators, not_modified_response
+from hs_ontology_api.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Valid values of the application_context parameter, for warm-up.
+APPLICATION_CONTEXTS = ('HUBMAP', 'SENNET')
+# Static variants of an endpoint with a required application_context parameter.
+APPLICATION_CONTEXT_VARIANTS = [{'application_context': context} for context in APPLICATION_CONTEXTS]
+
+
+class StaticResponse:
+
+    def __init__(self, body: bytes, mimetype: str, encodings: Iterable[str]):
+        """
+        A ready-to-send response.
+        :param body: uncompressed response body
+        :param mimetype: response mimetype
+        :param encodings: encodings for which to compress the body
+        """
+        self.mimetype = mimetype
+        # Bodies keyed by content encoding; None is the uncompressed body.
+        self.bodies = {None: body}
+        for encoding in encodings:
+            self.bodies[encoding] = compress(body, encoding)
+
+    def size(self) -> int:
+        """
+        Returns the size of all of the bodies, in bytes.
+        """
+        return sum(len(body) for body in self.bodies.values())
+
+    def respond(self):
+        """
+        Returns the response for the current request, or None if the body for the encodings accepted by
+        the client exceeds the LARGE_RESPONSE_THRESHOLD.
+        """
+        encoding = negotiate_encoding(len(self.bodies[None]))
+        if encoding not in self.bodies:
+            encoding = None
+        body = self.bodies[encoding]
+
+        threshold = large_response_threshold()
+        if threshold > 0 and len(body) > threshold:
+            return None
+
+        resp = current_app.response_class(body, mimetype=self.mimetype)
+        set_content_encoding(resp, encoding)
+        return resp
+
+
+class StaticResponseStore:
+
+    def __init__(self, enabled: bool = True):
+        """
+        :param enabled: whether static endpoints are answered from the store
+        """
+        self.enabled = enabled
+        self._responses = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.invalidations = 0
+
+    def configure(self, cfg):
+        """
+        Applies settings from app.cfg.
+        :param cfg: Flask configuration
+        """
+        self.enabled = cfg.get('STATIC_RESPONSE_ENABLED', self.enabled)
+        self.clear()
+
+    def get(self, key: tuple) -> Optional[StaticResponse]:
+        """
+        Returns the response for a key, or None if the response has not been built.
+        :param key: store key
+        """
+        with self._lock:
+            response = self._responses.get(key)
+            if response is None:
+                self.misses += 1
+                metrics.count_cache('static', 'miss')
+            else:
+                self.hits += 1
+                metrics.count_cache('static', 'hit')
+            return response
+
+    def set(self, key: tuple, response: StaticResponse):
+        """
+        Adds a response.
+        :param key: store key
+        :param response: response to store
+        """
+        with self._lock:
+            self._responses[key] = response
+
+    def count_not_modified(self):
+        with self._lock:
+            self.not_modified += 1
+        metrics.count_cache('static', 'not_modified')
+
+    def clear(self):
+        """
+        Removes all responses.
+        """
+        with self._lock:
+            self._responses.clear()
+
+    def invalidate(self):
+        """
+        Clears the store after a change of UBKG release.
+        """
+        with self._lock:
+            logger.info(f'Clearing {len(self._responses)} static responses.')
+            self._responses.clear()
+            self.invalidations += 1
+
+    def warm(self, app):
+        """
+        Builds the responses for every static variant of every static endpoint, by requesting them.
+        :param app: Flask application
+        """
+        start = time.perf_counter()
+        with app.test_request_context():
+            urls = [url_for(endpoint, **args)
+                    for endpoint, view in app.view_functions.items()
+                    for args in getattr(view, 'static_variants', [])]
+        client = app.test_client()
+        for url in urls:
+            resp = client.get(url)
+            if resp.status_code != 200:
+                logger.warning(f'Static response for {url}: HTTP {resp.status_code}')
+        logger.info(f'Built {len(urls)} static responses in {time.perf_counter() - start:.1f} s.')
+
+    def stats(self) -> dict:
+        """
+        Returns store counters.
+        """
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "size": len(self._responses),
+                "bytes": sum(response.size() for response in self._responses.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "not_modified": self.not_modified,
+                "invalidations": self.invalidations
+            }
+
+
+# Store shared by the controllers in this worker process.
+static_responses = StaticResponseStore()
+ubkg_version.add_listener(static_responses.invalidate)
+
+
+def init_static_responses(cfg, app) -> StaticResponseStore:
+    """
+    Configures the shared store from app.cfg, and builds the static responses at application startup if
+    STATIC_RESPONSE_PRELOAD is True.
+    :param cfg: Flask configuration
+    :param app: Flask application
+    """
+    static_responses.configure(cfg)
+    if static_responses.enabled and cfg.get('STATIC_RESPONSE_PRELOAD', True) \
+            and app.neo4jConnectionHelper is not None:
+        preload_in_worker('static responses', lambda: static_responses.warm(app))
+    return static_responses
+
+
+def static_key(params: frozenset) -> tuple:
+    """
+    Builds the store key for the current request from the path and the static arguments. The values of
+    static arguments are case-insensitive--e.g., application_context=hubmap is HUBMAP.
+    :param params: names of the static arguments of the endpoint
+    """
+    args = tuple((name, tuple(value.upper() for value in values))
+                 for name, values in sorted(request.args.lists()) if name in params)
+    return request.path, args
+
+
+def static_response(endpoint: str, params: Iterable[str] = (), variants: Iterable[dict] = ({},)) -> Callable:
+    """
+    Decorator for the view function of a static endpoint. Answers requests with only static arguments
+    from the store; other requests use the response cache.
+
+    Only successful JSON responses are stored.
+
+    :param endpoint: endpoint name, used for the response cache and for Cache-Control max-age overrides
+    :param params: names of the static arguments, which must be case-insensitive
+    :param variants: the arguments of each static variant, requested to warm the store--e.g.,
+                     [{'application_context': 'HUBMAP'}, {'application_context': 'SENNET'}]
+    """
+    params = frozenset(params)
+
+    def decorator(func):
+        cached = cached_response(endpoint)(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not static_responses.enabled or stream_requested() or not params.issuperset(request.args):
+                return cached(*args, **kwargs)
+
+            ubkg_version.check(current_app.neo4jConnectionHelper.instance())
+
+            key = static_key(params)
+            etag = request_etag(key)
+            matched = matching_etag(etag)
+            if matched is not None:
+                static_responses.count_not_modified()
+                return not_modified_response(endpoint, matched)
+
+            response = static_responses.get(key)
+            status = 'HIT'
+            if response is None:
+                status = 'MISS'
+                resp = make_response(func(*args, **kwargs))
+                if resp.status_code != 200 or not resp.is_json:
+                    return resp
+                body = decompress(resp.get_data(), resp.content_encoding)
+                response = StaticResponse(body=body, mimetype=resp.mimetype,
+                                          encodings=available_encodings(len(body)))
+                static_responses.set(key, response)
+
+            resp = response.respond()
+            if resp is None:
+                # The response is too large for this client; the view function handles it.
+                return func(*args, **kwargs)
+            set_validators(resp, endpoint, etag)
+            resp.headers['X-Cache'] = status
+            return resp
+
+        wrapper.static_variants = list(variants)
+        return wrapper
+
+    return decorator
@@ -0,0 +1,89 @@
+# coding: utf-8
+# Monitor for the UBKG release loaded in the neo4j instance.
+
+# The UBKG changes only when a new release is loaded. Caches of query results (e.g., response_cache.py
+# and count_cache.py) register with the monitor to be cleared when the release changes.
+
+# The monitor identifies a release by a fingerprint--the counts of nodes and relationships, which
+# neo4j reads from its count store. The fingerprint is checked at most once per interval.
+
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+from hs_ontology_api.utils.query_executor import query_single
+
+logger = logging.getLogger(__name__)
+
+# Query that returns the fingerprint of the UBKG release.
+FINGERPRINT_QUERY = 'ubkg_fingerprint.cypher'
+
+
+class UbkgVersionMonitor:
+
+    def __init__(self, check_interval: int = 60):
+        """
+        :param check_interval: minimum interval, in seconds, between checks of the fingerprint
+        """
+        self.check_interval = check_interval
+        self.fingerprint = None
+        self._listeners = []
+        self._last_check = None
+        self._check_running = False
+        self._lock = threading.Lock()
+
+    def configure(self, cfg):
+        """
+        Applies settings from app.cfg.
+        :param cfg: Flask configuration
+        """
+        self.check_interval = cfg.get('UBKG_VERSION_CHECK_INTERVAL', self.check_interval)
+
+    def add_listener(self, listener: Callable[[], None]):
+        """
+        Registers a function to call when the fingerprint changes.
+        :param listener: function with no arguments--e.g., the clear method of a cache
+        """
+        self._listeners.append(listener)
+
+    def check(self, neo4j_instance) -> Optional[tuple]:
+        """
+        Checks the fingerprint if the check interval has elapsed, and notifies the listeners if it changed.
+        Returns the current fingerprint.
+        :param neo4j_instance: neo4j connection
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._check_running or \
+                    (self._last_check is not None and now - self._last_check < self.check_interval):
+                return self.fingerprint
+            self._check_running = True
+
+        try:
+            record = query_single(neo4j_instance, FINGERPRINT_QUERY)
+            fingerprint = None if record is None else (record.get('nodes'), record.get('relationships'))
+        except Exception as e:
+            # Keep the current fingerprint; the next request will check again.
+            logger.warning(f'Unable to check the UBKG fingerprint: {e}')
+            with self._lock:
+                self._check_running = False
+            return self.fingerprint
+
+        with self._lock:
+            changed = self.fingerprint is not None and fingerprint != self.fingerprint
+            if changed:
+                logger.info(f'UBKG fingerprint changed from {self.fingerprint} to {fingerprint}.')
+            self.fingerprint = fingerprint
+            self._last_check = now
+            self._check_running = False
+
+        if changed:
+            for listener in self._listeners:
+                listener()
+
+        return fingerprint
+
+
+# Monitor shared by the caches in this worker process.
+ubkg_version = UbkgVersionMonitor()
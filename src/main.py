@@ -24,6 +24,23 @@ from hs_ontology_api.routes.datasettypes.datasettypes_controller import datasett
 from hs_ontology_api.routes.pathways.pathways_controller import pathways_blueprint
 from hs_ontology_api.routes.annotations.annotations_controller import annotations_blueprint
 
+# Preloaded Cypher query templates
+from hs_ontology_api.utils.cypher_templates import load_cypher_templates
+# Caches of query results, cleared when the UBKG release changes
+from hs_ontology_api.utils.ubkg_version import ubkg_version
+from hs_ontology_api.utils.response_cache import init_response_cache
+from hs_ontology_api.utils.count_cache import init_count_cache
+# In-memory resolver of HGNC gene identifiers, reloaded when the UBKG release changes
+from hs_ontology_api.utils.gene_resolver import init_gene_resolver
+# In-memory starts_with prefix indexes for the *-info list endpoints
+from hs_ontology_api.utils.prefix_index import init_prefix_indexes
+# Ready-to-send responses for the static endpoints (organs, dataset-types, assayclasses)
+from hs_ontology_api.utils.static_responses import init_static_responses
+# Prometheus metrics, exposed on the internal /metrics route
+from hs_ontology_api.utils.metrics import init_metrics
+# Log of slow queries, with a table of the worst offenders on the internal /admin/slow-queries route
+from hs_ontology_api.utils.slow_query_log import init_slow_query_log
+
 def make_flask_config():
     """
     Used to override the "native" app.cfg for the ubkg-api instantiated by the child API with
@@ -61,6 +78,22 @@ app.register_blueprint(datasettypes_blueprint)
 app.register_blueprint(pathways_blueprint)
 app.register_blueprint(annotations_blueprint)
 
+# Load and validate the Cypher query templates once, instead of reading a file for every request.
+load_cypher_templates(reload=cfg.get('CYPHER_TEMPLATE_RELOAD', False))
+
+# Configure the caches of query results.
+ubkg_version.configure(cfg)
+init_response_cache(cfg)
+init_count_cache(cfg)
+neo4j_instance = app.neo4jConnectionHelper.instance() if app.neo4jConnectionHelper is not None else None
+init_gene_resolver(cfg, neo4j_instance)
+init_prefix_indexes(cfg, neo4j_instance)
+init_static_responses(cfg, app)
+
+# Record request, query and cache metrics.
+init_metrics(cfg, app)
+init_slow_query_log(cfg, app)
+
 ####################################################################################################
 ## For local development/testing
 ####################################################################################################
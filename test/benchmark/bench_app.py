@@ -0,0 +1,190 @@
+# coding: utf-8
+"""
+In-process instance of hs-ontology-api for benchmarks, with a stand-in for the neo4j connection
+(fake_neo4j.py).
+
+make_app builds the application as main.py does--the ubkg-api application with the blueprints of
+hs-ontology-api--but with the connection helper that it is given instead of a connection to the neo4j
+instance in app.cfg.
+
+The benchmark configuration disables the caches of responses and query results, so that each request runs
+the queries and the Python code of its endpoint.
+
+URLS is a set of requests to every blueprint, from the arguments of the test scripts in the test folder.
+SCENARIOS are the requests of the endpoint benchmarks (bench_endpoints.py), for the synthetic graph of
+synthetic_ubkg.py.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'src')
+sys.path.insert(0, os.path.abspath(SRC_DIR))
+
+from ubkg_api.app import UbkgAPI
+# UbkgAPI uses the connection helper in this module if there is one.
+import neo4j_connection_helper
+
+from hs_ontology_api.routes.organs.organs_controller import organs_blueprint
+from hs_ontology_api.routes.relationships.relationships_controller import relationships_blueprint
+from hs_ontology_api.routes.valueset.valueset_controller import valueset_blueprint
+from hs_ontology_api.routes.genes.genes_controller import genes_blueprint
+from hs_ontology_api.routes.genesinfo.genesinfo_controller import genesinfo_blueprint
+from hs_ontology_api.routes.proteins.proteins_controller import proteins_blueprint
+from hs_ontology_api.routes.proteinsinfo.proteinsinfo_controller import proteinsinfo_blueprint
+from hs_ontology_api.routes.celltypes.celltypes_controller import celltypes_blueprint
+from hs_ontology_api.routes.celltypesinfo.celltypesinfo_controller import celltypesinfo_blueprint
+from hs_ontology_api.routes.fielddescriptions.fielddescriptions_controller import field_descriptions_blueprint
+from hs_ontology_api.routes.fieldtypes.fieldtypes_controller import field_types_blueprint
+from hs_ontology_api.routes.fieldassays.fieldassays_controller import field_assays_blueprint
+from hs_ontology_api.routes.fieldschemas.fieldschemas_controller import field_schemas_blueprint
+from hs_ontology_api.routes.fieldtypesinfo.fieldtypesinfo_controller import field_types_info_blueprint
+from hs_ontology_api.routes.assayclasses.assayclasses_controller import assayclasses_blueprint
+from hs_ontology_api.routes.datasettypes.datasettypes_controller import datasettypes_blueprint
+from hs_ontology_api.routes.pathways.pathways_controller import pathways_blueprint
+from hs_ontology_api.routes.annotations.annotations_controller import annotations_blueprint
+
+from hs_ontology_api.utils.cypher_templates import load_cypher_templates
+from hs_ontology_api.utils.ubkg_version import ubkg_version
+from hs_ontology_api.utils.response_cache import init_response_cache
+from hs_ontology_api.utils.count_cache import init_count_cache
+from hs_ontology_api.utils.gene_resolver import init_gene_resolver
+from hs_ontology_api.utils.prefix_index import init_prefix_indexes
+from hs_ontology_api.utils.static_responses import init_static_responses
+
+import synthetic_ubkg
+
+BLUEPRINTS = [organs_blueprint, relationships_blueprint, valueset_blueprint, genes_blueprint,
+              genesinfo_blueprint, proteins_blueprint, proteinsinfo_blueprint, celltypesinfo_blueprint,
+              celltypes_blueprint, field_descriptions_blueprint, field_types_blueprint, field_assays_blueprint,
+              field_schemas_blueprint, field_types_info_blueprint, assayclasses_blueprint,
+              datasettypes_blueprint, pathways_blueprint, annotations_blueprint]
+
+# Configuration for benchmarks: the settings of app.cfg.example, without caches.
+BENCH_CONFIG = {
+    'TIMEOUT': 28,
+    'LARGE_RESPONSE_THRESHOLD': 9*(2**20) + 900*(2**10),
+    'CYPHER_TEMPLATE_RELOAD': False,
+    'RESPONSE_CACHE_ENABLED': False,
+    'COUNT_CACHE_ENABLED': False,
+    'GENE_RESOLVER_PRELOAD': False,
+    'PREFIX_INDEX_ENABLED': False,
+    'PREFIX_INDEX_PRELOAD': False,
+    'STATIC_RESPONSE_ENABLED': False,
+    'STATIC_RESPONSE_PRELOAD': False,
+    'UBKG_VERSION_CHECK_INTERVAL': 60,
+}
+
+# Requests to the endpoints of every blueprint.
+URLS = [
+    '/annotations?sab=AZ',
+    '/annotations/organs?sab=AZ',
+    '/annotations/organ-levels?sab=AZ',
+    '/assayclasses?application_context=HUBMAP',
+    '/assayclasses?application_context=HUBMAP&process_state=primary',
+    '/assayclasses/C200001?application_context=HUBMAP&provide-hierarchy-info=true',
+    '/celltypes/2138,236',
+    '/celltypes/0002138/detail',
+    '/celltypes-info?page=1&celltypes_per_page=3',
+    '/celltypes-info?celltypes_per_page=3&starts_with=B',
+    '/dataset-types?application_context=SENNET',
+    '/dataset-types?application_context=HUBMAP&is_externally_processed=false',
+    '/dataset-types/hierarchy/C011902/C046009',
+    '/field-assays?assaytype=snRNAseq',
+    '/field-descriptions',
+    '/field-descriptions/acquisition_instrument_model?source=HMFIELD',
+    '/field-schemas?source=HMFIELD',
+    '/field-types',
+    '/field-types/acquisition_instrument_model?type=string',
+    '/field-types-info?type_source=HMFIELD',
+    '/genes/MMRN1',
+    '/genes/A1bg?organism=mouse',
+    '/genes-info?page=1&genes_per_page=3',
+    '/genes-info?genes_per_page=3&starts_with=B',
+    '/organs?application_context=HUBMAP',
+    '/organs/by-code?application_context=SENNET',
+    '/pathways/with-genes?geneids=EGFR,BRCA1',
+    '/pathways/with-genes?pathwaynamestartswith=AT',
+    '/pathways/R-HSA-8953897/participants?sabs=HGNC',
+    '/proteins/MMRN1_HUMAN',
+    '/proteins-info?page=1&proteins_per_page=3',
+    '/proteins-info?proteins_per_page=3&starts_with=B',
+    '/relationships/gene/MMRN1',
+    '/valueset?parent_sab=SENNET&parent_code=C020076&child_sabs=SENNET',
+]
+
+# The scenarios request the entities of the synthetic graph (synthetic_ubkg.py) at scale 0.1, from which the
+# fixtures in test/benchmark/fixtures are written (synthetic_fixtures.py): 4300 genes, 2000 proteins and
+# 300 cell types. The synthetic graph has no organs, fields or value sets, so the scenarios of these
+# endpoints measure an empty response.
+
+# 100 approved symbols of the synthetic genes, for requests with many identifiers
+GENES_100 = synthetic_ubkg.gene_symbols(100)
+# 100 UNIPROTKB codes
+PROTEINS_100 = [f'P{code:05d}' for code in range(1, 101)]
+# 100 Cell Ontology codes
+CELLTYPES_100 = [f'{code:07d}' for code in range(1, 101)]
+
+# Benchmark scenarios: endpoint, scenario and request
+SCENARIOS = [
+    ('genes', 'single id', f'/genes/{GENES_100[0]}'),
+    ('genes', '100 ids', '/genes/' + ','.join(GENES_100)),
+    ('genes detail', 'single id', f'/genes/{GENES_100[0]}/detail'),
+    ('genes detail', '100 ids', '/genes/' + ','.join(GENES_100) + '/detail'),
+    ('genes-info', 'first page', '/genes-info?page=1&genes_per_page=10'),
+    ('genes-info', 'prefix search', '/genes-info?genes_per_page=10&starts_with=B'),
+    ('genes-info', 'deep page', '/genes-info?page=400&genes_per_page=10'),
+    ('proteins', 'single id', f'/proteins/{PROTEINS_100[0]}'),
+    ('proteins', '100 ids', '/proteins/' + ','.join(PROTEINS_100)),
+    ('proteins-info', 'prefix search', '/proteins-info?proteins_per_page=10&starts_with=b'),
+    ('proteins-info', 'deep page', '/proteins-info?page=190&proteins_per_page=10'),
+    ('celltypes', 'single id', f'/celltypes/{CELLTYPES_100[0]}'),
+    ('celltypes', '100 ids', '/celltypes/' + ','.join(CELLTYPES_100)),
+    ('celltypes detail', 'single id', f'/celltypes/{CELLTYPES_100[0]}/detail'),
+    ('celltypes detail', '100 ids', '/celltypes/' + ','.join(CELLTYPES_100) + '/detail'),
+    ('celltypes-info', 'prefix search', '/celltypes-info?starts_with=b'),
+    ('celltypes-info', 'deep page', '/celltypes-info?page=29'),
+    ('field-descriptions', 'all', '/field-descriptions'),
+    ('field-descriptions', 'single id', '/field-descriptions/acquisition_instrument_model'),
+    ('field-types', 'all', '/field-types'),
+    ('field-types', 'single id', '/field-types/acquisition_instrument_model'),
+    ('field-types-info', 'all', '/field-types-info'),
+    ('field-assays', 'all', '/field-assays'),
+    ('field-assays', 'single id', '/field-assays/acquisition_instrument_model'),
+    ('field-schemas', 'all', '/field-schemas'),
+    ('field-schemas', 'single id', '/field-schemas/acquisition_instrument_model'),
+    # The first synthetic gene is not a participant of a reaction.
+    ('pathways with-genes', 'single id', f'/pathways/with-genes?geneids={GENES_100[1]}'),
+    ('pathways with-genes', '100 ids', '/pathways/with-genes?geneids=' + ','.join(GENES_100)),
+    ('pathways with-genes', 'prefix search', '/pathways/with-genes?pathwaynamestartswith=RE'),
+    ('pathways participants', 'single id', '/pathways/R-HSA-1/participants'),
+    ('organs', 'all', '/organs?application_context=HUBMAP'),
+    ('dataset-types', 'all', '/dataset-types?application_context=HUBMAP'),
+    ('assayclasses', 'all', '/assayclasses?application_context=HUBMAP'),
+    ('valueset', 'single id', '/valueset?parent_sab=SENNET&parent_code=C020076&child_sabs=SENNET'),
+    ('relationships', 'single id', f'/relationships/gene/{GENES_100[0]}'),
+]
+
+
+def make_app(helper, config: dict = None):
+    """
+    Returns the Flask application of hs-ontology-api with a connection helper.
+    :param helper: connection helper--e.g., fake_neo4j.replay_helper()
+    :param config: settings that override BENCH_CONFIG
+    """
+    neo4j_connection_helper.instance = helper
+    cfg = dict(BENCH_CONFIG, **(config or {}))
+    app = UbkgAPI(cfg, Path(SRC_DIR).absolute().parent).app
+    app.config.update(cfg)
+    for blueprint in BLUEPRINTS:
+        app.register_blueprint(blueprint)
+
+    load_cypher_templates(reload=cfg['CYPHER_TEMPLATE_RELOAD'])
+    ubkg_version.configure(app.config)
+    init_response_cache(app.config)
+    init_count_cache(app.config)
+    init_gene_resolver(app.config, helper.instance())
+    init_prefix_indexes(app.config, helper.instance())
+    init_static_responses(app.config, app)
+    return app
@@ -0,0 +1,53 @@
+# coding: utf-8
+"""
+Benchmark: per-request file reads of Cypher templates vs. the preloaded template registry.
+
+Compares the cost of obtaining the query strings used by the /genes, /organs and /dataset-types
+endpoints by:
+1. opening and reading the .cypher file (the original loadquerystring behavior)
+2. looking up the template in the registry loaded at startup
+
+Usage (from the root of the repository):
+    python test/benchmark/bench_cypher_templates.py [-n iterations]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'src')
+sys.path.insert(0, os.path.abspath(SRC_DIR))
+
+from hs_ontology_api.utils.cypher_templates import CYPHER_DIR, CypherTemplateRegistry
+
+TEMPLATES = ['gene.cypher', 'organs.cypher', 'dataset_types.cypher']
+
+
+def read_from_file(filename: str) -> str:
+    # Original behavior: open and read the file for every request.
+    f = open(os.path.join(CYPHER_DIR, filename), 'r')
+    query = f.read()
+    f.close()
+    return query
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cypher template loading benchmark')
+    parser.add_argument('-n', '--iterations', type=int, default=20000)
+    args = parser.parse_args()
+
+    registry = CypherTemplateRegistry()
+    registry.load_all()
+
+    print(f'{"template":<24}{"file read (us)":>16}{"registry (us)":>16}{"speedup":>10}')
+    for name in TEMPLATES:
+        file_time = timeit.timeit(lambda: read_from_file(name), number=args.iterations)
+        registry_time = timeit.timeit(lambda: registry.get(name).text, number=args.iterations)
+        file_us = file_time / args.iterations * 1e6
+        registry_us = registry_time / args.iterations * 1e6
+        print(f'{name:<24}{file_us:>16.2f}{registry_us:>16.3f}{file_us / registry_us:>9.0f}x')
+
+
+if __name__ == '__main__':
+    main()
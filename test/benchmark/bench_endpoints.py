@@ -0,0 +1,195 @@
+# coding: utf-8
+"""
+Benchmark: latency, memory allocation and payload size of the endpoints of hs-ontology-api, with
+regression gating against a stored baseline.
+
+The script sends the request of each scenario in bench_app.SCENARIOS--e.g., a single id, 100 ids, a
+prefix search or a deep page of an endpoint--to an in-process instance of the API through the Flask test
+client. The neo4j queries are answered from recorded fixtures (fake_neo4j.py, record_fixtures.py), so the
+benchmark measures the Python code of the endpoints: parameter validation, the transformation of records,
+serialization and compression.
+
+For each scenario, the script reports:
+- the p50, p95 and p99 latency of the request, in ms
+- the peak memory allocated by Python during the request (tracemalloc), in KiB
+- the size of the response body, in bytes
+
+With --save-baseline, the results are written to a baseline file. With --baseline, the results are
+compared with a baseline file, and the script exits with status 1 if a scenario regressed: its p50 or p95
+latency or its allocation exceeds the baseline by more than --threshold (and, for latency, by more than
+--min-delta-ms), its payload grew by more than --threshold, or its HTTP status changed. Compare only
+results from the same machine.
+
+The script also exits with status 1 if the request of a scenario fails (HTTP 5xx)--e.g., without fixtures
+for its queries--so that the scenario is not timed, unless --allow-untimed.
+
+Usage (from the root of the repository):
+    python test/benchmark/bench_endpoints.py [-n repetitions] [--fixtures test/benchmark/fixtures]
+        [--latency-ms 0] [--latency-scale 0] [--endpoint genes] [--save-baseline <file>]
+        [--baseline <file> [--threshold 0.2] [--min-delta-ms 0.5]] [--output <file>] [--allow-untimed]
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'src')
+sys.path.insert(0, os.path.abspath(SRC_DIR))
+
+from fake_neo4j import FIXTURE_DIR, replay_helper
+from bench_app import SCENARIOS, make_app
+
+# Default baseline file
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines', 'endpoints.json')
+
+
+def scenario_id(endpoint: str, scenario: str) -> str:
+    return f'{endpoint}: {scenario}'
+
+
+def percentiles(samples: list) -> dict:
+    # Returns the p50, p95 and p99 of the latency samples, in ms.
+    if len(samples) == 1:
+        return {'p50': round(samples[0], 3), 'p95': round(samples[0], 3), 'p99': round(samples[0], 3)}
+    cuts = statistics.quantiles(samples, n=100, method='inclusive')
+    return {'p50': round(cuts[49], 3), 'p95': round(cuts[94], 3), 'p99': round(cuts[98], 3)}
+
+
+def peak_allocation(client, url: str) -> int:
+    # Returns the peak memory allocated during a request, in bytes.
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        client.get(url).close()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak - before
+
+
+def run_scenario(client, url: str, repetitions: int, warmup: int) -> dict:
+    resp = client.get(url)
+    result = {'url': url, 'status': resp.status_code, 'payload_bytes': len(resp.get_data())}
+    resp.close()
+    if resp.status_code >= 500:
+        # For example, a request without a recorded fixture.
+        return result
+
+    for _ in range(warmup):
+        client.get(url).close()
+    samples = []
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        client.get(url).close()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    result.update(percentiles(samples))
+    result['alloc_peak_kib'] = round(peak_allocation(client, url) / 1024, 1)
+    return result
+
+
+def compare(results: dict, baseline: dict, threshold: float, min_delta_ms: float) -> list[str]:
+    # Returns a description of each regression against the baseline.
+    regressions = []
+    for sid, result in results.items():
+        base = baseline.get(sid)
+        if base is None:
+            continue
+        if result['status'] != base['status']:
+            regressions.append(f'{sid}: HTTP {base["status"]} -> {result["status"]}')
+            continue
+        for metric in ('p50', 'p95'):
+            if metric in result and metric in base:
+                delta = result[metric] - base[metric]
+                if delta > min_delta_ms and delta > threshold * base[metric]:
+                    regressions.append(f'{sid}: {metric} {base[metric]} -> {result[metric]} ms')
+        for metric in ('alloc_peak_kib', 'payload_bytes'):
+            if metric in result and metric in base and result[metric] > (1 + threshold) * base[metric]:
+                regressions.append(f'{sid}: {metric} {base[metric]} -> {result[metric]}')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Endpoint benchmarks with regression gating')
+    parser.add_argument('-n', '--repetitions', type=int, default=100)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--fixtures', default=FIXTURE_DIR, help='directory of the recorded fixtures')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='fixed latency of each query, in ms')
+    parser.add_argument('--latency-scale', type=float, default=0.0,
+                        help='multiple of the recorded server time of each query to add as latency')
+    parser.add_argument('--endpoint', action='append', help='benchmark only this endpoint; can be repeated')
+    parser.add_argument('--save-baseline', nargs='?', const=BASELINE_FILE,
+                        help='write the results as the baseline')
+    parser.add_argument('--baseline', nargs='?', const=BASELINE_FILE,
+                        help='compare the results with a baseline')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='allowed relative regression--e.g., 0.2 for 20%%')
+    parser.add_argument('--min-delta-ms', type=float, default=0.5,
+                        help='allowed absolute latency regression, in ms')
+    parser.add_argument('--output', help='write the results to a JSON file')
+    parser.add_argument('--allow-untimed', action='store_true',
+                        help='exit with status 0 if the requests of some scenarios fail')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    helper = replay_helper(args.fixtures, latency_ms=args.latency_ms, latency_scale=args.latency_scale)
+    app = make_app(helper)
+    logging.getLogger().setLevel(logging.WARNING)
+    client = app.test_client()
+
+    results = {}
+    print(f'{"endpoint: scenario":45} {"status":>6} {"p50":>9} {"p95":>9} {"p99":>9} {"alloc KiB":>10} '
+          f'{"payload B":>10}')
+    for endpoint, scenario, url in SCENARIOS:
+        if args.endpoint and endpoint not in args.endpoint:
+            continue
+        sid = scenario_id(endpoint, scenario)
+        result = run_scenario(client, url, args.repetitions, args.warmup)
+        results[sid] = result
+        if 'p50' in result:
+            print(f'{sid:45} {result["status"]:>6} {result["p50"]:>9.3f} {result["p95"]:>9.3f} '
+                  f'{result["p99"]:>9.3f} {result["alloc_peak_kib"]:>10.1f} {result["payload_bytes"]:>10}')
+        else:
+            print(f'{sid:45} {result["status"]:>6} (not timed)')
+
+    run = {'python': platform.python_version(), 'machine': platform.node(), 'repetitions': args.repetitions,
+           'latency_ms': args.latency_ms, 'latency_scale': args.latency_scale, 'scenarios': results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(run, f, indent=2)
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save_baseline)), exist_ok=True)
+        with open(args.save_baseline, 'w') as f:
+            json.dump(run, f, indent=2)
+        print(f'Saved the baseline to {args.save_baseline}')
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if (baseline.get('latency_ms'), baseline.get('latency_scale')) != (args.latency_ms, args.latency_scale):
+            print('Warning: the baseline was measured with a different replay latency.')
+        regressions = compare(results, baseline['scenarios'], args.threshold, args.min_delta_ms)
+        for regression in regressions:
+            print(f'REGRESSION {regression}')
+        if not regressions:
+            print(f'No regressions against {args.baseline}')
+    else:
+        regressions = []
+
+    # A scenario that is not timed--e.g., without fixtures for its queries--would not be gated.
+    untimed = [sid for sid, result in results.items() if 'p50' not in result]
+    if untimed:
+        print(f'Not timed: {", ".join(untimed)}')
+    if regressions or (untimed and not args.allow_untimed):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
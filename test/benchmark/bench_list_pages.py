@@ -0,0 +1,152 @@
+# coding: utf-8
+"""
+Benchmark: page latency of the *-info list queries against the number of matching entities.
+
+The genes-info, proteins-info and celltypes-info endpoints return one page of a list that is
+optionally filtered by a starts_with prefix. The list queries select and sort only the keys of the
+entities; the *_rows.cypher template of each list obtains names and descriptions only for the rows on
+the requested page, so the latency of a page should not grow with the number of matching entities.
+A page is timed as the API runs it: the list query, then the rows query with the code_ids of the page.
+
+For each list query, the script runs the query for a set of starts_with prefixes (from the empty
+prefix, which matches all entities, to prefixes that match few entities), for the first page and for
+a later page, and reports the number of matching entities with the latency of the page.
+
+With --compare-ref, the script also runs the version of each template from a git ref--e.g., a commit
+before the page-first rewrite--with the same parameters. A version of a list template that returns the
+rows of the page instead of code_ids is timed without a rows query.
+
+Unlike the other benchmarks, this script requires a neo4j instance with a UBKG release.
+
+Usage (from the root of the repository):
+    python test/benchmark/bench_list_pages.py --uri bolt://localhost:7687 --user neo4j --password ...
+        [-n repetitions] [--page-size 10] [--page 100] [--compare-ref <git ref>]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import neo4j
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'src')
+sys.path.insert(0, os.path.abspath(SRC_DIR))
+
+from hs_ontology_api.utils.cypher_templates import CYPHER_DIR, CypherTemplateRegistry
+
+# List queries, with the rows query that obtains the rows of a page, the count query that gives the number
+# of matching entities, the case of the starts_with parameter and any other parameters--e.g., null keyset pagination parameters,
+# for page-based pagination.
+LISTS = [
+    {'name': 'genes (human)', 'template': 'geneslist.cypher', 'rows': 'geneslist_rows.cypher',
+     'count': 'geneslist_count.cypher',
+     'count_key': 'genelistcount', 'case': str.upper, 'params': {'after_symbol': None, 'after_id': None}},
+    {'name': 'genes (mouse)', 'template': 'mouse_geneslist.cypher', 'rows': 'mouse_geneslist_rows.cypher',
+     'count': 'mouse_geneslist_count.cypher',
+     'count_key': 'genelistcount', 'case': str.upper, 'params': {'after_symbol': None, 'after_id': None}},
+    {'name': 'proteins', 'template': 'proteinslist.cypher', 'rows': 'proteinslist_rows.cypher',
+     'count': 'proteinslist_count.cypher',
+     'count_key': 'proteinlistcount', 'case': str.lower, 'params': {'organism': '', 'after_id': None}},
+    {'name': 'cell types', 'template': 'celltypeslist.cypher', 'rows': 'celltypeslist_rows.cypher',
+     'count': 'celltypeslist_count.cypher',
+     'count_key': 'celltypelistcount', 'case': str.lower, 'params': {'after_id': None}},
+]
+
+# Prefixes from broad to narrow.
+PREFIXES = ['', 'c', 'ca', 'cal']
+
+
+def template_at_ref(ref: str, filename: str) -> str:
+    # Reads a template from a git ref.
+    path = os.path.relpath(os.path.join(CYPHER_DIR, filename), start=repo_root())
+    return subprocess.run(['git', 'show', f'{ref}:{path}'], cwd=repo_root(), check=True,
+                          capture_output=True, text=True).stdout
+
+
+def repo_root() -> str:
+    return os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+
+def run(driver, query: str, params: dict) -> tuple:
+    # Returns the records, the wall time in ms and the server time in ms until the last record.
+    with driver.session(default_access_mode=neo4j.READ_ACCESS) as session:
+        start = time.perf_counter()
+        result = session.run(query, params)
+        records = list(result)
+        summary = result.consume()
+        wall = (time.perf_counter() - start) * 1000
+    return records, wall, summary.result_available_after + summary.result_consumed_after
+
+
+def run_page(driver, query: str, rows_query: str, params: dict) -> tuple:
+    # Runs the list query, and the rows query for the code_ids of the page if the list query returns code_ids.
+    # Returns the total wall and server times in ms.
+    records, wall, server = run(driver, query, params)
+    if records and 'code_id' in records[0].keys():
+        _, rows_wall, rows_server = run(driver, rows_query, {'ids': [record['code_id'] for record in records]})
+        wall += rows_wall
+        server += rows_server
+    return wall, server
+
+
+def time_page(driver, query: str, rows_query: str, params: dict, repetitions: int) -> tuple:
+    # Returns the median wall and server times in ms, after a warm-up run that populates the query cache.
+    run_page(driver, query, rows_query, params)
+    walls = []
+    servers = []
+    for _ in range(repetitions):
+        wall, server = run_page(driver, query, rows_query, params)
+        walls.append(wall)
+        servers.append(server)
+    return statistics.median(walls), statistics.median(servers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='List page latency benchmark')
+    parser.add_argument('--uri', default='bolt://localhost:7687')
+    parser.add_argument('--user', default='neo4j')
+    parser.add_argument('--password', required=True)
+    parser.add_argument('-n', '--repetitions', type=int, default=5)
+    parser.add_argument('--page-size', type=int, default=10)
+    parser.add_argument('--page', type=int, default=100, help='later page (1-based) to time with the first page')
+    parser.add_argument('--compare-ref', help='git ref with the templates to compare--e.g., a commit or tag')
+    args = parser.parse_args()
+
+    registry = CypherTemplateRegistry()
+    registry.load_all()
+
+    driver = neo4j.GraphDatabase.driver(args.uri, auth=(args.user, args.password))
+
+    header = f'{"list":<16}{"prefix":<8}{"matches":>10}{"page":>6}{"wall (ms)":>12}{"server (ms)":>13}'
+    if args.compare_ref:
+        header += f'{"ref wall (ms)":>16}{"ref server (ms)":>17}'
+    print(header)
+
+    try:
+        for entry in LISTS:
+            query = registry.get(entry['template']).text
+            rows_query = registry.get(entry['rows']).text
+            ref_query = template_at_ref(args.compare_ref, entry['template']) if args.compare_ref else None
+            for prefix in PREFIXES:
+                starts_with = entry['case'](prefix)
+                params = dict(entry['params'], starts_with=starts_with)
+                records, _, _ = run(driver, registry.get(entry['count']).text, params)
+                matches = records[0].get(entry['count_key']) if records else 0
+
+                for page in (1, args.page):
+                    page_params = dict(params, skiprows=(page - 1) * args.page_size, limitrows=args.page_size)
+                    wall, server = time_page(driver, query, rows_query, page_params, args.repetitions)
+                    line = f'{entry["name"]:<16}{repr(starts_with):<8}{matches:>10}{page:>6}{wall:>12.1f}{server:>13.0f}'
+                    if ref_query is not None:
+                        ref_wall, ref_server = time_page(driver, ref_query, rows_query, page_params, args.repetitions)
+                        line += f'{ref_wall:>16.1f}{ref_server:>17.0f}'
+                    print(line)
+    finally:
+        driver.close()
+
+
+if __name__ == '__main__':
+    main()
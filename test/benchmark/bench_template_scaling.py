@@ -0,0 +1,143 @@
+# coding: utf-8
+"""
+Benchmark: how the server time of each Cypher template scales with the size of the UBKG.
+
+For each scale--by default, from 10x smaller to 10x larger than a current release--the script loads a
+synthetic graph (synthetic_ubkg.py) into a neo4j instance, sends a set of requests to an in-process
+instance of the API (bench_app.py) that is connected to the instance, and collects the server time
+(result_available_after + result_consumed_after) of every template from the query statistics of the API.
+Running the templates through the endpoints uses the parameters that neo4j_logic builds for each request.
+
+For each template, the script reports the mean server time at each scale and the exponent of the growth
+of the server time with the scale (the slope on a log-log scale between the smallest and largest scale):
+about 1 for a query that is linear in the size of the graph, and about 0 for a query that is not. A
+template with an exponent above --max-exponent is reported as super-linear, and the script exits with
+status 1.
+
+Server times have a resolution of 1 ms, so times below 1 ms are counted as 1 ms.
+
+WARNING: the script deletes the graph in the neo4j instance. Use a local instance--e.g., a docker container
+of neo4j with the APOC plugin--and never the instance of a deployment.
+
+Usage (from the root of the repository):
+    python test/benchmark/bench_template_scaling.py --uri bolt://localhost:7687 --user neo4j --password ...
+        [--scales 0.1,1,10] [-n repetitions] [--max-exponent 1.2]
+"""
+
+import argparse
+import logging
+import math
+import os
+import sys
+
+import neo4j
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'src')
+sys.path.insert(0, os.path.abspath(SRC_DIR))
+
+from hs_ontology_api.utils.query_executor import query_stats
+from hs_ontology_api.utils.ubkg_version import ubkg_version
+
+from fake_neo4j import FakeConnectionHelper
+from bench_app import make_app
+import synthetic_ubkg
+
+
+def requests(graph: synthetic_ubkg.SyntheticGraph) -> list[str]:
+    # Requests for the entities of a synthetic graph.
+    genes = graph.gene_symbols[:100]
+    return [
+        f'/genes/{genes[0]}',
+        '/genes/' + ','.join(genes),
+        f'/genes/{genes[0]}/detail',
+        '/genes-info?page=1&genes_per_page=10',
+        f'/genes-info?genes_per_page=10&starts_with={genes[0][0]}',
+        '/genes-info?page=100&genes_per_page=10',
+        f'/proteins/{graph.protein_ids[0]}',
+        '/proteins-info?page=1&proteins_per_page=10',
+        '/proteins-info?page=100&proteins_per_page=10',
+        f'/celltypes/{graph.celltype_ids[0]}',
+        f'/celltypes/{graph.celltype_ids[0]}/detail',
+        '/celltypes-info?page=1',
+        '/celltypes-info?page=10',
+        f'/pathways/with-genes?geneids={genes[0]}',
+        f'/pathways/{graph.top_pathway_ids[0]}/participants',
+        '/assayclasses?application_context=HUBMAP',
+        f'/assayclasses/{graph.assay_classes[0]}?application_context=HUBMAP',
+        '/dataset-types?application_context=HUBMAP',
+    ]
+
+
+def measure(helper: FakeConnectionHelper, graph: synthetic_ubkg.SyntheticGraph, repetitions: int) -> dict:
+    # Returns the mean server time of each template, in ms.
+    app = make_app(helper, {'UBKG_VERSION_CHECK_INTERVAL': 0})
+    # Notify the indexes of the API--e.g., the gene resolver--that the graph changed.
+    ubkg_version.check(helper.instance())
+    ubkg_version.check_interval = 3600
+    client = app.test_client()
+
+    query_stats.reset()
+    for url in requests(graph):
+        for _ in range(repetitions):
+            resp = client.get(url)
+            resp.close()
+        if resp.status_code != 200:
+            print(f'HTTP {resp.status_code} {url}')
+
+    times = {}
+    for stats in query_stats.snapshot():
+        if stats['calls'] > 0:
+            total = stats['result_available_after_ms']['total'] + stats['result_consumed_after_ms']['total']
+            times[stats['template']] = max(total / stats['calls'], 1.0)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Scaling of the Cypher templates with the size of the UBKG')
+    parser.add_argument('--uri', required=True)
+    parser.add_argument('--user', default='neo4j')
+    parser.add_argument('--password', required=True)
+    parser.add_argument('--scales', default='0.1,1,10', help='comma-separated multiples of a current release')
+    parser.add_argument('-n', '--repetitions', type=int, default=3)
+    parser.add_argument('--max-exponent', type=float, default=1.2)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    scales = sorted(float(scale) for scale in args.scales.split(','))
+    driver = neo4j.GraphDatabase.driver(args.uri, auth=(args.user, args.password))
+    helper = FakeConnectionHelper(driver)
+    results = {}
+    try:
+        for scale in scales:
+            graph = synthetic_ubkg.generate(synthetic_ubkg.scaled_counts(scale), seed=args.seed)
+            nodes, rels = graph.size()
+            print(f'Scale {scale}: loading {nodes} nodes and {rels} relationships')
+            synthetic_ubkg.clear(driver)
+            synthetic_ubkg.load(driver, graph)
+            logging.getLogger().setLevel(logging.WARNING)
+            results[scale] = measure(helper, graph, args.repetitions)
+    finally:
+        driver.close()
+
+    superlinear = []
+    templates = sorted(set().union(*(times.keys() for times in results.values())))
+    print(f'{"template":40}' + ''.join(f'{f"x{scale:g} ms":>12}' for scale in scales) + f'{"exponent":>10}')
+    for template in templates:
+        times = [results[scale].get(template) for scale in scales]
+        exponent = None
+        if len(scales) > 1 and times[0] is not None and times[-1] is not None:
+            exponent = math.log(times[-1] / times[0]) / math.log(scales[-1] / scales[0])
+        line = f'{template:40}' + ''.join(f'{t:>12.1f}' if t is not None else f'{"-":>12}' for t in times)
+        line += f'{exponent:>10.2f}' if exponent is not None else f'{"-":>10}'
+        if exponent is not None and exponent > args.max_exponent:
+            line += '  SUPER-LINEAR'
+            superlinear.append(template)
+        print(line)
+
+    if superlinear:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
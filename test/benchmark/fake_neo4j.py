@@ -0,0 +1,469 @@
+# coding: utf-8
+"""
+Record/replay stand-in for the neo4j driver and the Neo4jConnectionHelper of ubkg-api.
+
+The API obtains its neo4j connection from app.neo4jConnectionHelper.instance(), and uses only the driver
+and the timeout of the connection: query_executor.py runs queries with session.execute_read and
+session.begin_transaction; the endpoints of ubkg-api run queries with session.run.
+
+In record mode, RecordingDriver wraps the driver of a real UBKG instance, and writes the query, the
+parameters, the keys and values of the records, and the server timings (result_available_after and
+result_consumed_after) of each query to a fixture file--one JSON file per Cypher template.
+
+In replay mode, ReplayDriver answers each query from the fixtures, with neo4j.Record objects and a summary
+with the recorded timings, without a neo4j instance. The replay can add latency per query: a fixed number
+of ms, and/or a multiple of the recorded server time. A query that has no fixture raises FixtureNotFound.
+
+Queries are matched to fixtures by the name of their template in the Cypher template registry (or a digest
+of the query text, for queries that are not templates--e.g., those of ubkg-api) and by their parameters.
+If a template changed after its fixtures were recorded, the replay logs a warning and serves the recorded
+records.
+
+Record values are stored as JSON; values that JSON does not represent--e.g., neo4j temporal types--are
+replayed as strings.
+"""
+
+import functools
+import glob
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Optional
+
+import neo4j
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'src')
+sys.path.insert(0, os.path.abspath(SRC_DIR))
+
+from hs_ontology_api.utils import cypher_templates
+
+logger = logging.getLogger(__name__)
+
+# Default directory for fixture files
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+class FixtureNotFound(LookupError):
+    pass
+
+
+def query_digest(query: str) -> str:
+    return hashlib.sha256(query.encode('utf-8')).hexdigest()[:16]
+
+
+def params_key(params: Optional[dict]) -> str:
+    # Canonical form of query parameters.
+    return json.dumps(params or {}, sort_keys=True, default=str, separators=(',', ':'))
+
+
+class FixtureStore:
+
+    def __init__(self, directory: str = FIXTURE_DIR):
+        """
+        Recorded queries, keyed by template name and parameters.
+        :param directory: directory of the fixture files
+        """
+        self.directory = directory
+        # Dict of {template name: {'query_sha256': digest, 'entries': {params key: entry}}}
+        self._templates = {}
+        self._names = None
+        self._stale = set()
+        self._lock = threading.Lock()
+
+    def template_name(self, query: str) -> str:
+        """
+        Returns the name of the Cypher template with the text of a query, or a name from the digest of the
+        query if it is not a template.
+        :param query: query text
+        """
+        if self._names is None:
+            registry = cypher_templates.registry
+            self._names = {registry.get(name).text: name for name in registry.names()}
+        return self._names.get(query, f'query-{query_digest(query)}')
+
+    def load(self) -> int:
+        """
+        Loads every fixture file in the directory. Returns the number of recorded queries.
+        """
+        count = 0
+        for path in sorted(glob.glob(os.path.join(self.directory, '*.json'))):
+            with open(path) as f:
+                fixture = json.load(f)
+            entries = {params_key(entry['params']): entry for entry in fixture['entries']}
+            self._templates[fixture['template']] = {'query_sha256': fixture['query_sha256'], 'entries': entries}
+            count += len(entries)
+        logger.info(f'Loaded {count} recorded queries from {self.directory}.')
+        return count
+
+    def save(self) -> int:
+        """
+        Writes one fixture file per template. Returns the number of recorded queries.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        count = 0
+        with self._lock:
+            for name, fixture in self._templates.items():
+                # One line per recorded query, so that a new recording has a readable diff.
+                entries = [json.dumps(fixture['entries'][key], default=str) for key in sorted(fixture['entries'])]
+                with open(os.path.join(self.directory, f'{name}.json'), 'w') as f:
+                    f.write(f'{{"template": {json.dumps(name)}, "query_sha256": "{fixture["query_sha256"]}", '
+                            f'"entries": [\n' + ',\n'.join(entries) + '\n]}\n')
+                count += len(entries)
+        return count
+
+    def add(self, query: str, params: dict, keys: list, records: list, summary):
+        """
+        Records a query. A query that is recorded again--e.g., after the driver retried a transaction--
+        replaces the earlier recording.
+        :param query: query text
+        :param params: query parameters
+        :param keys: keys of the records
+        :param records: lists of record values
+        :param summary: neo4j ResultSummary of the query
+        """
+        name = self.template_name(query)
+        entry = {'params': json.loads(params_key(params)),
+                 'keys': list(keys),
+                 'records': records,
+                 'result_available_after': summary.result_available_after or 0,
+                 'result_consumed_after': summary.result_consumed_after or 0}
+        with self._lock:
+            fixture = self._templates.setdefault(name, {'query_sha256': query_digest(query), 'entries': {}})
+            fixture['query_sha256'] = query_digest(query)
+            fixture['entries'][params_key(params)] = entry
+
+    def find(self, query: str, params: dict) -> dict:
+        """
+        Returns the recording of a query.
+        :param query: query text
+        :param params: query parameters
+        """
+        name = self.template_name(query)
+        fixture = self._templates.get(name)
+        entry = None if fixture is None else fixture['entries'].get(params_key(params))
+        if entry is None:
+            raise FixtureNotFound(f'No recording of {name} with parameters {params_key(params)} '
+                                  f'in {self.directory}.')
+        if fixture['query_sha256'] != query_digest(query) and name not in self._stale:
+            self._stale.add(name)
+            logger.warning(f'{name} has changed since its fixtures were recorded.')
+        return entry
+
+
+def _merge_params(parameters: Optional[dict], kwargs: dict) -> dict:
+    # session.run and tx.run accept parameters as a dict and as keyword arguments.
+    params = dict(parameters or {})
+    params.update(kwargs)
+    return params
+
+
+# -------- Record mode
+
+
+class RecordingResult:
+
+    def __init__(self, result: neo4j.Result, query: str, params: dict, store: FixtureStore):
+        """
+        Wraps a neo4j.Result, and records the records that the caller reads.
+        """
+        self._result = result
+        self._query = query
+        self._params = params
+        self._store = store
+        self._records = []
+        self._summary = None
+
+    def __iter__(self):
+        for record in self._result:
+            self._records.append(list(record.values()))
+            yield record
+        self.consume()
+
+    def keys(self):
+        return self._result.keys()
+
+    def single(self, strict: bool = False):
+        record = self._result.single(strict=strict)
+        if record is not None:
+            self._records.append(list(record.values()))
+        self.consume()
+        return record
+
+    def data(self, *keys):
+        return [record.data(*keys) for record in self]
+
+    def consume(self):
+        # Records the query once, with the records read until now.
+        if self._summary is None:
+            keys = self._result.keys()
+            self._summary = self._result.consume()
+            self._store.add(self._query, self._params, keys, self._records, self._summary)
+        return self._summary
+
+
+class RecordingTransaction:
+
+    def __init__(self, tx, store: FixtureStore):
+        self._tx = tx
+        self._store = store
+        self.results = []
+
+    def run(self, query: str, parameters: Optional[dict] = None, **kwargs) -> RecordingResult:
+        params = _merge_params(parameters, kwargs)
+        result = RecordingResult(self._tx.run(query, params), query, params, self._store)
+        self.results.append(result)
+        return result
+
+    def finish(self):
+        # Records the results that the caller did not consume before the end of the transaction.
+        for result in self.results:
+            result.consume()
+
+    def __getattr__(self, name):
+        return getattr(self._tx, name)
+
+    def __enter__(self):
+        self._tx.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        if exc[0] is None:
+            self.finish()
+        return self._tx.__exit__(*exc)
+
+
+class RecordingSession:
+
+    def __init__(self, session, store: FixtureStore):
+        self._session = session
+        self._store = store
+        self._results = []
+
+    def execute_read(self, transaction_function, *args, **kwargs):
+        # functools.wraps keeps the timeout and metadata of a function decorated with neo4j.unit_of_work.
+        @functools.wraps(transaction_function)
+        def work(tx, *a, **kw):
+            rtx = RecordingTransaction(tx, self._store)
+            value = transaction_function(rtx, *a, **kw)
+            rtx.finish()
+            return value
+
+        return self._session.execute_read(work, *args, **kwargs)
+
+    def begin_transaction(self, *args, **kwargs) -> RecordingTransaction:
+        return RecordingTransaction(self._session.begin_transaction(*args, **kwargs), self._store)
+
+    def run(self, query: str, parameters: Optional[dict] = None, **kwargs) -> RecordingResult:
+        params = _merge_params(parameters, kwargs)
+        result = RecordingResult(self._session.run(query, params), query, params, self._store)
+        self._results.append(result)
+        return result
+
+    def close(self):
+        for result in self._results:
+            result.consume()
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class RecordingDriver:
+
+    def __init__(self, driver, store: FixtureStore):
+        """
+        Wraps the driver of a real neo4j instance, and records every query in a FixtureStore.
+        :param driver: neo4j driver
+        :param store: store of the recordings
+        """
+        self._driver = driver
+        self.store = store
+
+    def session(self, **config) -> RecordingSession:
+        return RecordingSession(self._driver.session(**config), self.store)
+
+    def close(self):
+        self._driver.close()
+
+
+# -------- Replay mode
+
+
+class ReplaySummary:
+
+    def __init__(self, query: str, params: dict, entry: dict):
+        self.query = query
+        self.parameters = params
+        self.result_available_after = entry['result_available_after']
+        self.result_consumed_after = entry['result_consumed_after']
+
+
+class ReplayResult:
+
+    def __init__(self, query: str, params: dict, entry: dict, latency_ms: float, latency_scale: float):
+        """
+        Result of a recorded query. Waits for the latency before the first record, and for the recorded
+        time to stream the records (scaled) after the last record.
+        """
+        self._keys = entry['keys']
+        self._records = entry['records']
+        self._summary = ReplaySummary(query, params, entry)
+        self._available_delay = (latency_ms + latency_scale * entry['result_available_after']) / 1000
+        self._consumed_delay = latency_scale * entry['result_consumed_after'] / 1000
+        self._available = False
+        self._consumed = False
+
+    def _wait_available(self):
+        if not self._available:
+            self._available = True
+            if self._available_delay > 0:
+                time.sleep(self._available_delay)
+
+    def __iter__(self):
+        self._wait_available()
+        for values in self._records:
+            if self._consumed:
+                return
+            yield neo4j.Record(zip(self._keys, values))
+        self.consume()
+
+    def keys(self):
+        return list(self._keys)
+
+    def single(self, strict: bool = False):
+        records = list(self)
+        if strict and len(records) != 1:
+            raise neo4j.exceptions.ResultNotSingleError(f'Expected a single record, found {len(records)}.')
+        return records[0] if records else None
+
+    def data(self, *keys):
+        return [record.data(*keys) for record in self]
+
+    def consume(self) -> ReplaySummary:
+        if not self._consumed:
+            self._wait_available()
+            self._consumed = True
+            if self._consumed_delay > 0:
+                time.sleep(self._consumed_delay)
+        return self._summary
+
+
+class ReplayTransaction:
+
+    def __init__(self, driver: 'ReplayDriver'):
+        self._driver = driver
+
+    def run(self, query: str, parameters: Optional[dict] = None, **kwargs) -> ReplayResult:
+        return self._driver.replay(query, _merge_params(parameters, kwargs))
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+class ReplaySession(ReplayTransaction):
+
+    def execute_read(self, transaction_function, *args, **kwargs):
+        return transaction_function(ReplayTransaction(self._driver), *args, **kwargs)
+
+    def begin_transaction(self, *args, **kwargs) -> ReplayTransaction:
+        return ReplayTransaction(self._driver)
+
+
+class ReplayDriver:
+
+    def __init__(self, store: FixtureStore, latency_ms: float = 0.0, latency_scale: float = 0.0):
+        """
+        Answers queries from recorded fixtures.
+        :param store: store of the recordings, loaded
+        :param latency_ms: fixed latency of each query, in ms
+        :param latency_scale: multiple of the recorded server time of each query to add as latency--e.g.,
+                              1.0 to replay with the timings of the recording
+        """
+        self.store = store
+        self.latency_ms = latency_ms
+        self.latency_scale = latency_scale
+        self.queries = 0
+
+    def replay(self, query: str, params: dict) -> ReplayResult:
+        entry = self.store.find(query, params)
+        self.queries += 1
+        return ReplayResult(query, params, entry, self.latency_ms, self.latency_scale)
+
+    def session(self, **config) -> ReplaySession:
+        return ReplaySession(self)
+
+    def close(self):
+        pass
+
+
+# -------- Connection helper
+
+
+class FakeConnectionHelper:
+
+    def __init__(self, driver, timeout: int = 28, payloadlimit: int = 0):
+        """
+        Stand-in for the Neo4jConnectionHelper of ubkg-api, with a recording or replay driver.
+        :param driver: RecordingDriver or ReplayDriver
+        :param timeout: query timeout, in seconds
+        :param payloadlimit: LARGE_RESPONSE_THRESHOLD
+        """
+        self.driver = driver
+        self.timeout = timeout
+        self.payloadlimit = payloadlimit
+        self.database_name = 'neo4j'
+        self.database_version = 'replay'
+        self.database_edition = 'replay'
+
+    def instance(self):
+        return self
+
+    def check_connection(self) -> bool:
+        return True
+
+    def close(self):
+        self.driver.close()
+
+
+def replay_helper(fixture_dir: str = FIXTURE_DIR, latency_ms: float = 0.0, latency_scale: float = 0.0,
+                  timeout: int = 28) -> FakeConnectionHelper:
+    """
+    Returns a connection helper that replays the fixtures in a directory.
+    """
+    cypher_templates.load_cypher_templates()
+    store = FixtureStore(fixture_dir)
+    store.load()
+    return FakeConnectionHelper(ReplayDriver(store, latency_ms=latency_ms, latency_scale=latency_scale),
+                                timeout=timeout)
+
+
+def recording_helper(uri: str, user: str, password: str, fixture_dir: str = FIXTURE_DIR,
+                     timeout: int = 28) -> FakeConnectionHelper:
+    """
+    Returns a connection helper that records the queries to a neo4j instance. Existing fixtures in the
+    directory are loaded first, so that a recording adds to them.
+    """
+    cypher_templates.load_cypher_templates()
+    store = FixtureStore(fixture_dir)
+    store.load()
+    driver = neo4j.GraphDatabase.driver(uri, auth=(user, password))
+    return FakeConnectionHelper(RecordingDriver(driver, store), timeout=timeout)
@@ -0,0 +1,58 @@
+# coding: utf-8
+"""
+Records the neo4j queries of a set of requests to hs-ontology-api, for replay without neo4j
+(fake_neo4j.py).
+
+The script sends each request to an in-process instance of the API (bench_app.py) that is connected to a
+neo4j instance with a UBKG release through a recording driver, and writes the query, parameters and
+records of every query to the fixture files--one JSON file per Cypher template. Existing fixtures are kept,
+so that a recording can add requests to them.
+
+By default, the script requests bench_app.URLS and the requests of bench_app.SCENARIOS. Record the fixtures
+again after a change to a Cypher template or to the parameters of a query.
+
+This script requires a neo4j instance with a UBKG release.
+
+Usage (from the root of the repository):
+    python test/benchmark/record_fixtures.py --uri bolt://localhost:7687 --user neo4j --password ...
+        [--fixtures test/benchmark/fixtures] [url ...]
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'src')
+sys.path.insert(0, os.path.abspath(SRC_DIR))
+
+from fake_neo4j import FIXTURE_DIR, recording_helper
+from bench_app import URLS, SCENARIOS, make_app
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Records neo4j fixtures for offline benchmarks')
+    parser.add_argument('--uri', required=True)
+    parser.add_argument('--user', default='neo4j')
+    parser.add_argument('--password', required=True)
+    parser.add_argument('--fixtures', default=FIXTURE_DIR, help='directory of the fixture files')
+    parser.add_argument('urls', nargs='*', help='paths and arguments of requests; default: requests to every '
+                                                'blueprint and the requests of the endpoint benchmarks')
+    args = parser.parse_args()
+    urls = args.urls or list(dict.fromkeys(URLS + [url for _, _, url in SCENARIOS]))
+    logging.basicConfig(level=logging.WARNING)
+
+    helper = recording_helper(args.uri, args.user, args.password, fixture_dir=args.fixtures)
+    client = make_app(helper).test_client()
+    try:
+        for url in urls:
+            resp = client.get(url)
+            print(f'{resp.status_code} {url}')
+    finally:
+        count = helper.driver.store.save()
+        helper.close()
+    print(f'Recorded {count} queries in {args.fixtures}')
+
+
+if __name__ == '__main__':
+    main()
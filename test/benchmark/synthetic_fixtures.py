@@ -0,0 +1,585 @@
+# coding: utf-8
+"""
+Writes fixtures for the offline benchmarks (fake_neo4j.py) from a synthetic graph (synthetic_ubkg.py),
+without neo4j.
+
+record_fixtures.py records the fixtures from a neo4j instance--e.g., a local instance loaded with the
+synthetic graph. This script builds the fixtures of the same requests where there is no neo4j instance--
+e.g., on a CI runner: it sends each request to an in-process instance of the API (bench_app.py), and
+answers each query with the records that the Cypher template returns for the synthetic graph, computed in
+Python. The fixtures have the format of recorded fixtures, and are replayed in the same way.
+
+The answer for a template follows its MATCH patterns and filters for the entities that the synthetic graph
+has; patterns for entities that the graph does not have (e.g., organs, fields, cell type annotations) match
+nothing. The records are not produced by neo4j, so the server timings of the fixtures are 0: replay them
+with --latency-ms, not --latency-scale. A query of a template without an answer raises FixtureNotFound.
+
+After a change to a template, change its answer function in this script, and write the fixtures again.
+Existing fixtures are kept, so that the script can add requests to them.
+
+Usage (from the root of the repository):
+    python test/benchmark/synthetic_fixtures.py [--scale 0.1] [--seed 0] [--fixtures test/benchmark/fixtures]
+        [url ...]
+"""
+
+import argparse
+import logging
+import os
+import sys
+from collections import defaultdict
+from types import SimpleNamespace
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'src')
+sys.path.insert(0, os.path.abspath(SRC_DIR))
+
+from hs_ontology_api.utils import cypher_templates
+
+from fake_neo4j import FIXTURE_DIR, FakeConnectionHelper, FixtureNotFound, FixtureStore, ReplayDriver
+from bench_app import SCENARIOS, make_app
+import synthetic_ubkg
+
+# Server timings of the fixtures
+NO_TIMINGS = SimpleNamespace(result_available_after=0, result_consumed_after=0)
+
+# Term types of HGNC genes, with the keys of the genes endpoints
+GENE_TERM_KEYS = {'PT': 'approved_name', 'ACR': 'approved_symbol', 'NS': 'previous_symbols',
+                  'NP': 'previous_names', 'SYN': 'alias_symbols', 'NA_UBKG': 'alias_names'}
+
+REFERENCE_URLS = {
+    'UNIPROTKB': 'https://www.uniprot.org/uniprot/',
+    'ENSEMBL': 'https://www.ensembl.org/id/',
+    'OMIM': 'https://omim.org/entry/',
+    'ENTREZ': 'https://www.ncbi.nlm.nih.gov/gene/',
+    'HGNC': 'https://www.genenames.org/data/gene-symbol-report/#!/hgnc_id/',
+}
+
+
+class SyntheticUbkg:
+
+    def __init__(self, graph: synthetic_ubkg.SyntheticGraph):
+        """
+        Indexes of the nodes and relationships of a synthetic graph, for the answers to queries.
+        """
+        self.graph = graph
+        self.codes = graph.nodes['Code']
+        # CodeIDs of the codes of each concept, and the concept of each code
+        self.concept_codes = defaultdict(list)
+        self.code_concept = {}
+        # Tuples of (term type, name) of the terms of each code, keyed by CodeID. In the synthetic graph, the
+        # CUI of every term relationship is the CUI of the concept of the code.
+        self.terms = defaultdict(list)
+        # Definition nodes of each concept
+        self.definitions = defaultdict(list)
+        # Relationships between concepts: lists of (CUI, properties), keyed by (CUI, type) of the start
+        # (outgoing) or end (incoming) concept
+        self.outgoing = defaultdict(list)
+        self.incoming = defaultdict(list)
+
+        for (start_label, rel_type, end_label), rels in graph.rels.items():
+            for rel in rels:
+                start, end, props = rel['start'], rel['end'], rel['props']
+                if rel_type == 'CODE':
+                    self.concept_codes[start].append(end)
+                    self.code_concept[end] = start
+                elif start_label == 'Code':
+                    self.terms[start].append((rel_type, end))
+                elif rel_type == 'DEF':
+                    self.definitions[start].append(graph.nodes['Definition'][end])
+                else:
+                    self.outgoing[(start, rel_type)].append((end, props))
+                    self.incoming[(end, rel_type)].append((start, props))
+
+    def names(self, codeid: str, *term_types: str) -> list[str]:
+        # Names of the terms of a code with the term types.
+        return [name for term_type, name in self.terms[codeid] if term_type in term_types]
+
+    def codes_of(self, cui: str, sab: str) -> list[str]:
+        # CodeIDs of the codes of a concept in a SAB.
+        return [codeid for codeid in self.concept_codes[cui] if self.codes[codeid]['SAB'] == sab]
+
+    def sab_codes(self, sab: str) -> list[str]:
+        # CodeIDs of the codes in a SAB that belong to a concept.
+        return [codeid for codeid, code in self.codes.items() if code['SAB'] == sab and codeid in self.code_concept]
+
+    def definition_texts(self, cui: str, sab: str) -> list[str]:
+        return [definition['DEF'] for definition in self.definitions[cui] if definition['SAB'] == sab]
+
+    def related(self, cui: str, rel_type: str, sab: str = None, incoming: bool = False) -> list[str]:
+        # CUIs of the concepts related to a concept, optionally with the SAB property of the relationship.
+        rels = (self.incoming if incoming else self.outgoing)[(cui, rel_type)]
+        return [other for other, props in rels if sab is None or props.get('SAB') == sab]
+
+
+# -------- Answers: functions that return the keys and records of a query for a synthetic graph
+
+
+def ubkg_fingerprint(ubkg: SyntheticUbkg, params: dict) -> tuple:
+    nodes, relationships = ubkg.graph.size()
+    return ['nodes', 'relationships'], [[nodes, relationships]]
+
+
+def gene_identifiers(ubkg: SyntheticUbkg, params: dict) -> tuple:
+    rows = []
+    for codeid in ubkg.sab_codes('HGNC'):
+        for term_type, name in ubkg.terms[codeid]:
+            if term_type in GENE_TERM_KEYS:
+                rows.append([ubkg.code_concept[codeid], ubkg.codes[codeid]['CODE'], term_type, name])
+    rows.sort(key=lambda row: (row[1], row[2]))
+    return ['cui', 'code', 'type', 'name'], rows
+
+
+def _reference(ref: str) -> dict:
+    sab, code = ref.split(':', 1)
+    return {'id': code, 'source': 'hugo' if sab == 'HGNC' else sab.lower(),
+            'url': REFERENCE_URLS[sab] + code if sab in REFERENCE_URLS else ref}
+
+
+def _gene(ubkg: SyntheticUbkg, cui: str) -> dict:
+    # Gene object of the genes endpoints (gene.cypher and genedetail.cypher).
+    codeid = ubkg.codes_of(cui, 'HGNC')[0]
+    values = {key: ubkg.names(codeid, term_type) or None for term_type, key in GENE_TERM_KEYS.items()}
+    references = [ref for ref in ubkg.concept_codes[cui] if ubkg.codes[ref]['SAB'] in ('ENTREZ', 'ENSEMBL', 'OMIM')]
+    references.append(codeid)
+    for protein in ubkg.related(cui, 'has_gene_product'):
+        references.extend(ubkg.concept_codes[protein])
+    summaries = [text.replace('\\', '/') for text in ubkg.definition_texts(cui, 'REFSEQ')]
+    return {
+        'hgnc_id': int(ubkg.codes[codeid]['CODE']),
+        'approved_name': (values['approved_name'] or [None])[0],
+        'approved_symbol': (values['approved_symbol'] or [None])[0],
+        'previous_symbols': values['previous_symbols'],
+        'previous_names': values['previous_names'],
+        'alias_symbols': values['alias_symbols'],
+        'alias_names': values['alias_names'],
+        'references': [_reference(ref) for ref in references],
+        'summary': summaries or None
+    }
+
+
+def _gene_cuis(ubkg: SyntheticUbkg, cuis: list[str]) -> list[str]:
+    return [cui for cui in dict.fromkeys(cuis) if ubkg.codes_of(cui, 'HGNC')]
+
+
+def gene(ubkg: SyntheticUbkg, params: dict) -> tuple:
+    return ['genes'], [[[_gene(ubkg, cui) for cui in _gene_cuis(ubkg, params['cuis'])]]]
+
+
+def genedetail(ubkg: SyntheticUbkg, params: dict) -> tuple:
+    # The synthetic graph has no inverse_characterized_by relationships from genes to cell types.
+    return ['genes'], [[[dict(_gene(ubkg, cui), cell_types=None) for cui in _gene_cuis(ubkg, params['cuis'])]]]
+
+
+def _gene_symbols(ubkg: SyntheticUbkg) -> list[tuple]:
+    # (CodeID, HGNC ID, sorted approved symbols) of the genes with approved symbols.
+    genes = []
+    for codeid in ubkg.sab_codes('HGNC'):
+        symbols = sorted(ubkg.names(codeid, 'ACR'))
+        if symbols:
+            genes.append((codeid, int(ubkg.codes[codeid]['CODE']), symbols))
+    return genes
+
+
+def geneslist_count(ubkg: SyntheticUbkg, params: dict) -> tuple:
+    prefix = params['starts_with']
+    count = sum(1 for _, _, symbols in _gene_symbols(ubkg)
+                if prefix == '' or any(symbol.upper().startswith(prefix) for symbol in symbols))
+    return ['genelistcount'], [[count]]
+
+
+def geneslist(ubkg: SyntheticUbkg, params: dict) -> tuple:
+    prefix = params['starts_with']
+    after = (params['after_symbol'], params['after_id'])
+    rows = sorted((symbols[0], hgnc_id, codeid) for codeid, hgnc_id, symbols in _gene_symbols(ubkg)
+                  if (prefix == '' or any(symbol.upper().startswith(prefix) for symbol in symbols))
+                  and (after[1] is None or (symbols[0], hgnc_id) > after))
+    page = rows[params['skiprows']:params['skiprows'] + params['limitrows']]
+    return ['code_id', 'hgnc_id', 'sort_symbol'], [[codeid, hgnc_id, symbol] for symbol, hgnc_id, codeid in page]
+
+
+def geneslist_rows(ubkg: SyntheticUbkg, params: dict) -> tuple:
+    records = []
+    for codeid in params['ids']:
+        if codeid not in ubkg.codes:
+            continue
+        symbols = sorted(ubkg.names(codeid, 'ACR'))
+        cui = ubkg.code_concept[codeid]
+        definitions = [definition['DEF'] for definition in ubkg.definitions[cui] for _ in symbols]
+        records.append([int(ubkg.codes[codeid]['CODE']), symbols, ubkg.names(codeid, 'PT') or None,
+                        definitions or None, symbols[0] if symbols else None])
+    return ['hgnc_id', 'approved_symbol', 'approved_name', 'description', 'sort_symbol'], records
+
+
+def _entry_names(ubkg: SyntheticUbkg, codeid: str) -> list[str]:
+    return [name for name in ubkg.names(codeid, 'SY') if name.endswith('_HUMAN') or name.endswith('_MOUSE')]
+
+
+def _proteins(ubkg: SyntheticUbkg, params: dict) -> list[str]:
+    # Codes of the proteins that match the organism and starts_with filters of the proteins-info queries.
+    prefix = params['starts_with']
+    organism = params['organism']
+    codeids = []
+    for codeid in ubkg.sab_codes('UNIPROTKB'):
+        if organism != '' and not any(name.endswith('_' + organism) for name in ubkg.names(codeid, 'SY')):
+            continue
+        if prefix != '' and not ubkg.codes[codeid]['CODE'].lower().startswith(prefix) and \
+                not any(name.lower().startswith(prefix)
+                        for name in ubkg.names(codeid, 'PT') + _entry_names(ubkg, codeid)):
+            continue
+        codeids.append(codeid)
+    return codeids
+
+
+def proteinslist_count(ubkg: SyntheticUbkg, params: dict) -> tuple:
+    return ['proteinlistcount'], [[len(_proteins(ubkg, params))]]
+
+
+def proteinslist(ubkg: SyntheticUbkg, params: dict) -> tuple:
+    after = params['after_id']
+    rows = sorted((ubkg.codes[codeid]['CODE'], codeid) for codeid in _proteins(ubkg, params))
+    rows = [row for row in rows if after is None or row[0] > after]
+    page = rows[params['skiprows']:params['skiprows'] + params['limitrows']]
+    return ['code_id', 'id'], [[codeid, code] for code, codeid in page]
+
+
+def proteinslist_rows(ubkg: SyntheticUbkg, params: dict) -> tuple:
+    records = [[ubkg.codes[codeid]['CODE'], ubkg.names(codeid, 'PT') or None, _entry_names(ubkg, codeid) or None]
+               for codeid in params['ids'] if codeid in ubkg.codes]
+    return ['id', 'recommended_name', 'entry_name'], records
+
+
+def proteindetail(ubkg: SyntheticUbkg, params: dict) -> tuple:
+    ids = params['ids']
+    proteins = []
+    for codeid in sorted(ubkg.sab_codes('UNIPROTKB'), key=lambda codeid: ubkg.codes[codeid]['CODE']):
+        code = ubkg.codes[codeid]['CODE']
+        names = ubkg.names(codeid, 'PT', 'SY')
+        if ids[0] != '' and code not in ids and not any(name in ids for name in names):
+            continue
+        entry_names = _entry_names(ubkg, codeid)
+        synonyms = [name for name in ubkg.names(codeid, 'SY') if name not in entry_names]
+        descriptions = ubkg.definition_texts(ubkg.code_concept[codeid], 'UNIPROTKB')
+        organism_name = (entry_names or synonyms or [None])[0]
+        proteins.append({
+            'uniprotkb_id': code,
+            'recommended_name': ubkg.names(codeid, 'PT') or None,
+            'entry_name': entry_names or None,
+            'synonym': synonyms or None,
+            'references': [{
+                'source': 'uniprotkb',
+                'entry': descriptions[0] if descriptions else None,
+                'curation': 'swissprot',
+                'organism': None if organism_name is None or '_' not in organism_name
+                else organism_name.split('_')[1].lower(),
+                'url': f'https://www.uniprot.org/uniprotkb/{code}/entry'
+            }]
+        })
+    return ['proteins'], [[proteins]]
+
+
+def _cell_types(ubkg: SyntheticUbkg, ids: list[str]) -> list[tuple]:
+    # (CodeID, preferred term, definition) of the cell types that match the ids of celltype.cypher and
+    # celltypedetail.cypher: CL IDs, or text in the preferred term.
+    cell_types = []
+    for codeid in ubkg.sab_codes('CL'):
+        definitions = ubkg.definition_texts(ubkg.code_concept[codeid], 'CL')
+        for name in ubkg.names(codeid, 'PT'):
+            if not definitions:
+                continue
+            if ids[0] == '' or any(codeid == 'CL:' + id if id.isdigit() else id in name for id in ids):
+                cell_types.append((codeid, name, definitions[0]))
+    return cell_types
+
+
+def celltype(ubkg: SyntheticUbkg, params: dict) -> tuple:
+    return ['celltype'], [[[{'cell_type': {'id': codeid, 'name': name, 'definition': definition}}
+                            for codeid, name, definition in _cell_types(ubkg, params['ids'])]]]
+
+
+def celltypedetail(ubkg: SyntheticUbkg, params: dict) -> tuple:
+    # The synthetic graph has no cell type annotations, so the annotations and organ levels of a cell type are
+    # the maps of the null rows of their OPTIONAL MATCH.
+    no_annotation = {'code': None, 'term': None}
+    no_organ_level = {'annotation': None, 'organ_level_code': None, 'organ_level_term': None, 'uberon_code': None,
+                      'uberon_term': None}
+    return ['celltype'], [[[{'cell_type': {'id': codeid, 'name': name, 'definition': definition},
+                             'annotations': [no_annotation], 'organ_levels': [no_organ_level]}
+                            for codeid, name, definition in _cell_types(ubkg, params['ids'])]]]
+
+
+def _celltypes_list(ubkg: SyntheticUbkg, prefix: str) -> list[str]:
+    return sorted(codeid for codeid in ubkg.sab_codes('CL')
+                  if any(prefix == '' or name.lower().startswith(prefix) for name in ubkg.names(codeid, 'PT', 'SY')))
+
+
+def celltypeslist_count(ubkg: SyntheticUbkg, params: dict) -> tuple:
+    return ['celltypelistcount'], [[len(_celltypes_list(ubkg, params['starts_with']))]]
+
+
+def celltypeslist(ubkg: SyntheticUbkg, params: dict) -> tuple:
+    after = params['after_id']
+    codeids = [codeid for codeid in _celltypes_list(ubkg, params['starts_with']) if after is None or codeid > after]
+    page = codeids[params['skiprows']:params['skiprows'] + params['limitrows']]
+    return ['code_id'], [[codeid] for codeid in page]
+
+
+def celltypeslist_rows(ubkg: SyntheticUbkg, params: dict) -> tuple:
+    records = []
+    for codeid in params['ids']:
+        terms = ubkg.names(codeid, 'PT')
+        cui = ubkg.code_concept.get(codeid)
+        definitions = ubkg.definition_texts(cui, 'CL') if terms and cui is not None else []
+        records.append([codeid, min(terms) if terms else None, ubkg.names(codeid, 'SY'),
+                        min(definitions) if definitions else None])
+    return ['id', 'term', 'synonyms', 'definition'], records
+
+
+def _event(ubkg: SyntheticUbkg, cui: str) -> tuple:
+    # (code, name, type) of a REACTOME event, or None.
+    codeids = ubkg.codes_of(cui, 'REACTOME')
+    for event_type in ubkg.related(cui, 'isa', sab='REACTOME'):
+        for type_codeid in ubkg.codes_of(event_type, 'REACTOME_VS'):
+            for type_name in ubkg.names(type_codeid, 'PT'):
+                for codeid in codeids:
+                    for name in ubkg.names(codeid, 'PT'):
+                        return ubkg.codes[codeid]['CODE'], name, type_name
+    return None
+
+
+def _filter(values: list) -> list:
+    # Values of a list parameter that the queries treat as a filter: [''] and [] are no filter.
+    return values if values and values[0] != '' else []
+
+
+def pathwayevents_with_genes(ubkg: SyntheticUbkg, params: dict) -> tuple:
+    geneids = _filter(params['geneids'])
+    eventtypes = [eventtype.lower() for eventtype in _filter(params['eventtypes'])] or ['toplevelpathway', 'pathway']
+    pathwayid = params['pathwayid']
+    pathwayname = params['pathwayname'].lower()
+
+    genes = []
+    for codeid in ubkg.sab_codes('HGNC'):
+        names = [name for term_type, name in ubkg.terms[codeid] if term_type in GENE_TERM_KEYS]
+        if not names or not ubkg.names(codeid, 'ACR'):
+            continue
+        if not geneids or ubkg.codes[codeid]['CODE'] in geneids or any(name in geneids for name in names):
+            genes.append(ubkg.code_concept[codeid])
+
+    # Events on the paths of 1 to 10 causally_related_to relationships from the reactions of the genes to
+    # their ancestors.
+    events = set()
+    for cui in genes:
+        for reaction in ubkg.related(cui, 'has_participant', sab='REACTOME', incoming=True):
+            level = [reaction]
+            path_events = set()
+            for _ in range(10):
+                level = [parent for child in level
+                         for parent in ubkg.related(child, 'causally_related_to', sab='REACTOME', incoming=True)]
+                if not level:
+                    break
+                path_events.add(reaction)
+                path_events.update(level)
+            events.update(path_events)
+
+    rows = set()
+    for cui in events:
+        event = _event(ubkg, cui)
+        if event is None:
+            continue
+        code, name, event_type = event
+        if event_type.lower() in eventtypes and (pathwayid == '' or code == pathwayid) and \
+                (pathwayname == '' or name.lower().startswith(pathwayname)):
+            rows.add((event_type, name, code))
+    rows = sorted(sorted(rows, key=lambda row: row[1]), key=lambda row: row[0], reverse=True)
+    return ['event'], [[{'type': event_type, 'code': code, 'description': name}] for event_type, name, code in rows]
+
+
+def pathwayparticipants(ubkg: SyntheticUbkg, params: dict) -> tuple:
+    pathwayid = params['pathwayid']
+    sabs = [sab.upper() for sab in _filter(params['sabs'])] or ['HGNC']
+
+    pathways = []
+    for type_codeid in ubkg.sab_codes('REACTOME_VS'):
+        for type_name in ubkg.names(type_codeid, 'PT'):
+            for cui in ubkg.related(ubkg.code_concept[type_codeid], 'inverse_isa', sab='REACTOME'):
+                for codeid in ubkg.codes_of(cui, 'REACTOME'):
+                    for name in ubkg.names(codeid, 'PT'):
+                        code = ubkg.codes[codeid]['CODE']
+                        if code == pathwayid or name.lower().startswith(pathwayid.lower()):
+                            pathways.append((cui, code, name, type_name))
+
+    rows = []
+    for cui, code, name, type_name in pathways:
+        # The pathway and its descendants, to 10 levels.
+        events = [cui]
+        level = [cui]
+        for _ in range(10):
+            level = [child for parent in level for child in ubkg.related(parent, 'causally_related_to')]
+            events.extend(level)
+        participants = {}
+        for event in events:
+            for participant in ubkg.related(event, 'has_participant', sab='REACTOME'):
+                # Genes are the only participants of the synthetic graph; their codes in other SABs have no terms.
+                for codeid in ubkg.codes_of(participant, 'HGNC'):
+                    for symbol in ubkg.names(codeid, 'ACR'):
+                        for description in ubkg.names(codeid, 'PT'):
+                            participants[(ubkg.codes[codeid]['CODE'], symbol, description)] = symbol
+        if 'HGNC' not in sabs or not participants:
+            continue
+        genes = [{'id': gene_code, 'symbol': symbol, 'description': description, 'featuretype': 'n/a'}
+                 for gene_code, symbol, description in sorted(participants, key=lambda key: key[1])]
+        rows.append((type_name, name, code, [{'SAB': 'HGNC', 'count': len(genes), 'participants': genes}]))
+
+    rows = sorted(sorted(rows, key=lambda row: row[1]), key=lambda row: row[0], reverse=True)
+    return ['event'], [[{'code': code, 'name': name, 'type': type_name, 'sabs': pathwaysabs}]
+                       for type_name, name, code, pathwaysabs in rows]
+
+
+def assayclass(ubkg: SyntheticUbkg, params: dict) -> tuple:
+    context = params['context']
+    records = []
+    for cui in sorted(ubkg.related(f'{context}:C000004 CUI', 'isa', incoming=True)):
+        for codeid in ubkg.concept_codes[cui]:
+            for name in ubkg.names(codeid, 'PT'):
+                if params['assayclass'] is not None and codeid != f'{context}:{params["assayclass"]}' \
+                        and name != params['assayclass']:
+                    continue
+                assaytypes = [name.replace('_assaytype', '')
+                              for assaytype in ubkg.related(cui, 'has_assaytype')
+                              for assaytype_codeid in ubkg.codes_of(assaytype, context)
+                              for name in ubkg.names(assaytype_codeid, 'PT')]
+                process_states = [name for state in ubkg.related(cui, 'has_process_state')
+                                  if f'{context}:C004002 CUI' in ubkg.related(state, 'isa')
+                                  for state_codeid in ubkg.codes_of(state, context)
+                                  for name in ubkg.names(state_codeid, 'PT')]
+                dataset_types = [name for dataset_type in ubkg.related(cui, 'has_dataset_type')
+                                 for type_codeid in ubkg.codes_of(dataset_type, context)
+                                 for name in ubkg.names(type_codeid, 'PT')] or [None]
+                for assaytype in dict.fromkeys(assaytypes):
+                    if params['assaytype'] is not None and assaytype != params['assaytype']:
+                        continue
+                    for process_state in process_states:
+                        if params['process_state'] is not None and process_state != params['process_state']:
+                            continue
+                        for dataset_type in dict.fromkeys(dataset_types):
+                            if params['provide_hierarchy_info'] == 'True':
+                                dataset_type = {'dataset_type': dataset_type, 'PDR_category': None,
+                                                'fig2': {'aggregated_assaytype': None, 'modality': None,
+                                                         'category': None}}
+                            records.append([{
+                                'rule_description': {'code': ubkg.codes[codeid]['CODE'],
+                                                     'application_context': context, 'name': name},
+                                'value': {'assaytype': assaytype, 'dir_schema': None, 'tbl_schema': None,
+                                          'vitessce_hints': [], 'process_state': process_state,
+                                          'pipeline_shorthand': None, 'description': None,
+                                          'is_multiassay': False, 'must_contain': [], 'active_status': None,
+                                          'dataset_type': dataset_type, 'contains_full_genetic_sequences': False}
+                            }])
+    return ['rule_based_datasets'], records
+
+
+def dataset_types(ubkg: SyntheticUbkg, params: dict) -> tuple:
+    context = params['context']
+    rows = []
+    for cui in ubkg.related(f'{context}:C003041 CUI', 'isa', incoming=True):
+        for codeid in ubkg.codes_of(cui, context):
+            for name in ubkg.names(codeid, 'PT'):
+                assaytypes = [assaytype_name for assay_class in ubkg.related(cui, 'has_dataset_type', incoming=True)
+                              if ubkg.codes_of(assay_class, context)
+                              for assaytype in ubkg.related(assay_class, 'has_assaytype')
+                              for assaytype_codeid in ubkg.codes_of(assaytype, context)
+                              for assaytype_name in ubkg.names(assaytype_codeid, 'PT')]
+                rows.append((name, list(dict.fromkeys(assaytypes))))
+    types = []
+    for name, assaytypes in sorted(rows):
+        dataset_type = {'dataset_type': name, 'assaytypes': assaytypes, 'is_externally_processed': False,
+                        'PDR_category': None,
+                        'fig2': {'aggregated_assaytype': None, 'modality': None, 'category': None}}
+        if dataset_type not in types:
+            types.append(dataset_type)
+    return ['dataset_type'], [[types]]
+
+
+def no_records(*keys: str):
+    # Answer of a template for entities that the synthetic graph does not have.
+    return lambda ubkg, params: (list(keys), [])
+
+
+ANSWERS = {
+    'ubkg_fingerprint.cypher': ubkg_fingerprint,
+    'gene_identifiers.cypher': gene_identifiers,
+    'gene.cypher': gene,
+    'genedetail.cypher': genedetail,
+    'geneslist_count.cypher': geneslist_count,
+    'geneslist.cypher': geneslist,
+    'geneslist_rows.cypher': geneslist_rows,
+    'proteindetail.cypher': proteindetail,
+    'proteinslist_count.cypher': proteinslist_count,
+    'proteinslist.cypher': proteinslist,
+    'proteinslist_rows.cypher': proteinslist_rows,
+    'celltype.cypher': celltype,
+    'celltypedetail.cypher': celltypedetail,
+    'celltypeslist_count.cypher': celltypeslist_count,
+    'celltypeslist.cypher': celltypeslist,
+    'celltypeslist_rows.cypher': celltypeslist_rows,
+    'pathwayevents_with_genes.cypher': pathwayevents_with_genes,
+    'pathwayparticipants.cypher': pathwayparticipants,
+    'assayclass.cypher': assayclass,
+    'dataset_types.cypher': dataset_types,
+    'organs.cypher': no_records('organ'),
+    'valueset.cypher': no_records('term', 'code', 'sab'),
+    'fielddescriptions.cypher': no_records('code_ids'),
+    'fieldtypes.cypher': no_records('field_types'),
+    'fieldtypelist.cypher': no_records('field_types'),
+    'fieldschemas.cypher': no_records('field_name', 'code_ids', 'schemas'),
+    # The query collects the fields without grouping, so it returns a record for no fields.
+    'fieldassays.cypher': lambda ubkg, params: (['fieldassays'], [[{'fields': []}]]),
+}
+
+
+class SyntheticStore(FixtureStore):
+
+    def __init__(self, ubkg: SyntheticUbkg, directory: str = FIXTURE_DIR):
+        """
+        Store that answers each query from a synthetic graph, and records the answer as a fixture.
+        :param ubkg: indexes of the synthetic graph
+        :param directory: directory of the fixture files
+        """
+        super().__init__(directory)
+        self.ubkg = ubkg
+
+    def find(self, query: str, params: dict) -> dict:
+        name = self.template_name(query)
+        answer = ANSWERS.get(name)
+        if answer is None:
+            raise FixtureNotFound(f'No answer for {name} from the synthetic graph.')
+        keys, records = answer(self.ubkg, params)
+        self.add(query, params, keys, records, NO_TIMINGS)
+        return super().find(query, params)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Writes neo4j fixtures for offline benchmarks from a synthetic '
+                                                 'graph')
+    parser.add_argument('--scale', type=float, default=0.1, help='multiple of the counts of the synthetic graph')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--fixtures', default=FIXTURE_DIR, help='directory of the fixture files')
+    parser.add_argument('urls', nargs='*', help='paths and arguments of requests; default: the requests of the '
+                                                'endpoint benchmarks')
+    args = parser.parse_args()
+    urls = args.urls or [url for _, _, url in SCENARIOS]
+    logging.basicConfig(level=logging.WARNING)
+
+    graph = synthetic_ubkg.generate(synthetic_ubkg.scaled_counts(args.scale), seed=args.seed)
+    cypher_templates.load_cypher_templates()
+    store = SyntheticStore(SyntheticUbkg(graph), args.fixtures)
+    store.load()
+    client = make_app(FakeConnectionHelper(ReplayDriver(store))).test_client()
+    for url in urls:
+        resp = client.get(url)
+        print(f'{resp.status_code} {url}')
+    count = store.save()
+    print(f'Wrote {count} queries in {args.fixtures}')
+
+
+if __name__ == '__main__':
+    main()
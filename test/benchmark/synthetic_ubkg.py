@@ -0,0 +1,352 @@
+# coding: utf-8
+"""
+Generator of a synthetic graph in the shape of a UBKG release, for scale tests of the Cypher templates.
+
+The templates assume the Concept-Code-Term model of the UBKG:
+    (:Concept {CUI})-[:CODE]->(:Code {CodeID, SAB, CODE})-[r:<term type> {CUI}]->(:Term {name})
+    (:Concept)-[:DEF]->(:Definition {ATUI, SAB, DEF})
+with relationships between concepts--e.g., isa, has_gene_product, has_participant.
+
+The generator builds, at a configurable scale:
+- HGNC genes, with approved symbols and names, previous symbols, aliases, RefSeq summaries and ENTREZ and
+  ENSEMBL cross-references;
+- UNIPROTKB proteins, the gene products of the genes, with recommended names and entry names;
+- CL cell types, in an isa hierarchy, with definitions and biomarker genes (characterized_by);
+- a REACTOME event hierarchy: top-level pathways, pathways down to a configurable depth, and reactions with
+  gene participants;
+- for the HUBMAP and SENNET contexts, assay classes with assay types, process states and dataset types.
+
+The identifiers follow the conventions of the UBKG--e.g., HGNC:<n>, CL:<7 digits>, REACTOME:R-HSA-<n>,
+HUBMAP:C<6 digits>--so that the endpoints of the API work with the synthetic graph. Organs, annotations,
+mouse genes, fields and value sets are not generated.
+
+The graph is deterministic for a seed. It is loaded into an empty neo4j instance with batched UNWIND
+queries; with --clear, the script first deletes the graph in the instance.
+
+Usage (from the root of the repository):
+    python test/benchmark/synthetic_ubkg.py --uri bolt://localhost:7687 --user neo4j --password ...
+        [--scale 1.0] [--genes 43000] [--proteins 20000] [--celltypes 3000] [--pathways 2600]
+        [--pathway-depth 6] [--reactions 15000] [--assay-classes 150] [--dataset-types 60] [--clear]
+"""
+
+import argparse
+import random
+import string
+import time
+from collections import defaultdict
+
+import neo4j
+
+# Property that identifies the nodes with each label.
+KEYS = {'Concept': 'CUI', 'Code': 'CodeID', 'Term': 'name', 'Definition': 'ATUI'}
+# Other indexed properties.
+INDEXES = [('Code', 'SAB'), ('Code', 'CODE')]
+
+# Approximate size of a current release, at scale 1.0.
+DEFAULTS = {
+    'genes': 43000,
+    'proteins': 20000,
+    'celltypes': 3000,
+    'top_pathways': 29,
+    'pathways': 2600,
+    'pathway_depth': 6,
+    'reactions': 15000,
+    'participants': 4,
+    'assay_classes': 150,
+    'dataset_types': 60,
+}
+# Counts that do not change with the scale.
+FIXED = ('pathway_depth', 'participants')
+
+CONTEXTS = ('HUBMAP', 'SENNET')
+PROCESS_STATES = ('primary', 'derived')
+EVENT_TYPES = ('TopLevelPathway', 'Pathway', 'Reaction')
+
+WORDS = ['alpha', 'beta', 'gamma', 'delta', 'kinase', 'receptor', 'factor', 'binding', 'protein', 'channel',
+         'domain', 'subunit', 'regulator', 'transporter', 'ligand', 'associated', 'family', 'member', 'zinc',
+         'finger', 'cell', 'epithelial', 'neuron', 'stromal', 'immune', 'progenitor', 'signaling', 'membrane']
+
+
+def scaled_counts(scale: float, **counts) -> dict:
+    """
+    Returns the counts of entities for a scale.
+    :param scale: multiple of the counts--e.g., 0.1 for a graph 10x smaller
+    :param counts: counts at scale 1.0 that override DEFAULTS
+    """
+    base = dict(DEFAULTS, **{name: value for name, value in counts.items() if value is not None})
+    return {name: value if name in FIXED else max(1, round(value * scale)) for name, value in base.items()}
+
+
+class SyntheticGraph:
+
+    def __init__(self, seed: int = 0):
+        """
+        Nodes and relationships of a synthetic graph.
+        """
+        self.random = random.Random(seed)
+        # Dict of {label: {key: properties}}
+        self.nodes = defaultdict(dict)
+        # Dict of {(start label, type, end label): [{start, end, props}]}
+        self.rels = defaultdict(list)
+
+        # Identifiers of the generated entities, for requests to the API
+        self.gene_symbols = []
+        self.protein_ids = []
+        self.celltype_ids = []
+        self.top_pathway_ids = []
+        self.assay_classes = []
+
+    def node(self, label: str, **props) -> str:
+        key = props[KEYS[label]]
+        self.nodes[label].setdefault(key, props)
+        return key
+
+    def rel(self, start_label: str, start: str, rel_type: str, end_label: str, end: str, **props):
+        self.rels[(start_label, rel_type, end_label)].append({'start': start, 'end': end, 'props': props})
+
+    def concept(self, cui: str, sab: str, code: str, terms: list, definition: str = None,
+                definition_sab: str = None) -> str:
+        """
+        Adds a concept with a code and the terms of the code.
+        :param cui: CUI of the concept
+        :param sab: SAB of the code
+        :param code: CODE of the code
+        :param terms: list of (term type, name)--e.g., [('PT', 'alpha kinase')]
+        :param definition: text of a definition of the concept
+        :param definition_sab: SAB of the definition; default: the SAB of the code
+        """
+        codeid = f'{sab}:{code}'
+        self.node('Concept', CUI=cui)
+        self.node('Code', CodeID=codeid, SAB=sab, CODE=code)
+        self.rel('Concept', cui, 'CODE', 'Code', codeid)
+        for term_type, name in terms:
+            self.node('Term', name=name)
+            self.rel('Code', codeid, term_type, 'Term', name, CUI=cui)
+        if definition is not None:
+            atui = f'AT{len(self.nodes["Definition"]):08d}'
+            self.node('Definition', ATUI=atui, SAB=definition_sab or sab, DEF=definition)
+            self.rel('Concept', cui, 'DEF', 'Definition', atui)
+        return cui
+
+    def cross_reference(self, cui: str, sab: str, code: str):
+        # Adds a code of another vocabulary to a concept.
+        codeid = f'{sab}:{code}'
+        self.node('Code', CodeID=codeid, SAB=sab, CODE=code)
+        self.rel('Concept', cui, 'CODE', 'Code', codeid)
+
+    def words(self, n: int) -> str:
+        return ' '.join(self.random.choice(WORDS) for _ in range(n))
+
+    def symbol(self) -> str:
+        # Returns a new gene symbol--e.g., KRTX4.
+        while True:
+            letters = ''.join(self.random.choice(string.ascii_uppercase) for _ in range(self.random.randint(2, 5)))
+            symbol = f'{letters}{self.random.randint(1, 99)}'
+            if symbol not in self.nodes['Term']:
+                return symbol
+
+    def add_genes(self, count: int):
+        for n in range(1, count + 1):
+            symbol = self.symbol()
+            terms = [('ACR', symbol), ('PT', f'{self.words(3)} {n}')]
+            if self.random.random() < 0.3:
+                terms.append(('NS', f'{symbol}P'))
+            if self.random.random() < 0.5:
+                terms.append(('SYN', f'{symbol}A'))
+            cui = self.concept(f'HGNC:{n} CUI', 'HGNC', str(n), terms,
+                               definition=f'RefSeq summary of {symbol}: {self.words(20)}', definition_sab='REFSEQ')
+            self.cross_reference(cui, 'ENTREZ', str(100000 + n))
+            self.cross_reference(cui, 'ENSEMBL', f'ENSG{n:011d}')
+            self.gene_symbols.append(symbol)
+
+    def add_proteins(self, count: int):
+        for n in range(1, count + 1):
+            code = f'P{n:05d}'
+            symbol = self.gene_symbols[(n - 1) % len(self.gene_symbols)]
+            cui = self.concept(f'UNIPROTKB:{code} CUI', 'UNIPROTKB', code,
+                               [('PT', f'{self.words(2)} protein {n}'), ('SY', f'{symbol}{n}_HUMAN')],
+                               definition=self.words(15))
+            gene = f'HGNC:{(n - 1) % len(self.gene_symbols) + 1} CUI'
+            self.rel('Concept', gene, 'has_gene_product', 'Concept', cui)
+            self.protein_ids.append(code)
+
+    def add_celltypes(self, count: int):
+        for n in range(1, count + 1):
+            code = f'{n:07d}'
+            cui = self.concept(f'CL:{code} CUI', 'CL', code,
+                               [('PT', f'{self.words(2)} cell {n}'), ('SY', f'{self.words(2)} cell synonym {n}')],
+                               definition=self.words(12))
+            if n > 1:
+                self.rel('Concept', cui, 'isa', 'Concept', f'CL:{n // 2:07d} CUI')
+            for _ in range(3):
+                gene = self.random.randint(1, len(self.gene_symbols))
+                self.rel('Concept', cui, 'characterized_by', 'Concept', f'HGNC:{gene} CUI')
+            self.celltype_ids.append(code)
+
+    def add_pathways(self, top: int, count: int, depth: int, reactions: int, participants: int):
+        """
+        Adds a REACTOME event hierarchy. The pathways below the top level are spread over the levels of the
+        hierarchy, with more pathways at deeper levels; each pathway has a parent at the level above.
+        Reactions are children of random pathways.
+        """
+        types = {}
+        for event_type in EVENT_TYPES:
+            types[event_type] = self.concept(f'REACTOME_VS:{event_type} CUI', 'REACTOME_VS', event_type,
+                                             [('PT', event_type)])
+
+        number = 0
+
+        def event(event_type: str, parent: str = None) -> str:
+            nonlocal number
+            number += 1
+            code = f'R-HSA-{number}'
+            cui = self.concept(f'REACTOME:{code} CUI', 'REACTOME', code, [('PT', f'{self.words(3)} {number}')])
+            self.rel('Concept', cui, 'isa', 'Concept', types[event_type], SAB='REACTOME')
+            self.rel('Concept', types[event_type], 'inverse_isa', 'Concept', cui, SAB='REACTOME')
+            if parent is not None:
+                self.rel('Concept', parent, 'causally_related_to', 'Concept', cui, SAB='REACTOME')
+            return cui
+
+        levels = [[event('TopLevelPathway') for _ in range(top)]]
+        self.top_pathway_ids = [f'R-HSA-{n}' for n in range(1, top + 1)]
+        weights = [2 ** level for level in range(1, depth + 1)]
+        remaining = max(count - top, 0)
+        for level in range(1, depth + 1):
+            size = max(1, round(remaining * weights[level - 1] / sum(weights)))
+            levels.append([event('Pathway', self.random.choice(levels[-1])) for _ in range(size)])
+
+        pathways = [cui for level in levels for cui in level]
+        for _ in range(reactions):
+            reaction = event('Reaction', self.random.choice(pathways))
+            for _ in range(participants):
+                gene = self.random.randint(1, len(self.gene_symbols))
+                self.rel('Concept', reaction, 'has_participant', 'Concept', f'HGNC:{gene} CUI', SAB='REACTOME')
+
+    def add_assay_classes(self, assay_classes: int, dataset_types: int):
+        for context in CONTEXTS:
+            def concept(code: str, name: str) -> str:
+                return self.concept(f'{context}:{code} CUI', context, code, [('PT', name)])
+
+            assay_class_parent = concept('C000004', f'{context} assay class')
+            dataset_type_parent = concept('C003041', f'{context} dataset type')
+            process_state_parent = concept('C004002', f'{context} process state')
+            states = []
+            for n, state in enumerate(PROCESS_STATES):
+                states.append(concept(f'C00400{n + 3}', state))
+                self.rel('Concept', states[-1], 'isa', 'Concept', process_state_parent)
+
+            types = []
+            for n in range(1, dataset_types + 1):
+                types.append(concept(f'C01{n:04d}', f'{context} dataset type {n}'))
+                self.rel('Concept', types[-1], 'isa', 'Concept', dataset_type_parent)
+
+            for n in range(1, assay_classes + 1):
+                code = f'C2{n:05d}'
+                cui = concept(code, f'{context} assay class {n}')
+                self.rel('Concept', cui, 'isa', 'Concept', assay_class_parent)
+                assay_type = concept(f'C3{n:05d}', f'assay{n}_assaytype')
+                self.rel('Concept', cui, 'has_assaytype', 'Concept', assay_type)
+                self.rel('Concept', cui, 'has_process_state', 'Concept', self.random.choice(states))
+                self.rel('Concept', cui, 'has_dataset_type', 'Concept', types[(n - 1) % len(types)])
+                if context == CONTEXTS[0]:
+                    self.assay_classes.append(code)
+
+    def size(self) -> tuple:
+        return (sum(len(nodes) for nodes in self.nodes.values()),
+                sum(len(rels) for rels in self.rels.values()))
+
+
+def generate(counts: dict, seed: int = 0) -> SyntheticGraph:
+    """
+    Builds a synthetic graph.
+    :param counts: counts of entities--e.g., from scaled_counts
+    :param seed: seed of the random generator
+    """
+    graph = SyntheticGraph(seed)
+    graph.add_genes(counts['genes'])
+    graph.add_proteins(counts['proteins'])
+    graph.add_celltypes(counts['celltypes'])
+    graph.add_pathways(counts['top_pathways'], counts['pathways'], counts['pathway_depth'], counts['reactions'],
+                       counts['participants'])
+    graph.add_assay_classes(counts['assay_classes'], counts['dataset_types'])
+    return graph
+
+
+def gene_symbols(count: int, seed: int = 0) -> list[str]:
+    """
+    Returns the approved symbols of the first genes of a graph. The genes are generated first, so their
+    symbols do not depend on the counts of the other entities, or on the count of genes if it is larger.
+    :param count: number of genes
+    :param seed: seed of the random generator
+    """
+    graph = SyntheticGraph(seed)
+    graph.add_genes(count)
+    return graph.gene_symbols
+
+
+def batches(rows: list, size: int):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def clear(driver):
+    # Deletes every node and relationship.
+    with driver.session() as session:
+        session.run('MATCH (n) CALL { WITH n DETACH DELETE n } IN TRANSACTIONS OF 10000 ROWS').consume()
+
+
+def load(driver, graph: SyntheticGraph, batch_size: int = 10000):
+    """
+    Loads a synthetic graph into a neo4j instance, with indexes on the keys of the nodes.
+    """
+    with driver.session() as session:
+        for label, key in list(KEYS.items()) + INDEXES:
+            session.run(f'CREATE INDEX {label.lower()}_{key.lower()} IF NOT EXISTS FOR (n:{label}) ON (n.{key})'
+                        ).consume()
+        session.run('CALL db.awaitIndexes()').consume()
+
+        for label, nodes in graph.nodes.items():
+            for rows in batches(list(nodes.values()), batch_size):
+                session.run(f'UNWIND $rows AS row CREATE (n:{label}) SET n = row', rows=rows).consume()
+
+        for (start_label, rel_type, end_label), rels in graph.rels.items():
+            query = (f'UNWIND $rows AS row '
+                     f'MATCH (a:{start_label} {{{KEYS[start_label]}: row.start}}) '
+                     f'MATCH (b:{end_label} {{{KEYS[end_label]}: row.end}}) '
+                     f'CREATE (a)-[r:{rel_type}]->(b) SET r = row.props')
+            for rows in batches(rels, batch_size):
+                session.run(query, rows=rows).consume()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Synthetic UBKG graph generator')
+    parser.add_argument('--uri', required=True)
+    parser.add_argument('--user', default='neo4j')
+    parser.add_argument('--password', required=True)
+    parser.add_argument('--scale', type=float, default=1.0, help='multiple of the counts--e.g., 0.1 or 10')
+    for name, value in DEFAULTS.items():
+        parser.add_argument(f'--{name.replace("_", "-")}', type=int, help=f'count at scale 1.0; default: {value}')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--clear', action='store_true', help='delete the graph in the instance first')
+    args = parser.parse_args()
+
+    counts = scaled_counts(args.scale, **{name: getattr(args, name) for name in DEFAULTS})
+    print(f'Counts: {counts}')
+    start = time.perf_counter()
+    graph = generate(counts, seed=args.seed)
+    nodes, rels = graph.size()
+    print(f'Generated {nodes} nodes and {rels} relationships in {time.perf_counter() - start:.1f} s')
+
+    driver = neo4j.GraphDatabase.driver(args.uri, auth=(args.user, args.password))
+    try:
+        if args.clear:
+            clear(driver)
+        start = time.perf_counter()
+        load(driver, graph)
+        print(f'Loaded in {time.perf_counter() - start:.1f} s')
+    finally:
+        driver.close()
+
+
+if __name__ == '__main__':
+    main()
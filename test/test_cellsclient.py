@@ -0,0 +1,159 @@
+# coding: utf-8
+"""
+Tests of OntologyCellsClient and CellsTsvIndex (utils/cellsclient.py).
+
+The Cells API is replaced with a stand-in client, so the tests do not make network calls or need
+hubmap-api-py-client, which is not in requirements.txt.
+
+Run from the root of the repository:
+    python -m pytest test
+"""
+
+import csv
+import os
+import sys
+import threading
+
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, os.path.abspath(SRC_DIR))
+
+from hs_ontology_api.utils.cellsclient import CELLS_COLUMNS, CellsTsvIndex, CellTypesCache, OntologyCellsClient
+
+
+class FakeCells:
+    # Result of select_cells
+    def __init__(self, cells: list[dict]):
+        self.cells = cells
+
+    def get_list(self) -> list[dict]:
+        return self.cells
+
+
+class FakeClientError(Exception):
+    # Stand-in for the ClientError of hubmap-api-py-client
+    pass
+
+
+class FakeCellsClient:
+    # Stand-in for the hubmap-api-py-client Client: cells keyed by gene symbol. A symbol that is not a key
+    # raises a FakeClientError, as the Client raises a ClientError for a symbol that is not in its list of genes.
+    def __init__(self, cells: dict):
+        self.cells = cells
+        self.calls = []
+        self.threads = set()
+        self._lock = threading.Lock()
+
+    def select_cells(self, where: str, has: list[str], genomic_modality: str) -> FakeCells:
+        gene_symbol = has[0].split(' ')[0]
+        with self._lock:
+            self.calls.append(gene_symbol)
+            self.threads.add(threading.current_thread().name)
+        if gene_symbol not in self.cells:
+            raise FakeClientError(gene_symbol)
+        return FakeCells([{'cell_type': cell_type} for cell_type in self.cells[gene_symbol]])
+
+
+CELLS = {
+    'MMRN1': ['endothelial', 'pericyte', 'endothelial'],
+    'TP53': ['fibroblast'],
+    'BRCA1': []
+}
+
+
+@pytest.fixture
+def client():
+    fake = FakeCellsClient(CELLS)
+    cells_client = OntologyCellsClient('http://localhost', cells_index=object(), workers=4,
+                                       celltypes_cache=CellTypesCache(), client=fake,
+                                       client_error=FakeClientError)
+    yield cells_client, fake
+    cells_client._executor.shutdown()
+
+
+def test_celltypes_for_genes_distinct_in_request_order(client):
+    cells_client, fake = client
+    result = cells_client.celltypes_for_genes(['TP53', 'MMRN1', 'TP53', 'BRCA1'])
+
+    assert list(result) == ['TP53', 'MMRN1', 'BRCA1']
+    assert result == {'TP53': ['fibroblast'], 'MMRN1': ['endothelial', 'pericyte'], 'BRCA1': []}
+    # One call per distinct gene, from the pool
+    assert sorted(fake.calls) == ['BRCA1', 'MMRN1', 'TP53']
+    assert all(name.startswith('cellsclient') for name in fake.threads)
+
+
+def test_celltypes_for_genes_cached(client):
+    cells_client, fake = client
+    cells_client.celltypes_for_genes(['TP53', 'MMRN1'])
+    fake.calls.clear()
+
+    result = cells_client.celltypes_for_genes(['MMRN1', 'BRCA1', 'TP53'])
+
+    assert result == {'MMRN1': ['endothelial', 'pericyte'], 'BRCA1': [], 'TP53': ['fibroblast']}
+    # Only the gene that was not cached is obtained from the Cells API.
+    assert fake.calls == ['BRCA1']
+    assert cells_client.celltypes_cache.stats()['hits'] == 2
+
+
+def test_celltypes_for_gene_error_cached_as_negative(client):
+    cells_client, fake = client
+    assert cells_client.celltypes_for_gene('NOTAGENE') == []
+    assert cells_client.celltypes_for_gene('NOTAGENE') == []
+    assert fake.calls == ['NOTAGENE']
+
+
+def test_celltypes_for_genes_negative_ttl(client):
+    cells_client, fake = client
+    cells_client.celltypes_cache.negative_ttl = 0
+    cells_client.celltypes_for_genes(['NOTAGENE', 'TP53'])
+    cells_client.celltypes_for_genes(['NOTAGENE', 'TP53'])
+
+    # The expired negative result is obtained again; the cell types of TP53 are still cached.
+    assert sorted(fake.calls) == ['NOTAGENE', 'NOTAGENE', 'TP53']
+
+
+def write_tsv(path, rows: list[list[str]], mtime_ns: int):
+    # Writes a file in the dialect of build_index.py, with a given modification time.
+    with open(path, 'w', newline='') as tsvfile:
+        writer = csv.writer(tsvfile, delimiter='\t', quotechar='|', quoting=csv.QUOTE_MINIMAL)
+        writer.writerow(CELLS_COLUMNS)
+        writer.writerows(rows)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_cells_tsv_index_reloads_when_file_changes(tmp_path):
+    path = tmp_path / 'cells.tsv'
+    write_tsv(path, [['TP53', 'uuid1', 'heart', 'fibroblast']], 1_000_000_000)
+    index = CellsTsvIndex(str(path))
+
+    assert index.get('TP53') == (('uuid1', 'heart', 'fibroblast'),)
+    assert index.get('MMRN1') == ()
+    first = index.rows()
+    # Same modification time: the file is not read again.
+    assert index.rows() is first
+
+    write_tsv(path, [['TP53', 'uuid2', 'lung', 'pericyte'],
+                     ['MMRN1', 'uuid2', 'lung', 'endothelial']], 2_000_000_000)
+
+    assert index.rows() is not first
+    assert index.get('TP53') == (('uuid2', 'lung', 'pericyte'),)
+    assert index.get('MMRN1') == (('uuid2', 'lung', 'endothelial'),)
+
+
+def test_celltypes_for_genes_csv(tmp_path):
+    path = tmp_path / 'cells.tsv'
+    write_tsv(path, [['TP53', 'uuid1', 'heart', 'fibroblast'],
+                     ['MMRN1', 'uuid1', 'heart', 'endothelial'],
+                     ['TP53', 'uuid2', 'lung', 'pericyte']], 1_000_000_000)
+    cells_client = OntologyCellsClient('http://localhost', cells_index=CellsTsvIndex(str(path)),
+                                       client=FakeCellsClient({}), client_error=FakeClientError)
+
+    result = cells_client.celltypes_for_genes_csv(['TP53', 'BRCA1', 'MMRN1'])
+
+    assert list(result) == ['TP53', 'BRCA1', 'MMRN1']
+    assert [celltype['id'] for celltype in result['TP53']] == ['fibroblast', 'pericyte']
+    assert result['BRCA1'] == []
+    assert [celltype['id'] for celltype in result['MMRN1']] == ['endothelial']
+    assert result['TP53'] == cells_client.celltypes_for_gene_csv('TP53')
+    cells_client._executor.shutdown()
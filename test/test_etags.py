@@ -0,0 +1,168 @@
+# coding: utf-8
+"""
+Tests of the ETags of cached responses (utils/etags.py and utils/response_cache.py).
+
+The requests are made with app.test_request_context on a Flask application with one cached endpoint,
+and the UBKG fingerprint comes from a stand-in for the fingerprint query, so the tests do not need
+a UBKG instance.
+
+Run from the root of the repository:
+    python -m pytest test
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+from flask import Flask, jsonify
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, os.path.abspath(SRC_DIR))
+
+from hs_ontology_api.utils import ubkg_version as ubkg_version_module
+from hs_ontology_api.utils.ubkg_version import ubkg_version
+from hs_ontology_api.utils.etags import encoded_etag, matching_etag, request_etag
+from hs_ontology_api.utils.response_cache import cached_response, init_response_cache, response_cache
+
+CONFIG = {
+    'RESPONSE_CACHE_ENABLED': True,
+    'RESPONSE_COMPRESSION_ENABLED': True,
+    'RESPONSE_COMPRESSION_MIN_SIZE': 0,
+    'LARGE_RESPONSE_THRESHOLD': 0,
+}
+
+
+@pytest.fixture
+def fingerprint(monkeypatch) -> dict:
+    # Counts of nodes and relationships returned by the fingerprint query; the fingerprint is checked
+    # on every request.
+    counts = {'nodes': 100, 'relationships': 200}
+    monkeypatch.setattr(ubkg_version_module, 'query_single', lambda neo4j_instance, queryfile: dict(counts))
+    monkeypatch.setattr(ubkg_version, 'fingerprint', None)
+    monkeypatch.setattr(ubkg_version, 'check_interval', 0)
+    monkeypatch.setattr(ubkg_version, '_last_check', None)
+    return counts
+
+
+@pytest.fixture
+def app(fingerprint):
+    app = Flask(__name__)
+    app.config.update(CONFIG)
+    app.neo4jConnectionHelper = SimpleNamespace(instance=lambda: None)
+    init_response_cache(app.config)
+    yield app
+    response_cache.clear()
+
+
+@pytest.fixture
+def view() -> SimpleNamespace:
+    # Cached view function that counts its calls.
+    calls = SimpleNamespace(count=0)
+
+    @cached_response('organs')
+    def organs():
+        calls.count += 1
+        return jsonify([{'code': 'C030024', 'term': 'Heart'}] * 50)
+
+    calls.get = organs
+    return calls
+
+
+def get(app, view, headers: dict = None):
+    with app.test_request_context('/organs?application_context=HUBMAP', headers=headers or {}):
+        return view.get()
+
+
+def test_encoded_etag():
+    assert encoded_etag('abc', None) == 'abc'
+    assert encoded_etag('abc', 'gzip') == 'abc-gzip'
+    assert encoded_etag('abc', 'zstd') == 'abc-zstd'
+
+
+def test_request_etag(fingerprint):
+    key = ('organs', '/organs', ())
+    # Without a fingerprint, there is no ETag.
+    assert request_etag(key) is None
+
+    ubkg_version.fingerprint = (100, 200)
+    etag = request_etag(key)
+    assert etag == request_etag(key)
+    assert etag != request_etag(('organs', '/organs', (('application_context', ('HUBMAP',)),)))
+    ubkg_version.fingerprint = (101, 200)
+    assert etag != request_etag(key)
+
+
+@pytest.mark.parametrize('if_none_match, expected', [
+    (None, None),
+    ('"other"', None),
+    ('"abc"', 'abc'),
+    ('W/"abc"', 'abc'),
+    ('"abc-gzip"', 'abc-gzip'),
+    ('"other", "abc-zstd"', 'abc-zstd'),
+    ('"abc-br"', None),
+    ('*', 'abc'),
+])
+def test_matching_etag(if_none_match, expected):
+    app = Flask(__name__)
+    headers = {} if if_none_match is None else {'If-None-Match': if_none_match}
+    with app.test_request_context('/', headers=headers):
+        assert matching_etag('abc') == expected
+        # Without an ETag--e.g., before the fingerprint is known--nothing matches.
+        assert matching_etag(None) is None
+
+
+def test_not_modified_without_calling_view(app, view):
+    resp = get(app, view)
+    assert resp.status_code == 200
+    assert resp.headers['X-Cache'] == 'MISS'
+    etag, weak = resp.get_etag()
+    assert etag is not None and not weak
+    assert resp.cache_control.public
+
+    not_modified = response_cache.stats()['not_modified']
+    resp = get(app, view, headers={'If-None-Match': f'"{etag}"'})
+
+    assert resp.status_code == 304
+    assert resp.get_etag() == (etag, False)
+    assert resp.get_data() == b''
+    assert view.count == 1
+    assert response_cache.stats()['not_modified'] == not_modified + 1
+
+
+def test_etag_per_encoding(app, view):
+    resp = get(app, view)
+    etag, _ = resp.get_etag()
+    body = resp.get_data()
+
+    # The cached response, compressed for a client that accepts gzip, has its own ETag.
+    resp = get(app, view, headers={'Accept-Encoding': 'gzip'})
+    assert resp.status_code == 200
+    assert resp.headers['X-Cache'] == 'HIT'
+    assert resp.content_encoding == 'gzip'
+    assert resp.get_data() != body
+    assert resp.get_etag() == (f'{etag}-gzip', False)
+
+    resp = get(app, view, headers={'Accept-Encoding': 'gzip', 'If-None-Match': f'"{etag}-gzip"'})
+    assert resp.status_code == 304
+    assert resp.get_etag() == (f'{etag}-gzip', False)
+    assert resp.content_encoding is None
+    assert view.count == 1
+
+
+def test_fingerprint_change_clears_cache(app, view, fingerprint):
+    etag, _ = get(app, view).get_etag()
+    assert get(app, view).headers['X-Cache'] == 'HIT'
+    invalidations = response_cache.stats()['invalidations']
+
+    # A new UBKG release is loaded.
+    fingerprint['nodes'] += 1
+    resp = get(app, view, headers={'If-None-Match': f'"{etag}"'})
+
+    # The ETag of the previous release does not match, and the response is not from the cache.
+    assert resp.status_code == 200
+    assert resp.headers['X-Cache'] == 'MISS'
+    assert resp.get_etag()[0] != etag
+    assert view.count == 2
+    assert response_cache.stats()['invalidations'] == invalidations + 1
+    assert response_cache.stats()['fingerprint'] == (101, 200)
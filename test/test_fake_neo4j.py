@@ -0,0 +1,61 @@
+# coding: utf-8
+"""
+Tests of the replay of neo4j fixtures in the offline benchmarks (benchmark/fake_neo4j.py), with the fixtures
+in benchmark/fixtures, which are written from a synthetic graph by benchmark/synthetic_fixtures.py.
+
+Run from the root of the repository:
+    python -m pytest test
+"""
+
+import os
+import sys
+
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, os.path.abspath(SRC_DIR))
+BENCHMARK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark')
+sys.path.insert(0, BENCHMARK_DIR)
+
+from hs_ontology_api.utils import cypher_templates
+
+from fake_neo4j import FIXTURE_DIR, FixtureNotFound, replay_helper
+from bench_app import make_app
+
+
+@pytest.fixture(scope='module')
+def helper():
+    return replay_helper(FIXTURE_DIR)
+
+
+@pytest.fixture(scope='module')
+def client(helper):
+    return make_app(helper).test_client()
+
+
+def test_replay_celltype(client, helper):
+    queries = helper.driver.queries
+    resp = client.get('/celltypes/0000001')
+
+    assert resp.status_code == 200
+    assert resp.get_json() == [{'cell_type': {
+        'id': 'CL:0000001',
+        'name': 'signaling immune cell 1',
+        'definition': 'binding ligand stromal transporter membrane zinc member finger delta member regulator '
+                      'signaling'}}]
+    assert helper.driver.queries == queries + 1
+
+
+def test_replay_celltypes_info(client):
+    resp = client.get('/celltypes-info')
+
+    assert resp.status_code == 200
+    body = resp.get_json()
+    assert [cell_type['id'] for cell_type in body['cell_types']] == [f'CL:{n:07d}' for n in range(1, 11)]
+    assert body['pagination']['item_count'] == 300
+
+
+def test_query_without_fixture(helper):
+    query = cypher_templates.registry.get('celltype.cypher').text
+    with pytest.raises(FixtureNotFound):
+        helper.driver.replay(query, {'ids': ['9999999']})
@@ -0,0 +1,128 @@
+# coding: utf-8
+"""
+Tests of the cursors for keyset pagination of the *-info list endpoints (utils/pagination_cursor.py).
+
+Run from the root of the repository:
+    python -m pytest test
+"""
+
+import base64
+import json
+import os
+import sys
+
+import pytest
+from flask import Flask
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, os.path.abspath(SRC_DIR))
+
+from hs_ontology_api.utils.pagination_cursor import (decode_cursor, encode_cursor, validate_cursor,
+                                                     GENE_KEY_TYPES, ID_KEY_TYPES)
+
+
+def raw_cursor(data: bytes) -> str:
+    # Encodes arbitrary bytes as a cursor, without the checks of encode_cursor.
+    return base64.urlsafe_b64encode(data).decode('ascii').rstrip('=')
+
+
+def json_cursor(value) -> str:
+    return raw_cursor(json.dumps(value).encode('utf-8'))
+
+
+@pytest.mark.parametrize('key, key_types', [
+    (['MMRN1', 7178], GENE_KEY_TYPES),
+    ([None, 1915609], GENE_KEY_TYPES),
+    (['Ünïcode', 1], GENE_KEY_TYPES),
+    (['CL:0000115'], ID_KEY_TYPES),
+    (['P12345'], ID_KEY_TYPES),
+])
+def test_round_trip(key, key_types):
+    cursor = encode_cursor(key)
+    assert '=' not in cursor
+    assert decode_cursor(cursor, key_types=key_types) == key
+
+
+def test_empty_cursor_requests_first_page():
+    assert decode_cursor('', key_types=GENE_KEY_TYPES) is None
+
+
+@pytest.mark.parametrize('cursor', [
+    'not a cursor!',
+    '%%%',
+    raw_cursor(b'\xff\xfe'),
+    raw_cursor(b'{not json'),
+])
+def test_bad_base64_or_json(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, key_types=ID_KEY_TYPES)
+
+
+@pytest.mark.parametrize('key, key_types', [
+    (['MMRN1'], GENE_KEY_TYPES),
+    (['MMRN1', 7178, 1], GENE_KEY_TYPES),
+    ([], ID_KEY_TYPES),
+    (['CL:0000115', 'CL:0000116'], ID_KEY_TYPES),
+    ({'id': 'CL:0000115'}, ID_KEY_TYPES),
+    ('CL:0000115', ID_KEY_TYPES),
+])
+def test_wrong_arity(key, key_types):
+    with pytest.raises(ValueError):
+        decode_cursor(json_cursor(key), key_types=key_types)
+
+
+@pytest.mark.parametrize('key, key_types', [
+    # bool is a subclass of int, but is not a gene ID.
+    (['MMRN1', True], GENE_KEY_TYPES),
+    (['MMRN1', False], GENE_KEY_TYPES),
+    (['MMRN1', '7178'], GENE_KEY_TYPES),
+    (['MMRN1', 7178.0], GENE_KEY_TYPES),
+    ([1, 7178], GENE_KEY_TYPES),
+    ([1], ID_KEY_TYPES),
+    ([True], ID_KEY_TYPES),
+])
+def test_wrong_types(key, key_types):
+    with pytest.raises(ValueError):
+        decode_cursor(json_cursor(key), key_types=key_types)
+
+
+@pytest.mark.parametrize('key, key_types', [
+    (['MMRN1', None], GENE_KEY_TYPES),
+    ([None, None], GENE_KEY_TYPES),
+    ([None], ID_KEY_TYPES),
+])
+def test_null_id(key, key_types):
+    with pytest.raises(ValueError):
+        decode_cursor(json_cursor(key), key_types=key_types)
+
+
+@pytest.fixture
+def app():
+    return Flask(__name__)
+
+
+def test_validate_cursor(app):
+    with app.test_request_context():
+        assert validate_cursor(None, None, key_types=ID_KEY_TYPES) is None
+        assert validate_cursor(None, '2', key_types=ID_KEY_TYPES) is None
+        assert validate_cursor('', None, key_types=ID_KEY_TYPES) is None
+        assert validate_cursor(encode_cursor(['CL:0000115']), None, key_types=ID_KEY_TYPES) is None
+
+        response = validate_cursor(encode_cursor(['CL:0000115']), '2', key_types=ID_KEY_TYPES)
+        assert response.status_code == 400
+        assert b'either page or cursor' in response.get_data()
+
+
+@pytest.mark.parametrize('cursor', [
+    '<script>alert(1)</script>',
+    json_cursor(['<script>alert(1)</script>', True]),
+    raw_cursor(b'<img src=x onerror=alert(1)>'),
+])
+def test_400_does_not_reflect_cursor(app, cursor):
+    with app.test_request_context():
+        response = validate_cursor(cursor, None, key_types=GENE_KEY_TYPES)
+    body = response.get_data(as_text=True)
+    assert response.status_code == 400
+    assert body == 'The value for parameter cursor is not a valid cursor.'
+    assert cursor not in body
+    assert '<' not in body
@@ -0,0 +1,115 @@
+# coding: utf-8
+"""
+Tests of the starts_with prefix indexes of the *-info list endpoints (utils/prefix_index.py).
+
+Run from the root of the repository:
+    python -m pytest test
+"""
+
+import os
+import sys
+
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, os.path.abspath(SRC_DIR))
+
+from hs_ontology_api.utils import prefix_index
+from hs_ontology_api.utils.prefix_index import PrefixIndex, _gene_sort_key
+from hs_ontology_api.utils.pagination_cursor import GENE_KEY_TYPES, ID_KEY_TYPES
+
+
+def gene(symbol, gene_id: int, *keys) -> tuple:
+    # Item of a gene index, as in _load_genes.
+    cursor_key = [symbol, gene_id]
+    return _gene_sort_key(cursor_key), f'HGNC:{gene_id}', cursor_key, list(keys or [symbol.upper()])
+
+
+@pytest.fixture
+def genes() -> PrefixIndex:
+    # Items out of sort order; BRCA2 also matches the prefix BRX with a second symbol.
+    return PrefixIndex([gene('EGFR', 3236), gene('BRCA2', 1101, 'BRCA2', 'BRXX'), gene('BRCA1', 1100),
+                        gene('BRAF', 1097), gene('TP53', 11998)],
+                       cursor_sort_key=_gene_sort_key, cursor_types=GENE_KEY_TYPES)
+
+
+@pytest.fixture
+def celltypes() -> PrefixIndex:
+    items = [((code_id,), code_id, [code_id], [term])
+             for code_id, term in [('CL:0000001', 'b cell'), ('CL:0000002', 't cell'), ('CL:0000003', 'b blast')]]
+    return PrefixIndex(items, cursor_sort_key=tuple, cursor_types=ID_KEY_TYPES)
+
+
+@pytest.mark.parametrize('prefix, count', [('', 5), ('BR', 3), ('BRC', 2), ('BRX', 1), ('X', 0)])
+def test_count(genes, prefix, count):
+    assert genes.count(prefix) == count
+
+
+def test_page_skip_limit(genes):
+    assert genes.page('', skip=0, limit=2) == (['HGNC:1097', 'HGNC:1100'], ['BRCA1', 1100])
+    assert genes.page('', skip=2, limit=2) == (['HGNC:1101', 'HGNC:3236'], ['EGFR', 3236])
+    # Last page, which is not full.
+    assert genes.page('', skip=4, limit=2) == (['HGNC:11998'], None)
+    # Page after the last page.
+    assert genes.page('', skip=6, limit=2) == ([], None)
+
+
+def test_page_prefix(genes):
+    assert genes.page('BR', skip=0, limit=2) == (['HGNC:1097', 'HGNC:1100'], ['BRCA1', 1100])
+    assert genes.page('BR', skip=2, limit=2) == (['HGNC:1101'], None)
+    # A full last page has no next page.
+    assert genes.page('BRC', skip=0, limit=2) == (['HGNC:1100', 'HGNC:1101'], None)
+    assert genes.page('X', skip=0, limit=2) == ([], None)
+
+
+def test_page_after(genes):
+    code_ids, after = genes.page('', skip=0, limit=2)
+    assert genes.page('', skip=0, limit=2, after=after) == (['HGNC:1101', 'HGNC:3236'], ['EGFR', 3236])
+    # The key of a cursor need not be in the index, or match the prefix.
+    assert genes.page('BR', skip=0, limit=10, after=['BRB', 1]) == (['HGNC:1100', 'HGNC:1101'], None)
+    assert genes.page('BR', skip=0, limit=10, after=['EGFR', 3236]) == ([], None)
+
+
+def test_page_after_last_key(genes, celltypes):
+    assert genes.page('', skip=0, limit=2, after=['TP53', 11998]) == ([], None)
+    assert genes.page('BR', skip=0, limit=2, after=['BRCA2', 1101]) == ([], None)
+    assert celltypes.page('b', skip=0, limit=2, after=['CL:0000003']) == ([], None)
+
+
+@pytest.mark.parametrize('after', [
+    [1100, 'BRCA1'],
+    ['BRCA1', '1100'],
+    ['BRCA1', True],
+    ['BRCA1'],
+    'BRCA1',
+])
+def test_page_invalid_gene_cursor(genes, after):
+    with pytest.raises(ValueError):
+        genes.page('', skip=0, limit=2, after=after)
+
+
+@pytest.mark.parametrize('after', [[1], [None], ['CL:0000001', 1]])
+def test_page_invalid_id_cursor(celltypes, after):
+    with pytest.raises(ValueError):
+        celltypes.page('', skip=0, limit=2, after=after)
+
+
+def test_mouse_genes_without_symbols_sort_last(monkeypatch):
+    records = [
+        {'code_id': 'MGI:3', 'id': 3, 'symbols': []},
+        {'code_id': 'MGI:2', 'id': 2, 'symbols': ["['Zfp1']"]},
+        {'code_id': 'MGI:1', 'id': 1, 'symbols': []},
+        {'code_id': 'MGI:4', 'id': 4, 'symbols': ["['A1bg']"]},
+    ]
+    monkeypatch.setattr(prefix_index, 'query_records', lambda neo4j_instance, queryfile: records)
+    index = prefix_index._load_mouse_genes(None)['mouse']
+
+    assert index.page('', skip=0, limit=4) == (['MGI:4', 'MGI:2', 'MGI:1', 'MGI:3'], None)
+    # Genes without symbols have no search keys.
+    assert index.count('') == 4
+    assert index.count('A1') == 1
+    # Cursors from genes without symbols have a null symbol.
+    code_ids, after = index.page('', skip=0, limit=3)
+    assert after == [None, 1]
+    assert index.page('', skip=0, limit=3, after=after) == (['MGI:3'], None)
+    assert index.page('', skip=0, limit=3, after=["['Zfp1']", 2]) == (['MGI:1', 'MGI:3'], None)